@@ -1,5 +1,9 @@
 import random
 
+import numpy as np
+
+from phase2.BulkCsvLoader import BulkCsvLoader, DRIVER_COLUMNS, REQUEST_COLUMNS
+
 
 def load_drivers(path: str) -> list[dict]:
     """ Read drivers from a CSV.
@@ -410,6 +414,112 @@ def generate_requests(start_t: int, out_list: list,
         out_list.append(req)
 
 
+def _load_csv_array(path: str, columns: dict[str, tuple[str, ...]], bounds: list[float], cache: bool) -> np.ndarray:
+    """
+    Parse a whole CSV into an int array of the given columns and drop the invalid rows.
+
+    Parsing, caching and the checks are done by phase2's BulkCsvLoader. Rows with a value
+    that is not an integer, is negative or is above its bound are dropped and reported in
+    one warning. With cache=True the parsed file is kept next to it as
+    `<path>.<mtime_ns>.npy` and reused until the file changes.
+
+    Returns:
+        np.ndarray: (rows, columns) int64 array of the valid rows, in file order.
+    """
+    loader = BulkCsvLoader(50, 30, cache=cache)
+    _, values = loader.load(path, columns, bounds, integer=True)
+
+    report = loader.report
+    if report["kept"] < report["rows"]:
+        print(f"Warning: {path}: skipped {report['rows'] - report['kept']} of {report['rows']} rows "
+              f"({report['not_a_number'] + report['not_an_integer']} not an integer, {report['negative']} negative, "
+              f"{report['out_of_bounds']} out of bounds).")
+    return values
+
+
+def load_drivers_array(path: str, cache: bool = False) -> np.ndarray:
+    """
+    Bulk version of load_drivers for large files: the same headers and checks, but the file
+    is parsed in one go into a NumPy array and skipped rows are reported in one warning.
+
+    Returns:
+        np.ndarray: (n, 2) int64 array of x and y; driver i of load_drivers is row i - 1.
+
+    Tests
+    --------
+    >>> import tempfile, os, io, contextlib
+    >>> txt = "#initial px,py\\n4,5\\n-1,5\\n5,31\\nhello,2\\n50,30\\n"
+    >>> f = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+    >>> _ = f.write(txt.encode()); f.close()
+    >>> buf = io.StringIO()
+    >>> with contextlib.redirect_stdout(buf):
+    ...     rows = load_drivers_array(f.name)
+    >>> rows.tolist()
+    [[4, 5], [50, 30]]
+    >>> buf.getvalue().count("Warning")
+    1
+    >>> with contextlib.redirect_stdout(buf):
+    ...     same = rows.tolist() == [[d["x"], d["y"]] for d in load_drivers(f.name)]
+    >>> same
+    True
+    >>> os.unlink(f.name)
+
+    Cached parse is reused until the file changes:
+    >>> f = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+    >>> _ = f.write(b"x,y\\n1,2\\n"); f.close()
+    >>> load_drivers_array(f.name, cache=True).tolist()
+    [[1, 2]]
+    >>> sidecar = f"{f.name}.{os.stat(f.name).st_mtime_ns}.npy"
+    >>> os.path.exists(sidecar)
+    True
+    >>> load_drivers_array(f.name, cache=True).tolist()
+    [[1, 2]]
+    >>> os.unlink(sidecar); os.unlink(f.name)
+    """
+    try:
+        return _load_csv_array(path, DRIVER_COLUMNS, [50, 30], cache)
+    except FileNotFoundError:
+        print(f"Error: The file at path '{path}' was not found.")
+        return np.empty((0, 2), dtype=np.int64)
+
+
+def load_requests_array(path: str, cache: bool = False) -> np.ndarray:
+    """
+    Bulk version of load_requests for large files. Rows with a value that is not an integer
+    are skipped (with the other invalid rows, in one warning) instead of raising.
+
+    Returns:
+        np.ndarray: (n, 5) int64 array of t, px, py, dx and dy.
+
+    Tests
+    --------
+    >>> import tempfile, os, io, contextlib
+    >>> txt = (
+    ...     "#request time,pickup x,pickup y,delivery x,delivery y\\n"
+    ...     "-1,0,0,0,0\\n"    # drop: t < 0
+    ...     "0,60,0,0,0\\n"    # drop: px > 50
+    ...     "hello,1,2,3,4\\n" # drop: not an integer
+    ...     "1e30,1,2,3,4\\n"  # drop: does not fit an int64
+    ...     "0,1,2,3,4\\n"     # keep
+    ... )
+    >>> f = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+    >>> _ = f.write(txt.encode()); f.close()
+    >>> buf = io.StringIO()
+    >>> with contextlib.redirect_stdout(buf):
+    ...     out = load_requests_array(f.name)
+    >>> out.tolist()
+    [[0, 1, 2, 3, 4]]
+    >>> print(buf.getvalue().strip())  # doctest: +ELLIPSIS
+    Warning: ...: skipped 4 of 5 rows (1 not an integer, 1 negative, 2 out of bounds).
+    >>> os.unlink(f.name)
+    """
+    try:
+        return _load_csv_array(path, REQUEST_COLUMNS, [np.inf, 50, 30, 50, 30], cache)
+    except FileNotFoundError:
+        print(f"Error: The file at path '{path}' was not found.")
+        return np.empty((0, 5), dtype=np.int64)
+
+
 if __name__ == "__main__":
     import doctest
 
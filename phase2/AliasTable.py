@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+
+class AliasTable:
+    """
+    Samples an index with probability proportional to its weight in O(1), using Vose's alias
+    method.
+
+    Building the table is O(n): every index gets a column holding its own probability and an
+    alias index that fills the rest of the column. A draw picks a column uniformly and then
+    either the column's index or its alias, so it costs two uniform numbers whatever the
+    number of weights.
+    """
+
+    def __init__(self, weights) -> None:
+        weights = np.asarray(weights, dtype=np.float64).ravel()
+        if weights.size == 0:
+            raise ValueError("weights must not be empty")
+        if not np.all(np.isfinite(weights)) or np.any(weights < 0):
+            raise ValueError("weights must be finite and non-negative")
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("weights must not all be zero")
+
+        n = weights.size
+        scaled = weights * n / total
+        prob = np.ones(n, dtype=np.float64)
+        alias = np.arange(n)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            # The large index gives away what the small column lacks
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to rounding errors and keeps prob 1
+
+        self.size = n
+        self.prob = prob.tolist()
+        self.alias = alias.tolist()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __str__(self) -> str:
+        return f"AliasTable(size={self.size})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def sample(self, rng: random.Random) -> int:
+        """
+        Draw one index.
+
+        Args:
+            rng (random.Random): Stream to draw from (or the random module)
+
+        Returns:
+            int: An index, with probability proportional to its weight.
+        """
+        column = int(rng.random() * self.size)
+        return column if rng.random() < self.prob[column] else self.alias[column]
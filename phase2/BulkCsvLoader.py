@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import glob
+import os
+import warnings
+
+import numpy as np
+
+# Accepted headers of each column, compared without '#', surrounding spaces and case
+DRIVER_COLUMNS = {"x": ("x", "px", "initial px"), "y": ("y", "py")}
+REQUEST_COLUMNS = {"t": ("request time",), "px": ("pickup x",), "py": ("pickup y",),
+                   "dx": ("delivery x",), "dy": ("delivery y",)}
+# Largest float64 below 2**63, integer columns must fit into int64
+INT64_BOUND = float(np.nextafter(2.0 ** 63, 0))
+
+
+class BulkCsvLoader:
+    """
+    Loads driver and request CSVs (the formats of data/drivers.csv and data/requests.csv)
+    into NumPy arrays in one pass, instead of building a dict per row.
+
+    The whole file is parsed by np.loadtxt. Only if that fails on a malformed value is the
+    file parsed again line by line, with such values read as NaN. Rows are then validated
+    with array operations: values must be finite numbers (integers that fit into int64 for
+    requests), non-negative and inside the map. Rejected rows are not printed one by one but
+    counted per reason in `report`, see summary().
+
+    With `cache` the parsed file is saved next to it as `<path>.<mtime_ns>.npy` and reused as
+    long as the file's modification time does not change, so repeated runs skip parsing.
+    Bounds are checked after the cache, so one cache serves any map size. The cache is
+    written to a temporary file and renamed, so concurrent loaders never read half of it.
+    """
+
+    def __init__(self, width: float, height: float, cache: bool = False) -> None:
+        if not isinstance(width, (int, float)) or not isinstance(height, (int, float)):
+            raise TypeError("width and height must be a number")
+        if width < 0 or height < 0:
+            raise ValueError("width and height must be non-negative")
+
+        self.width = width
+        self.height = height
+        self.cache = cache
+        # Rows read and rejected per reason by the last load
+        self.report: dict[str, int] = {}
+
+    def __str__(self) -> str:
+        return f"BulkCsvLoader(width={self.width}, height={self.height}, cache={self.cache})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @staticmethod
+    def cache_path(path: str) -> str:
+        """
+        Returns:
+            str: Path of the sidecar cache of a CSV for its current modification time.
+        """
+        return f"{path}.{os.stat(path).st_mtime_ns}.npy"
+
+    def read(self, path: str) -> tuple[list[str], np.ndarray]:
+        """
+        Parse a CSV, or load it from its cache.
+
+        Args:
+            path (str): Path of the CSV
+
+        Returns:
+            The normalised headers and a float64 (rows, columns) array of the values, NaN
+            where a value is not a number.
+        """
+        with open(path, 'r') as file:
+            header_line = file.readline()
+        if not header_line:
+            raise ValueError(f"{path}: file is empty (no header row)")
+        headers = [header.strip().lstrip("#").strip().lower() for header in header_line.split(",")]
+
+        sidecar = self.cache_path(path) if self.cache else None
+        if sidecar is not None and os.path.exists(sidecar):
+            try:
+                return headers, np.load(sidecar)
+            except FileNotFoundError:
+                # Removed by another loader after the file changed
+                pass
+
+        try:
+            with warnings.catch_warnings():
+                # A file with only a header is not an error
+                warnings.simplefilter("ignore", UserWarning)
+                values = np.loadtxt(path, dtype=np.float64, delimiter=",", skiprows=1, comments=None, ndmin=2)
+            if values.size == 0:
+                values = np.empty((0, len(headers)), dtype=np.float64)
+            elif values.shape[1] != len(headers):
+                raise ValueError("rows do not match the header")
+        except ValueError:
+            values = self._read_lines(path, len(headers))
+
+        if sidecar is not None:
+            self._write_cache(path, sidecar, values)
+        return headers, values
+
+    @staticmethod
+    def _write_cache(path: str, sidecar: str, values: np.ndarray) -> None:
+        """
+        Write the cache of a CSV atomically and drop the caches of older versions of the file.
+        """
+        tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(tmp_path, sidecar)
+        for stale in glob.glob(f"{glob.escape(path)}.*.npy"):
+            if stale != sidecar:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def _read_lines(path: str, n_columns: int) -> np.ndarray:
+        """
+        Slow path of read() for files with malformed values: NaN for values that are not
+        numbers, a row of NaN for rows with too few values.
+        """
+        rows = []
+        with open(path, 'r') as file:
+            file.readline()
+            for line in file:
+                if not line.strip():
+                    continue
+                values = line.split(",")
+                row = []
+                for j in range(n_columns):
+                    try:
+                        row.append(float(values[j]))
+                    except (ValueError, IndexError):
+                        row.append(np.nan)
+                rows.append(row)
+        return np.array(rows, dtype=np.float64).reshape(-1, n_columns)
+
+    def load(self, path: str, columns: dict[str, tuple[str, ...]], bounds: list[float],
+             integer: bool) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Load the given columns of a CSV and drop the invalid rows, see the class docstring.
+
+        Args:
+            path (str): Path of the CSV
+            columns (dict[str, tuple[str, ...]]): Name -> accepted headers of each column
+            bounds (list[float]): Largest valid value of each column
+            integer (bool): Whether the values must be integers, returned as int64
+
+        Returns:
+            The row numbers (from 1) of the valid rows and a (n, columns) array of their
+            values.
+        """
+        headers, values = self.read(path)
+
+        indices = []
+        for name, aliases in columns.items():
+            found = [headers.index(alias) for alias in aliases if alias in headers]
+            if not found:
+                raise ValueError(f"{path}: missing the {name} column, accepted headers: {', '.join(aliases)}")
+            indices.append(found[0])
+        values = values[:, indices]
+
+        bounds = np.array(bounds, dtype=np.float64)
+        if integer:
+            bounds = np.minimum(bounds, INT64_BOUND)
+        # Infinite values are no more usable than NaN, e.g. inf would pass an infinite bound
+        not_a_number = ~np.isfinite(values).all(axis=1)
+        not_an_integer = ~not_a_number & (values != np.round(values)).any(axis=1) if integer \
+            else np.zeros(len(values), dtype=bool)
+        # NaN compares False, so rows that are not numbers are not counted twice
+        negative = ~not_a_number & ~not_an_integer & (values < 0).any(axis=1)
+        out_of_bounds = ~not_a_number & ~not_an_integer & ~negative & (values > bounds).any(axis=1)
+        keep = ~(not_a_number | not_an_integer | negative | out_of_bounds)
+
+        self.report = {'rows': len(values),
+                       'kept': int(keep.sum()),
+                       'not_a_number': int(not_a_number.sum()),
+                       'not_an_integer': int(not_an_integer.sum()),
+                       'negative': int(negative.sum()),
+                       'out_of_bounds': int(out_of_bounds.sum())}
+
+        # Row numbers count the data rows from 1, like the ids given by the line-by-line loaders
+        rows = np.flatnonzero(keep) + 1
+        kept = values[keep]
+        return rows, kept.astype(np.int64) if integer else kept
+
+    def load_drivers(self, path: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Load the starting positions of drivers.
+
+        Args:
+            path (str): CSV with x (or px, #initial px) and y (or py) columns
+
+        Returns:
+            The row numbers (from 1) of the valid rows and a float64 (n, 2) array of their
+            x and y.
+        """
+        return self.load(path, DRIVER_COLUMNS, [self.width, self.height], integer=False)
+
+    def load_requests(self, path: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Load requests.
+
+        Args:
+            path (str): CSV with #request time, pickup x, pickup y, delivery x and delivery y
+                columns
+
+        Returns:
+            The row numbers (from 1) of the valid rows and an int64 (n, 5) array of their
+            time, px, py, dx and dy.
+        """
+        return self.load(path, REQUEST_COLUMNS, [np.inf, self.width, self.height, self.width, self.height],
+                          integer=True)
+
+    def summary(self, path: str) -> str:
+        """
+        Returns:
+            str: One line with the rows of the last load and the rejected rows per reason.
+        """
+        rejected = {reason: count for reason, count in self.report.items()
+                    if reason not in ('rows', 'kept') and count}
+        text = f"{path}: kept {self.report.get('kept', 0)} of {self.report.get('rows', 0)} rows"
+        if rejected:
+            text += " (skipped " + ", ".join(f"{count} {reason.replace('_', ' ')}"
+                                             for reason, count in rejected.items()) + ")"
+        return text
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import os
+import pickle
+import random
+import threading
+import time
+import zlib
+
+# Start of every checkpoint file, the last three characters are the format version
+MAGIC = b"DSCKP001"
+
+
+class Checkpointer:
+    """
+    Saves the full state of a DeliverySimulation to a file, so a long run can be resumed
+    where it stopped, and does so every `every` ticks while the simulation runs.
+
+    A checkpoint is the pickled simulation (drivers, requests, policies, generators and their
+    random streams), the state of the global random module and the position of the run's
+    event log, compressed with zlib behind a MAGIC header. Files are written to a temporary
+    file and renamed, so a crash never leaves a half-written checkpoint behind. Loading one
+    cuts the event log back to that position, a resumed run therefore logs exactly the events
+    of a run that never stopped.
+
+    Periodic checkpoints are written in the background, so the simulation only stalls for
+    the part that must see a consistent state:
+
+    - "fork": the process is forked and the child pickles, compresses and writes the
+      copy-on-write snapshot of the simulation. The tick thread only pays for the fork.
+    - "thread": the simulation is pickled in the tick thread, which freezes the snapshot,
+      and a background thread compresses and writes it.
+
+    "fork" is the default where os.fork exists. A checkpoint that is due while the previous
+    one is still being written is skipped. The stall of every checkpoint is kept in `stalls`
+    (nanoseconds), see report().
+    """
+
+    MODES = ("fork", "thread")
+
+    def __init__(self, path: str, every: int, mode: str | None = None) -> None:
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        if not isinstance(every, int):
+            raise TypeError("every must be int")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if mode is None:
+            mode = "fork" if hasattr(os, "fork") else "thread"
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {', '.join(self.MODES)}")
+        if mode == "fork" and not hasattr(os, "fork"):
+            raise ValueError("mode fork is not available on this platform")
+
+        self.path = path
+        self.every = every
+        self.mode = mode
+        self.saved = 0
+        self.skipped = 0
+        self.stalls: list[int] = []
+        self._worker: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    def __str__(self) -> str:
+        return f"Checkpointer(path={self.path}, every={self.every}, mode={self.mode})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @staticmethod
+    def payload(simulation) -> dict:
+        """
+        Collect everything a checkpoint holds. Flushes the run's events.
+
+        Args:
+            simulation (DeliverySimulation): Simulation to checkpoint, between two ticks
+
+        Returns:
+            dict: The simulation, the global random state and the event log position.
+        """
+        return {'simulation': simulation,
+                'random_state': random.getstate(),
+                'event_log': simulation.event_manager.log_position()}
+
+    @staticmethod
+    def pack(pickled: bytes) -> bytes:
+        """
+        Returns:
+            bytes: The contents of a checkpoint file holding a pickled payload.
+        """
+        return MAGIC + zlib.compress(pickled, 1)
+
+    @classmethod
+    def encode(cls, payload: dict) -> bytes:
+        """
+        Returns:
+            bytes: The contents of a checkpoint file holding the payload.
+        """
+        return cls.pack(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def decode(data: bytes) -> dict:
+        """
+        Args:
+            data (bytes): Contents of a checkpoint file
+
+        Returns:
+            dict: The payload of the checkpoint.
+        """
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a checkpoint file or a checkpoint of another version")
+        return pickle.loads(zlib.decompress(data[len(MAGIC):]))
+
+    @staticmethod
+    def write(path: str, data: bytes) -> None:
+        """
+        Write a file atomically: the file at `path` is either the old or the new one.
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def save(cls, simulation, path: str) -> None:
+        """
+        Save a checkpoint of a simulation in the tick thread.
+
+        Args:
+            simulation (DeliverySimulation): Simulation to checkpoint, between two ticks
+            path (str): Checkpoint file
+        """
+        cls.write(path, cls.encode(cls.payload(simulation)))
+
+    @classmethod
+    def read(cls, path: str) -> dict:
+        """
+        Args:
+            path (str): Checkpoint file
+
+        Returns:
+            dict: The payload of the checkpoint, see payload().
+        """
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+    @staticmethod
+    def restore(payload: dict):
+        """
+        Restore the global random state and cut the run's event log back to the checkpoint.
+
+        Args:
+            payload (dict): Payload of a checkpoint
+
+        Returns:
+            DeliverySimulation: The simulation, ready for its next tick.
+        """
+        simulation = payload['simulation']
+        random.setstate(payload['random_state'])
+        simulation.event_manager.restore_log(payload['event_log'])
+        return simulation
+
+    def busy(self) -> bool:
+        """
+        Returns:
+            bool: True while a checkpoint is being written.
+        """
+        return self._worker is not None and self._worker.is_alive()
+
+    def maybe_checkpoint(self, simulation) -> bool:
+        """
+        Start a checkpoint in the background if one is due at the simulation's time.
+
+        Args:
+            simulation (DeliverySimulation): Simulation to checkpoint, between two ticks
+
+        Returns:
+            bool: True if a checkpoint was started.
+        """
+        if simulation.time % self.every != 0:
+            return False
+        if self.busy():
+            self.skipped += 1
+            return False
+        self._check_error()
+
+        start = time.perf_counter_ns()
+        # Flushed in the parent, a child writing buffered events would log them twice
+        payload = self.payload(simulation)
+        if self.mode == "fork":
+            pid = os.fork()
+            if pid == 0:
+                # Child: write the snapshot and exit without running any cleanup of the parent
+                status = 0
+                try:
+                    self.write(self.path, self.encode(payload))
+                except BaseException:
+                    status = 1
+                os._exit(status)
+            self._worker = threading.Thread(target=self._wait_child, args=(pid,),
+                                            name=f"Checkpointer({self.path})", daemon=True)
+        else:
+            pickled = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            self._worker = threading.Thread(target=self._write_pickled, args=(pickled,),
+                                            name=f"Checkpointer({self.path})", daemon=True)
+        self._worker.start()
+
+        self.stalls.append(time.perf_counter_ns() - start)
+        self.saved += 1
+        return True
+
+    def _wait_child(self, pid: int) -> None:
+        _, status = os.waitpid(pid, 0)
+        if status != 0:
+            self._error = RuntimeError(f"checkpoint process exited with status {status}")
+
+    def _write_pickled(self, pickled: bytes) -> None:
+        try:
+            self.write(self.path, self.pack(pickled))
+        except BaseException as error:
+            self._error = error
+
+    def _check_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise RuntimeError(f"Writing checkpoint {self.path} failed") from error
+
+    def wait(self) -> None:
+        """
+        Wait until the checkpoint being written, if any, is on disk.
+        """
+        if self._worker is not None:
+            self._worker.join()
+        self._check_error()
+
+    def report(self) -> str:
+        """
+        Returns:
+            str: One line with the number of checkpoints and how long the simulation stalled.
+        """
+        text = f"checkpoints: {self.saved} saved, {self.skipped} skipped"
+        if self.stalls:
+            text += (f", stall avg {sum(self.stalls) / len(self.stalls) / 1e6:.2f} ms, "
+                     f"max {max(self.stalls) / 1e6:.2f} ms")
+        return text
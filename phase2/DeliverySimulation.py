@@ -1,34 +1,53 @@
 from __future__ import annotations
 
 import datetime
+import time
 
+import numpy as np
+
+from phase2.Checkpointer import Checkpointer
 from phase2.Driver import Driver, DriverStatus
+from phase2.FleetStore import FleetStore
 from phase2.MutationRule import MutationRule
 from phase2.Offer import Offer
 from phase2.Point import Point
 from phase2.Request import Request, RequestStatus
 from phase2.RequestGenerator import RequestGenerator
+from phase2.RequestStore import RequestStore
+from phase2.SpatialGrid import SpatialGrid
 from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
 from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.CostMatrix import CostMatrix
 from phase2.dispatch.DispatchPolicy import DispatchPolicy
 from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
 from phase2.metrics.Event import Event, EventType
 from phase2.metrics.EventManager import EventManager
+from phase2.metrics.TickProfiler import TickPhase, TickProfiler
+from phase2.metrics.TickTracer import TickTracer
 
 
 class DeliverySimulation:
+    # Number of nearest idle drivers a rejected request can be re-offered to in cascade mode
+    DEFAULT_CASCADE_CANDIDATES = 5
+
     def __init__(self,
                  time: int,
                  width: int,
                  height: int,
                  drivers: list[Driver],
-                 requests: list[Request],
+                 requests: list[Request] | RequestStore,
                  request_generator: RequestGenerator,
                  dispatch_policy: DispatchPolicy,
                  mutation_rule: MutationRule,
                  timeout: int,
                  statistics: dict,
-                 run_id: str) -> None:
+                 run_id: str,
+                 vectorized: bool = False,
+                 cascade_rounds: int = 0,
+                 cascade_candidates: int = DEFAULT_CASCADE_CANDIDATES,
+                 profile: bool = False,
+                 trace: bool = False,
+                 checkpointer: Checkpointer | None = None) -> None:
         if not isinstance(time, int):
             raise TypeError("time must be int")
         if not isinstance(width, int):
@@ -41,8 +60,9 @@ class DeliverySimulation:
             raise TypeError("run_id must be str")
         if not isinstance(drivers, list) or not all(isinstance(d, Driver) for d in drivers):
             raise TypeError("drivers must be list[Driver]")
-        if not isinstance(requests, list) or not all(isinstance(r, Request) for r in requests):
-            raise TypeError("requests must be list[Request]")
+        if not isinstance(requests, RequestStore) and \
+                (not isinstance(requests, list) or not all(isinstance(r, Request) for r in requests)):
+            raise TypeError("requests must be list[Request] or RequestStore")
         if not isinstance(request_generator, RequestGenerator):
             raise TypeError("request_generator must be RequestGenerator")
         if not isinstance(dispatch_policy, DispatchPolicy):
@@ -51,22 +71,198 @@ class DeliverySimulation:
             raise TypeError("mutation_rule must be MutationRule")
         if not isinstance(statistics, dict):
             raise TypeError("statistics must be dict")
-
-        self.time = time
+        if not isinstance(vectorized, bool):
+            raise TypeError("vectorized must be bool")
+        if not isinstance(cascade_rounds, int):
+            raise TypeError("cascade_rounds must be int")
+        if cascade_rounds < 0:
+            raise ValueError("cascade_rounds must be non-negative")
+        if not isinstance(cascade_candidates, int):
+            raise TypeError("cascade_candidates must be int")
+        if cascade_candidates < 1:
+            raise ValueError("cascade_candidates must be at least 1")
+        if not isinstance(profile, bool):
+            raise TypeError("profile must be bool")
+        if not isinstance(trace, bool):
+            raise TypeError("trace must be bool")
+        if checkpointer is not None and not isinstance(checkpointer, Checkpointer):
+            raise TypeError("checkpointer must be Checkpointer or None")
+
+        # When vectorized, driver state is kept in a FleetStore and drivers are moved with NumPy
+        self.vectorized = vectorized
+        self.fleet: FleetStore | None = None
+
+        self._time = time
+        # Tick whose requests have had their wait counted, see _wait_clock()
+        self._wait_tick: int | None = None
         self.width = width
         self.height = height
         self.drivers = drivers
-        self.requests = requests
         self.dispatch_policy = dispatch_policy
         self.mutation_rule = mutation_rule
         self.timeout = timeout
         self.statistics = statistics
         self.request_generator = request_generator
+        # Set after the map, timeout and generator, which size its pickup index
+        self.requests = requests
+
+        # Cascade mode: requests rejected during a tick are re-offered to their next nearest idle
+        # drivers, for at most cascade_rounds extra rounds (0 turns it off)
+        self.cascade_rounds = cascade_rounds
+        self.cascade_candidates = cascade_candidates
+        self.last_cascade_rounds = 0
+
+        # Wall time per tick phase, only recorded when profiling or tracing
+        self.profiler: TickProfiler | None = TickProfiler() if profile else None
+        self.tracer: TickTracer | None = TickTracer() if trace else None
+
+        # Saves a checkpoint every checkpointer.every ticks, None turns it off
+        self.checkpointer = checkpointer
 
         # Unique run identifier used for the EventManager
         self.run_id = run_id
         self.event_manager = EventManager(run_id)
 
+    @property
+    def drivers(self) -> list[Driver]:
+        return self._drivers
+
+    @drivers.setter
+    def drivers(self, drivers: list[Driver]) -> None:
+        self._drivers = drivers
+        self._build_driver_index()
+        if self.vectorized:
+            self._build_fleet()
+
+    @property
+    def time(self) -> int:
+        return self._time
+
+    @time.setter
+    def time(self, time: int) -> None:
+        """
+        Setting the time forward counts the skipped ticks as waited, like ticks would. Setting
+        it back restarts the clock, e.g. when the GUI re-initialises a run: active requests keep
+        the waits counted so far and count on from `time`, so they still expire `timeout` ticks
+        after they started waiting.
+        """
+        if time >= self._time:
+            self._time = time
+            return
+        # Freeze the waits on the old clock, then start them again on the new one
+        self._requests.clock = None
+        self._time = time
+        self._wait_tick = None
+        self._requests.clock = self._wait_clock
+
+    @property
+    def requests(self) -> RequestStore:
+        return self._requests
+
+    @requests.setter
+    def requests(self, requests: list[Request] | RequestStore) -> None:
+        if not isinstance(requests, RequestStore):
+            requests = RequestStore(requests, cell_size=self._pickup_cell_size())
+        self._requests = requests
+        self._requests.clock = self._wait_clock
+
+    def _pickup_cell_size(self) -> float:
+        """
+        Cell size of the index of waiting pickups. Requests wait at most `timeout` ticks, so at
+        peak demand about peak_rate * timeout of them are spread over the map.
+        """
+        return SpatialGrid.cell_size_for_area(self.width, self.height,
+                                              self.request_generator.peak_rate * self.timeout)
+
+    def _wait_clock(self) -> int:
+        """
+        Clock used to derive request wait times: the number of ticks whose waits were counted.
+        A tick counts from the wait update phase on, so a request created during a tick has
+        waited one tick after that phase, and as many ticks as it was in the simulation
+        between ticks.
+        """
+        return self.time + 1 if self._wait_tick == self.time else self.time
+
+    def _build_driver_index(self) -> None:
+        """
+        (Re)build the id -> driver index from the current list of drivers.
+        """
+        self._driver_index = {driver.id: driver for driver in self._drivers}
+        self._driver_index_len = len(self._drivers)
+
+    def _get_driver(self, driver_id: int) -> Driver | None:
+        """
+        Look up a driver by id.
+
+        Args:
+            driver_id (int): Id of the driver
+
+        Returns:
+            The driver, or None if no driver has that id.
+        """
+        # Drivers may have been added to the list since the index was built
+        if self._driver_index_len != len(self._drivers):
+            self._build_driver_index()
+        return self._driver_index.get(driver_id)
+
+    def _build_fleet(self) -> None:
+        """
+        (Re)build the FleetStore from the current list of drivers.
+        """
+        if self.fleet is not None:
+            self.fleet.release()
+        self.fleet = FleetStore(self._drivers)
+
+    def _current_fleet(self) -> FleetStore:
+        """
+        Returns:
+            The FleetStore of the drivers, rebuilt if drivers were added to the list since it was built.
+        """
+        if self.fleet is None or self.fleet.source_len != len(self.drivers):
+            self._build_fleet()
+        return self.fleet
+
+    def __getstate__(self) -> dict:
+        # Timings and the checkpointer belong to the process, a resumed run starts them afresh
+        state = self.__dict__.copy()
+        state['profiler'] = state['profiler'] is not None
+        state['tracer'] = state['tracer'] is not None
+        state['checkpointer'] = None
+        del state['event_manager']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.profiler = TickProfiler() if state['profiler'] else None
+        self.tracer = TickTracer() if state['tracer'] else None
+        self.event_manager = EventManager(self.run_id)
+
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Save the full state of the simulation between two ticks, see Checkpointer.
+
+        Args:
+            path (str): Checkpoint file
+        """
+        Checkpointer.save(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> DeliverySimulation:
+        """
+        Resume a simulation from a checkpoint. Also restores the global random state and cuts
+        the run's event log back to the checkpoint.
+
+        Args:
+            path (str): Checkpoint file
+
+        Returns:
+            DeliverySimulation: The simulation, continuing exactly like the checkpointed run.
+        """
+        payload = Checkpointer.read(path)
+        if not isinstance(payload['simulation'], cls):
+            raise TypeError(f"{path} is not a checkpoint of a {cls.__name__}")
+        return Checkpointer.restore(payload)
+
     def __str__(self):
         return (f"DeliverySimulation(time={self.time}, "
                 f"drivers={self.drivers}, "
@@ -84,35 +280,129 @@ class DeliverySimulation:
         2. Update waiting times and mark expired requests.
         3. Compute proposed assignments via dispatch_policy. (missing)
         4. Convert proposals to offers, ask driver behaviours to accept/reject.
-        5. Resolve conflicts and finalise assignments.
+        5. Resolve conflicts and finalise assignments. In cascade mode, re-offer rejected
+           requests to their next nearest idle drivers.
         6. Move drivers and handle pickup/dropoff events.
         7. Apply mutation_rule to each driver.
-        8. Increment time.
+        8. Increment time, and save a checkpoint if one is due.
         """
 
+        timed = self.profiler is not None or self.tracer is not None
+        tick_start = start = time.perf_counter_ns() if timed else 0
+
         # Generate new requests
-        self.requests.extend(self.request_generator.maybe_generate(self.time))
+        new_requests = self.request_generator.maybe_generate(self.time)
+        self.requests.extend(new_requests)
+        if timed: start = self._lap(TickPhase.GENERATION, start, len(new_requests))
 
         # Update waiting times and mark expired requests
         self._update_req_wait_times()
+        if timed: start = self._lap(TickPhase.WAIT_UPDATE, start)
 
-        # Compute proposed assignments via dispatch_policy
-        proposals = self.dispatch_policy.assign(drivers=self.drivers, requests=self.requests, time=self.time,
-                                                run_id=self.run_id)
+        # Costs of this tick's (idle driver, waiting request) pairs, shared by dispatch and offers
+        waiting_requests = self.requests.waiting()
+        costs = self._tick_costs(waiting_requests)
+        if self.tracer is not None:
+            assign_start = time.perf_counter_ns()
+            if costs is not None:
+                self.tracer.region("CostMatrix", start, assign_start,
+                                   {'idle_drivers': len(costs.drivers), 'waiting_requests': len(costs.requests)})
 
-        offers = self._create_offers(proposals)
+        # Compute proposed assignments via dispatch_policy
+        proposals = self.dispatch_policy.assign(drivers=self.drivers, requests=waiting_requests,
+                                                time=self.time, run_id=self.run_id, costs=costs)
+        if self.tracer is not None:
+            self.tracer.region("dispatch_policy.assign", assign_start, time.perf_counter_ns(),
+                               {'policy': type(self.dispatch_policy).__name__, 'proposals': len(proposals)})
+        if timed: start = self._lap(TickPhase.DISPATCH, start, len(waiting_requests),
+                                    idle_drivers=len(costs.drivers) if costs is not None else 0,
+                                    waiting_requests=len(waiting_requests), proposals=len(proposals))
+
+        offers = self._create_offers(proposals, costs)
+        if timed: start = self._lap(TickPhase.OFFERS, start, len(offers), offers=len(offers))
 
         # Get driver responses to offers, resolve conflicts and finalize assignments
         self._assign_and_resolve_offers(offers)
 
+        if self.cascade_rounds > 0:
+            self.last_cascade_rounds = self._cascade_offers(offers, costs)
+            self.statistics['cascade_rounds'] = self.statistics.get('cascade_rounds', 0) + self.last_cascade_rounds
+        if timed: start = self._lap(TickPhase.RESOLUTION, start, len(offers), offers=len(offers),
+                                    cascade_rounds=self.last_cascade_rounds)
+
         # Move drivers and handle pickup/dropoff events
         self._move_drivers(self.drivers, dt=1.0)
+        if timed: start = self._lap(TickPhase.MOVEMENT, start, len(self.drivers), drivers=len(self.drivers))
 
         # Apply mutation_rule to each driver
         self._mutate_drivers(self.drivers, self.time)
+        if timed: start = self._lap(TickPhase.MUTATION, start, len(self.drivers), drivers=len(self.drivers))
+
+        # Let the event writer know the tick is over, so it can write this tick's events
+        self.event_manager.end_tick()
 
         # Increment time
         self.time += 1
+        if timed:
+            end = self._lap(TickPhase.TIME_ADVANCE, start)
+            if self.profiler is not None:
+                self.profiler.end_tick()
+            if self.tracer is not None:
+                self.tracer.end_tick(tick_start, end, {'time': self.time - 1, 'drivers': len(self.drivers),
+                                                       'waiting_requests': len(waiting_requests)})
+
+        if self.checkpointer is not None:
+            self.checkpointer.maybe_checkpoint(self)
+
+    def run_until(self, end: int) -> None:
+        """
+        Run ticks until the simulation time reaches `end`.
+
+        Args:
+            end (int): Time to stop at
+        """
+        while self.time < end:
+            self.tick()
+
+    def _tick_costs(self, waiting_requests: list[Request]) -> CostMatrix | None:
+        """
+        Build the CostMatrix of the tick, which takes O(drivers) time.
+
+        Args:
+            waiting_requests (list[Request]): Waiting requests of the tick
+
+        Returns:
+            CostMatrix | None: The costs, or None if there are no idle drivers or no waiting requests.
+        """
+        if not waiting_requests:
+            return None
+        if self.vectorized:
+            fleet = self._current_fleet()
+            if not (fleet.status == DriverStatus.IDLE.value).any():
+                return None
+            return CostMatrix(self.drivers, waiting_requests, fleet=fleet)
+        if not any(driver.status == DriverStatus.IDLE for driver in self.drivers):
+            return None
+        return CostMatrix(self.drivers, waiting_requests)
+
+    def _lap(self, phase: TickPhase, start: int, items: int = 0, **counts) -> int:
+        """
+        Record a finished tick phase with the profiler and the tracer, whichever are enabled.
+
+        Args:
+            phase (TickPhase): Phase that just finished
+            start (int): perf_counter_ns() value at which the phase started
+            items (int): Number of items the phase processed, for the profiler
+            counts: Counts to show with the phase's trace span
+        Returns:
+            int: The current perf_counter_ns() value, the start of the next phase
+        """
+        end = time.perf_counter_ns()
+        if self.profiler is not None:
+            self.profiler.record(phase, start, end, items)
+        if self.tracer is not None:
+            self.tracer.span(phase, start, end, counts)
+        return end
 
     def get_snapshot(self) -> dict:
         """
@@ -128,11 +418,10 @@ class DeliverySimulation:
                           'position': (driver.position.x, driver.position.y),
                           'status': driver.status.name} for driver in self.drivers]
 
-        pickup_positions = [(req.pickup.x, req.pickup.y) for req in self.requests if
-                            req.status in {RequestStatus.WAITING, RequestStatus.ASSIGNED}]
+        pickup_positions = [(req.pickup.x, req.pickup.y) for req in
+                            self.requests.waiting() + self.requests.assigned()]
 
-        dropoff_positions = [(req.dropoff.x, req.dropoff.y) for req in self.requests if
-                             req.status == RequestStatus.PICKED]
+        dropoff_positions = [(req.dropoff.x, req.dropoff.y) for req in self.requests.picked()]
 
         snapshot = {
             'drivers': driver_states,
@@ -145,25 +434,17 @@ class DeliverySimulation:
 
     def _update_req_wait_times(self) -> None:
         """
-        Update waiting times for all WAITING requests and mark expired ones.
-        """
-        if len(self.requests) == 0:
-            return
-
-        for req in self.requests:
-            if req.status == RequestStatus.DELIVERED or req.status == RequestStatus.EXPIRED:
-                continue
-
-            req.wait_time += 1
-
-            # if request has not reached timeout yet, continue
-            if req.wait_time < self.timeout:
-                continue
+        Mark requests that reached the timeout as expired.
 
+        Wait times are derived from the wait clock, so counting the tick in progress is all
+        the updating they need. Expiry is scheduled when a request is added, only the requests
+        expiring now are visited.
+        """
+        self._wait_tick = self.time
+        for req in self.requests.pop_expired(self.timeout):
             # Handle expiration different if request is assigned to a driver or not
             if req.assigned_driver is not None:
-                # Find the assigned driver and expire the current request
-                assigned_driver = next((driver for driver in self.drivers if driver.id == req.assigned_driver), None)
+                assigned_driver = self._get_driver(req.assigned_driver)
 
                 if assigned_driver is not None:
                     self.statistics['expired'] += 1
@@ -177,20 +458,25 @@ class DeliverySimulation:
                 req.mark_expired(self.time)
 
     @staticmethod
-    def _create_offers(proposals: list[tuple[Driver, Request]]) -> list[Offer]:
+    def _create_offers(proposals: list[tuple[Driver, Request]], costs: CostMatrix | None = None) -> list[Offer]:
         """
         Create offers based on proposals.
         Args:
             proposals (list[tuple[Driver, Request]]): Proposed (driver, request) pairs
+            costs (CostMatrix | None): Costs of the tick, estimates are read from it when it has the pair
         Returns:
             list[Offer]: List of created offers
         """
         offers = []
 
         for driver, request in proposals:
-            estimated_total_distance = driver.calc_estimated_total_dist_to_delivery(request)
-            estimated_distance_to_pickup = driver.position.distance_to(request.pickup)
-            estimated_reward = driver.calc_estimated_delivery_reward(request)
+            estimates = costs.pair(driver, request) if costs is not None else None
+            if estimates is not None:
+                estimated_total_distance, estimated_distance_to_pickup, estimated_reward = estimates
+            else:
+                estimated_total_distance = driver.calc_estimated_total_dist_to_delivery(request)
+                estimated_distance_to_pickup = driver.position.distance_to(request.pickup)
+                estimated_reward = driver.calc_estimated_delivery_reward(request)
 
             offers.append(Offer(driver=driver, request=request,
                                 estimated_total_distance=estimated_total_distance,
@@ -215,6 +501,15 @@ class DeliverySimulation:
         # Sort offers by estimated travel time in ascending order
         if len(offers) == 0: return
 
+        # Policies propose each driver and request at most once, then no decision depends on an
+        # earlier one and all offers can be decided in batches
+        if len({offer.driver.id for offer in offers}) == len(offers) and \
+                len({offer.request.id for offer in offers}) == len(offers):
+            for offer, accepted in zip(offers, self._decide_offers(offers)):
+                if accepted:
+                    offer.driver.assign_request(request=offer.request, current_time=self.time)
+            return
+
         # Iteratively offer offers to drivers
         for offer in offers:
             # Make sure offer is not already accepted and driver is not busy
@@ -237,6 +532,81 @@ class DeliverySimulation:
                 busy_drivers.add(offer.driver.id)
                 accepted_requests.add(offer.request.id)
 
+    def _cascade_offers(self, offers: list[Offer], costs: CostMatrix | None) -> int:
+        """
+        Re-offer the requests rejected in this tick, round after round, until every request is
+        accepted, has run out of candidates or cascade_rounds rounds were used.
+
+        Each rejected request gets a list of its cascade_candidates nearest idle drivers once.
+        In every round it is offered to the first driver on its list that is still idle, has
+        not rejected it yet and was not taken by an earlier request in the round (requests
+        keep the order of the original offers).
+
+        Args:
+            offers (list[Offer]): Offers of the first round, already resolved
+            costs (CostMatrix | None): Costs of the tick, built here if the tick had none
+        Returns:
+            int: Number of rounds used
+        """
+        pending = [offer.request for offer in offers if offer.request.status == RequestStatus.WAITING]
+        if not pending:
+            return 0
+        if costs is None:
+            costs = CostMatrix(self.drivers, pending)
+        rejected_by = {offer.request.id: {offer.driver.id} for offer in offers}
+        candidates = {request.id: costs.nearest_drivers(request, self.cascade_candidates) for request in pending}
+
+        rounds = 0
+        while pending and rounds < self.cascade_rounds:
+            proposals = []
+            taken = set()
+            for request in pending:
+                # Drop drivers that are busy now or already rejected the request, anywhere in the list
+                rejected = rejected_by[request.id]
+                remaining = [driver for driver in candidates[request.id]
+                             if driver.status == DriverStatus.IDLE and driver.id not in rejected]
+                candidates[request.id] = remaining
+                driver = next((d for d in remaining if d.id not in taken), None)
+                if driver is not None:
+                    proposals.append((driver, request))
+                    taken.add(driver.id)
+
+            if not proposals:
+                break
+            rounds += 1
+
+            offers = self._create_offers(proposals, costs)
+            self._assign_and_resolve_offers(offers)
+
+            for offer in offers:
+                rejected_by[offer.request.id].add(offer.driver.id)
+            # Requests whose drivers were all taken by earlier requests of the round try again
+            pending = [request for request in pending
+                       if request.status == RequestStatus.WAITING and candidates[request.id]]
+
+        return rounds
+
+    def _decide_offers(self, offers: list[Offer]) -> list[bool]:
+        """
+        Let the drivers decide on offers, with one decide_batch call per behaviour class.
+
+        Args:
+            offers (list[Offer]): Offers to decide on, each driver and request at most once
+        Returns:
+            list[bool]: Whether each offer was accepted, in offer order
+        """
+        groups: dict[type, list[int]] = {}
+        for i, offer in enumerate(offers):
+            groups.setdefault(type(offer.driver.behaviour), []).append(i)
+
+        decisions = [False] * len(offers)
+        for positions in groups.values():
+            batch = [offers[i] for i in positions]
+            accepted = batch[0].driver.behaviour.decide_batch(batch, self.time, self.run_id)
+            for i, is_accepted in zip(positions, accepted.tolist()):
+                decisions[i] = is_accepted
+        return decisions
+
     def _move_drivers(self, drivers: list[Driver], dt: float) -> None:
         """
         Move drivers and handle pickup/dropoff events.
@@ -248,6 +618,10 @@ class DeliverySimulation:
         Returns:
             None
         """
+        if self.vectorized and drivers is self.drivers:
+            self._move_fleet(dt)
+            return
+
         for driver in drivers:
             # Handle idle drivers
             if driver.status == DriverStatus.IDLE:
@@ -277,6 +651,46 @@ class DeliverySimulation:
 
             driver.step(dt)
 
+    def _move_fleet(self, dt: float) -> None:
+        """
+        Vectorized version of _move_drivers working on the FleetStore columns.
+
+        Idle times, idle events, movement and arrival detection are done for all drivers at
+        once. Only drivers that reach their pickup/dropoff this tick are visited in Python.
+
+        Args:
+            dt (float): Time delta for the movement step
+
+        Returns:
+            None
+        """
+        fleet = self._current_fleet()
+
+        # Handle idle drivers
+        idle = fleet.status == DriverStatus.IDLE.value
+        fleet.idle_time[idle] += 1
+        fleet.idle_time[~idle] = 0
+        self.event_manager.add_driver_events(self.time, EventType.DRIVER_IDLE,
+                                             fleet.ids[idle], fleet.idle_time[idle])
+
+        # Handle pickups
+        for slot in fleet.arrived(DriverStatus.TO_PICKUP):
+            driver = fleet.drivers[slot]
+            driver.position = driver.current_request.pickup
+            driver.complete_pickup(self.time)
+
+        # Handle dropoffs, including drivers that just picked up and are already at the dropoff
+        delivered = np.zeros(len(fleet), dtype=bool)
+        for slot in fleet.arrived(DriverStatus.TO_DROPOFF):
+            driver = fleet.drivers[slot]
+            driver.position = driver.current_request.dropoff
+            self.statistics['served'] += 1
+            self.statistics['served_waits'].append(driver.current_request.wait_time)
+            driver.complete_dropoff(self.time)
+            delivered[slot] = True
+
+        fleet.advance(~idle & ~delivered, dt)
+
     def _mutate_drivers(self, drivers: list[Driver], time: int) -> None:
         """
         Apply mutation_rule to each driver.
@@ -15,6 +15,10 @@ class DriverStatus(Enum):
 
 
 class Driver:
+    # Estimated reward of a delivery: BASE_REWARD + REWARD_PER_DISTANCE * total distance
+    BASE_REWARD = 15
+    REWARD_PER_DISTANCE = 2
+
     def __init__(self,
                  id: int,
                  position: Point,
@@ -210,7 +214,4 @@ class Driver:
         if not isinstance(request, Request):
             raise TypeError(f"request must be Request, got {type(request).__name__}")
 
-        base_reward = 15
-        reward_per_distance = 2
-
-        return base_reward + (reward_per_distance * self.calc_estimated_total_dist_to_delivery(request))
+        return self.BASE_REWARD + (self.REWARD_PER_DISTANCE * self.calc_estimated_total_dist_to_delivery(request))
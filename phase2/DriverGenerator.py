@@ -1,15 +1,21 @@
+from __future__ import annotations
+
 import random
-from random import choice
+
+import numpy as np
 
 from phase2.Driver import Driver, DriverStatus
 from phase2.Point import Point
+from phase2.RandomStreams import as_random
 from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
 from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
 
 
 class DriverGenerator:
-    def __init__(self, run_id: str) -> None:
+    def __init__(self, run_id: str, rng: random.Random | np.random.Generator | None = None) -> None:
+        # rng: fleet stream to draw from, the global random module if None
         self.run_id = run_id
+        self.rng = as_random(rng)
 
     def generate(self, amount: int, width: int, height: int, speed: float, start_id: int) -> list[Driver]:
         """
@@ -27,15 +33,15 @@ class DriverGenerator:
         """
         drivers = []
         for _ in range(amount):
-            x = int(min(round(random.uniform(0, width)), width - 1))
-            y = int(min(round(random.uniform(0, height)), height - 1))
+            x = int(min(round(self.rng.uniform(0, width)), width - 1))
+            y = int(min(round(self.rng.uniform(0, height)), height - 1))
             position = Point(x, y)
 
             driver = Driver(
                 id=start_id,
                 position=position,
                 speed=speed,
-                behaviour=choice([EarningsMaxBehaviour(), GreedyDistanceBehaviour()]),
+                behaviour=self.rng.choice([EarningsMaxBehaviour(), GreedyDistanceBehaviour()]),
                 status=DriverStatus.IDLE,
                 current_request=None,
                 history=[],
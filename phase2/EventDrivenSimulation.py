@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.Driver import Driver, DriverStatus
+from phase2.Point import Point
+from phase2.Request import RequestStatus
+
+# Kinds of scheduled events, in the order they are handled within a tick
+ARRIVAL = 0
+MUTATION = 1
+
+
+class EventDrivenSimulation(DeliverySimulation):
+    """
+    DeliverySimulation that jumps from event to event (next-event time advance) instead of
+    stepping every driver every tick.
+
+    Time still counts in ticks, and a tick in which something happens runs the phases of
+    DeliverySimulation.tick() in the same order. Ticks in which nothing can happen are
+    skipped. Something happens at a tick when:
+
+    - the request generator creates requests (see RequestGenerator.next_arrival),
+    - the oldest active request expires,
+    - a driver reaches its pickup or dropoff,
+    - a driver mutates (see MutationRule.next_mutation),
+    - dispatch may assign a request: after requests, idle drivers or behaviours changed.
+      Decisions are deterministic, so re-offering an unchanged situation is skipped,
+    - a checkpoint is due.
+
+    Arrivals and mutations are kept in a priority queue. A driver's arrival tick is computed
+    from the distance to its target and its speed when it starts a leg. Its position is only
+    brought up to date along the leg when something needs it: an expiry that stops the
+    driver, a snapshot, or the end of run_until(). Policies only look at idle drivers, which
+    do not move.
+
+    Requests, arrivals and positions are the same as with the tick engine. Mutations are not:
+    a driver's next mutation is drawn once per change of its behaviour or history instead of
+    every tick, so with a MutationRule a run matches the tick engine only in distribution.
+    DRIVER_IDLE events are not logged, since they would have to be written every tick.
+
+    Drivers must not be vectorized, and ticks are neither profiled nor traced.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        # Same arguments as DeliverySimulation
+        super().__init__(*args, **kwargs)
+        if self.vectorized:
+            raise ValueError("EventDrivenSimulation moves drivers itself, vectorized must be False")
+        if self.profiler is not None or self.tracer is not None:
+            raise ValueError("EventDrivenSimulation does not profile or trace ticks")
+
+        # (tick, kind, seq, driver, leg) of every scheduled arrival and mutation
+        self._events: list[tuple[int, int, int, Driver, list | None]] = []
+        self._seq = itertools.count()
+        # Driver id -> [start tick, start x, start y, direction x, direction y, arrival tick]
+        # of the leg the driver is moving along
+        self._legs: dict[int, list] = {}
+        # Driver id -> first tick it was idle in, for the idle drivers
+        self._idle_since: dict[int, int] = {}
+        # Driver id -> seq of the driver's valid mutation event
+        self._mutation_seq: dict[int, int] = {}
+        # Set when dispatch may assign a request that it could not assign before
+        self._dispatch_due = True
+        self._waiting_seen = -1
+        # Driver id -> position in the list of drivers, for the drivers tracked so far
+        self._order: dict[int, int] = {}
+        # Ticks handled, for comparison with the number of ticks simulated
+        self.processed_ticks = 0
+
+    def __str__(self):
+        return f"EventDrivenSimulation(time={self.time}, drivers={len(self.drivers)}, " \
+               f"events={len(self._events)}, processed_ticks={self.processed_ticks})"
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        # The counter continues from the next sequence number
+        next_seq = next(self._seq)
+        self._seq = itertools.count(next_seq)
+        state['_seq'] = next_seq
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._seq = itertools.count(state['_seq'])
+
+    def tick(self) -> None:
+        """
+        Advance the simulation by one time step, handling the events of that tick if any.
+        """
+        self.run_until(self.time + 1)
+
+    def run_until(self, end: int) -> None:
+        """
+        Handle every event before `end`, jumping over the ticks without events, then bring the
+        drivers up to date at time `end`.
+
+        Args:
+            end (int): Time to stop at
+        """
+        self._track_new_drivers()
+        while self.time < end:
+            next_tick = self._next_event_tick(end)
+            if next_tick is None:
+                break
+            self.time = next_tick
+            self._handle_tick()
+        self.time = max(self.time, end)
+        self._sync_drivers()
+
+    def get_snapshot(self) -> dict:
+        """
+        Returns: The snapshot of DeliverySimulation.get_snapshot(), with the drivers at their
+        current positions.
+        """
+        self._sync_drivers()
+        return super().get_snapshot()
+
+    def _track_new_drivers(self) -> None:
+        """
+        Start tracking the drivers added since the last call: schedule the leg of a moving
+        driver, the idle time of an idle one and the mutation of both.
+        """
+        if len(self._order) == len(self.drivers):
+            return
+        for i, driver in enumerate(self.drivers):
+            if driver.id in self._order:
+                continue
+            self._order[driver.id] = i
+            if driver.status == DriverStatus.IDLE or driver.target_point() is None:
+                self._idle_since[driver.id] = self.time - driver.idle_time
+            else:
+                if driver.dir_vector is None:
+                    driver.compute_direction_vector()
+                self._start_leg(driver, self.time)
+            self._schedule_mutation(driver, self.time)
+        self._dispatch_due = True
+
+    def _next_event_tick(self, end: int) -> int | None:
+        """
+        Returns:
+            int | None: The first tick in [time, end) with an event, or None.
+        """
+        # Requests added from outside, e.g. by the GUI
+        if self.requests.count(RequestStatus.WAITING) != self._waiting_seen:
+            self._dispatch_due = True
+
+        candidates = [end]
+        if self._dispatch_due and self._idle_since and self.requests.count(RequestStatus.WAITING):
+            candidates.append(self.time)
+        if self._events:
+            candidates.append(self._events[0][0])
+        oldest = self.requests.next_expiry()
+        if oldest is not None:
+            # Requests expire in the tick whose wait clock (time + 1) reaches the timeout
+            candidates.append(max(self.time, math.ceil(oldest) + self.timeout - 1))
+        if self.checkpointer is not None:
+            every = self.checkpointer.every
+            candidates.append(-(-(self.time + 1) // every) * every - 1)
+        horizon = min(candidates)
+
+        # The generator skips the ticks without requests before the horizon
+        arrival = self.request_generator.next_arrival(self.time, horizon)
+        if arrival is not None:
+            return arrival
+        return horizon if horizon < end else None
+
+    def _handle_tick(self) -> None:
+        """
+        Run the phases of DeliverySimulation.tick() for the current tick, only visiting the
+        drivers and requests with events.
+        """
+        # Generate new requests
+        if self.request_generator.next_arrival(self.time, self.time + 1) is not None:
+            new_requests = self.request_generator.maybe_generate(self.time)
+            if new_requests:
+                self.requests.extend(new_requests)
+                self._dispatch_due = True
+
+        # Mark expired requests
+        self._update_req_wait_times()
+
+        # Dispatch, offers and assignments
+        if self._dispatch_due and self._idle_since and self.requests.count(RequestStatus.WAITING):
+            self._dispatch()
+        else:
+            self._dispatch_due = False
+
+        # Pickups and dropoffs, in the order of the drivers like _move_drivers()
+        arrived = []
+        while self._events and self._events[0][0] == self.time and self._events[0][1] == ARRIVAL:
+            _, _, _, driver, leg = heapq.heappop(self._events)
+            if self._legs.get(driver.id) is leg:
+                arrived.append(driver)
+        for driver in sorted(arrived, key=lambda d: self._order[d.id]):
+            self._arrive(driver)
+
+        # Mutations
+        while self._events and self._events[0][0] == self.time:
+            _, _, seq, driver, _ = heapq.heappop(self._events)
+            if self._mutation_seq.get(driver.id) == seq:
+                self.mutation_rule.mutate(driver, self.time)
+                self._schedule_mutation(driver, self.time + 1)
+                if driver.id in self._idle_since:
+                    self._dispatch_due = True
+
+        self._waiting_seen = self.requests.count(RequestStatus.WAITING)
+        self.event_manager.end_tick()
+        self.processed_ticks += 1
+
+        self.time += 1
+        if self.checkpointer is not None:
+            self.checkpointer.maybe_checkpoint(self)
+
+    def _update_req_wait_times(self) -> None:
+        """
+        Mark requests that reached the timeout as expired. Drivers of expired requests stop
+        where they are.
+        """
+        self._wait_tick = self.time
+        for req in self.requests.pop_expired(self.timeout):
+            self.statistics['expired'] = self.statistics.get('expired', 0) + 1
+            driver = self._get_driver(req.assigned_driver) if req.assigned_driver is not None else None
+            if driver is not None:
+                self._sync_position(driver)
+                self._legs.pop(driver.id, None)
+                driver.expire_current_request(self.time)
+                self._idle_since[driver.id] = self.time
+                self._schedule_mutation(driver, self.time)
+            else:
+                req.mark_expired(self.time)
+            self._dispatch_due = True
+
+    def _dispatch(self) -> None:
+        """
+        Assign waiting requests like DeliverySimulation.tick() and start the legs of the
+        drivers that accepted one.
+        """
+        waiting_requests = self.requests.waiting()
+        costs = self._tick_costs(waiting_requests)
+        proposals = self.dispatch_policy.assign(drivers=self.drivers, requests=waiting_requests,
+                                                time=self.time, run_id=self.run_id, costs=costs)
+        offers = self._create_offers(proposals, costs)
+        self._assign_and_resolve_offers(offers)
+        if self.cascade_rounds > 0:
+            self.last_cascade_rounds = self._cascade_offers(offers, costs)
+            self.statistics['cascade_rounds'] = self.statistics.get('cascade_rounds', 0) + self.last_cascade_rounds
+
+        # Only changes can make an offer succeed that failed in this tick
+        self._dispatch_due = False
+        if costs is None:
+            return
+        for driver in costs.drivers:
+            if driver.status != DriverStatus.IDLE:
+                self._idle_since.pop(driver.id, None)
+                self._start_leg(driver, self.time)
+                self._dispatch_due = True
+
+    def _start_leg(self, driver: Driver, start: int) -> None:
+        """
+        Schedule the arrival of a driver at its target. The driver moves in every tick from
+        `start` on and arrives in the first one that begins within one step of the target.
+        """
+        position = driver.position
+        target = driver.target_point()
+        distance = position.distance_to(target)
+        # Driver.step() with dt=1.0 adds this to the position every tick
+        step_x, step_y = driver.dir_vector.x * driver.speed, driver.dir_vector.y * driver.speed
+
+        if distance <= driver.speed:
+            arrival = start
+        elif driver.speed > 0:
+            steps = distance / driver.speed
+            arrival = start + math.ceil(steps) - 1
+            if abs(steps - round(steps)) < 1e-9 * steps:
+                # The target is a whole number of steps away, whether the last step ends within
+                # reach depends on how the steps round, so take them like the tick engine does
+                x, y = position.x, position.y
+                arrival = start
+                while Point(x, y).distance_to(target) > driver.speed:
+                    x, y = x + step_x, y + step_y
+                    arrival += 1
+        else:
+            # Never arrives, the leg only tracks the position
+            arrival = None
+
+        leg = [start, position.x, position.y, step_x, step_y, arrival]
+        self._legs[driver.id] = leg
+        if arrival is not None:
+            heapq.heappush(self._events, (arrival, ARRIVAL, next(self._seq), driver, leg))
+
+    def _arrive(self, driver: Driver) -> None:
+        """
+        Handle a driver reaching its target in the current tick, like _move_drivers().
+        """
+        self._legs.pop(driver.id, None)
+
+        if driver.status == DriverStatus.TO_PICKUP:
+            driver.position = driver.current_request.pickup
+            driver.complete_pickup(self.time)
+            # The driver moves on to the dropoff in this tick, and may already be there
+            self._start_leg(driver, self.time)
+            leg = self._legs[driver.id]
+            if leg[5] != self.time:
+                return
+            self._legs.pop(driver.id, None)
+
+        driver.position = driver.current_request.dropoff
+        self.statistics['served'] += 1
+        self.statistics['served_waits'].append(driver.current_request.wait_time)
+        driver.complete_dropoff(self.time)
+
+        self._idle_since[driver.id] = self.time + 1
+        self._schedule_mutation(driver, self.time)
+        self._dispatch_due = True
+
+    def _schedule_mutation(self, driver: Driver, start: int) -> None:
+        """
+        (Re)draw the tick at which a driver mutates, from `start` on. Replaces the event drawn
+        before, which no longer matches the driver's behaviour or history.
+        """
+        tick = self.mutation_rule.next_mutation(driver, start)
+        if tick is None:
+            self._mutation_seq.pop(driver.id, None)
+            return
+        seq = next(self._seq)
+        self._mutation_seq[driver.id] = seq
+        heapq.heappush(self._events, (tick, MUTATION, seq, driver, None))
+
+    def _sync_position(self, driver: Driver) -> None:
+        """
+        Move a driver to its position at the start of the current tick along its leg.
+        """
+        leg = self._legs.get(driver.id)
+        if leg is None:
+            return
+        start, x, y, step_x, step_y, arrival = leg
+        steps = self.time - start
+        if arrival is not None:
+            steps = min(steps, arrival - start)
+        if steps <= 0:
+            return
+        # One addition per tick like Driver.step(), so positions match the tick engine exactly
+        for _ in range(steps):
+            x += step_x
+            y += step_y
+        driver.position = Point(x, y)
+        # Continue the leg from here
+        leg[0], leg[1], leg[2] = self.time, x, y
+
+    def _sync_drivers(self) -> None:
+        """
+        Bring the position and idle time of every driver up to date.
+        """
+        for driver in self.drivers:
+            idle_since = self._idle_since.get(driver.id)
+            if idle_since is None:
+                self._sync_position(driver)
+                driver.idle_time = 0
+            else:
+                driver.idle_time = max(self.time - idle_since, 0)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+
+from phase2.Request import Request
+
+
+class ExpiryScheduler:
+    """
+    Min-heap of requests ordered by the time they started waiting, used to find expired
+    requests.
+
+    All requests in a simulation share the same timeout, so ordering by start of the wait
+    is the same as ordering by deadline (start + timeout). Keying on the start keeps the
+    heap valid when the timeout is changed after requests were scheduled.
+
+    Requests that finish before expiring are not removed eagerly, they are skipped when
+    they reach the top of the heap. So are the entries of a request that was scheduled
+    again with another start. Every request is pushed and popped once, so handling
+    expirations costs O(log n) per request over the whole run.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int | float, int, Request]] = []
+        # Tie-breaker so requests with equal creation time keep insertion order
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __str__(self) -> str:
+        return f"ExpiryScheduler(scheduled={len(self._heap)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __getstate__(self) -> dict:
+        # Store the next tie-breaker instead of the counter, which newer Pythons can not pickle
+        next_count = next(self._counter)
+        self._counter = itertools.count(next_count)
+        return {'_heap': self._heap, '_next_count': next_count}
+
+    def __setstate__(self, state: dict) -> None:
+        self._heap = state['_heap']
+        self._counter = itertools.count(state['_next_count'])
+
+    def schedule(self, request: Request, start: int | float | None = None) -> None:
+        """
+        Schedule a request for expiry, replacing its earlier entry if any.
+
+        Args:
+            request (Request): The request to schedule
+            start (int | float | None): Time the request started waiting, its creation time
+                if None
+        """
+        if start is None:
+            start = request.creation_time
+        count = next(self._counter)
+        request._expiry_entry = count
+        heapq.heappush(self._heap, (start, count, request))
+
+    def pop_due(self, cutoff: int | float) -> list[Request]:
+        """
+        Remove and return all active requests that started waiting at or before the cutoff.
+
+        Args:
+            cutoff (int | float): Latest start that counts as expired,
+                i.e. current wait clock minus timeout.
+
+        Returns:
+            list[Request]: Active requests that have reached their deadline, oldest first.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= cutoff:
+            _, count, request = heapq.heappop(self._heap)
+            if self._is_current(count, request):
+                due.append(request)
+        return due
+
+    def next_due(self) -> int | float | None:
+        """
+        Start of the wait of the oldest active request, the next one to expire. Finished and
+        replaced entries at the top of the heap are dropped on the way.
+
+        Returns:
+            int | float | None: The start, or None if no active request is scheduled.
+        """
+        while self._heap and not self._is_current(self._heap[0][1], self._heap[0][2]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    @staticmethod
+    def _is_current(count: int, request: Request) -> bool:
+        return request.is_active() and request._expiry_entry == count
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import numpy as np
+
+from phase2.Driver import Driver, DriverStatus
+from phase2.Point import Point
+
+
+class FleetPoint(Point):
+    """
+    Point whose coordinates live in a row of a FleetStore.
+
+    Reading or writing x/y goes straight to the fleet's position column, so code that
+    mutates `driver.position` in place keeps working while the driver is attached.
+    """
+
+    def __init__(self, fleet: FleetStore, slot: int) -> None:
+        self._fleet = fleet
+        self._slot = slot
+
+    @property
+    def x(self) -> float:
+        return float(self._fleet.position[self._slot, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._fleet.position[self._slot, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._fleet.position[self._slot, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._fleet.position[self._slot, 1] = value
+
+
+class FleetDriver(Driver):
+    """
+    Driver whose state lives in a slot of a FleetStore.
+
+    FleetStore switches the class of the drivers it holds to FleetDriver and back to Driver
+    when they are released, so standalone drivers keep plain attributes. Reads stay plain
+    attribute lookups: `position` is a FleetPoint onto the fleet's position column and only
+    `idle_time`, which the fleet updates on its own, is read from the arrays. Assignments to
+    the attributes the fleet keeps columns for are copied into those columns.
+    """
+
+    _fleet: FleetStore
+    _slot: int
+
+    @property
+    def idle_time(self) -> int:
+        return int(self._fleet.idle_time[self._slot])
+
+    @idle_time.setter
+    def idle_time(self, value: int) -> None:
+        self._fleet.idle_time[self._slot] = value
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == 'position':
+            # Keep the view, only its coordinates change
+            self._fleet.position[self._slot] = (value.x, value.y)
+            return
+
+        object.__setattr__(self, name, value)
+        if name == 'status':
+            self._fleet.status[self._slot] = value.value
+            self._fleet.refresh_target(self._slot)
+        elif name == 'current_request':
+            self._fleet.refresh_target(self._slot)
+        elif name == 'speed':
+            self._fleet.speed[self._slot] = value
+        elif name == 'dir_vector':
+            self._fleet.set_direction(self._slot, value)
+
+
+class FleetStore:
+    """
+    Struct-of-arrays store for the state of a fleet of drivers.
+
+    Every driver gets a slot (row) in a set of NumPy columns: position, speed, direction
+    vector, target point, status code, current request id and idle time. Attached drivers
+    become FleetDrivers that keep these columns up to date, which lets the simulation
+    advance all drivers with a few vectorized operations instead of a Python loop.
+
+    Status codes are the values of DriverStatus. Rows without a target hold NaN in the
+    target column, so they never count as arrived.
+    """
+
+    NO_REQUEST = -1
+
+    def __init__(self, drivers: list[Driver]) -> None:
+        if not isinstance(drivers, list) or not all(isinstance(d, Driver) for d in drivers):
+            raise TypeError("drivers must be list[Driver]")
+
+        # A driver may only occupy a single slot, even if it is listed twice
+        unique_drivers = list({id(d): d for d in drivers}.values())
+        n = len(unique_drivers)
+
+        self.source_len = len(drivers)
+        self.drivers = unique_drivers
+        self.ids = np.array([d.id for d in unique_drivers], dtype=np.int64)
+        self.position = np.zeros((n, 2), dtype=np.float64)
+        self.speed = np.zeros(n, dtype=np.float64)
+        self.direction = np.zeros((n, 2), dtype=np.float64)
+        self.has_direction = np.zeros(n, dtype=bool)
+        self.target = np.full((n, 2), np.nan, dtype=np.float64)
+        self.status = np.zeros(n, dtype=np.int8)
+        self.request_id = np.full(n, self.NO_REQUEST, dtype=np.int64)
+        self.idle_time = np.zeros(n, dtype=np.int64)
+
+        for slot, driver in enumerate(unique_drivers):
+            self._attach(driver, slot)
+
+    def __len__(self) -> int:
+        return len(self.drivers)
+
+    def __str__(self) -> str:
+        return f"FleetStore(size={len(self)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _attach(self, driver: Driver, slot: int) -> None:
+        """
+        Copy the state of a driver into a slot and turn the driver into a view of it.
+        """
+        if isinstance(driver, FleetDriver):
+            driver._fleet._detach(driver)
+
+        self.position[slot] = (driver.position.x, driver.position.y)
+        self.speed[slot] = driver.speed
+        self.idle_time[slot] = driver.idle_time
+        self.status[slot] = driver.status.value
+        self.set_direction(slot, driver.dir_vector)
+
+        driver.__class__ = FleetDriver
+        driver._fleet = self
+        driver._slot = slot
+        driver.__dict__['position'] = FleetPoint(self, slot)
+        self.refresh_target(slot)
+
+    def _detach(self, driver: FleetDriver) -> None:
+        """
+        Copy the state of a slot back onto its driver, so the driver stands on its own again.
+        """
+        slot = driver._slot
+        state = driver.__dict__
+        state['position'] = Point(float(self.position[slot, 0]), float(self.position[slot, 1]))
+        state['idle_time'] = int(self.idle_time[slot])
+        del state['_fleet'], state['_slot']
+        driver.__class__ = Driver
+
+    def release(self) -> None:
+        """
+        Detach all drivers from the store. The store must not be used afterwards.
+        """
+        for driver in self.drivers:
+            if isinstance(driver, FleetDriver) and driver._fleet is self:
+                self._detach(driver)
+        self.drivers = []
+
+    def refresh_target(self, slot: int) -> None:
+        """
+        Recompute the target point and current request id of a slot from its driver.
+
+        Args:
+            slot (int): Slot of the driver whose target changed.
+        """
+        driver = self.drivers[slot]
+        target = driver.target_point()
+        if target is None:
+            self.target[slot] = np.nan
+        else:
+            self.target[slot] = (target.x, target.y)
+
+        request = driver.current_request
+        self.request_id[slot] = request.id if request is not None else self.NO_REQUEST
+
+    def set_direction(self, slot: int, dir_vector: Point | None) -> None:
+        """
+        Args:
+            slot (int): Slot of the driver whose direction changed.
+            dir_vector (Point | None): The new direction vector, None if the driver has no target.
+        """
+        if dir_vector is None:
+            self.direction[slot] = 0.0
+            self.has_direction[slot] = False
+        else:
+            self.direction[slot] = (dir_vector.x, dir_vector.y)
+            self.has_direction[slot] = True
+
+    def distances_to_target(self) -> np.ndarray:
+        """
+        Returns:
+            Euclidean distance from every driver to its target (NaN for drivers without one).
+        """
+        delta = self.position - self.target
+        return np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1])
+
+    def arrived(self, status: DriverStatus) -> np.ndarray:
+        """
+        Args:
+            status (DriverStatus): Only consider drivers with this status.
+
+        Returns:
+            Slots of drivers with the given status that are within one step of their target.
+        """
+        # NaN distances compare False, so drivers without a target never arrive
+        mask = (self.status == status.value) & (self.distances_to_target() <= self.speed)
+        return np.flatnonzero(mask)
+
+    def advance(self, mask: np.ndarray, dt: float) -> None:
+        """
+        Move the selected drivers along their direction vector by speed * dt.
+
+        Args:
+            mask (np.ndarray): Boolean mask of slots to move.
+            dt (float): Time delta for the movement step.
+        """
+        mask = mask & self.has_direction
+        self.position[mask] += self.direction[mask] * self.speed[mask][:, None] * dt
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from random import choice
-from random import random
+import math
+import random
+
+import numpy as np
 
 from phase2.Driver import Driver
+from phase2.RandomStreams import as_random
 from phase2.Request import RequestStatus
 from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
 from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
@@ -12,7 +15,17 @@ from phase2.metrics.EventManager import EventManager
 
 
 class MutationRule:
-    def __init__(self, n_trips: int, threshold: float, run_id: str) -> None:
+    # Chance per tick that a driver switches behaviour at random
+    RANDOM_SWITCH_PROBABILITY = 0.02
+    # Chance per tick that an EarningsMaxBehaviour driver with enough trips switches anyway
+    EARNINGS_SWITCH_PROBABILITY = 0.05
+
+    def __init__(self,
+                 n_trips: int,
+                 threshold: float,
+                 run_id: str,
+                 rng: random.Random | np.random.Generator | None = None) -> None:
+        # rng: mutation stream to draw from, the global random module if None
         if not isinstance(n_trips, int):
             raise TypeError("n_trips must be an integer")
         if not isinstance(threshold, float):
@@ -23,6 +36,7 @@ class MutationRule:
         self.n_trips = n_trips
         self.threshold = threshold
         self.run_id = run_id
+        self.rng = as_random(rng)
 
     def __str__(self) -> str:
         return f"MutationRule(n_trips={self.n_trips}, threshold={self.threshold})"
@@ -30,16 +44,28 @@ class MutationRule:
     def __repr__(self) -> str:
         return self.__str__()
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # The global random module can not be pickled, checkpoints save its state separately
+        if state['rng'] is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.rng = as_random(self.rng)
+
     def maybe_mutate(self, driver: Driver, time: int) -> None:
         """
-         Inspect a driver (and possibly global statistics) and decide whether to update its behaviour or behaviour parameters.
+         Inspect a driver (and possibly global statistics) and decide whether to update its behaviour or
+         behaviour parameters.
 
          Args:
             driver (Driver): The driver to inspect and possibly mutate.
             time (int): The current simulation time, used for event logging.
         """
 
-        if random() < 0.02:
+        if self.rng.random() < self.RANDOM_SWITCH_PROBABILITY:
             self.__mutate_driver(driver, time)  # switch behaviour randomly sometimes
             return
 
@@ -53,12 +79,69 @@ class MutationRule:
             if len(expired_trips) / self.n_trips >= self.threshold:
                 self.__mutate_driver(driver, time)  # switch to a less optimal behaviour
                 return
-            if random() < 0.05:  # 5% of the time, switch to a less optimal behaviour
+            # 5% of the time, switch to a less optimal behaviour
+            if self.rng.random() < self.EARNINGS_SWITCH_PROBABILITY:
                 self.__mutate_driver(driver, time)
                 return
 
         if type(driver.behaviour) == GreedyDistanceBehaviour:
-            if random() < (1 - self.threshold): self.__mutate_driver(driver, time)  # switch to a more optimal behaviour
+            if self.rng.random() < (1 - self.threshold):
+                self.__mutate_driver(driver, time)  # switch to a more optimal behaviour
+
+    def mutation_probability(self, driver: Driver) -> float:
+        """
+        Chance that maybe_mutate() mutates a driver in a tick, given its current behaviour and
+        history.
+
+        Args:
+            driver (Driver): The driver to inspect.
+
+        Returns:
+            float: The probability per tick.
+        """
+        switch = 0.0
+        if len(driver.history) >= self.n_trips:
+            if type(driver.behaviour) == EarningsMaxBehaviour:
+                last_n_trips = driver.history[-self.n_trips:]
+                expired_trips = [trips for trips in last_n_trips if trips.status == RequestStatus.EXPIRED]
+                switch = 1.0 if len(expired_trips) / self.n_trips >= self.threshold \
+                    else self.EARNINGS_SWITCH_PROBABILITY
+            elif type(driver.behaviour) == GreedyDistanceBehaviour:
+                switch = 1 - self.threshold
+        return self.RANDOM_SWITCH_PROBABILITY + (1 - self.RANDOM_SWITCH_PROBABILITY) * switch
+
+    def next_mutation(self, driver: Driver, time: int) -> int | None:
+        """
+        Draw the tick at which a driver mutates, for simulations that jump from event to event
+        instead of calling maybe_mutate() every tick.
+
+        As long as the driver's behaviour and history do not change, every tick mutates it
+        with the same probability, so the waiting time is geometrically distributed. The
+        draw must be repeated when they change.
+
+        Args:
+            driver (Driver): The driver to inspect.
+            time (int): First tick at which the driver may mutate.
+
+        Returns:
+            int | None: The tick of the mutation, or None if the driver never mutates.
+        """
+        p = self.mutation_probability(driver)
+        if p <= 0:
+            return None
+        if p >= 1:
+            return time
+        return time + int(math.log(1.0 - self.rng.random()) / math.log(1.0 - p))
+
+    def mutate(self, driver: Driver, time: int) -> None:
+        """
+        Switch a driver to another behaviour, see next_mutation().
+
+        Args:
+            driver (Driver): The driver to mutate.
+            time (int): The current simulation time, used for event logging.
+        """
+        self.__mutate_driver(driver, time)
 
     def __mutate_driver(self, driver: Driver, time: int) -> None:
         """
@@ -80,7 +163,7 @@ class MutationRule:
         if not candidates:
             candidates = behaviour_classes
 
-        new_behaviour_cls = choice(candidates)
+        new_behaviour_cls = self.rng.choice(candidates)
         driver.behaviour = new_behaviour_cls()
         driver.history.clear()  # Reset history after mutation
 
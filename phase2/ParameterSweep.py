@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from phase2.run import build_simulation, parse_args, run
+
+RESULT_COLUMNS = ["config", "replication", "seed", "run_id", "served", "expired", "avg_wait", "seconds"]
+
+
+def run_configuration(params: dict, seed: int, run_id: str) -> dict:
+    """
+    Run one simulation of a sweep. Runs in a worker process.
+
+    Args:
+        params (dict): Parameters of the run, named like the options of phase2.run
+        seed (int): Seed of the run's RandomStreams
+        run_id (str): Unique identifier for the simulation run
+
+    Returns:
+        dict: served, expired, avg_wait and seconds of the run.
+    """
+    args = parse_args([])
+    for name, value in params.items():
+        setattr(args, name, value)
+    args.seed = seed
+
+    simulation = build_simulation(args, run_id)
+    seconds = run(simulation, args.ticks)
+
+    waits = simulation.statistics['served_waits']
+    return {'served': simulation.statistics['served'],
+            'expired': simulation.statistics['expired'],
+            'avg_wait': sum(waits) / len(waits) if waits else 0.0,
+            'seconds': seconds}
+
+
+class ParameterSweep:
+    """
+    Runs a simulation for every combination of a parameter grid, with several replications
+    each, in a process pool.
+
+    Parameters are named like the options of phase2.run (rate, timeout, n_trips, threshold,
+    drivers, policy, ticks, ...). Parameters not in the grid keep the defaults of phase2.run,
+    or the values in `base`.
+
+    Every run gets its own seed, derived from the sweep seed, the configuration and the
+    replication, so results do not depend on the number of workers or the order in which the
+    runs finish. It also gets its own run id, `<sweep_id>_c<config>_r<replication>`.
+
+    Each finished run is appended to a results CSV straight away. Running a sweep again with
+    the same results file skips the runs already in it, so an interrupted sweep resumes where
+    it stopped.
+    """
+
+    def __init__(self,
+                 sweep_id: str,
+                 grid: dict[str, list],
+                 replications: int = 1,
+                 base: dict | None = None,
+                 seed: int = 0,
+                 results_path: str | None = None,
+                 write_events: bool = False) -> None:
+        if not isinstance(sweep_id, str):
+            raise TypeError("sweep_id must be str")
+        if not isinstance(grid, dict) or not all(isinstance(values, list) and values for values in grid.values()):
+            raise TypeError("grid must be a dict of non-empty lists")
+        if not isinstance(replications, int):
+            raise TypeError("replications must be int")
+        if replications < 1:
+            raise ValueError("replications must be at least 1")
+        if not isinstance(seed, int):
+            raise TypeError("seed must be int")
+
+        base = dict(base or {})
+        defaults = vars(parse_args([]))
+        unknown = [name for name in list(grid) + list(base) if name not in defaults]
+        if unknown:
+            raise ValueError(f"unknown parameters: {', '.join(unknown)}")
+        if 'seed' in grid or 'seed' in base:
+            raise ValueError("seeds are set by the sweep, use the seed argument")
+
+        self.sweep_id = sweep_id
+        self.grid = grid
+        self.replications = replications
+        self.base = base
+        self.seed = seed
+        self.write_events = write_events
+
+        if results_path is None:
+            base_dir = os.path.join(os.path.abspath(os.path.dirname(__file__)), "metrics", "runs", sweep_id)
+            results_path = os.path.join(base_dir, f"{sweep_id}_results.csv")
+        self.results_path = results_path
+
+        # Every combination of the grid, in the order of the grid's keys
+        names = list(grid)
+        self.configurations = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+    def __str__(self) -> str:
+        return (f"ParameterSweep(sweep_id={self.sweep_id}, configurations={len(self.configurations)}, "
+                f"replications={self.replications})")
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def columns(self) -> list[str]:
+        return RESULT_COLUMNS[:4] + list(self.grid) + RESULT_COLUMNS[4:]
+
+    def run_id(self, config: int, replication: int) -> str:
+        run_id = f"{self.sweep_id}_c{config}_r{replication}"
+        # Run ids containing "test_run" write no events
+        return run_id if self.write_events else f"{run_id}_test_run"
+
+    def seed_for(self, config: int, replication: int) -> int:
+        return int(np.random.SeedSequence([self.seed, config, replication]).generate_state(1)[0])
+
+    def completed(self) -> set[tuple[int, int]]:
+        """
+        Returns:
+            set[tuple[int, int]]: (config, replication) of the runs of this sweep in the results file.
+        """
+        return {(row['config'], row['replication']) for row in self.results()}
+
+    def pending(self) -> list[tuple[int, int]]:
+        """
+        Returns:
+            list[tuple[int, int]]: (config, replication) of the runs that still need to run.
+        """
+        completed = self.completed()
+        return [(config, replication)
+                for config in range(len(self.configurations))
+                for replication in range(self.replications)
+                if (config, replication) not in completed]
+
+    def run(self, max_workers: int | None = None, progress=None) -> list[dict]:
+        """
+        Run all pending runs in a process pool, appending each result to the results file.
+
+        A failing run does not stop the others: every run that finishes is recorded, then the
+        failures are reported together. They stay pending, so running the sweep again retries them.
+
+        Args:
+            max_workers (int | None): Number of worker processes, defaults to the CPU count
+            progress (Callable[[int, int], None] | None): Called with (finished, total) after
+                every run
+
+        Returns:
+            list[dict]: All results in the results file, see results().
+
+        Raises:
+            RuntimeError: If any run failed, chained to the error of the first one.
+        """
+        pending = self.pending()
+        total = len(self.configurations) * self.replications
+        finished = total - len(pending)
+
+        if pending:
+            os.makedirs(os.path.dirname(os.path.abspath(self.results_path)), exist_ok=True)
+            write_header = not os.path.exists(self.results_path) or os.path.getsize(self.results_path) == 0
+            if not write_header:
+                with open(self.results_path, newline='') as f:
+                    if next(csv.reader(f), None) != self.columns:
+                        raise ValueError(f"{self.results_path} holds the results of a sweep with other parameters")
+
+            with open(self.results_path, 'a', newline='') as f, ProcessPoolExecutor(max_workers) as pool:
+                writer = csv.DictWriter(f, fieldnames=self.columns)
+                if write_header:
+                    writer.writeheader()
+
+                futures = {}
+                for config, replication in pending:
+                    params = {**self.base, **self.configurations[config]}
+                    seed = self.seed_for(config, replication)
+                    run_id = self.run_id(config, replication)
+                    future = pool.submit(run_configuration, params, seed, run_id)
+                    futures[future] = (config, replication, seed, run_id)
+
+                failures = []
+                for future in as_completed(futures):
+                    config, replication, seed, run_id = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        failures.append((run_id, e))
+                        continue
+                    writer.writerow({'config': config, 'replication': replication, 'seed': seed, 'run_id': run_id,
+                                     **self.configurations[config], **result})
+                    f.flush()
+                    finished += 1
+                    if progress is not None:
+                        progress(finished, total)
+
+            if failures:
+                failures.sort(key=lambda failure: failure[0])
+                details = "; ".join(f"{run_id}: {error!r}" for run_id, error in failures)
+                raise RuntimeError(f"{len(failures)} of {len(pending)} runs failed: {details}") from failures[0][1]
+
+        return self.results()
+
+    def results(self) -> list[dict]:
+        """
+        Rows of the results file whose parameters do not match this sweep's grid (e.g. left by
+        a sweep with another grid) are ignored.
+
+        Returns:
+            list[dict]: One row per finished run, sorted by (config, replication), with the
+                grid parameters and served, expired, avg_wait and seconds.
+        """
+        if not os.path.exists(self.results_path):
+            return []
+        rows = []
+        with open(self.results_path, newline='') as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames != self.columns:
+                return []
+            for row in reader:
+                config = int(row['config'])
+                if config >= len(self.configurations) or int(row['replication']) >= self.replications or \
+                        any(row.get(name) != str(value) for name, value in self.configurations[config].items()):
+                    continue
+                rows.append({'config': config,
+                             'replication': int(row['replication']),
+                             'seed': int(row['seed']),
+                             'run_id': row['run_id'],
+                             **self.configurations[config],
+                             'served': int(row['served']),
+                             'expired': int(row['expired']),
+                             'avg_wait': float(row['avg_wait']),
+                             'seconds': float(row['seconds'])})
+        return sorted(rows, key=lambda row: (row['config'], row['replication']))
+
+    def summary(self) -> list[dict]:
+        """
+        Returns:
+            list[dict]: One row per configuration with its parameters, the number of finished
+                replications and the mean served, expired and avg_wait over them.
+        """
+        rows = self.results()
+        summary = []
+        for config, params in enumerate(self.configurations):
+            runs = [row for row in rows if row['config'] == config]
+            if not runs:
+                continue
+            summary.append({'config': config,
+                            **params,
+                            'replications': len(runs),
+                            'served': float(np.mean([row['served'] for row in runs])),
+                            'expired': float(np.mean([row['expired'] for row in runs])),
+                            'avg_wait': float(np.mean([row['avg_wait'] for row in runs]))})
+        return summary
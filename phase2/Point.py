@@ -61,4 +61,8 @@ class Point:
     def distance_to(self, other: Point) -> float:
         if not isinstance(other, Point):
             raise TypeError("distance_to() requires a Point")
-        return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
+        # dx * dx rather than dx ** 2: products are exactly rounded, so NumPy code computing
+        # distances the same way (e.g. CostMatrix) gets identical results
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return math.sqrt(dx * dx + dy * dy)
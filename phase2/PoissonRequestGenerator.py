@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+
+from phase2.AliasTable import AliasTable
+from phase2.Point import Point
+from phase2.RateProfile import RateProfile
+from phase2.Request import Request, RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventManager import EventManager
+
+
+class PoissonRequestGenerator(RequestGenerator):
+    """
+    Generate requests as a non-homogeneous Poisson process whose rate follows a RateProfile,
+    e.g. with rush-hour peaks.
+
+    The arrivals during tick [t, t + 1) are sampled by thinning: candidate arrivals are drawn
+    at the profile's maximum rate and each one is kept with probability rate(s) / max_rate,
+    where s is its arrival time. The number of requests per tick is therefore Poisson
+    distributed (not floor(rate) plus one, like RequestGenerator) and follows changes of the
+    rate within a tick.
+
+    Pickups and dropoffs can follow demand-density grids: 2D arrays of weights, one per cell
+    of the map, rows along the height and columns along the width. A cell is drawn from an
+    AliasTable in O(1) and the point uniformly inside it. Without a grid, points are uniform
+    over the map like in RequestGenerator.
+
+    `rate` is the profile's rate at the last generated tick, for display.
+    """
+
+    def __init__(self,
+                 profile: RateProfile,
+                 width: int,
+                 height: int,
+                 start_id: int,
+                 run_id: str,
+                 rng: random.Random | np.random.Generator | None = None,
+                 pickup_density: np.ndarray | None = None,
+                 dropoff_density: np.ndarray | None = None) -> None:
+        # profile: expected requests per tick over time
+        # pickup_density, dropoff_density: demand-density grids, uniform over the map if None
+        if not isinstance(profile, RateProfile):
+            raise TypeError("profile must be RateProfile")
+        super().__init__(rate=profile.rate(0), width=width, height=height, start_id=start_id, run_id=run_id,
+                         rng=rng)
+
+        self.profile = profile
+        self._pickup_grid = self._density_grid(pickup_density, "pickup_density")
+        self._dropoff_grid = self._density_grid(dropoff_density, "dropoff_density")
+
+    def __str__(self) -> str:
+        return f"PoissonRequestGenerator(profile={self.profile}, width={self.width}, height={self.height})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def peak_rate(self) -> float:
+        return self.profile.max_rate
+
+    @staticmethod
+    def _density_grid(density: np.ndarray | None, name: str) -> tuple[AliasTable, int] | None:
+        """
+        Returns:
+            The alias table over the cells of a density grid and the number of columns, or
+            None for a uniform map.
+        """
+        if density is None:
+            return None
+        density = np.asarray(density, dtype=np.float64)
+        if density.ndim != 2:
+            raise ValueError(f"{name} must be a 2D array")
+        return AliasTable(density), density.shape[1]
+
+    def _arrivals(self, time: int | float) -> int:
+        """
+        Number of arrivals during [time, time + 1), sampled by thinning.
+        """
+        max_rate = self.profile.max_rate
+        if max_rate <= 0:
+            return 0
+
+        count = 0
+        t = time + self.rng.expovariate(max_rate)
+        while t < time + 1:
+            if self.rng.random() * max_rate < self.profile.rate(t):
+                count += 1
+            t += self.rng.expovariate(max_rate)
+        return count
+
+    def _draw_count(self, time: int | float) -> int:
+        return self._arrivals(time)
+
+    def _sample_point(self, grid: tuple[AliasTable, int] | None) -> Point:
+        """
+        Draw a point on the map, from a density grid or uniformly.
+        """
+        if grid is None:
+            x = int(min(round(self.rng.uniform(0, self.width)), self.width - 1))
+            y = int(min(round(self.rng.uniform(0, self.height)), self.height - 1))
+            return Point(x, y)
+
+        table, columns = grid
+        rows = len(table) // columns
+        cell = table.sample(self.rng)
+        row, column = divmod(cell, columns)
+        # Uniform inside the cell, floored so the point stays in it
+        x = math.floor((column + self.rng.random()) * self.width / columns)
+        y = math.floor((row + self.rng.random()) * self.height / rows)
+        return Point(int(min(x, self.width - 1)), int(min(y, self.height - 1)))
+
+    def maybe_generate(self, time):
+        """
+        Create the requests arriving during the current tick.
+
+        Args:
+            time (int | float): Current simulation time.
+
+        Returns:
+            list[Request]: The new requests.
+        """
+        if not isinstance(time, (int, float)):
+            raise TypeError("time must be a number")
+        if time < 0:
+            raise ValueError("time must be non-negative")
+
+        self.rate = self.profile.rate(time)
+
+        new_requests = []
+        for _ in range(self._take_count(time)):
+            new_requests.append(Request(id=self.next_id,
+                                        pickup=self._sample_point(self._pickup_grid),
+                                        dropoff=self._sample_point(self._dropoff_grid),
+                                        creation_time=time,
+                                        status=RequestStatus.WAITING,
+                                        assigned_driver=None,
+                                        wait_time=0,
+                                        run_id=self.run_id))
+            self.next_id += 1
+
+        EventManager(self.run_id).add_events([Event(time, EventType.REQUEST_GENERATED, None, req.id, None,
+                                                    behaviour_name=None)
+                                              for req in new_requests])
+        return new_requests
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+from types import ModuleType
+
+import numpy as np
+
+
+class NumpyRandom(random.Random):
+    """
+    random.Random drawing from a numpy.random.Generator, so components written against the
+    random.Random API (random, uniform, choice, ...) can use a numpy stream. Every draw is
+    derived from Generator.random(), seeding is done through the Generator.
+    """
+
+    def __init__(self, generator: np.random.Generator) -> None:
+        if not isinstance(generator, np.random.Generator):
+            raise TypeError("generator must be numpy.random.Generator")
+        self.generator = generator
+        super().__init__()
+
+    def random(self) -> float:
+        return float(self.generator.random())
+
+    def seed(self, a=None, version=2) -> None:
+        # The state lives in the Generator
+        pass
+
+    def getstate(self):
+        return self.generator.bit_generator.state
+
+    def setstate(self, state) -> None:
+        self.generator.bit_generator.state = state
+
+    def __reduce__(self):
+        return NumpyRandom, (self.generator,)
+
+
+def as_random(rng: random.Random | np.random.Generator | None) -> random.Random | ModuleType:
+    """
+    Normalise the `rng` argument of a component.
+
+    Args:
+        rng (random.Random | np.random.Generator | None): Stream to draw from
+
+    Returns:
+        The random.Random to draw from, or the global random module if rng is None.
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, random.Random):
+        return rng
+    if isinstance(rng, np.random.Generator):
+        return NumpyRandom(rng)
+    raise TypeError("rng must be random.Random, numpy.random.Generator or None")
+
+
+class RandomStreams:
+    """
+    Independent random streams of one run, all derived from the run seed: demand (request
+    generation), fleet (driver generation) and mutation (behaviour changes).
+
+    The streams are spawned from a numpy SeedSequence, so they do not overlap and each one
+    only depends on the seed, not on how much the others were used. Two runs with the same
+    seed draw the same numbers, and runs that differ in e.g. the dispatch policy still see
+    the same demand (common random numbers).
+    """
+
+    KINDS = ("python", "numpy")
+
+    def __init__(self, seed: int | None = None, kind: str = "python") -> None:
+        if seed is not None and not isinstance(seed, int):
+            raise TypeError("seed must be int or None")
+        if kind not in self.KINDS:
+            raise ValueError(f"kind must be one of {', '.join(self.KINDS)}")
+
+        self.seed = seed
+        self.kind = kind
+        self.demand, self.fleet, self.mutation = [self._stream(sequence)
+                                                  for sequence in np.random.SeedSequence(seed).spawn(3)]
+
+    def __str__(self) -> str:
+        return f"RandomStreams(seed={self.seed}, kind={self.kind})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def _stream(self, sequence: np.random.SeedSequence) -> random.Random | np.random.Generator:
+        if self.kind == "numpy":
+            return np.random.default_rng(sequence)
+        return random.Random(int.from_bytes(sequence.generate_state(4).tobytes(), "little"))
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import bisect
+
+
+class RateProfile:
+    """
+    Request rate (expected requests per tick) as a function of the simulation time.
+
+    The curve is given as (time, rate) points. With kind "step" the rate of a point holds until
+    the next point, with kind "linear" the rate is interpolated between points. Before the
+    first point the first rate applies, after the last point the last rate. With a `period`
+    the curve repeats, e.g. a day of 300 ticks with a rush hour:
+
+        RateProfile([(0, 0.5), (100, 3.0), (150, 0.5)], period=300)
+
+    A linear periodic curve interpolates from its last point back to the first point of the
+    next period.
+    """
+
+    KINDS = ("step", "linear")
+
+    def __init__(self, points: list[tuple[float, float]], period: float | None = None, kind: str = "step") -> None:
+        if not isinstance(points, list) or not points:
+            raise TypeError("points must be a non-empty list of (time, rate) tuples")
+        if not all(isinstance(p, tuple) and len(p) == 2 and all(isinstance(v, (int, float)) for v in p)
+                   for p in points):
+            raise TypeError("points must be a non-empty list of (time, rate) tuples")
+        times = [float(t) for t, _ in points]
+        rates = [float(r) for _, r in points]
+        if any(b <= a for a, b in zip(times, times[1:])):
+            raise ValueError("point times must be strictly increasing")
+        if any(t < 0 for t in times):
+            raise ValueError("point times must be non-negative")
+        if any(r < 0 for r in rates):
+            raise ValueError("rates must be non-negative")
+        if period is not None:
+            if not isinstance(period, (int, float)):
+                raise TypeError("period must be a number or None")
+            if period <= times[-1]:
+                raise ValueError("period must be after the last point")
+        if kind not in self.KINDS:
+            raise ValueError(f"kind must be one of {', '.join(self.KINDS)}")
+
+        self.points = points
+        self.period = period
+        self.kind = kind
+        self._times = times
+        self._rates = rates
+        if period is not None and kind == "linear":
+            # Close the cycle: interpolate from the last point to the start of the next period
+            self._times = times + [times[0] + period]
+            self._rates = rates + [rates[0]]
+        self.max_rate = max(rates)
+
+    @classmethod
+    def constant(cls, rate: float) -> RateProfile:
+        return cls([(0, rate)])
+
+    def __str__(self) -> str:
+        return f"RateProfile(points={self.points}, period={self.period}, kind={self.kind})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def rate(self, time: float) -> float:
+        """
+        Args:
+            time (float): Simulation time
+
+        Returns:
+            float: Expected requests per tick at that time.
+        """
+        if self.period is not None:
+            time %= self.period
+            if time < self._times[0]:
+                # Before the first point of a period the previous period's curve continues
+                time += self.period
+
+        i = bisect.bisect_right(self._times, time) - 1
+        if i < 0:
+            return self._rates[0]
+        if self.kind == "step" or i == len(self._times) - 1:
+            return self._rates[i]
+
+        t0, t1 = self._times[i], self._times[i + 1]
+        r0, r1 = self._rates[i], self._rates[i + 1]
+        return r0 + (r1 - r0) * (time - t0) / (t1 - t0)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from phase2.Point import Point
 from phase2.metrics.Event import Event, EventType
 from phase2.metrics.EventManager import EventManager
 
+if TYPE_CHECKING:
+    from phase2.RequestStore import RequestStore
+
 
 class RequestStatus(Enum):
     WAITING = 1
@@ -25,6 +29,13 @@ class Request:
                  assigned_driver: int | None,
                  wait_time: int,
                  run_id: str) -> None:
+        # Set when the request is added to a RequestStore, which is told about status changes
+        self._store: RequestStore | None = None
+        # Reading of the store's clock at which the request had waited 0 ticks, set by the store
+        self._wait_origin: int | float | None = None
+        # Heap entry of the request in its store's ExpiryScheduler
+        self._expiry_entry: int | None = None
+
         self.id = id
         self.pickup = pickup
         self.dropoff = dropoff
@@ -35,6 +46,41 @@ class Request:
         self.eventManager = EventManager(run_id)
         self.run_id = run_id
 
+    @property
+    def status(self) -> RequestStatus:
+        return self._status
+
+    @status.setter
+    def status(self, value: RequestStatus) -> None:
+        old = getattr(self, '_status', None)
+        if old is not None and self.is_active() and value in (RequestStatus.DELIVERED, RequestStatus.EXPIRED):
+            # Freeze the derived wait time once the request is finished
+            self._wait_time = self.wait_time
+        self._status = value
+        if self._store is not None and old is not value:
+            self._store._status_changed(self, old, value)
+
+    @property
+    def wait_time(self) -> int:
+        """
+        Number of ticks the request has waited.
+
+        While the request is active and tracked by a RequestStore with a clock, this is derived
+        from the store's clock: the wait it had when it was added, plus the ticks counted since.
+        Otherwise the stored value is returned.
+        """
+        clock = self._store.clock if self._store is not None else None
+        if clock is None or self._wait_origin is None or not self.is_active():
+            return self._wait_time
+        return clock() - self._wait_origin
+
+    @wait_time.setter
+    def wait_time(self, value: int) -> None:
+        self._wait_time = value
+        if self._store is not None and self.is_active():
+            # Continue counting from the new value
+            self._store._start_wait(self)
+
     def __str__(self) -> str:
         return f"Request(id={self.id}, pick_up={self.pickup}, drop_off={self.dropoff}, " \
                f"creation_time={self.creation_time}, status={self.status}, " \
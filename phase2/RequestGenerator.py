@@ -2,24 +2,39 @@ from __future__ import annotations
 
 import random
 
+import numpy as np
+
 from phase2.Point import Point
+from phase2.RandomStreams import NumpyRandom, as_random
 from phase2.Request import Request, RequestStatus
 from phase2.metrics.Event import Event, EventType
 from phase2.metrics.EventManager import EventManager
 
 
 class RequestGenerator:
-    """Generate new Request objects during the simulation."""
+    """
+    Generate new Request objects during the simulation.
+
+    By default every request is drawn on its own. With `batch_ticks` set, the request counts
+    of the next `batch_ticks` ticks and the coordinates of all their requests are drawn in one
+    NumPy call, and each tick only turns its slice of those arrays into requests. The counts
+    follow the same floor(rate) plus Bernoulli(fraction) rule, but the draws come from a NumPy
+    generator, so a batched run does not reproduce the requests of an unbatched one.
+    """
 
     def __init__(self,
                  rate: float,
                  width: int,
                  height: int,
                  start_id: int,
-                 run_id: str):
+                 run_id: str,
+                 rng: random.Random | np.random.Generator | None = None,
+                 batch_ticks: int = 0):
         # rate: expected number of new requests per tick (e.g. 0.5, 1.0, 2.3)
         # width, height: size of the map
         # start_id: first id to use
+        # rng: demand stream to draw from, the global random module if None
+        # batch_ticks: ticks drawn per NumPy call, 0 draws every request on its own
         if not isinstance(rate, (float, int)):
             raise TypeError("rate must be a number")
         if rate < 0:
@@ -32,12 +47,40 @@ class RequestGenerator:
             raise TypeError("start_id must be a number")
         if not isinstance(run_id, str):
             raise TypeError("run_id must be a string")
+        if not isinstance(batch_ticks, int):
+            raise TypeError("batch_ticks must be an integer")
+        if batch_ticks < 0:
+            raise ValueError("batch_ticks must be non-negative")
 
         self.rate = rate
         self.width = width
         self.height = height
         self.next_id = start_id
         self.run_id = run_id
+        self.rng = as_random(rng)
+        self.batch_ticks = batch_ticks
+
+        # Drawn block of ticks: count per tick, coordinates (px, py, dx, dy) per request,
+        # the next tick and request to hand out, and the rate the block was drawn with
+        self._generator: np.random.Generator | None = None
+        self._counts: list[int] = []
+        self._coords: list[list[int]] = []
+        self._next_tick = 0
+        self._next_request = 0
+        self._block_rate = rate
+        # (tick, count) of the next tick with requests, drawn ahead by next_arrival()
+        self._arrival: tuple[int, int] | None = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # The global random module can not be pickled, checkpoints save its state separately
+        if state['rng'] is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.rng = as_random(self.rng)
 
     def maybe_generate(self, time):
         """
@@ -53,24 +96,19 @@ class RequestGenerator:
         if time < 0:
             raise ValueError("time must be non-negative")
 
-        # Decide how many requests to create this tick.
-        # Always create floor(rate). With probability equal to the
-        # fractional part, create one extra.
-        base = int(self.rate)
-        frac = self.rate - base
+        if self.batch_ticks:
+            return self._generate_batched(time)
 
-        num = base
-        if random.random() < frac:
-            num += 1
+        num = self._take_count(time)
 
         new_requests = []
 
         for _ in range(num):
             # random pick_up and dropoff inside the map
-            px = int(min(round(random.uniform(0, self.width)), self.width - 1))
-            py = int(min(round(random.uniform(0, self.height)), self.height - 1))
-            dx = int(min(round(random.uniform(0, self.width)), self.width - 1))
-            dy = int(min(round(random.uniform(0, self.height)), self.height - 1))
+            px = int(min(round(self.rng.uniform(0, self.width)), self.width - 1))
+            py = int(min(round(self.rng.uniform(0, self.height)), self.height - 1))
+            dx = int(min(round(self.rng.uniform(0, self.width)), self.width - 1))
+            dy = int(min(round(self.rng.uniform(0, self.height)), self.height - 1))
 
             pickup = Point(px, py)
             dropoff = Point(dx, dy)
@@ -91,3 +129,136 @@ class RequestGenerator:
             self.next_id += 1
 
         return new_requests
+
+    @property
+    def peak_rate(self) -> float:
+        """
+        Highest expected number of requests per tick, used to size per-request indexes.
+        """
+        return self.rate
+
+    def next_arrival(self, time: int, until: int) -> int | None:
+        """
+        Find the next tick at which requests are created, for simulations that jump from event
+        to event instead of calling maybe_generate() every tick.
+
+        The request counts of the ticks in between are drawn like maybe_generate() would draw
+        them, so the requests are the same as when every tick is generated. Those ticks count
+        as generated: the next maybe_generate() call must be for the returned tick, or for
+        `until` or later if None is returned.
+
+        Args:
+            time (int): First tick whose requests are not generated yet
+            until (int): Tick to stop looking at
+
+        Returns:
+            int | None: The first tick in [time, until) with requests, or None.
+        """
+        if self._arrival is not None:
+            return self._arrival[0] if self._arrival[0] < until else None
+        for tick in range(time, until):
+            count = self._draw_count(tick)
+            if count:
+                self._arrival = (tick, count)
+                return tick
+        return None
+
+    def _draw_count(self, time: int | float) -> int:
+        """
+        Draw the number of requests created at a tick.
+        """
+        if self.batch_ticks:
+            if self._next_tick >= len(self._counts) or self.rate != self._block_rate:
+                self._draw_block()
+            num = self._counts[self._next_tick]
+            self._next_tick += 1
+            return num
+
+        # Always create floor(rate). With probability equal to the
+        # fractional part, create one extra.
+        base = int(self.rate)
+        frac = self.rate - base
+
+        num = base
+        if self.rng.random() < frac:
+            num += 1
+        return num
+
+    def _take_count(self, time: int | float) -> int:
+        """
+        Number of requests to create at a tick, the count drawn ahead by next_arrival() if
+        there is one.
+        """
+        if self._arrival is None:
+            return self._draw_count(time)
+        tick, num = self._arrival
+        if time < tick:
+            # Drawn ahead as a tick without requests
+            return 0
+        self._arrival = None
+        return num
+
+    def _numpy_generator(self) -> np.random.Generator:
+        """
+        Returns:
+            np.random.Generator: The generator of the batches, the demand stream itself if it
+                is a NumPy generator, otherwise one seeded from the demand stream.
+        """
+        if self._generator is None:
+            if isinstance(self.rng, NumpyRandom):
+                self._generator = self.rng.generator
+            else:
+                self._generator = np.random.default_rng(self.rng.getrandbits(64))
+        return self._generator
+
+    def _draw_block(self) -> None:
+        """
+        Draw the request counts of the next batch_ticks ticks and the coordinates of all their
+        requests.
+        """
+        generator = self._numpy_generator()
+        base = int(self.rate)
+        counts = base + (generator.random(self.batch_ticks) < self.rate - base)
+
+        upper = np.array([self.width, self.height, self.width, self.height], dtype=np.float64)
+        coords = generator.uniform(0, upper, size=(int(counts.sum()), 4))
+        # Same rounding and clamping as the unbatched path
+        coords = np.minimum(np.rint(coords), upper - 1).astype(np.int64)
+
+        self._counts = counts.tolist()
+        self._coords = coords.tolist()
+        self._next_tick = 0
+        self._next_request = 0
+        self._block_rate = self.rate
+
+    def _generate_batched(self, time: int | float) -> list[Request]:
+        """
+        Create the requests of the current tick from the drawn block, drawing a new block when
+        the current one is used up or the rate changed.
+
+        Args:
+            time (int | float): Current simulation time.
+
+        Returns:
+            list[Request]: The new requests.
+        """
+        num = self._take_count(time)
+        rows = self._coords[self._next_request:self._next_request + num]
+        self._next_request += num
+
+        new_requests = []
+        for px, py, dx, dy in rows:
+            new_requests.append(Request(id=self.next_id,
+                                        pickup=Point(px, py),
+                                        dropoff=Point(dx, dy),
+                                        creation_time=time,
+                                        status=RequestStatus.WAITING,
+                                        assigned_driver=None,
+                                        wait_time=0,
+                                        run_id=self.run_id))
+            self.next_id += 1
+
+        EventManager(self.run_id).add_events([Event(time, EventType.REQUEST_GENERATED, None, req.id, None,
+                                                    behaviour_name=None)
+                                              for req in new_requests])
+        return new_requests
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+from phase2.ExpiryScheduler import ExpiryScheduler
+from phase2.Request import Request, RequestStatus
+from phase2.SpatialGrid import SpatialGrid
+
+ACTIVE_STATUSES = (RequestStatus.WAITING, RequestStatus.ASSIGNED, RequestStatus.PICKED)
+
+
+class RequestStore:
+    """
+    Container for all requests of a simulation, partitioned by status.
+
+    WAITING, ASSIGNED and PICKED requests are kept in separate buckets indexed by request id.
+    DELIVERED and EXPIRED requests are moved to an archive which is only read when someone
+    explicitly asks for every request (e.g. iterating the store), never on the per-tick path.
+
+    Requests report their own status changes to the store they belong to, so the buckets
+    are always up to date without rescanning.
+
+    If a `clock` is set, the wait time of active requests is derived from it instead of
+    being counted every tick: a request keeps the wait it had when it was added and waits
+    from the clock's reading at that moment on, like the per-tick count it replaces. Active
+    requests are scheduled for expiry by that start.
+
+    The pickups of WAITING requests are kept in a SpatialGrid (`pickup_index`), updated
+    together with the WAITING bucket, so dispatch can query the nearest waiting request.
+    """
+
+    def __init__(self, requests: list[Request] | None = None,
+                 cell_size: float = SpatialGrid.DEFAULT_CELL_SIZE) -> None:
+        self._buckets: dict[RequestStatus, dict[int, Request]] = {status: {} for status in ACTIVE_STATUSES}
+        self.archive: list[Request] = []
+        self.expiry = ExpiryScheduler()
+        self.pickup_index = SpatialGrid(cell_size)
+        # Returns the current wait clock, the number of ticks counted so far
+        self._clock: Callable[[], int] | None = None
+
+        if requests is not None:
+            self.extend(requests)
+
+    def __str__(self) -> str:
+        return f"RequestStore(waiting={self.count(RequestStatus.WAITING)}, " \
+               f"assigned={self.count(RequestStatus.ASSIGNED)}, " \
+               f"picked={self.count(RequestStatus.PICKED)}, " \
+               f"archived={len(self.archive)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self.archive) + sum(len(bucket) for bucket in self._buckets.values())
+
+    @property
+    def clock(self) -> Callable[[], int] | None:
+        return self._clock
+
+    @clock.setter
+    def clock(self, clock: Callable[[], int] | None) -> None:
+        active = self.active()
+        # Keep the waits counted so far, then count on with the new clock
+        for request in active:
+            request._wait_time = request.wait_time
+        self._clock = clock
+        self.expiry = ExpiryScheduler()
+        for request in active:
+            self._start_wait(request)
+
+    def __iter__(self) -> Iterator[Request]:
+        """
+        Iterate over every request, archived ones included. Not meant for the hot path.
+        """
+        yield from self.archive
+        for status in ACTIVE_STATUSES:
+            yield from list(self._buckets[status].values())
+
+    def add(self, request: Request) -> None:
+        """
+        Add a request to the store and start tracking its status changes.
+
+        Args:
+            request (Request): Request to add
+        """
+        if not isinstance(request, Request):
+            raise TypeError(f"request must be Request, got {type(request).__name__}")
+
+        if request._store is not None and request._store is not self:
+            # Keep the wait counted by the other store
+            request._wait_time = request.wait_time
+            request._store._discard(request, request.status)
+
+        request._store = self
+        self._place(request, request.status)
+        if request.is_active():
+            self._start_wait(request)
+
+    # list-like aliases so code written against a plain list keeps working
+    append = add
+
+    def extend(self, requests: list[Request]) -> None:
+        """
+        Add several requests to the store.
+
+        Args:
+            requests (list[Request]): Requests to add
+        """
+        for request in requests:
+            self.add(request)
+
+    def get(self, request_id: int) -> Request | None:
+        """
+        Look up an active request by id.
+
+        Args:
+            request_id (int): Id of the request
+
+        Returns:
+            The request if it is WAITING, ASSIGNED or PICKED, otherwise None.
+        """
+        for bucket in self._buckets.values():
+            request = bucket.get(request_id)
+            if request is not None:
+                return request
+        return None
+
+    def count(self, status: RequestStatus) -> int:
+        """
+        Returns:
+            Number of requests with the given status.
+        """
+        if status in self._buckets:
+            return len(self._buckets[status])
+        return sum(1 for request in self.archive if request.status == status)
+
+    def by_status(self, status: RequestStatus) -> list[Request]:
+        """
+        Args:
+            status (RequestStatus): Status to filter by. Must be an active status.
+
+        Returns:
+            Requests currently having the given status.
+        """
+        if status not in self._buckets:
+            raise ValueError(f"{status.name} requests are archived, use the archive attribute instead")
+        return list(self._buckets[status].values())
+
+    def waiting(self) -> list[Request]:
+        return self.by_status(RequestStatus.WAITING)
+
+    def assigned(self) -> list[Request]:
+        return self.by_status(RequestStatus.ASSIGNED)
+
+    def picked(self) -> list[Request]:
+        return self.by_status(RequestStatus.PICKED)
+
+    def active(self) -> list[Request]:
+        """
+        Returns:
+            All WAITING, ASSIGNED and PICKED requests.
+        """
+        active = []
+        for status in ACTIVE_STATUSES:
+            active.extend(self._buckets[status].values())
+        return active
+
+    def pop_expired(self, timeout: int) -> list[Request]:
+        """
+        Return the active requests that have waited at least `timeout` ticks.
+        Only the expiring requests are visited. Requires a clock to be set.
+
+        Args:
+            timeout (int): Number of ticks a request may wait
+
+        Returns:
+            list[Request]: Requests that should expire now, oldest first.
+        """
+        if self.clock is None:
+            raise RuntimeError("RequestStore needs a clock to find expired requests")
+
+        due = self.expiry.pop_due(self.clock() - timeout)
+        return [request for request in due if request._store is self]
+
+    def next_expiry(self) -> int | float | None:
+        """
+        Returns:
+            int | float | None: Clock reading at which the next active request to expire
+                started waiting, or None if there are no active requests or no clock.
+        """
+        return self.expiry.next_due()
+
+    def _start_wait(self, request: Request) -> None:
+        """
+        Count the wait of an active request from its stored wait time and the current clock,
+        and schedule its expiry accordingly.
+        """
+        if self._clock is None:
+            request._wait_origin = None
+            return
+        request._wait_origin = self._clock() - request._wait_time
+        self.expiry.schedule(request, request._wait_origin)
+
+    def _place(self, request: Request, status: RequestStatus) -> None:
+        if status in self._buckets:
+            self._buckets[status][request.id] = request
+            if status == RequestStatus.WAITING:
+                self.pickup_index.insert(request)
+        else:
+            self.archive.append(request)
+
+    def _discard(self, request: Request, status: RequestStatus) -> None:
+        if status in self._buckets:
+            self._buckets[status].pop(request.id, None)
+            if status == RequestStatus.WAITING:
+                self.pickup_index.remove(request)
+        else:
+            self.archive.remove(request)
+
+    def _status_changed(self, request: Request, old: RequestStatus, new: RequestStatus) -> None:
+        """
+        Called by a request when its status changes, moves it to the matching bucket.
+        """
+        # Archived requests are final, but tolerate them being revived (e.g. in tests)
+        self._discard(request, old)
+        self._place(request, new)
+        if old in (RequestStatus.DELIVERED, RequestStatus.EXPIRED) and new in self._buckets:
+            self._start_wait(request)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Any, Callable, Iterator
+
+from phase2.Driver import Driver
+from phase2.Point import Point
+from phase2.Request import Request
+
+
+def _pickup(request: Request) -> Point:
+    return request.pickup
+
+
+def _driver_position(driver: Driver) -> Point:
+    return driver.position
+
+
+class SpatialGrid:
+    """
+    Uniform grid over points, used to find the items nearest to a point.
+
+    By default the items are requests placed at their pickup, but any item with an `id`
+    can be indexed by passing a `position` function (see from_drivers). Each item lives in
+    the square cell of side `cell_size` containing its point. A query searches the cells in
+    rings around the query point and stops as soon as no unsearched cell can hold a closer
+    item, so it only looks at items close to the point instead of all of them.
+
+    Every item gets a sequence number when inserted. Among items at the same distance the
+    lowest sequence number wins, so results match a linear scan over the items in
+    insertion order.
+    """
+
+    DEFAULT_CELL_SIZE = 2.0
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE, position: Callable[[Any], Point] = _pickup) -> None:
+        if not isinstance(cell_size, (int, float)):
+            raise TypeError("cell_size must be int or float")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+
+        self.cell_size = float(cell_size)
+        self.position = position
+        # cell -> item id -> (seq, x, y, item)
+        self._cells: dict[tuple[int, int], dict[int, tuple[int, float, float, Any]]] = {}
+        # item id -> (cell, seq)
+        self._where: dict[int, tuple[tuple[int, int], int]] = {}
+        self._next_seq = 0
+        # Number of items per cell column and per cell row
+        self._column_counts: dict[int, int] = {}
+        self._row_counts: dict[int, int] = {}
+        # Bounding box of the cells holding items, in cell coordinates, the limit of a search.
+        # Emptying a column or row on its edge marks it stale, the next query recomputes it.
+        self._min_cell: tuple[int, int] | None = None
+        self._max_cell: tuple[int, int] | None = None
+        self._bounds_stale = False
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._where
+
+    def __str__(self) -> str:
+        return f"SpatialGrid(cell_size={self.cell_size}, items={len(self)}, cells={len(self._cells)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def from_requests(cls, requests: list[Request], cell_size: float | None = None) -> SpatialGrid:
+        """
+        Build a grid over the pickups of some requests, inserted in list order.
+
+        Args:
+            requests (list[Request]): Requests to index
+            cell_size (float | None): Side of a cell. If None, it is chosen so that there is
+                about one request per cell.
+
+        Returns:
+            SpatialGrid: The grid.
+        """
+        return cls._from_items(requests, cell_size, _pickup)
+
+    @classmethod
+    def from_drivers(cls, drivers: list[Driver], cell_size: float | None = None) -> SpatialGrid:
+        """
+        Build a grid over the positions of some drivers, inserted in list order.
+
+        Args:
+            drivers (list[Driver]): Drivers to index
+            cell_size (float | None): Side of a cell. If None, it is chosen so that there is
+                about one driver per cell.
+
+        Returns:
+            SpatialGrid: The grid.
+        """
+        return cls._from_items(drivers, cell_size, _driver_position)
+
+    @classmethod
+    def _from_items(cls, items: list, cell_size: float | None, position: Callable[[Any], Point]) -> SpatialGrid:
+        points = [position(item) for item in items]
+        if cell_size is None:
+            cell_size = cls._cell_size_for(points)
+        grid = cls(cell_size, position)
+        for item, point in zip(items, points):
+            grid._insert(item, point, None)
+        return grid
+
+    @classmethod
+    def _cell_size_for(cls, points: list[Point]) -> float:
+        if not points:
+            return cls.DEFAULT_CELL_SIZE
+        xs = [point.x for point in points]
+        ys = [point.y for point in points]
+        return cls.cell_size_for_area(max(xs) - min(xs), max(ys) - min(ys), len(points))
+
+    @classmethod
+    def cell_size_for_area(cls, width: float, height: float, count: float) -> float:
+        """
+        Args:
+            width (float): Width of the area the items are spread over
+            height (float): Height of the area
+            count (float): Expected number of items in the grid
+
+        Returns:
+            float: Side of a cell that gives about one item per cell, or DEFAULT_CELL_SIZE if
+                the area or the count is not positive.
+        """
+        area = width * height
+        if area <= 0 or count <= 0:
+            return cls.DEFAULT_CELL_SIZE
+        return math.sqrt(area / count)
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, item: Any, seq: int | None = None) -> None:
+        """
+        Add an item, or move it if its position changed. An item that is already in the grid
+        keeps its sequence number.
+
+        Args:
+            item (Any): Item to add, e.g. a Request
+            seq (int | None): Sequence number to use, e.g. one returned by remove(). A new one
+                is assigned if None.
+        """
+        self._insert(item, self.position(item), seq)
+
+    def _insert(self, item: Any, point: Point, seq: int | None) -> None:
+        x, y = point.x, point.y
+        cell = self._cell_of(x, y)
+
+        if item.id in self._where:
+            old_cell, old_seq = self._where[item.id]
+            self._remove_from_cell(old_cell, item.id)
+            if seq is None:
+                seq = old_seq
+        elif seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+
+        self._cells.setdefault(cell, {})[item.id] = (seq, x, y, item)
+        self._where[item.id] = (cell, seq)
+        self._column_counts[cell[0]] = self._column_counts.get(cell[0], 0) + 1
+        self._row_counts[cell[1]] = self._row_counts.get(cell[1], 0) + 1
+
+        if self._bounds_stale:
+            return
+        if self._min_cell is None:
+            self._min_cell = self._max_cell = cell
+        else:
+            self._min_cell = (min(self._min_cell[0], cell[0]), min(self._min_cell[1], cell[1]))
+            self._max_cell = (max(self._max_cell[0], cell[0]), max(self._max_cell[1], cell[1]))
+
+    def remove(self, item: Any) -> int | None:
+        """
+        Remove an item from the grid.
+
+        Args:
+            item (Any): Item to remove
+
+        Returns:
+            The sequence number the item had, or None if it was not in the grid.
+        """
+        location = self._where.pop(item.id, None)
+        if location is None:
+            return None
+        cell, seq = location
+        self._remove_from_cell(cell, item.id)
+        return seq
+
+    def _remove_from_cell(self, cell: tuple[int, int], item_id: int) -> None:
+        entries = self._cells[cell]
+        del entries[item_id]
+        if not entries:
+            del self._cells[cell]
+
+        column, row = cell
+        self._column_counts[column] -= 1
+        if not self._column_counts[column]:
+            del self._column_counts[column]
+            self._bounds_stale |= column in (self._min_cell[0], self._max_cell[0])
+        self._row_counts[row] -= 1
+        if not self._row_counts[row]:
+            del self._row_counts[row]
+            self._bounds_stale |= row in (self._min_cell[1], self._max_cell[1])
+
+    def _update_bounds(self) -> None:
+        """
+        Recompute the bounding box from the columns and rows that still hold items.
+        """
+        if self._column_counts:
+            self._min_cell = (min(self._column_counts), min(self._row_counts))
+            self._max_cell = (max(self._column_counts), max(self._row_counts))
+        else:
+            self._min_cell = self._max_cell = None
+        self._bounds_stale = False
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._where.clear()
+        self._column_counts.clear()
+        self._row_counts.clear()
+        self._min_cell = self._max_cell = None
+        self._bounds_stale = False
+
+    def nearest(self, point: Point) -> Any | None:
+        """
+        Find the item closest to a point.
+
+        Args:
+            point (Point): Query point
+
+        Returns:
+            The closest item (lowest sequence number on ties), or None if the grid is empty.
+        """
+        for _, _, item in self.iter_nearest(point):
+            return item
+        return None
+
+    def iter_nearest(self, point: Point, offset: float = 0.0) -> Iterator[tuple[float, int, Any]]:
+        """
+        Yield the items from closest to farthest, expanding the search one ring of cells at a
+        time as the caller asks for more.
+
+        Items are ordered by (distance + offset, seq), with distance computed like
+        Point.distance_to. A constant offset does not change which item is closer, but the
+        sum is rounded, so distances that differ slightly can give the same key. Passing it
+        in lets callers get the exact order of `distance + offset` keys.
+
+        The grid must not be changed while iterating.
+
+        Args:
+            point (Point): Query point
+            offset (float): Added to every distance
+
+        Yields:
+            (distance + offset, seq, item) tuples.
+        """
+        if not self._where:
+            return
+        if self._bounds_stale:
+            self._update_bounds()
+
+        px, py = point.x, point.y
+        cx, cy = self._cell_of(px, py)
+        # Rings beyond this one cannot contain any used cell
+        last_ring = max(cx - self._min_cell[0], self._max_cell[0] - cx,
+                        cy - self._min_cell[1], self._max_cell[1] - cy, 0)
+
+        found = []
+        ring = 0
+        while True:
+            for cell in self._ring_cells(cx, cy, ring):
+                entries = self._cells.get(cell)
+                if entries is None:
+                    continue
+                for seq, x, y, item in entries.values():
+                    dx = px - x
+                    dy = py - y
+                    heapq.heappush(found, (math.sqrt(dx * dx + dy * dy) + offset, seq, item))
+
+            if ring >= last_ring:
+                while found:
+                    yield heapq.heappop(found)
+                return
+
+            # Every item in the next rings is at least `ring * cell_size` away. Only yield items
+            # strictly below that bound, an item with an equal key could have a lower seq.
+            bound = ring * self.cell_size + offset
+            while found and found[0][0] < bound:
+                yield heapq.heappop(found)
+            ring += 1
+
+    def pop_nearest(self, point: Point) -> tuple[Any, int] | None:
+        """
+        Find and remove the item closest to a point.
+
+        Args:
+            point (Point): Query point
+
+        Returns:
+            The removed item and its sequence number (to re-insert it with), or None if the
+            grid is empty.
+        """
+        item = self.nearest(point)
+        if item is None:
+            return None
+        return item, self.remove(item)
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        """
+        Yield the cells at Chebyshev distance `ring` from (cx, cy).
+        """
+        if ring == 0:
+            yield cx, cy
+            return
+        for x in range(cx - ring, cx + ring + 1):
+            yield x, cy - ring
+            yield x, cy + ring
+        for y in range(cy - ring + 1, cy + ring):
+            yield cx - ring, y
+            yield cx + ring, y
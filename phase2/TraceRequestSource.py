@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import math
+from typing import Iterator
+
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventManager import EventManager
+
+TRACE_COLUMNS = ("#request time", "pickup x", "pickup y", "delivery x", "delivery y")
+
+
+class TraceRequestSource(RequestGenerator):
+    """
+    Replays the requests of a CSV trace, in the format of data/requests.csv, at their request
+    time.
+
+    The file is streamed: a generator reads one row at a time and maybe_generate(time) only
+    releases the rows whose request time has arrived, keeping the first row of a later tick
+    until its time comes. Memory does not grow with the length of the trace, so traces with
+    millions of rows can be replayed.
+
+    The trace must be sorted by request time, a row earlier than the row before it raises a
+    ValueError. Rows with a negative time or a point outside the map are skipped and counted
+    in `skipped`.
+    """
+
+    def __init__(self,
+                 path: str,
+                 width: int,
+                 height: int,
+                 start_id: int,
+                 run_id: str) -> None:
+        # path: CSV trace with the columns of TRACE_COLUMNS, sorted by request time
+        if not isinstance(path, str):
+            raise TypeError("path must be a string")
+        super().__init__(rate=0, width=width, height=height, start_id=start_id, run_id=run_id)
+
+        self.path = path
+        self.skipped = 0
+        self.released = 0
+        # Data lines read so far and the request time of the last valid one
+        self._lines_read = 0
+        self._last_time: int | None = None
+        self._rows = self._read_rows()
+        # First row not released yet, read ahead of its tick
+        self._pending: tuple[int, int, int, int, int] | None = next(self._rows, None)
+
+    def __str__(self) -> str:
+        return f"TraceRequestSource(path={self.path}, released={self.released}, skipped={self.skipped})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __getstate__(self) -> dict:
+        # The open file can not be pickled, the replay is resumed from the number of lines read
+        state = super().__getstate__()
+        del state['_rows']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._rows = self._read_rows(skip=self._lines_read)
+
+    def exhausted(self) -> bool:
+        """
+        Returns:
+            bool: True once every row of the trace has been released.
+        """
+        return self._pending is None
+
+    def close(self) -> None:
+        """
+        Stop the replay and close the file.
+        """
+        self._rows.close()
+        self._pending = None
+
+    def next_arrival(self, time: int, until: int) -> int | None:
+        """
+        Args:
+            time (int): First tick whose requests are not released yet
+            until (int): Tick to stop looking at
+
+        Returns:
+            int | None: The first tick in [time, until) at which rows are released, or None.
+        """
+        if self._pending is None:
+            return None
+        tick = max(time, math.ceil(self._pending[0]))
+        return tick if tick < until else None
+
+    def _read_rows(self, skip: int = 0) -> Iterator[tuple[int, int, int, int, int]]:
+        """
+        Yield the valid rows of the trace as (time, px, py, dx, dy), one line at a time.
+
+        Args:
+            skip (int): Number of data lines already read, e.g. before a checkpoint
+        """
+        with open(self.path, 'r') as file:
+            headers = [header.strip() for header in file.readline().split(',')]
+            missing = [column for column in TRACE_COLUMNS if column not in headers]
+            if missing:
+                raise ValueError(f"{self.path} is missing the columns {', '.join(missing)}")
+            indices = [headers.index(column) for column in TRACE_COLUMNS]
+
+            for line_number, line in enumerate(file, start=2):
+                if line_number - 2 < skip:
+                    continue
+                self._lines_read += 1
+                if not line.strip():
+                    continue
+                values = line.split(',')
+                try:
+                    t, px, py, dx, dy = (int(values[i]) for i in indices)
+                except (ValueError, IndexError):
+                    self.skipped += 1
+                    continue
+
+                if t < 0 or not (0 <= px <= self.width and 0 <= py <= self.height and
+                                 0 <= dx <= self.width and 0 <= dy <= self.height):
+                    self.skipped += 1
+                    continue
+                if self._last_time is not None and t < self._last_time:
+                    raise ValueError(f"{self.path} is not sorted by request time (line {line_number})")
+                self._last_time = t
+                yield t, px, py, dx, dy
+
+    def maybe_generate(self, time):
+        """
+        Release the requests of the trace whose request time is at most `time`.
+
+        Args:
+            time (int | float): Current simulation time.
+
+        Returns:
+            list[Request]: The released requests, created at their request time.
+        """
+        if not isinstance(time, (int, float)):
+            raise TypeError("time must be a number")
+        if time < 0:
+            raise ValueError("time must be non-negative")
+
+        new_requests = []
+        while self._pending is not None and self._pending[0] <= time:
+            t, px, py, dx, dy = self._pending
+            new_requests.append(Request(id=self.next_id,
+                                        pickup=Point(px, py),
+                                        dropoff=Point(dx, dy),
+                                        creation_time=t,
+                                        status=RequestStatus.WAITING,
+                                        assigned_driver=None,
+                                        wait_time=0,
+                                        run_id=self.run_id))
+            self.next_id += 1
+            self._pending = next(self._rows, None)
+
+        self.released += len(new_requests)
+        EventManager(self.run_id).add_events([Event(time, EventType.REQUEST_GENERATED, None, req.id, None,
+                                                    behaviour_name=None)
+                                              for req in new_requests])
+        return new_requests
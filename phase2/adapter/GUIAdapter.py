@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from random import choice
-
+from phase2.BulkCsvLoader import BulkCsvLoader
 from phase2.DeliverySimulation import DeliverySimulation
 from phase2.Driver import Driver, DriverStatus
 from phase2.DriverGenerator import DriverGenerator
 from phase2.Point import Point
+from phase2.RandomStreams import RandomStreams, as_random
 from phase2.Request import Request, RequestStatus
 from phase2.RequestGenerator import RequestGenerator
 from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
@@ -21,9 +21,17 @@ class GUIAdapter:
 
     def __init__(self,
                  run_id: str,
-                 delivery_simulation: DeliverySimulation):
+                 delivery_simulation: DeliverySimulation,
+                 streams: RandomStreams | None = None,
+                 cache_csv: bool = False):
+        # streams: demand and fleet streams of the run, the global random module if None
+        # cache_csv: keep parsed driver and request CSVs in .npy sidecar files
         self.run_id = run_id
         self.simulation = delivery_simulation
+        self.cache_csv = cache_csv
+        # Raw streams, the generators normalise them with as_random() themselves
+        self.demand_rng = streams.demand if streams is not None else None
+        self.fleet_rng = streams.fleet if streams is not None else None
 
     def load_drivers(self, path: str) -> list[dict]:
         """
@@ -35,39 +43,17 @@ class GUIAdapter:
         Returns:
             list[dict]: A list of driver dictionaries in UI format.
         """
-        drivers: list[dict] = []
-
+        loader = BulkCsvLoader(self.simulation.width, self.simulation.height, cache=self.cache_csv)
         try:
-            with open(path, 'r') as file:
-                # Read headers and split by commas
-                headers = file.readline().strip().split(',')
-
-                # Iterate through each remaining line in the file
-                for i, line in enumerate(file, start=1):
-                    values = line.strip().split(',')
-
-                    # Create a dictionary, mapping each header to its corresponding value, converted to int
-                    driver_data = {headers[j].strip(): float(values[j]) for j in range(len(headers))}
-
-                    # Validate that pickup coordinates are within grid bounds
-                    if (0 <= driver_data['#initial px'] <= self.simulation.width and
-                            0 <= driver_data['py'] <= self.simulation.height):
-                        driver = {
-                            'id': i,
-                            'x': driver_data['#initial px'],
-                            'y': driver_data['py'],
-                            'vx': 0,
-                            'vy': 0,
-                            'tx': 0,
-                            'ty': 0,
-                            'target_id': None,
-                        }
-
-                        drivers.append(driver)
-                return drivers
+            rows, positions = loader.load_drivers(path)
         except FileNotFoundError:
             print(f"Error: The file at path '{path}' was not found.")
             return []
+        if loader.report['kept'] < loader.report['rows']:
+            print(f"Warning: {loader.summary(path)}")
+
+        return [{'id': i, 'x': x, 'y': y, 'vx': 0, 'vy': 0, 'tx': 0, 'ty': 0, 'target_id': None}
+                for i, (x, y) in zip(rows.tolist(), positions.tolist())]
 
     def load_requests(self, path: str) -> list[dict]:
         """
@@ -79,45 +65,18 @@ class GUIAdapter:
         Returns:
             list[dict]: A list of request dictionaries in UI format.
         """
-        requests = []
-
+        loader = BulkCsvLoader(self.simulation.width, self.simulation.height, cache=self.cache_csv)
         try:
-            with open(path, 'r') as file:
-                # Read headers and split by commas
-                headers = file.readline().strip().split(',')
-
-                # Iterate through each remaining line in the file
-                for i, line in enumerate(file, start=1):
-                    values = line.strip().split(',')
-
-                    # Create a dictionary, mapping each header to its corresponding value, converted to int
-                    request_data = {headers[j].strip(): int(values[j]) for j in range(len(headers))}
-
-                    # Validate that pickup and delivery coordinates are within grid bounds
-                    # and that request time is zero or positive
-                    if (request_data['#request time'] >= 0 and
-                            0 <= request_data['pickup x'] <= self.simulation.width and
-                            0 <= request_data['pickup y'] <= self.simulation.height and
-                            0 <= request_data['delivery x'] <= self.simulation.width and
-                            0 <= request_data['delivery y'] <= self.simulation.height):
-                        # Build a structured request dictionary following the UI format
-                        request = {
-                            'id': i,
-                            't': request_data['#request time'],
-                            'px': request_data['pickup x'],
-                            'py': request_data['pickup y'],
-                            'dx': request_data['delivery x'],
-                            'dy': request_data['delivery y'],
-                            'driver_id': None,
-                            'status': 'waiting',
-                            't_wait': 0,
-                        }
-
-                        requests.append(request)
-                return requests
+            rows, values = loader.load_requests(path)
         except FileNotFoundError:
             print(f"Error: The file at path '{path}' was not found.")
             return []
+        if loader.report['kept'] < loader.report['rows']:
+            print(f"Warning: {loader.summary(path)}")
+
+        return [{'id': i, 't': t, 'px': px, 'py': py, 'dx': dx, 'dy': dy,
+                 'driver_id': None, 'status': 'waiting', 't_wait': 0}
+                for i, (t, px, py, dx, dy) in zip(rows.tolist(), values.tolist())]
 
     def generate_drivers(self, n: int, width: int = 50, height: int = 30) -> list[dict]:
         """
@@ -132,7 +91,7 @@ class GUIAdapter:
             list[dict]: A list of driver dictionaries in UI format.
         """
         out: list[dict] = []
-        gen = DriverGenerator(run_id=self.run_id)
+        gen = DriverGenerator(run_id=self.run_id, rng=self.fleet_rng)
         drivers = gen.generate(amount=n, width=width, height=height, speed=3.0, start_id=1)
         for d in drivers:
             out.append(
@@ -161,7 +120,8 @@ class GUIAdapter:
             width (int): Width of the simulation area.
             height (int): Height of the simulation area.
         """
-        gen = RequestGenerator(rate=req_rate, width=width, height=height, start_id=1, run_id=self.run_id)
+        gen = RequestGenerator(rate=req_rate, width=width, height=height, start_id=1, run_id=self.run_id,
+                               rng=self.demand_rng)
         new = gen.maybe_generate(start_t)
         for r in new:
             out_list.append({
@@ -201,15 +161,17 @@ class GUIAdapter:
         drv_objs: list[Driver] = [self._dict_to_driver(d) for d in drivers]
         req_objs: list[Request] = [self._dict_to_request(r) for r in requests]
 
-        # Put into simulation
+        # Put into simulation. The requests come last: their waits count from the new time and
+        # their pickup index is sized for the new map, generator and timeout
         self.simulation.drivers = drv_objs
-        self.simulation.requests = req_objs
         self.simulation.time = 0
         self.simulation.width = width
         self.simulation.height = height
         self.simulation.request_generator = RequestGenerator(rate=req_rate, width=width, height=height,
-                                                             start_id=(len(req_objs) + 1), run_id=self.run_id)
+                                                             start_id=(len(req_objs) + 1), run_id=self.run_id,
+                                                             rng=self.demand_rng)
         self.simulation.timeout = timeout
+        self.simulation.requests = req_objs
         self.simulation.statistics = {"served": 0, "expired": 0, "served_waits": []}
 
         # Build UI-shaped lists
@@ -218,7 +180,7 @@ class GUIAdapter:
             ui_drivers.append(self._driver_to_dict(d))
 
         ui_pending = []
-        for r in self.simulation.requests:
+        for r in self.simulation.requests.active():
             ui_pending.append({'id': r.id,
                                't': int(r.creation_time),
                                'px': float(r.pickup.x),
@@ -295,8 +257,8 @@ class GUIAdapter:
 
         ui_pending = []
 
-        # pending request dicts from simulation.requests
-        for r in self.simulation.requests:
+        # pending request dicts from the active (waiting, assigned, picked) simulation requests
+        for r in self.simulation.requests.active():
             ui_pending.append({'id': r.id,
                                't': int(r.creation_time),
                                'px': float(r.pickup.x),
@@ -386,7 +348,7 @@ class GUIAdapter:
         drv_id = int(driver.get('id', len(self.simulation.drivers) + 1))
         speed = float(driver.get('speed', 1.0))
 
-        behaviour = choice([EarningsMaxBehaviour(), GreedyDistanceBehaviour()])
+        behaviour = as_random(self.fleet_rng).choice([EarningsMaxBehaviour(), GreedyDistanceBehaviour()])
 
         status = driver.get('status', 'idle')
 
@@ -3,6 +3,11 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventManager import EventManager
+
 if TYPE_CHECKING:
     from phase2.Driver import Driver
     from phase2.Offer import Offer
@@ -23,6 +28,39 @@ class DriverBehaviour(ABC):
         """
         raise NotImplementedError()
 
+    def decide_batch(self, offers: list[Offer], time: int, run_id: str) -> np.ndarray:
+        """
+        Decide on many offers at once, each for its own driver (offer.driver), and log an
+        accepted or denied event per offer like decide does.
+
+        The simulation calls this once per behaviour class with the offers of every driver
+        whose behaviour is of that class. Subclasses can override it with vectorized
+        comparisons, the default asks each driver's behaviour to decide one offer at a time.
+
+        Args:
+            offers (list[Offer]): Offers on which the drivers should decide
+            time (int): Current time step
+            run_id (str): Unique identifier for the simulation run
+
+        Returns:
+            np.ndarray: Boolean array, True where the driver accepts the offer.
+        """
+        return np.fromiter((offer.driver.behaviour.decide(offer.driver, offer, time, run_id) for offer in offers),
+                           dtype=bool, count=len(offers))
+
+    @staticmethod
+    def _log_decisions(offers: list[Offer], accepted: np.ndarray, time: int, run_id: str) -> None:
+        """
+        Log the accepted and denied events of a batch of decisions in one go, in offer order.
+        """
+        event_manager = EventManager(run_id)
+        event_manager.add_events([
+            Event(time,
+                  EventType.REQUEST_PROPOSAL_ACCEPTED if is_accepted else EventType.REQUEST_PROPOSAL_DENIED,
+                  offer.driver.id, offer.request.id, None, None)
+            for offer, is_accepted in zip(offers, accepted.tolist())
+        ])
+
     def __str__(self) -> str:
         return self.__class__.__name__
 
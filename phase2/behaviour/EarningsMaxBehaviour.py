@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from phase2.Driver import Driver
 from phase2.Offer import Offer
 from phase2.behaviour.DriverBehaviour import DriverBehaviour
@@ -8,6 +10,9 @@ from phase2.metrics.EventManager import EventManager
 
 
 class EarningsMaxBehaviour(DriverBehaviour):
+    # optimized based on manual testing
+    RATIO_THRESHOLD = 2.375
+
     def decide(self, driver: Driver, offer: Offer, time: int, run_id: str) -> bool:
         """
         Accept if the ratio estimated reward divided by travel distance is above a threshold.
@@ -23,16 +28,13 @@ class EarningsMaxBehaviour(DriverBehaviour):
         """
         eventManager = EventManager(run_id)
 
-        # hardcode threshold
-        threshold = 2.375  # optimized based on manual testing
-
         # compute ratio
         try:
             ratio = offer.estimated_reward / offer.estimated_total_distance
         except ZeroDivisionError:
             ratio = float('inf')
 
-        if ratio > threshold:
+        if ratio > self.RATIO_THRESHOLD:
             eventManager.add_event(
                 Event(time, EventType.REQUEST_PROPOSAL_ACCEPTED, driver.id, offer.request.id, None, None))
             return True
@@ -40,3 +42,27 @@ class EarningsMaxBehaviour(DriverBehaviour):
             eventManager.add_event(
                 Event(time, EventType.REQUEST_PROPOSAL_DENIED, driver.id, offer.request.id, None, None))
             return False
+
+    def decide_batch(self, offers: list[Offer], time: int, run_id: str) -> np.ndarray:
+        """
+        Same rule as decide, compared for all offers at once. The events are logged in bulk.
+
+        Args:
+            offers (list[Offer]): Offers on which the drivers should decide
+            time (int): Current time step
+            run_id (str): Unique identifier for the simulation run
+
+        Returns:
+            np.ndarray: Boolean array, True where the driver accepts the offer.
+        """
+        rewards = np.fromiter((offer.estimated_reward for offer in offers), dtype=np.float64, count=len(offers))
+        distances = np.fromiter((offer.estimated_total_distance for offer in offers),
+                                dtype=np.float64, count=len(offers))
+
+        # A zero distance gives an infinite ratio, like in decide
+        ratios = np.full(len(offers), np.inf)
+        np.divide(rewards, distances, out=ratios, where=distances != 0)
+
+        accepted = ratios > self.RATIO_THRESHOLD
+        self._log_decisions(offers, accepted, time, run_id)
+        return accepted
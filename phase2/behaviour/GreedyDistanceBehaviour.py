@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from phase2.Driver import Driver
 from phase2.Offer import Offer
 from phase2.behaviour.DriverBehaviour import DriverBehaviour
@@ -8,6 +10,9 @@ from phase2.metrics.EventManager import EventManager
 
 
 class GreedyDistanceBehaviour(DriverBehaviour):
+    # ~ avg dist between two points in 50x30 grid, times a scalar found by testing with varying parameters
+    DISTANCE_THRESHOLD = 21.2 * 0.9
+
     def decide(self, driver: Driver, offer: Offer, time: int, run_id: str) -> bool:
         """
         Accept if the distance to the pickup is below a given threshold.
@@ -22,11 +27,7 @@ class GreedyDistanceBehaviour(DriverBehaviour):
         """
         eventManager = EventManager(run_id)
 
-        # hardcode distance to pickup threshold
-        threshold = 21.2  # ~ avg dist between two points in 50x30 grid
-        threshold *= 0.9  # scalar found by testing with varying parameters
-
-        if offer.estimated_distance_to_pickup < threshold:
+        if offer.estimated_distance_to_pickup < self.DISTANCE_THRESHOLD:
             eventManager.add_event(
                 Event(time, EventType.REQUEST_PROPOSAL_ACCEPTED, driver.id, offer.request.id, None, None))
             return True
@@ -34,3 +35,21 @@ class GreedyDistanceBehaviour(DriverBehaviour):
             eventManager.add_event(
                 Event(time, EventType.REQUEST_PROPOSAL_DENIED, driver.id, offer.request.id, None, None))
             return False
+
+    def decide_batch(self, offers: list[Offer], time: int, run_id: str) -> np.ndarray:
+        """
+        Same rule as decide, compared for all offers at once. The events are logged in bulk.
+
+        Args:
+            offers (list[Offer]): Offers on which the drivers should decide
+            time (int): Current time step
+            run_id (str): Unique identifier for the simulation run
+
+        Returns:
+            np.ndarray: Boolean array, True where the driver accepts the offer.
+        """
+        distances = np.fromiter((offer.estimated_distance_to_pickup for offer in offers),
+                                dtype=np.float64, count=len(offers))
+        accepted = distances < self.DISTANCE_THRESHOLD
+        self._log_decisions(offers, accepted, time, run_id)
+        return accepted
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from phase2.Driver import Driver, DriverStatus
+from phase2.Request import Request, RequestStatus
+
+if TYPE_CHECKING:
+    from phase2.FleetStore import FleetStore
+
+
+class CostMatrix:
+    """
+    Costs of every (idle driver, waiting request) pair of one tick, computed with NumPy.
+
+    Rows are the idle drivers and columns the waiting requests, both in the order they were
+    given. Trip lengths (pickup to dropoff) are computed up front. The dense matrices
+    (distance to pickup, total distance, ETA, estimated reward) are computed with one
+    broadcast the first time they are asked for and cached, so the dispatch policy and the
+    offers of a tick share them. Values equal those of Point.distance_to and the Driver
+    estimates.
+
+    A dense matrix takes D * R floats, so policies only use it if `fits_dense` is True.
+    Single pairs can always be looked up with pair(), which does not need the matrix.
+
+    When the drivers are held by a FleetStore, pass it as `fleet`: the idle drivers and
+    their positions and speeds are then taken from its columns.
+    """
+
+    # Largest number of pairs for which policies use the dense matrices (8 MB per matrix)
+    DENSE_LIMIT = 1_000_000
+
+    def __init__(self,
+                 drivers: list[Driver],
+                 requests: list[Request],
+                 dense_limit: int = DENSE_LIMIT,
+                 fleet: FleetStore | None = None) -> None:
+        if not isinstance(dense_limit, int):
+            raise TypeError("dense_limit must be int")
+
+        if fleet is None:
+            self.drivers = [driver for driver in drivers if driver.status == DriverStatus.IDLE]
+            self.driver_xy = np.array([(d.position.x, d.position.y) for d in self.drivers],
+                                      dtype=np.float64).reshape(-1, 2)
+            self.speed = np.array([d.speed for d in self.drivers], dtype=np.float64)
+        else:
+            slots = np.flatnonzero(fleet.status == DriverStatus.IDLE.value)
+            self.drivers = [fleet.drivers[slot] for slot in slots.tolist()]
+            self.driver_xy = fleet.position[slots]
+            self.speed = fleet.speed[slots]
+        self.requests = [request for request in requests if request.status == RequestStatus.WAITING]
+        self.dense_limit = dense_limit
+
+        self._rows = {driver.id: row for row, driver in enumerate(self.drivers)}
+        self._cols = {request.id: col for col, request in enumerate(self.requests)}
+
+        self.pickup_xy = np.array([(r.pickup.x, r.pickup.y) for r in self.requests],
+                                  dtype=np.float64).reshape(-1, 2)
+        dropoff_xy = np.array([(r.dropoff.x, r.dropoff.y) for r in self.requests],
+                              dtype=np.float64).reshape(-1, 2)
+        self.trip_lengths = self._distance(self.pickup_xy[:, 0], self.pickup_xy[:, 1],
+                                           dropoff_xy[:, 0], dropoff_xy[:, 1])
+
+        self._pickup_distances: np.ndarray | None = None
+        self._total_distances: np.ndarray | None = None
+
+    def __str__(self) -> str:
+        return f"CostMatrix(drivers={len(self.drivers)}, requests={len(self.requests)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.drivers), len(self.requests)
+
+    @property
+    def fits_dense(self) -> bool:
+        return len(self.drivers) * len(self.requests) <= self.dense_limit
+
+    @staticmethod
+    def _distance(x1, y1, x2, y2):
+        # Same operations as Point.distance_to, so the results are identical
+        dx = x1 - x2
+        dy = y1 - y2
+        return np.sqrt(dx * dx + dy * dy)
+
+    def matches(self, drivers: list[Driver], requests: list[Request]) -> bool:
+        """
+        Args:
+            drivers (list[Driver]): Idle drivers, in row order
+            requests (list[Request]): Waiting requests, in column order
+
+        Returns:
+            True if the rows and columns are exactly these drivers and requests.
+        """
+        return (len(drivers) == len(self.drivers) and len(requests) == len(self.requests)
+                and all(a is b for a, b in zip(drivers, self.drivers))
+                and all(a is b for a, b in zip(requests, self.requests)))
+
+    def pickup_distances(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (drivers, requests) distances from each driver to each pickup.
+        """
+        if self._pickup_distances is None:
+            self._pickup_distances = self._distance(self.driver_xy[:, 0, None], self.driver_xy[:, 1, None],
+                                                    self.pickup_xy[None, :, 0], self.pickup_xy[None, :, 1])
+        return self._pickup_distances
+
+    def total_distances(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (drivers, requests) distances to pickup plus trip length.
+        """
+        if self._total_distances is None:
+            self._total_distances = self.pickup_distances() + self.trip_lengths[None, :]
+        return self._total_distances
+
+    def etas(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (drivers, requests) ticks each driver needs to deliver each request.
+        """
+        return self.total_distances() / self.speed[:, None]
+
+    def rewards(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (drivers, requests) estimated delivery rewards.
+        """
+        return Driver.BASE_REWARD + Driver.REWARD_PER_DISTANCE * self.total_distances()
+
+    def total_distances_of(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """
+        Total distances of a block of pairs, computed without the dense matrix.
+
+        Args:
+            rows (np.ndarray): Rows (idle drivers) of the block
+            cols (np.ndarray): Columns (waiting requests) of the block
+
+        Returns:
+            np.ndarray: (len(rows), len(cols)) distances to pickup plus trip length.
+        """
+        driver_xy = self.driver_xy[rows]
+        pickup_xy = self.pickup_xy[cols]
+        to_pickup = self._distance(driver_xy[:, 0, None], driver_xy[:, 1, None],
+                                   pickup_xy[None, :, 0], pickup_xy[None, :, 1])
+        return to_pickup + self.trip_lengths[cols][None, :]
+
+    def nearest_drivers(self, request: Request, k: int) -> list[Driver]:
+        """
+        Find the k idle drivers closest to the pickup of a request, which are also the k with
+        the smallest total distance. Only the request's column is computed if the dense matrix
+        is not cached.
+
+        Args:
+            request (Request): A waiting request of this tick
+            k (int): Number of drivers to return
+
+        Returns:
+            list[Driver]: Up to k drivers, closest first (lowest row on ties).
+        """
+        col = self._cols.get(request.id)
+        if col is None or self.requests[col] is not request or k <= 0:
+            return []
+
+        if self._pickup_distances is not None:
+            distances = self._pickup_distances[:, col]
+        else:
+            distances = self._distance(self.driver_xy[:, 0], self.driver_xy[:, 1], *self.pickup_xy[col])
+
+        rows = np.arange(len(distances))
+        if k < len(distances):
+            rows = np.argpartition(distances, k - 1)[:k]
+        rows = rows[np.lexsort((rows, distances[rows]))]
+        return [self.drivers[row] for row in rows.tolist()]
+
+    def pair(self, driver: Driver, request: Request) -> tuple[float, float, float] | None:
+        """
+        Look up the costs of one pair.
+
+        Args:
+            driver (Driver): An idle driver of this tick
+            request (Request): A waiting request of this tick
+
+        Returns:
+            (total distance, distance to pickup, estimated reward), or None if the driver or
+            request is not part of the matrix.
+        """
+        row = self._rows.get(driver.id)
+        col = self._cols.get(request.id)
+        if row is None or col is None or self.drivers[row] is not driver or self.requests[col] is not request:
+            return None
+
+        if self._pickup_distances is not None:
+            to_pickup = float(self._pickup_distances[row, col])
+        else:
+            x, y = self.driver_xy[row].tolist()
+            px, py = self.pickup_xy[col].tolist()
+            dx = x - px
+            dy = y - py
+            to_pickup = math.sqrt(dx * dx + dy * dy)
+
+        total = to_pickup + float(self.trip_lengths[col])
+        return total, to_pickup, Driver.BASE_REWARD + Driver.REWARD_PER_DISTANCE * total
@@ -1,23 +1,30 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from phase2.Driver import Driver
 from phase2.Request import Request
 
+if TYPE_CHECKING:
+    from phase2.dispatch.CostMatrix import CostMatrix
+
 
 class DispatchPolicy(ABC):
     @abstractmethod
     def assign(self, drivers: list[Driver],
                requests: list[Request],
                time: int,
-               run_id: str) -> list[tuple[Driver, Request]]:
+               run_id: str,
+               costs: CostMatrix | None = None) -> list[tuple[Driver, Request]]:
         """
         Args:
             drivers (list[Driver]): List of available drivers
             requests (list[Request]): List of pending requests
             time (int): Current time step
             run_id (str): Unique identifier for the simulation run
+            costs (CostMatrix | None): Costs of the tick's (idle driver, waiting request) pairs,
+                shared with the rest of the tick. Policies compute distances themselves if None.
 
         Returns:
             Proposed (driver, request) pairs for this tick.
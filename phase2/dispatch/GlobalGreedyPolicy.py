@@ -1,20 +1,60 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from itertools import islice
+
+import numpy as np
+
 from phase2.Driver import Driver, DriverStatus
 from phase2.Request import Request, RequestStatus
+from phase2.SpatialGrid import SpatialGrid
+from phase2.dispatch.CostMatrix import CostMatrix
 from phase2.dispatch.DispatchPolicy import DispatchPolicy
 
 
 class GlobalGreedyPolicy(DispatchPolicy):
-    def assign(self, drivers: list[Driver], requests: list[Request], time: int, run_id: str) -> list[
-        tuple[Driver, Request]]:
+    """
+    Greedy matching on (idle driver, waiting request) pairs in order of total distance,
+    i.e. driver to pickup plus pickup to dropoff.
+
+    Instead of building and sorting every pair, each request only starts with its
+    `candidates` nearest idle drivers, taken from a spatial grid over the drivers. A heap
+    holds the best free candidate of every request. When the top pair's driver was already
+    matched, the request moves on to its next candidate, drawing more drivers from the grid
+    once its first ones are used up. Since a request's candidates come in order of distance,
+    the top of the heap is always the best pair still available, so the matching is the
+    same as sorting all pairs.
+
+    When the tick's cost matrix is given and small enough, its total distances are sorted
+    directly instead.
+    """
+
+    DEFAULT_CANDIDATES = 8
+
+    def __init__(self, candidates: int = DEFAULT_CANDIDATES) -> None:
+        if not isinstance(candidates, int):
+            raise TypeError(f"candidates must be int, got {type(candidates).__name__}")
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+
+        self.candidates = candidates
+
+    def assign(self, drivers: list[Driver], requests: list[Request], time: int, run_id: str,
+               costs: CostMatrix | None = None) -> list[tuple[Driver, Request]]:
         """
-        build all (idle driver, waiting request) pairs, sort by distance,
-        and match greedily while avoiding reuse of drivers and requests
+        match (idle driver, waiting request) pairs greedily in order of distance,
+        avoiding reuse of drivers and requests
+
+        Pairs with the same distance are matched in the order of the drivers, then of the
+        requests, in the given lists.
 
         Args:
             drivers (list[Driver]): List of available drivers
             requests (list[Request]): List of pending requests
             time (int): Current time step
             run_id (str): Unique identifier for the simulation run
+            costs (CostMatrix | None): Costs of the tick's (idle driver, waiting request) pairs
 
         Returns:
             Proposed (driver, request) pairs for this tick.
@@ -23,28 +63,88 @@ class GlobalGreedyPolicy(DispatchPolicy):
         idle_drivers = [driver for driver in drivers if driver.status.value == DriverStatus.IDLE.value]
         waiting_requests = [request for request in requests if request.status.value == RequestStatus.WAITING.value]
 
-        # Initialize list to keep all pairs and their respective distance (driver, request, distance)
-        all_pairs = []
+        if len(idle_drivers) == 0 or len(waiting_requests) == 0:
+            return []
 
-        # Iteratively build all pairs
-        for driver in idle_drivers:
-            for request in waiting_requests:
-                distance = driver.position.distance_to(request.pickup) + request.pickup.distance_to(request.dropoff)
-                all_pairs.append((driver, request, distance))
+        if costs is not None and costs.fits_dense and costs.matches(idle_drivers, waiting_requests):
+            return self._assign_dense(costs)
 
-        # Sort pairs based on distance
-        all_pairs.sort(key=lambda x: x[2])
+        # Drivers are numbered by their position in idle_drivers (their seq in the grid)
+        grid = SpatialGrid.from_drivers(idle_drivers)
 
-        # Initialize sets to keep track of used drivers/requests and a list for holding matched pairs.
+        # Per request: the drivers in order of total distance, and the first few taken from it
+        streams = []
+        candidates = []
+        # (distance, driver index, request index) of the best candidate of every request
+        heap = []
+        for index, request in enumerate(waiting_requests):
+            stream = grid.iter_nearest(request.pickup, offset=request.pickup.distance_to(request.dropoff))
+            streams.append(stream)
+            candidates.append(deque(islice(stream, self.candidates)))
+            self._push_next(heap, candidates, streams, index, set())
+
+        # Sets to keep track of used drivers/requests and a list for holding matched pairs.
         assigned_drivers = set()
         assigned_requests = set()
         matched_pairs = []
 
-        # Iteratively match drivers to requests based on distance making sure no driver/request is reused.
-        for driver, request, distance in all_pairs:
+        # Repeatedly take the closest pair left, moving on to the next candidate of a request
+        # whose driver has been matched in the meantime.
+        while heap and len(matched_pairs) < min(len(idle_drivers), len(waiting_requests)):
+            distance, driver_index, request_index = heapq.heappop(heap)
+            driver = idle_drivers[driver_index]
+            request = waiting_requests[request_index]
+
+            if driver.id in assigned_drivers:
+                self._push_next(heap, candidates, streams, request_index, assigned_drivers)
+                continue
+            if request.id in assigned_requests:
+                continue
+
+            matched_pairs.append((driver, request))
+            assigned_drivers.add(driver.id)
+            assigned_requests.add(request.id)
+
+        return matched_pairs
+
+    @staticmethod
+    def _assign_dense(costs: CostMatrix) -> list[tuple[Driver, Request]]:
+        """
+        Same matching as assign(), by sorting the total distances of the cost matrix.
+        """
+        n_requests = len(costs.requests)
+        # A stable sort of the row-major matrix orders ties by driver, then by request
+        order = np.argsort(costs.total_distances(), axis=None, kind='stable')
+
+        assigned_drivers = set()
+        assigned_requests = set()
+        matched_pairs = []
+        n_pairs = min(len(costs.drivers), n_requests)
+        for flat in order.tolist():
+            row, col = divmod(flat, n_requests)
+            driver = costs.drivers[row]
+            request = costs.requests[col]
             if driver.id not in assigned_drivers and request.id not in assigned_requests:
                 matched_pairs.append((driver, request))
                 assigned_drivers.add(driver.id)
                 assigned_requests.add(request.id)
-
+                if len(matched_pairs) == n_pairs:
+                    break
         return matched_pairs
+
+    def _push_next(self, heap: list, candidates: list[deque], streams: list, request_index: int,
+                   assigned_drivers: set) -> None:
+        """
+        Push the best candidate of a request whose driver is not matched yet, if there is one.
+        """
+        queue = candidates[request_index]
+        while True:
+            if not queue:
+                # Fallback when the first candidates are all taken: draw the next ones
+                queue.extend(islice(streams[request_index], self.candidates))
+                if not queue:
+                    return
+            distance, driver_index, driver = queue.popleft()
+            if driver.id not in assigned_drivers:
+                heapq.heappush(heap, (distance, driver_index, request_index))
+                return
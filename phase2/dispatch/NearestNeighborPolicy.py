@@ -1,22 +1,32 @@
 from __future__ import annotations
 
+import numpy as np
+
 from phase2.Driver import Driver, DriverStatus
 from phase2.Request import Request, RequestStatus
+from phase2.SpatialGrid import SpatialGrid
+from phase2.dispatch.CostMatrix import CostMatrix
 from phase2.dispatch.DispatchPolicy import DispatchPolicy
 
 
 class NearestNeighborPolicy(DispatchPolicy):
-    def assign(self, drivers: list[Driver], requests: list[Request], time: int, run_id: str) -> list[
-        tuple[Driver, Request]]:
+    def assign(self, drivers: list[Driver], requests: list[Request], time: int, run_id: str,
+               costs: CostMatrix | None = None) -> list[tuple[Driver, Request]]:
         """
         repeatedly match the closest idle driver to the closest waiting request,
         avoiding reuse of drivers and requests
 
+        Each lookup is a nearest-neighbour query on a spatial grid over the pickups, so it
+        only visits requests near the driver. When the tick's cost matrix is given and small
+        enough, the lookups are row minimums of its distance matrix instead. Ties go to the
+        request listed first.
+
         Args:
             drivers (list[Driver]): List of available drivers
             requests (list[Request]): List of pending requests
             time (int): Current time step
             run_id (str): Unique identifier for the simulation run
+            costs (CostMatrix | None): Costs of the tick's (idle driver, waiting request) pairs
 
         Returns:
             Proposed (driver, request) pairs for this tick.
@@ -29,27 +39,63 @@ class NearestNeighborPolicy(DispatchPolicy):
         if len(idle_drivers) == 0 or len(waiting_requests) == 0:
             return []
 
+        if costs is not None and costs.fits_dense and costs.matches(idle_drivers, waiting_requests):
+            return self._assign_dense(costs)
+
+        # Nearest-request queries go through a spatial grid over the pickups. Requests of a
+        # RequestStore already have one, otherwise a grid is built for this call.
+        index = self._pickup_index(waiting_requests)
+        shared = index is not None
+        if index is None:
+            index = SpatialGrid.from_requests(waiting_requests)
+
         # Initialize list for holding matched pairs
         pairs = []
-        # Initialize set for quick look-up speed for already assigned requests
-        assigned_requests = set()
-
-        # Repeatedly find the closest (driver, request) pair and remove them from the pool
-        for driver in idle_drivers:
-            current_request = None
-            current_distance = float("inf")  # arbitrarily high number
-
-            # Find the closest pair among remaining idle drivers and waiting requests
-            for request in waiting_requests:
-                if request.id not in assigned_requests:
-                    distance = driver.position.distance_to(request.pickup)
-                    if distance < current_distance:
-                        current_distance = distance
-                        current_request = request
-
-            # Append new pair if it exists
-            if current_request is not None:
-                assigned_requests.add(current_request.id)
-                pairs.append((driver, current_request))
+        # Requests taken out of a shared index, put back once all drivers are matched
+        removed = []
+
+        try:
+            # Give each idle driver the closest request not yet given to an earlier driver
+            for driver in idle_drivers:
+                nearest = index.pop_nearest(driver.position)
+                if nearest is None:
+                    break
+                removed.append(nearest)
+                pairs.append((driver, nearest[0]))
+        finally:
+            if shared:
+                for request, seq in removed:
+                    index.insert(request, seq)
+
+        return pairs
 
+    @staticmethod
+    def _assign_dense(costs: CostMatrix) -> list[tuple[Driver, Request]]:
+        """
+        Same matching as assign(), using the distances of the cost matrix.
+        """
+        distances = costs.pickup_distances().copy()
+        pairs = []
+        for row, driver in enumerate(costs.drivers):
+            # argmin returns the first minimum, i.e. the request listed first on ties
+            col = int(np.argmin(distances[row]))
+            if distances[row, col] == np.inf:
+                break
+            pairs.append((driver, costs.requests[col]))
+            # Requests already given to a driver are out of reach for the rest
+            distances[:, col] = np.inf
         return pairs
+
+    @staticmethod
+    def _pickup_index(requests: list[Request]) -> SpatialGrid | None:
+        """
+        Returns:
+            The pickup index of the RequestStore the requests belong to, if the requests are
+            exactly the waiting requests of that store. Otherwise None.
+        """
+        store = requests[0]._store
+        if store is None or len(requests) != len(store.pickup_index):
+            return None
+        if not all(request._store is store for request in requests):
+            return None
+        return store.pickup_index
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import numpy as np
+
+from phase2.Driver import Driver, DriverStatus
+from phase2.Request import Request, RequestStatus
+from phase2.dispatch.CostMatrix import CostMatrix
+from phase2.dispatch.DispatchPolicy import DispatchPolicy
+
+
+class OptimalAssignmentPolicy(DispatchPolicy):
+    """
+    Assign idle drivers to waiting requests so that the total distance (driver to pickup
+    plus pickup to dropoff, summed over all pairs) is as small as possible.
+
+    Every idle driver gets a request if there are enough, otherwise every request gets a
+    driver (rectangular assignment problem). Up to `max_exact_size` drivers or requests
+    (whichever is fewer) the problem is solved exactly with the Hungarian algorithm in its
+    shortest augmenting path form (as in Jonker-Volgenant), with the inner loops vectorized.
+    Larger problems use an epsilon-scaling auction, whose total distance is at most
+    `auction_epsilon` per pair above the optimum.
+
+    When the full matrix does not fit (see CostMatrix.fits_dense), the smaller side is
+    matched in chunks instead. Each chunk's rows only consider their `candidates` nearest
+    free partners, and each chunk takes what earlier chunks left, so the result is close to
+    the optimum but no longer exact. No block computed this way holds more than
+    CostMatrix.dense_limit entries.
+    """
+
+    DEFAULT_MAX_EXACT_SIZE = 300
+    DEFAULT_AUCTION_EPSILON = 1e-3
+    DEFAULT_CANDIDATES = 8
+
+    def __init__(self,
+                 max_exact_size: int = DEFAULT_MAX_EXACT_SIZE,
+                 auction_epsilon: float = DEFAULT_AUCTION_EPSILON,
+                 candidates: int = DEFAULT_CANDIDATES) -> None:
+        if not isinstance(max_exact_size, int):
+            raise TypeError(f"max_exact_size must be int, got {type(max_exact_size).__name__}")
+        if max_exact_size < 0:
+            raise ValueError("max_exact_size must be non-negative")
+        if not isinstance(auction_epsilon, (int, float)):
+            raise TypeError(f"auction_epsilon must be a number, got {type(auction_epsilon).__name__}")
+        if auction_epsilon <= 0:
+            raise ValueError("auction_epsilon must be positive")
+        if not isinstance(candidates, int):
+            raise TypeError(f"candidates must be int, got {type(candidates).__name__}")
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+
+        self.max_exact_size = max_exact_size
+        self.auction_epsilon = float(auction_epsilon)
+        self.candidates = candidates
+
+    def assign(self, drivers: list[Driver], requests: list[Request], time: int, run_id: str,
+               costs: CostMatrix | None = None) -> list[tuple[Driver, Request]]:
+        """
+        match idle drivers to waiting requests with the smallest total distance
+
+        Args:
+            drivers (list[Driver]): List of available drivers
+            requests (list[Request]): List of pending requests
+            time (int): Current time step
+            run_id (str): Unique identifier for the simulation run
+            costs (CostMatrix | None): Costs of the tick's (idle driver, waiting request) pairs
+
+        Returns:
+            Proposed (driver, request) pairs for this tick, in driver order.
+        """
+        idle_drivers = [driver for driver in drivers if driver.status.value == DriverStatus.IDLE.value]
+        waiting_requests = [request for request in requests if request.status.value == RequestStatus.WAITING.value]
+
+        if len(idle_drivers) == 0 or len(waiting_requests) == 0:
+            return []
+
+        if costs is None or not costs.matches(idle_drivers, waiting_requests):
+            costs = CostMatrix(idle_drivers, waiting_requests)
+
+        if costs.fits_dense:
+            rows, cols = self.solve(costs.total_distances())
+        else:
+            rows, cols = self._solve_in_chunks(costs)
+        return [(costs.drivers[row], costs.requests[col]) for row, col in zip(rows.tolist(), cols.tolist())]
+
+    def _solve_in_chunks(self, costs: CostMatrix) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Assignment for a cost matrix too large to build, see the class docstring.
+
+        Returns:
+            (rows, cols): Indices of the assigned pairs, min(drivers, requests) of them, sorted by row.
+        """
+        n_drivers, n_requests = costs.shape
+        # Chunks are taken from the smaller side, blocks span all free entries of the larger one
+        by_request = n_requests <= n_drivers
+        n_large = n_drivers if by_request else n_requests
+        chunk_size = max(1, costs.dense_limit // n_large)
+
+        free = np.ones(n_large, dtype=bool)
+        pending = np.arange(n_requests if by_request else n_drivers)
+        small_matched = []
+        large_matched = []
+        while len(pending) and free.any():
+            chunk, rest = pending[:chunk_size], pending[chunk_size:]
+            free_cols = np.flatnonzero(free)
+            if by_request:
+                block = costs.total_distances_of(free_cols, chunk).T
+            else:
+                block = costs.total_distances_of(chunk, free_cols)
+
+            # Union of the nearest free partners of the chunk's rows
+            if self.candidates < len(free_cols):
+                candidates = np.unique(np.argpartition(block, self.candidates - 1, axis=1)[:, :self.candidates])
+            else:
+                candidates = np.arange(len(free_cols))
+
+            rows, cols = self.solve(block[:, candidates])
+            small_matched.append(chunk[rows])
+            large_matched.append(free_cols[candidates[cols]])
+            free[large_matched[-1]] = False
+
+            # Rows that lost out to others of the chunk try again with the next chunk
+            unmatched = np.ones(len(chunk), dtype=bool)
+            unmatched[rows] = False
+            pending = np.concatenate((chunk[unmatched], rest))
+
+        small = np.concatenate(small_matched) if small_matched else np.empty(0, dtype=np.int64)
+        large = np.concatenate(large_matched) if large_matched else np.empty(0, dtype=np.int64)
+        rows, cols = (large, small) if by_request else (small, large)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+
+    def solve(self, cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Solve the rectangular assignment problem for a cost matrix.
+
+        Args:
+            cost (np.ndarray): (n, m) matrix of finite costs
+
+        Returns:
+            (rows, cols): Indices of the assigned pairs, min(n, m) of them, sorted by row.
+        """
+        cost = np.asarray(cost, dtype=np.float64)
+        if cost.ndim != 2:
+            raise ValueError("cost must be a 2D matrix")
+        if cost.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        # Both solvers assign every row, so they need at most as many rows as columns
+        transposed = cost.shape[0] > cost.shape[1]
+        if transposed:
+            cost = cost.T
+
+        if cost.shape[0] <= self.max_exact_size:
+            col_of_row = self._hungarian(cost)
+        else:
+            col_of_row = self._auction(cost, self.auction_epsilon)
+
+        rows = np.arange(cost.shape[0])
+        if transposed:
+            rows, col_of_row = col_of_row, rows
+            order = np.argsort(rows)
+            return rows[order], col_of_row[order]
+        return rows, col_of_row
+
+    @staticmethod
+    def _hungarian(cost: np.ndarray) -> np.ndarray:
+        """
+        Exact minimum cost assignment of every row to a distinct column (n <= m).
+
+        Rows are added one at a time. For each new row, a Dijkstra-like search over the
+        columns with reduced costs (cost - u[row] - v[col]) finds the cheapest augmenting
+        path to a free column. The potentials u and v keep all reduced costs non-negative.
+
+        Returns:
+            np.ndarray: Column assigned to each row.
+        """
+        n, m = cost.shape
+        u = np.zeros(n + 1)
+        v = np.zeros(m + 1)
+        # row_of_col[j] is the row (1-based, 0 = free) assigned to column j, column 0 is the search root
+        row_of_col = np.zeros(m + 1, dtype=np.int64)
+        way = np.zeros(m + 1, dtype=np.int64)
+
+        for row in range(1, n + 1):
+            row_of_col[0] = row
+            col = 0
+            min_reduced = np.full(m + 1, np.inf)
+            used = np.zeros(m + 1, dtype=bool)
+
+            while True:
+                used[col] = True
+                current_row = row_of_col[col]
+                free = ~used
+                free[0] = False
+
+                # Relax all columns not yet in the tree through the row just reached
+                reduced = cost[current_row - 1] - u[current_row] - v[1:]
+                improved = free[1:] & (reduced < min_reduced[1:])
+                min_reduced[1:][improved] = reduced[improved]
+                way[1:][improved] = col
+
+                candidates = np.where(free, min_reduced, np.inf)
+                next_col = int(np.argmin(candidates))
+                delta = candidates[next_col]
+
+                u[row_of_col[used]] += delta
+                v[used] -= delta
+                min_reduced[free] -= delta
+
+                col = next_col
+                if row_of_col[col] == 0:
+                    break
+
+            # Flip the assignments along the augmenting path
+            while col:
+                previous = way[col]
+                row_of_col[col] = row_of_col[previous]
+                col = previous
+
+        col_of_row = np.empty(n, dtype=np.int64)
+        assigned = np.flatnonzero(row_of_col[1:])
+        col_of_row[row_of_col[1:][assigned] - 1] = assigned
+        return col_of_row
+
+    @staticmethod
+    def _auction(cost: np.ndarray, epsilon: float) -> np.ndarray:
+        """
+        Near-optimal assignment of every row to a distinct column (n <= m) with an
+        epsilon-scaling auction. The total cost is at most n * epsilon above the optimum.
+
+        Rows bid for columns all at once (Jacobi auction): each unassigned row bids for its
+        best column, raising its price by the difference to the second best plus epsilon,
+        and each column goes to its highest bidder. The auction is repeated with decreasing
+        epsilon, keeping the prices.
+
+        The problem is made square with m - n dummy rows that cost nothing on any column, so
+        the real rows end up on the cheapest set of columns. Dummy rows are all the same, so
+        q unassigned dummies bid together for the q cheapest columns, at the price of the
+        next cheapest one plus epsilon.
+
+        Returns:
+            np.ndarray: Column assigned to each row.
+        """
+        n, m = cost.shape
+        if m == 1:
+            return np.zeros(n, dtype=np.int64)
+
+        benefit = -cost
+        prices = np.zeros(m)
+        step = max(float(np.ptp(benefit)) / 4, epsilon)
+        while True:
+            # Rows n..m-1 are the dummies
+            col_of_row = np.full(m, -1, dtype=np.int64)
+            row_of_col = np.full(m, -1, dtype=np.int64)
+
+            while True:
+                bidders = np.flatnonzero(col_of_row < 0)
+                if len(bidders) == 0:
+                    break
+                real = bidders[bidders < n]
+                dummies = bidders[bidders >= n]
+
+                # Real rows: best column, outbidding the second best by epsilon
+                values = benefit[real] - prices
+                top_two = np.argpartition(values, m - 2, axis=1)[:, -2:]
+                top_values = np.take_along_axis(values, top_two, axis=1)
+                best = np.argmax(top_values, axis=1)
+                real_cols = top_two[np.arange(len(real)), best]
+                real_bids = prices[real_cols] + top_values.max(axis=1) - top_values.min(axis=1) + step
+
+                # Dummy rows: the cheapest columns, one each
+                q = len(dummies)
+                if q:
+                    by_price = np.argpartition(prices, q) if q < m else np.arange(m)
+                    dummy_cols = by_price[:q]
+                    next_price = prices[by_price[q]] if q < m else prices.max()
+                    dummy_bids = np.full(q, next_price + step)
+                else:
+                    dummy_cols = np.empty(0, dtype=np.int64)
+                    dummy_bids = np.empty(0)
+
+                bidders = np.concatenate((real, dummies))
+                best_cols = np.concatenate((real_cols, dummy_cols))
+                bids = np.concatenate((real_bids, dummy_bids))
+
+                # Highest bid per column wins
+                order = np.lexsort((-bids, best_cols))
+                first = np.ones(len(order), dtype=bool)
+                first[1:] = best_cols[order][1:] != best_cols[order][:-1]
+                winners = order[first]
+                won_cols = best_cols[winners]
+
+                outbid = row_of_col[won_cols]
+                col_of_row[outbid[outbid >= 0]] = -1
+                row_of_col[won_cols] = bidders[winners]
+                col_of_row[bidders[winners]] = won_cols
+                prices[won_cols] = bids[winners]
+
+            if step <= epsilon:
+                return col_of_row[:n]
+            step = max(step / 5, epsilon)
@@ -0,0 +1,146 @@
+"""
+Compare the dispatch policies on speed and on simulation outcome.
+
+Two benchmarks are run:
+- assignment: one call of assign() on random instances of growing size, reporting the
+  runtime and the total distance of the matching of every policy,
+- simulation: a DeliverySimulation per policy with the same seed, reporting the served and
+  expired requests, the average wait and the time per tick.
+
+Run with `python -m phase2.dispatch.benchmark`, see --help for the sizes. The simulations use
+a run id containing "test_run", so no event files are written.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.Driver import Driver, DriverStatus
+from phase2.MutationRule import MutationRule
+from phase2.Point import Point
+from phase2.RandomStreams import RandomStreams
+from phase2.Request import Request, RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.CostMatrix import CostMatrix
+from phase2.dispatch.DispatchPolicy import DispatchPolicy
+from phase2.run import POLICIES
+
+RUN_ID = "benchmark_test_run"
+
+
+def random_instance(n_drivers: int, n_requests: int, width: int, height: int,
+                    seed: int) -> tuple[list[Driver], list[Request]]:
+    """
+    Create idle drivers and waiting requests at random positions.
+
+    Args:
+        n_drivers (int): Number of drivers
+        n_requests (int): Number of requests
+        width (int): Width of the map
+        height (int): Height of the map
+        seed (int): Seed of the positions
+
+    Returns:
+        (drivers, requests)
+    """
+    rng = random.Random(seed)
+    drivers = [Driver(i, Point(rng.uniform(0, width), rng.uniform(0, height)), 1.0, DriverStatus.IDLE,
+                      None, GreedyDistanceBehaviour(), [], RUN_ID)
+               for i in range(n_drivers)]
+    requests = [Request(i, Point(rng.uniform(0, width), rng.uniform(0, height)),
+                        Point(rng.uniform(0, width), rng.uniform(0, height)),
+                        0, RequestStatus.WAITING, None, 0, RUN_ID)
+                for i in range(n_requests)]
+    return drivers, requests
+
+
+def bench_assignment(policy: DispatchPolicy, drivers: list[Driver], requests: list[Request]) -> tuple[float, int, float]:
+    """
+    Time one assign() call, including building the tick's CostMatrix.
+
+    Returns:
+        (seconds, number of pairs, total distance of the pairs)
+    """
+    start = time.perf_counter()
+    costs = CostMatrix(drivers, requests)
+    pairs = policy.assign(drivers, requests, 0, RUN_ID, costs=costs)
+    elapsed = time.perf_counter() - start
+
+    total = sum(costs.pair(driver, request)[0] for driver, request in pairs)
+    return elapsed, len(pairs), total
+
+
+def bench_simulation(policy: DispatchPolicy, n_drivers: int, rate: float, width: int, height: int,
+                     ticks: int, timeout: int, seed: int) -> dict:
+    """
+    Run a simulation with a policy.
+
+    Returns:
+        dict with served, expired, avg_wait and ms_per_tick.
+    """
+    # Every policy sees the same drivers and the same requests
+    streams = RandomStreams(seed)
+    fleet = streams.fleet
+    drivers = [Driver(i, Point(fleet.randint(0, width - 1), fleet.randint(0, height - 1)), 1.5,
+                      DriverStatus.IDLE, None,
+                      EarningsMaxBehaviour() if i % 2 else GreedyDistanceBehaviour(), [], RUN_ID)
+               for i in range(n_drivers)]
+    simulation = DeliverySimulation(time=0, width=width, height=height, drivers=drivers, requests=[],
+                                    request_generator=RequestGenerator(rate, width, height, 1, RUN_ID, streams.demand),
+                                    dispatch_policy=policy, mutation_rule=MutationRule(5, 0.7, RUN_ID, streams.mutation),
+                                    timeout=timeout, statistics={'served': 0, 'expired': 0, 'served_waits': []},
+                                    run_id=RUN_ID)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.tick()
+    elapsed = time.perf_counter() - start
+
+    waits = simulation.statistics['served_waits']
+    return {
+        'served': simulation.statistics['served'],
+        'expired': simulation.statistics['expired'],
+        'avg_wait': sum(waits) / len(waits) if waits else 0.0,
+        'ms_per_tick': 1000 * elapsed / ticks,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the dispatch policies.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000],
+                        help="numbers of drivers (and requests) of the assignment benchmark")
+    parser.add_argument("--drivers", type=int, default=100, help="drivers of the simulation benchmark")
+    parser.add_argument("--rate", type=float, default=6.0, help="requests per tick of the simulation benchmark")
+    parser.add_argument("--size", type=int, nargs=2, default=[50, 50], metavar=("WIDTH", "HEIGHT"),
+                        help="map size of the simulation benchmark")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks of the simulation benchmark")
+    parser.add_argument("--timeout", type=int, default=30, help="request timeout of the simulation benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print("Assignment (idle drivers x waiting requests on a 1000 x 1000 map)")
+    print(f"{'size':>6} {'policy':<18} {'seconds':>9} {'pairs':>6} {'total distance':>15}")
+    for size in args.sizes:
+        drivers, requests = random_instance(size, size, 1000, 1000, args.seed)
+        for name, policy_class in POLICIES.items():
+            seconds, n_pairs, total = bench_assignment(policy_class(), drivers, requests)
+            print(f"{size:>6} {name:<18} {seconds:>9.3f} {n_pairs:>6} {total:>15.1f}")
+
+    width, height = args.size
+    print()
+    print(f"Simulation ({args.drivers} drivers, {args.rate} requests per tick, {width} x {height} map, "
+          f"{args.ticks} ticks)")
+    print(f"{'policy':<18} {'served':>7} {'expired':>8} {'avg wait':>9} {'ms/tick':>8}")
+    for name, policy_class in POLICIES.items():
+        result = bench_simulation(policy_class(), args.drivers, args.rate, width, height,
+                                  args.ticks, args.timeout, args.seed)
+        print(f"{name:<18} {result['served']:>7} {result['expired']:>8} "
+              f"{result['avg_wait']:>9.2f} {result['ms_per_tick']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from enum import Enum
+
+import numpy as np
+
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import EventWriter
+
+# Control messages for the writer thread
+_FLUSH = object()
+_STOP = object()
+
+
+class BackpressurePolicy(Enum):
+    BLOCK = 1  # wait until the writer thread has room
+    DROP_IDLE = 2  # drop DRIVER_IDLE events when full, block for everything else
+    SPILL = 3  # write overflowing events to a spill file, merged into the run file on flush
+
+
+class AsyncEventWriter(EventWriter):
+    """
+    EventWriter that formats and writes events on a background thread.
+
+    add() only converts the event to a compact tuple and puts it on a bounded queue, so the
+    simulation thread does not pay for formatting or file I/O. The writer thread formats
+    queued records and writes them whenever its buffer is full or the queue runs empty.
+
+    When the queue is full, the backpressure policy decides what happens. With SPILL, the
+    overflow is kept as records and appended to `<filepath>.spill` in blocks of buffer_size,
+    then moved into the run file on flush() or close(), so spilled events may appear after
+    events that were queued later.
+    """
+
+    DEFAULT_QUEUE_SIZE = 65536
+    FORMAT = "async"
+
+    def __init__(self,
+                 filepath: str,
+                 buffer_size: int = EventWriter.DEFAULT_BUFFER_SIZE,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK) -> None:
+        if not isinstance(queue_size, int):
+            raise TypeError("queue_size must be int")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if not isinstance(backpressure, BackpressurePolicy):
+            raise TypeError("backpressure must be BackpressurePolicy")
+
+        super().__init__(filepath, buffer_size)
+
+        self.backpressure = backpressure
+        self.spill_path = filepath + ".spill"
+        self.dropped = 0
+        self.spilled = 0
+        self._spill_file = None
+        # Spilled records not yet written to the spill file
+        self._spill_buffer: list[tuple] = []
+        self._error: BaseException | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name=f"AsyncEventWriter({filepath})", daemon=True)
+        self._thread.start()
+
+    def __str__(self) -> str:
+        return f"AsyncEventWriter(filepath={self.filepath}, queued={self._queue.qsize()}, " \
+               f"backpressure={self.backpressure.name})"
+
+    def add(self, event: Event) -> None:
+        """
+        Queue an event for the writer thread, applying the backpressure policy if the queue is full.
+
+        Args:
+            event (Event): Event to write
+        """
+        record = self.to_record(event)
+        self._put(record, 1, record[1] == EventType.DRIVER_IDLE.value)
+
+    def add_many(self, events: list[Event]) -> None:
+        """
+        Queue several events, in order, each with the backpressure policy.
+
+        Args:
+            events (list[Event]): Events to write
+        """
+        for event in events:
+            self.add(event)
+
+    def add_driver_events(self,
+                          timestamp: int,
+                          event_type: EventType,
+                          driver_ids: np.ndarray,
+                          wait_times: np.ndarray) -> None:
+        """
+        Queue one event per driver as a single block, applying the backpressure policy to the block.
+
+        Args:
+            timestamp (int): Timestamp of all events
+            event_type (EventType): Type of all events
+            driver_ids (np.ndarray): Driver id of each event
+            wait_times (np.ndarray): Wait time of each event
+        """
+        block = [(timestamp, event_type.value, driver_id, None, wait_time, None)
+                 for driver_id, wait_time in zip(driver_ids.tolist(), wait_times.tolist())]
+        self._put(block, len(block), event_type is EventType.DRIVER_IDLE)
+
+    def _put(self, item: tuple | list[tuple], count: int, idle: bool) -> None:
+        """
+        Put a record or a block of records on the queue, applying the backpressure policy if it is full.
+        """
+        if self.backpressure is BackpressurePolicy.BLOCK:
+            self._queue.put(item)
+            return
+
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if self.backpressure is BackpressurePolicy.SPILL:
+                self._spill(item)
+            elif idle:
+                self.dropped += count
+            else:
+                self._queue.put(item)
+
+    def end_tick(self) -> None:
+        """
+        Nothing to do, the writer thread writes as soon as it has caught up.
+        """
+        self._check_error()
+
+    def flush(self) -> None:
+        """
+        Wait until every queued event has been written, then merge any spilled events.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+        self._merge_spill()
+        self._check_error()
+
+    def clear(self) -> None:
+        """
+        Drop all pending events and reset the file to just the header.
+        """
+        self.flush()
+        super().clear()
+
+    def close(self) -> None:
+        """
+        Write all pending events, stop the writer thread, close the file and unregister the writer.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._merge_spill()
+        self._close_file()
+        if EventWriter._writers.get(self.filepath) is self:
+            del EventWriter._writers[self.filepath]
+        self._check_error()
+
+    def _run(self) -> None:
+        """
+        Body of the writer thread.
+        """
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    EventWriter.flush(self)
+                    return
+                if item is _FLUSH:
+                    EventWriter.flush(self)
+                    continue
+
+                if isinstance(item, list):
+                    self._buffer.extend(map(self.format_record, item))
+                else:
+                    self._buffer.append(self.format_record(item))
+                if len(self._buffer) >= self.buffer_size or self._queue.empty():
+                    EventWriter.flush(self)
+            except Exception as e:
+                # Reported to the simulation thread on the next end_tick/flush/close
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _spill(self, item: tuple | list[tuple]) -> None:
+        if isinstance(item, list):
+            self._spill_buffer.extend(item)
+            self.spilled += len(item)
+        else:
+            self._spill_buffer.append(item)
+            self.spilled += 1
+        if len(self._spill_buffer) >= self.buffer_size:
+            self._write_spill()
+
+    def _write_spill(self) -> None:
+        """
+        Format the buffered spilled records and append them to the spill file in one write.
+        """
+        if self._spill_file is None:
+            self._spill_file = open(self.spill_path, 'a')
+        self._spill_file.write(''.join(map(self.format_record, self._spill_buffer)))
+        self._spill_buffer.clear()
+
+    def _merge_spill(self) -> None:
+        """
+        Append the spill file and the buffered spilled records to the run file. Only called
+        while the writer thread is idle.
+        """
+        if self._spill_file is None and not self._spill_buffer:
+            return
+
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            with open(self.spill_path, 'r') as f:
+                self._buffer.append(f.read())
+            os.remove(self.spill_path)
+        self._buffer.extend(map(self.format_record, self._spill_buffer))
+        self._spill_buffer.clear()
+        EventWriter.flush(self)
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Writing events to {self.filepath} failed") from error
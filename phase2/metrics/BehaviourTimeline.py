@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import numpy as np
+
+from phase2.metrics.BinaryEventLog import EVENT_DTYPE, NONE, NO_BEHAVIOUR
+from phase2.metrics.Event import EventType
+from phase2.metrics.EventIndex import EventIndex
+
+
+class BehaviourTimeline:
+    """
+    Answers "which behaviour did driver d have at time t" for a run.
+
+    Behaviour changes (DRIVER_GENERATED_BEHAVIOUR and BEHAVIOUR_CHANGED events) are sorted by
+    (driver, timestamp) into one key array, where key = driver rank * span + time offset.
+    The behaviour at (d, t) is the last change with a key <= the key of (d, t), so any number
+    of lookups is a single numpy.searchsorted call. Changes with the same timestamp keep their
+    logging order, so the last logged one wins.
+    """
+
+    def __init__(self, changes: np.ndarray, behaviour_names: list[str]) -> None:
+        if not isinstance(changes, np.ndarray) or changes.dtype != EVENT_DTYPE:
+            raise TypeError("changes must be a structured array with EVENT_DTYPE")
+
+        self.behaviour_names = behaviour_names
+
+        changes = changes[changes['driver_id'] != NONE]
+        changes = changes[np.lexsort((changes['timestamp'], changes['driver_id']))]
+        self._drivers = changes['driver_id']
+        self._codes = changes['behaviour']
+        self.driver_ids = np.unique(self._drivers)
+
+        timestamps = changes['timestamp']
+        self._min_time = int(timestamps.min()) if len(changes) else 0
+        self._max_time = int(timestamps.max()) if len(changes) else 0
+        # Every driver gets a range of span keys, the first key of a range is "before any change"
+        self._span = self._max_time - self._min_time + 2
+        ranks = np.searchsorted(self.driver_ids, self._drivers)
+        self._keys = ranks * self._span + (timestamps - self._min_time + 1)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __str__(self) -> str:
+        return f"BehaviourTimeline(changes={len(self)}, drivers={len(self.driver_ids)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def from_index(cls, event_index: EventIndex) -> BehaviourTimeline:
+        """
+        Args:
+            event_index (EventIndex): Index of the run
+
+        Returns:
+            BehaviourTimeline: Timeline of every driver's behaviour changes in the run.
+        """
+        return cls(event_index.of_type(EventType.DRIVER_GENERATED_BEHAVIOUR, EventType.BEHAVIOUR_CHANGED),
+                   event_index.behaviour_names)
+
+    def codes_at(self, driver_ids: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """
+        Look up the behaviour of many (driver, time) pairs at once.
+
+        Args:
+            driver_ids (np.ndarray): Driver id of each lookup
+            times (np.ndarray): Time of each lookup, same length as driver_ids
+
+        Returns:
+            np.ndarray: Behaviour code of each lookup (an index into behaviour_names), or NO_BEHAVIOUR if
+                the driver had no behaviour change at or before that time.
+        """
+        driver_ids = np.asarray(driver_ids, dtype=np.int64)
+        times = np.asarray(times, dtype=np.int64)
+        if driver_ids.shape != times.shape:
+            raise ValueError("driver_ids and times must have the same shape")
+
+        codes = np.full(driver_ids.shape, NO_BEHAVIOUR, dtype=np.int64)
+        if len(self._keys) == 0:
+            return codes
+
+        ranks = np.minimum(np.searchsorted(self.driver_ids, driver_ids), len(self.driver_ids) - 1)
+        known = self.driver_ids[ranks] == driver_ids
+
+        # Times after the last change behave like the last change, times before the first like "no change"
+        offsets = np.clip(times - self._min_time + 1, 0, self._span - 1)
+        positions = np.searchsorted(self._keys, ranks * self._span + offsets, side='right') - 1
+
+        found = known & (positions >= 0)
+        found[found] &= self._drivers[positions[found]] == driver_ids[found]
+        codes[found] = self._codes[positions[found]]
+        return codes
+
+    def behaviour_at(self, driver_id: int, time: int) -> str | None:
+        """
+        Args:
+            driver_id (int): Id of the driver
+            time (int): Tick to look up
+
+        Returns:
+            Name of the behaviour the driver had at that tick, or None if it is not known.
+        """
+        code = int(self.codes_at(np.array([driver_id]), np.array([time]))[0])
+        return None if code == NO_BEHAVIOUR else self.behaviour_names[code]
+
+    def names_at(self, driver_ids: np.ndarray, times: np.ndarray) -> list[str | None]:
+        """
+        Same as codes_at, but returns the behaviour names (None where unknown).
+        """
+        return [None if code == NO_BEHAVIOUR else self.behaviour_names[code]
+                for code in self.codes_at(driver_ids, times).tolist()]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
+
+# File starts with this magic, followed by fixed-width records
+MAGIC = b"DSEVT002"
+
+# Missing driver_id/request_id/wait_time are stored as the smallest int64, which no id or
+# wait time can take. Events without a behaviour have behaviour code -1.
+NONE = np.iinfo(np.int64).min
+NO_BEHAVIOUR = -1
+
+EVENT_DTYPE = np.dtype([('timestamp', '<i8'),
+                        ('event_type', 'u1'),
+                        ('driver_id', '<i8'),
+                        ('request_id', '<i8'),
+                        ('wait_time', '<i8'),
+                        ('behaviour', '<i2')])
+
+
+class BinaryEventLog:
+    """
+    Reader for the binary events file of a run.
+
+    The file holds one fixed-width EVENT_DTYPE record per event after an 8 byte magic.
+    Behaviour names are interned: the `behaviour` column is an index into a side table
+    with one name per line. Records are exposed as a read-only numpy.memmap structured
+    array, so loading does not parse anything or build Python objects.
+
+    For a run CSV `runs/<run_id>/<run_id>.csv` the binary files are `<run_id>.events`
+    and `<run_id>.behaviours` in the same folder.
+    """
+
+    def __init__(self, data_path: str) -> None:
+        self.data_path = data_path
+        self.names_path = self.names_path_for(data_path)
+
+        with open(data_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{data_path} is not a binary events file")
+
+        self.behaviour_names = self._read_names()
+        self.records = self._map_records()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __str__(self) -> str:
+        return f"BinaryEventLog(path={self.data_path}, events={len(self)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @staticmethod
+    def data_path_for(csv_path: str) -> str:
+        return os.path.splitext(csv_path)[0] + ".events"
+
+    @staticmethod
+    def names_path_for(data_path: str) -> str:
+        return os.path.splitext(data_path)[0] + ".behaviours"
+
+    def _read_names(self) -> list[str]:
+        if not os.path.exists(self.names_path):
+            return []
+        with open(self.names_path, 'r') as f:
+            return [line.rstrip('\n') for line in f]
+
+    def _map_records(self) -> np.ndarray:
+        n_bytes = os.path.getsize(self.data_path) - len(MAGIC)
+        count = n_bytes // EVENT_DTYPE.itemsize
+        if count == 0:
+            # numpy cannot map an empty region
+            return np.empty(0, dtype=EVENT_DTYPE)
+        return np.memmap(self.data_path, dtype=EVENT_DTYPE, mode='r', offset=len(MAGIC), shape=(count,))
+
+    def behaviour_name(self, code: int) -> str | None:
+        """
+        Args:
+            code (int): Value of the behaviour column
+
+        Returns:
+            The interned behaviour name, or None for NO_BEHAVIOUR.
+        """
+        return None if code == NO_BEHAVIOUR else self.behaviour_names[code]
+
+    def to_events(self) -> list[Event]:
+        """
+        Returns:
+            list[Event]: All records as Event instances. Builds one object per event, use the
+                `records` array directly for large runs.
+        """
+        events = []
+        for timestamp, event_type, driver_id, request_id, wait_time, behaviour in self.records.tolist():
+            events.append(Event(timestamp=timestamp,
+                                event_type=EventType(event_type),
+                                driver_id=None if driver_id == NONE else driver_id,
+                                request_id=None if request_id == NONE else request_id,
+                                wait_time=None if wait_time == NONE else wait_time,
+                                behaviour_name=self.behaviour_name(behaviour)))
+        return events
+
+    def export_csv(self, csv_path: str) -> None:
+        """
+        Write the events in the regular CSV format.
+
+        Args:
+            csv_path (str): Path of the CSV file to write
+        """
+        with open(csv_path, 'w') as f:
+            f.write(CSV_HEADER)
+            for timestamp, event_type, driver_id, request_id, wait_time, behaviour in self.records.tolist():
+                f.write(EventWriter.format_record((timestamp,
+                                                   event_type,
+                                                   None if driver_id == NONE else driver_id,
+                                                   None if request_id == NONE else request_id,
+                                                   None if wait_time == NONE else wait_time,
+                                                   self.behaviour_name(behaviour))))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import numpy as np
+
+from phase2.metrics.BinaryEventLog import BinaryEventLog, EVENT_DTYPE, MAGIC, NONE, NO_BEHAVIOUR
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import EventWriter
+
+
+class BinaryEventWriter(EventWriter):
+    """
+    EventWriter that stores events in the binary format read by BinaryEventLog instead of CSV.
+
+    It is registered under the run's CSV path like any other writer, but writes to the
+    `.events` file next to it. Behaviour names are interned, new names are appended to the
+    `.behaviours` side table as they are first seen.
+    """
+
+    FORMAT = "binary"
+
+    def __init__(self, filepath: str, buffer_size: int = EventWriter.DEFAULT_BUFFER_SIZE) -> None:
+        # log_path must be known before EventWriter creates the file
+        self.data_path = BinaryEventLog.data_path_for(filepath)
+        self.names_path = BinaryEventLog.names_path_for(self.data_path)
+        super().__init__(filepath, buffer_size)
+        self._buffer: list[tuple] = []
+
+        # Continue the side table of an existing file
+        with open(self.names_path, 'r') as f:
+            self._behaviour_codes = {line.rstrip('\n'): code for code, line in enumerate(f)}
+
+    def __str__(self) -> str:
+        return f"BinaryEventWriter(filepath={self.data_path}, buffered={len(self._buffer)})"
+
+    @property
+    def log_path(self) -> str:
+        return self.data_path
+
+    def _reset_files(self) -> None:
+        with open(self.data_path, 'wb') as f:
+            f.write(MAGIC)
+        with open(self.names_path, 'w'):
+            pass
+        self._behaviour_codes = {}
+
+    def _behaviour_code(self, name: str | None) -> int:
+        if name is None:
+            return NO_BEHAVIOUR
+        code = self._behaviour_codes.get(name)
+        if code is None:
+            code = len(self._behaviour_codes)
+            self._behaviour_codes[name] = code
+            with open(self.names_path, 'a') as f:
+                f.write(name + '\n')
+        return code
+
+    def add(self, event: Event) -> None:
+        """
+        Buffer an event as a fixed-width record, flushing the buffer when it is full.
+
+        Args:
+            event (Event): Event to write
+        """
+        self._buffer.append(self._record(event))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_many(self, events: list[Event]) -> None:
+        """
+        Buffer several events as fixed-width records, in order.
+
+        Args:
+            events (list[Event]): Events to write
+        """
+        self._buffer.extend(map(self._record, events))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_driver_events(self,
+                          timestamp: int,
+                          event_type: EventType,
+                          driver_ids: np.ndarray,
+                          wait_times: np.ndarray) -> None:
+        """
+        Write one record per driver as a single block, after the buffered records.
+
+        Args:
+            timestamp (int): Timestamp of all events
+            event_type (EventType): Type of all events
+            driver_ids (np.ndarray): Driver id of each event
+            wait_times (np.ndarray): Wait time of each event
+        """
+        block = np.empty(len(driver_ids), dtype=EVENT_DTYPE)
+        block['timestamp'] = timestamp
+        block['event_type'] = event_type.value
+        block['driver_id'] = driver_ids
+        block['request_id'] = NONE
+        block['wait_time'] = wait_times
+        block['behaviour'] = NO_BEHAVIOUR
+
+        self.flush()
+        self._write(block)
+
+    def _record(self, event: Event) -> tuple:
+        return (event.timestamp,
+                event.event_type.value,
+                NONE if event.driver_id is None else event.driver_id,
+                NONE if event.request_id is None else event.request_id,
+                NONE if event.wait_time is None else event.wait_time,
+                self._behaviour_code(event.behaviour_name))
+
+    def flush(self) -> None:
+        """
+        Write all buffered records to the file.
+        """
+        if not self._buffer:
+            return
+        self._write(np.array(self._buffer, dtype=EVENT_DTYPE))
+        self._buffer.clear()
+
+    def _write(self, records: np.ndarray) -> None:
+        if self._file is None:
+            self._file = open(self.data_path, 'ab')
+        self._file.write(records.tobytes())
+        self._file.flush()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import numpy as np
+
+from phase2.metrics.BinaryEventLog import EVENT_DTYPE, NONE, NO_BEHAVIOUR
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventManager import EventManager
+
+
+class EventIndex:
+    """
+    In-memory index over all events of a run, built once and queried by the metrics plots.
+
+    Events are held as an EVENT_DTYPE structured array (missing values are NONE and behaviour
+    names are interned, like in the binary log). On top of it the index keeps:
+    - a timestamp-sorted view of all events,
+    - per event type, the sorted positions of its events,
+    - per driver and per request, offsets into a view sorted by (id, timestamp).
+
+    Binary runs are indexed straight from the memory-mapped log. CSV runs are parsed once.
+    """
+
+    def __init__(self, records: np.ndarray, behaviour_names: list[str]) -> None:
+        if not isinstance(records, np.ndarray) or records.dtype != EVENT_DTYPE:
+            raise TypeError("records must be a structured array with EVENT_DTYPE")
+
+        self.records = records
+        self.behaviour_names = behaviour_names
+
+        # Stable sort keeps the logging order of events with the same timestamp
+        self.by_time = records[np.argsort(records['timestamp'], kind='stable')]
+
+        event_types = self.by_time['event_type']
+        self._type_positions = {event_type: np.flatnonzero(event_types == event_type.value)
+                                for event_type in EventType}
+
+        self._driver_view, self._driver_ids, self._driver_offsets = self._group_by(self.by_time, 'driver_id')
+        self._request_view, self._request_ids, self._request_offsets = self._group_by(self.by_time, 'request_id')
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __str__(self) -> str:
+        return f"EventIndex(events={len(self)}, drivers={len(self._driver_ids)}, requests={len(self._request_ids)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @classmethod
+    def load(cls, event_manager: EventManager) -> EventIndex:
+        """
+        Build the index for the run of an EventManager, reading the run's events exactly once.
+
+        Args:
+            event_manager (EventManager): EventManager of the run
+
+        Returns:
+            EventIndex: Index over all events of the run.
+        """
+        event_log = event_manager.get_event_log()
+        if event_log is not None:
+            return cls(np.asarray(event_log.records), event_log.behaviour_names)
+
+        event_manager.flush()
+        with open(event_manager.filepath, 'r') as f:
+            return cls.from_csv_lines(f)
+
+    @classmethod
+    def from_csv_lines(cls, lines) -> EventIndex:
+        """
+        Build the index from the lines of an events CSV. Malformed lines are skipped, like in
+        EventManager.get_events.
+
+        Args:
+            lines (Iterable[str]): Lines of the CSV, the header line is optional.
+
+        Returns:
+            EventIndex: Index over the parsed events.
+        """
+        rows = []
+        behaviour_codes: dict[str, int] = {}
+        valid_types = {event_type.value for event_type in EventType}
+
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("timestamp"):
+                continue
+            values = line.split(', ')
+            if len(values) != 6:
+                continue
+            ts, et, did, rid, wt, behaviour_name = values
+            try:
+                row = (int(ts),
+                       int(et),
+                       int(did) if did != 'None' else NONE,
+                       int(rid) if rid != 'None' else NONE,
+                       int(wt) if wt != 'None' else NONE)
+            except ValueError:
+                continue
+            if row[1] not in valid_types:
+                continue
+
+            if behaviour_name == 'None':
+                code = NO_BEHAVIOUR
+            else:
+                code = behaviour_codes.setdefault(behaviour_name, len(behaviour_codes))
+            rows.append(row + (code,))
+
+        return cls(np.array(rows, dtype=EVENT_DTYPE), list(behaviour_codes))
+
+    @staticmethod
+    def _group_by(records: np.ndarray, column: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            The records with a value in `column`, sorted by (column, timestamp), the distinct
+            values of the column and the offset of each value's first record. The last offset
+            is the number of records, so the records of value i are view[offsets[i]:offsets[i + 1]].
+        """
+        present = records[records[column] != NONE]
+        view = present[np.argsort(present[column], kind='stable')]
+        ids, starts = np.unique(view[column], return_index=True)
+        offsets = np.append(starts, len(view))
+        return view, ids, offsets
+
+    @staticmethod
+    def _slice(view: np.ndarray, ids: np.ndarray, offsets: np.ndarray, key: int) -> np.ndarray:
+        i = np.searchsorted(ids, key)
+        if i == len(ids) or ids[i] != key:
+            return view[:0]
+        return view[offsets[i]:offsets[i + 1]]
+
+    def of_type(self, *event_types: EventType) -> np.ndarray:
+        """
+        Args:
+            event_types (EventType): One or more event types
+
+        Returns:
+            Events of the given types, sorted by timestamp.
+        """
+        positions = np.concatenate([self._type_positions[event_type] for event_type in event_types])
+        if len(event_types) > 1:
+            positions.sort()
+        return self.by_time[positions]
+
+    def count(self, event_type: EventType) -> int:
+        return len(self._type_positions[event_type])
+
+    def for_driver(self, driver_id: int) -> np.ndarray:
+        """
+        Returns:
+            Events of one driver, sorted by timestamp.
+        """
+        return self._slice(self._driver_view, self._driver_ids, self._driver_offsets, driver_id)
+
+    def for_request(self, request_id: int) -> np.ndarray:
+        """
+        Returns:
+            Events of one request, sorted by timestamp.
+        """
+        return self._slice(self._request_view, self._request_ids, self._request_offsets, request_id)
+
+    def driver_ids(self) -> np.ndarray:
+        return self._driver_ids
+
+    def request_ids(self) -> np.ndarray:
+        return self._request_ids
+
+    def behaviour_name(self, code: int) -> str | None:
+        return None if code == NO_BEHAVIOUR else self.behaviour_names[code]
+
+    def to_events(self, records: np.ndarray) -> list[Event]:
+        """
+        Convert records of this index to Event instances.
+
+        Args:
+            records (np.ndarray): Records returned by one of the queries
+
+        Returns:
+            list[Event]: One Event per record.
+        """
+        return [Event(timestamp=timestamp,
+                      event_type=EventType(event_type),
+                      driver_id=None if driver_id == NONE else driver_id,
+                      request_id=None if request_id == NONE else request_id,
+                      wait_time=None if wait_time == NONE else wait_time,
+                      behaviour_name=self.behaviour_name(behaviour))
+                for timestamp, event_type, driver_id, request_id, wait_time, behaviour in records.tolist()]
@@ -1,58 +1,233 @@
 from __future__ import annotations
 
+import functools
 import os
 
+import numpy as np
+
 from phase2.metrics.Event import Event, EventType
+from phase2.metrics.AsyncEventWriter import AsyncEventWriter, BackpressurePolicy
+from phase2.metrics.BinaryEventLog import BinaryEventLog
+from phase2.metrics.BinaryEventWriter import BinaryEventWriter
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
 
 
 class EventManager:
+    """
+    Reads and writes the events of a run.
+
+    Writing goes through the process-wide EventWriter of the run, so creating an EventManager
+    is cheap and every EventManager of a run shares one buffer and one open file. Can be used
+    as a context manager, which closes the run's writer on exit.
+    """
+
     def __init__(self, run_id: str):
-        self.filepath = os.path.join(os.path.abspath(os.path.dirname(__file__)), "runs", f"{run_id}.csv")
+        self.filepath = self._filepath(run_id)
         if "test_run" in self.filepath:
             return
+
+        # Directories and header are only created the first time the run is opened in this process
+        EventWriter.for_path(self.filepath)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _filepath(run_id: str) -> str:
+        """
+        Path of the events CSV of a run, cached since every Request creates an EventManager.
+
+        Args:
+            run_id (str): Unique identifier for the simulation run
+
+        Returns:
+            str: runs/<run_id>/<run_id>.csv, or runs/<run_id>.csv for test runs.
+        """
+        filepath = os.path.join(os.path.abspath(os.path.dirname(__file__)), "runs", f"{run_id}.csv")
+        if "test_run" in filepath:
+            return filepath
         # Place each run in its own subfolder: runs/<run_id>/<run_id>.csv
         base_dir = os.path.abspath(os.path.dirname(__file__))
         runs_dir = os.path.join(base_dir, "runs")
         run_dir = os.path.join(runs_dir, run_id)
-        self.filepath = os.path.join(run_dir, f"{run_id}.csv")
+        return os.path.join(run_dir, f"{run_id}.csv")
 
-        # Ensure directories exist
-        if not os.path.exists(run_dir):
-            os.makedirs(run_dir, exist_ok=True)
+    def __enter__(self) -> EventManager:
+        return self
 
-        # Initialize CSV file with header if it does not exist
-        if not os.path.exists(self.filepath):
-            with open(self.filepath, 'w') as f:
-                f.write("timestamp, "
-                        "event_type, "
-                        "driver_id, "
-                        "request_id, "
-                        "wait_time, "
-                        "behaviour_name\n")
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
     def add_event(self, event: Event) -> None:
         """
-        Add an event to the CSV file.
+        Add an event to the run's buffer. It is written to the CSV file on the next flush.
         Args:
             event (Event): Event instance to be added
         """
-        # Append the event to csv file
         if "test_run" in self.filepath:
             return
 
-        with open(self.filepath, 'a') as f:
-            f.write("{timestamp}, "
-                    "{event_type}, "
-                    "{driver_id}, "
-                    "{request_id}, "
-                    "{wait_time}, "
-                    "{behaviour_name}"
-                    .format(timestamp=event.timestamp,
-                            event_type=event.event_type.value,
-                            driver_id=event.driver_id,
-                            request_id=event.request_id,
-                            wait_time=event.wait_time,
-                            behaviour_name=event.behaviour_name if event.behaviour_name is not None else 'None') + '\n')
+        EventWriter.for_path(self.filepath).add(event)
+
+    def add_events(self, events: list[Event]) -> None:
+        """
+        Add several events to the run's buffer with a single writer lookup.
+        Args:
+            events (list[Event]): Event instances to be added, in order
+        """
+        if "test_run" in self.filepath or not events:
+            return
+
+        EventWriter.for_path(self.filepath).add_many(events)
+
+    def add_driver_events(self,
+                          timestamp: int,
+                          event_type: EventType,
+                          driver_ids: np.ndarray,
+                          wait_times: np.ndarray) -> None:
+        """
+        Add one event of the same type per driver, without creating Event objects. Used by the
+        vectorized simulation to log the DRIVER_IDLE events of a whole fleet.
+        Args:
+            timestamp (int): Timestamp of all events
+            event_type (EventType): Type of all events
+            driver_ids (np.ndarray): Driver id of each event
+            wait_times (np.ndarray): Wait time of each event, same length as driver_ids
+        """
+        if "test_run" in self.filepath or len(driver_ids) == 0:
+            return
+
+        EventWriter.for_path(self.filepath).add_driver_events(timestamp, event_type, driver_ids, wait_times)
+
+    def end_tick(self) -> None:
+        """
+        Signal the end of a simulation tick to the run's writer.
+        """
+        writer = EventWriter.get(self.filepath)
+        if writer is not None:
+            writer.end_tick()
+
+    def use_async_writer(self,
+                         queue_size: int = AsyncEventWriter.DEFAULT_QUEUE_SIZE,
+                         backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK) -> None:
+        """
+        Switch the run to asynchronous logging. Events are queued and written by a background
+        thread, see AsyncEventWriter. Events already buffered are written first.
+
+        Args:
+            queue_size (int): Maximum number of queued events
+            backpressure (BackpressurePolicy): What to do when the queue is full
+        """
+        if "test_run" in self.filepath:
+            return
+        if isinstance(EventWriter.get(self.filepath), AsyncEventWriter):
+            return
+        EventWriter.register(AsyncEventWriter(self.filepath, queue_size=queue_size, backpressure=backpressure))
+
+    def use_binary_writer(self) -> None:
+        """
+        Switch the run to the binary event format, see BinaryEventWriter. Events already
+        logged to the CSV are moved into the binary log, so the binary readers see every event
+        of the run. Use export_csv() to get a CSV afterwards.
+        """
+        if "test_run" in self.filepath:
+            return
+        if isinstance(EventWriter.get(self.filepath), BinaryEventWriter):
+            return
+
+        self.flush()
+        events = self._read_csv_events() if os.path.exists(self.filepath) else []
+        writer = BinaryEventWriter(self.filepath)
+        EventWriter.register(writer)
+        if events:
+            writer.add_many(events)
+            writer.flush()
+            with open(self.filepath, 'w') as f:
+                f.write(CSV_HEADER)
+
+    def log_position(self) -> tuple[str, str, int] | None:
+        """
+        Flush the run's events and return where its event log ends, saved with checkpoints.
+
+        Returns:
+            The writer format (csv, binary or async), the path of the log file and its size in
+            bytes, or None for test runs.
+        """
+        writer = EventWriter.get(self.filepath)
+        if writer is None:
+            return None
+        writer.flush()
+        return writer.FORMAT, writer.log_path, os.path.getsize(writer.log_path)
+
+    def restore_log(self, position: tuple[str, str, int] | None) -> None:
+        """
+        Continue the run's event log from a checkpoint. Events written after the checkpoint
+        was saved are cut off, so they are not logged twice, and the writer format of the
+        checkpointed run is selected again.
+
+        Args:
+            position (tuple[str, str, int] | None): Log position returned by log_position()
+        """
+        if position is None or "test_run" in self.filepath:
+            return
+        event_format, path, size = position
+
+        self.close()
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, 'r+b') as f:
+                f.truncate(size)
+
+        if event_format == BinaryEventWriter.FORMAT:
+            # The CSV is not part of a binary log (it may hold an export), so nothing is moved over
+            EventWriter.register(BinaryEventWriter(self.filepath))
+        elif event_format == AsyncEventWriter.FORMAT:
+            self.use_async_writer()
+        else:
+            EventWriter.for_path(self.filepath)
+
+    def get_event_log(self) -> BinaryEventLog | None:
+        """
+        Open the binary events file of the run.
+
+        Returns:
+            BinaryEventLog | None: The memory-mapped log, or None if the run was not written in binary.
+        """
+        data_path = BinaryEventLog.data_path_for(self.filepath)
+        if not os.path.exists(data_path):
+            return None
+        self.flush()
+        return BinaryEventLog(data_path)
+
+    def export_csv(self, path: str | None = None) -> str:
+        """
+        Export the events of a binary run in the CSV format.
+
+        Args:
+            path (str | None): Where to write the CSV, defaults to the run's CSV file.
+
+        Returns:
+            str: Path of the written CSV file.
+        """
+        event_log = self.get_event_log()
+        if event_log is None:
+            raise FileNotFoundError(f"No binary events file for {self.filepath}")
+        path = path if path is not None else self.filepath
+        event_log.export_csv(path)
+        return path
+
+    def flush(self) -> None:
+        """
+        Write all buffered events of the run to the CSV file.
+        """
+        writer = EventWriter.get(self.filepath)
+        if writer is not None:
+            writer.flush()
+
+    def close(self) -> None:
+        """
+        Flush buffered events and close the run's CSV file.
+        """
+        writer = EventWriter.get(self.filepath)
+        if writer is not None:
+            writer.close()
 
     def get_events(self) -> list[Event]:
         """
@@ -61,6 +236,19 @@ class EventManager:
         Returns:
             List[Event]: List of Event instances
         """
+        # Binary runs are read from the memory-mapped log
+        event_log = self.get_event_log()
+        if event_log is not None:
+            return event_log.to_events()
+
+        # Make sure events still in the buffer are included
+        self.flush()
+        return self._read_csv_events()
+
+    def _read_csv_events(self) -> list[Event]:
+        """
+        Parse the events of the run's CSV file, skipping malformed lines.
+        """
         with open(self.filepath, 'r') as f:
             lines = f.readlines()
             # Skip header line if present
@@ -107,10 +295,4 @@ class EventManager:
         """
         if "test_run" in self.filepath:
             return
-        with open(self.filepath, 'w') as f:
-            f.write("timestamp, "
-                    "event_type, "
-                    "driver_id, "
-                    "request_id, "
-                    "wait_time, "
-                    "behaviour_name\n")
+        EventWriter.for_path(self.filepath).clear()
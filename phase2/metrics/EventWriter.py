@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import atexit
+import os
+
+import numpy as np
+
+from phase2.metrics.Event import Event, EventType
+
+CSV_HEADER = ("timestamp, "
+              "event_type, "
+              "driver_id, "
+              "request_id, "
+              "wait_time, "
+              "behaviour_name\n")
+
+
+class EventWriter:
+    """
+    Buffered writer for the events CSV of a run.
+
+    There is one writer per file in the process, shared by every EventManager of that run,
+    so directories and the header are only checked once. Events are formatted into an
+    in-memory buffer, which is written to the file when it holds `buffer_size` lines, at
+    every tick boundary (see end_tick) or on an explicit flush()/close().
+    The file is kept open between flushes.
+    """
+
+    DEFAULT_BUFFER_SIZE = 4096
+    # Value of run.py's --event-format that selects this writer
+    FORMAT = "csv"
+
+    # filepath -> writer, shared by the whole process
+    _writers: dict[str, EventWriter] = {}
+
+    def __init__(self, filepath: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        if not isinstance(buffer_size, int):
+            raise TypeError("buffer_size must be int")
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+
+        self.filepath = filepath
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        self._file = None
+
+        # Ensure directories exist
+        run_dir = os.path.dirname(filepath)
+        if run_dir and not os.path.exists(run_dir):
+            os.makedirs(run_dir, exist_ok=True)
+
+        # Initialize the log file if it does not exist
+        if not os.path.exists(self.log_path):
+            self._reset_files()
+
+    def __str__(self) -> str:
+        return f"EventWriter(filepath={self.filepath}, buffered={len(self._buffer)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @property
+    def log_path(self) -> str:
+        """
+        Returns:
+            str: Path of the file the events are written to.
+        """
+        return self.filepath
+
+    @classmethod
+    def for_path(cls, filepath: str) -> EventWriter:
+        """
+        Return the shared writer for a file, creating it on first use.
+
+        Args:
+            filepath (str): Path of the events CSV
+
+        Returns:
+            EventWriter: The writer for that file.
+        """
+        writer = cls._writers.get(filepath)
+        if writer is None:
+            writer = cls(filepath)
+            cls._writers[filepath] = writer
+        return writer
+
+    @classmethod
+    def get(cls, filepath: str) -> EventWriter | None:
+        """
+        Returns:
+            The shared writer for a file, or None if the file has not been opened for writing.
+        """
+        return cls._writers.get(filepath)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """
+        Flush and close every open writer. Registered to run when the interpreter exits.
+        """
+        for writer in list(cls._writers.values()):
+            writer.close()
+
+    @staticmethod
+    def to_record(event: Event) -> tuple:
+        """
+        Args:
+            event (Event): Event to convert
+
+        Returns:
+            Compact (timestamp, event_type value, driver_id, request_id, wait_time, behaviour_name) tuple.
+        """
+        return (event.timestamp, event.event_type.value, event.driver_id, event.request_id, event.wait_time,
+                event.behaviour_name)
+
+    @staticmethod
+    def format_record(record: tuple) -> str:
+        """
+        Args:
+            record (tuple): Record as returned by to_record
+
+        Returns:
+            The CSV line for the record, including the trailing newline.
+        """
+        timestamp, event_type, driver_id, request_id, wait_time, behaviour_name = record
+        return ("{timestamp}, "
+                "{event_type}, "
+                "{driver_id}, "
+                "{request_id}, "
+                "{wait_time}, "
+                "{behaviour_name}"
+                .format(timestamp=timestamp,
+                        event_type=event_type,
+                        driver_id=driver_id,
+                        request_id=request_id,
+                        wait_time=wait_time,
+                        behaviour_name=behaviour_name if behaviour_name is not None else 'None') + '\n')
+
+    @classmethod
+    def format_line(cls, event: Event) -> str:
+        """
+        Args:
+            event (Event): Event to format
+
+        Returns:
+            The CSV line for the event, including the trailing newline.
+        """
+        return cls.format_record(cls.to_record(event))
+
+    @classmethod
+    def register(cls, writer: EventWriter) -> None:
+        """
+        Make a writer the shared writer for its file, closing any writer it replaces.
+
+        Args:
+            writer (EventWriter): The writer to register
+        """
+        existing = cls._writers.get(writer.filepath)
+        if existing is not None and existing is not writer:
+            existing.close()
+        cls._writers[writer.filepath] = writer
+
+    def add(self, event: Event) -> None:
+        """
+        Buffer an event, flushing the buffer when it is full.
+
+        Args:
+            event (Event): Event to write
+        """
+        self._buffer.append(self.format_line(event))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_many(self, events: list[Event]) -> None:
+        """
+        Buffer several events at once, in order.
+
+        Args:
+            events (list[Event]): Events to write
+        """
+        self._buffer.extend(map(self.format_line, events))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def add_driver_events(self,
+                          timestamp: int,
+                          event_type: EventType,
+                          driver_ids: np.ndarray,
+                          wait_times: np.ndarray) -> None:
+        """
+        Buffer one event per driver, formatted straight from the arrays.
+
+        Args:
+            timestamp (int): Timestamp of all events
+            event_type (EventType): Type of all events
+            driver_ids (np.ndarray): Driver id of each event
+            wait_times (np.ndarray): Wait time of each event
+        """
+        # Same lines as format_record for events without request and behaviour
+        prefix = f"{timestamp}, {event_type.value}, "
+        self._buffer.extend([f"{prefix}{driver_id}, None, {wait_time}, None\n"
+                             for driver_id, wait_time in zip(driver_ids.tolist(), wait_times.tolist())])
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def end_tick(self) -> None:
+        """
+        Called by the simulation at the end of every tick. Writes the tick's events.
+        """
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Write all buffered events to the file.
+        """
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._file = open(self.filepath, 'a')
+        self._file.write(''.join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+
+    def clear(self) -> None:
+        """
+        Drop all buffered events and reset the file to just the header.
+        """
+        self._buffer.clear()
+        self._close_file()
+        self._reset_files()
+
+    def close(self) -> None:
+        """
+        Flush buffered events, close the file and unregister the writer.
+        """
+        self.flush()
+        self._close_file()
+        if EventWriter._writers.get(self.filepath) is self:
+            del EventWriter._writers[self.filepath]
+
+    def _reset_files(self) -> None:
+        with open(self.filepath, 'w') as f:
+            f.write(CSV_HEADER)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+atexit.register(EventWriter.close_all)
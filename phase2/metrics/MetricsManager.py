@@ -1,8 +1,12 @@
 import os
 
 import matplotlib.pyplot as plt
+import numpy as np
 
-from phase2.metrics.Event import EventType
+from phase2.metrics.BehaviourTimeline import BehaviourTimeline
+from phase2.metrics.BinaryEventLog import NONE
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventIndex import EventIndex
 from phase2.metrics.EventManager import EventManager
 
 
@@ -29,13 +33,25 @@ class MetricsManager:
 
         Side effects:
         - Initializes an EventManager to read events from the run's CSV file.
-        - Preloads event lists for convenience.
+        - Reads the run's events once into an EventIndex, which all plots query.
+        - Builds the BehaviourTimeline of the run's drivers from the index.
         """
         self.run_id = run_id
         self.event_manager = EventManager(self.run_id)
-        self.all_events = self.event_manager.get_events()
-        self.req_expired = self.event_manager.get_events_by_type(EventType.REQUEST_EXPIRED)
-        self.req_delivered = self.event_manager.get_events_by_type(EventType.REQUEST_DELIVERED)
+        self.event_index = EventIndex.load(self.event_manager)
+        self.behaviour_timeline = BehaviourTimeline.from_index(self.event_index)
+
+    @property
+    def all_events(self) -> list[Event]:
+        return self.event_index.to_events(self.event_index.records)
+
+    @property
+    def req_expired(self) -> list[Event]:
+        return self.event_index.to_events(self.event_index.of_type(EventType.REQUEST_EXPIRED))
+
+    @property
+    def req_delivered(self) -> list[Event]:
+        return self.event_index.to_events(self.event_index.of_type(EventType.REQUEST_DELIVERED))
 
     def _get_run_output_dir(self) -> str:
         """
@@ -55,45 +71,27 @@ class MetricsManager:
         """
         Plot delivered, expired, and pending request counts over time.
 
-        This plot is built by scanning the event stream in chronological order and
-        maintaining counters for each request status. At each event timestamp, we record
-        a snapshot of the totals to draw three lines: Delivered, Expired, and Pending.
+        This plot is built from the chronological event stream by keeping running totals
+        for each request status. At each event timestamp, we take a snapshot of the totals
+        to draw three lines: Delivered, Expired, and Pending.
 
         Args:
             save (bool): If True, save the figure as `<run_id>_requests_over_time.png` inside the
                   run's output folder. If False, only show the plot.
         """
-        if not self.all_events:
+        if len(self.event_index) == 0:
             print("No events recorded. Skipping Requests Over Time plot.")
             return
 
-        # Sort events by timestamp to process chronologically
-        events = sorted(self.all_events, key=lambda e: e.timestamp)
-
-        total_generated = 0
-        total_delivered = 0
-        total_expired = 0
+        # Events in chronological order, with running totals taken at each event
+        events = self.event_index.by_time
+        event_types = events['event_type']
 
-        times = []
-        delivered_series = []
-        expired_series = []
-        pending_series = []
-
-        # Process events, update counters and capture snapshot at each event time
-        for ev in events:
-            if ev.event_type == EventType.REQUEST_GENERATED:
-                total_generated += 1
-            elif ev.event_type == EventType.REQUEST_DELIVERED:
-                total_delivered += 1
-            elif ev.event_type == EventType.REQUEST_EXPIRED:
-                total_expired += 1
-
-            pending = max(total_generated - total_delivered - total_expired, 0)
-
-            times.append(ev.timestamp)
-            delivered_series.append(total_delivered)
-            expired_series.append(total_expired)
-            pending_series.append(pending)
+        times = events['timestamp']
+        generated_series = np.cumsum(event_types == EventType.REQUEST_GENERATED.value)
+        delivered_series = np.cumsum(event_types == EventType.REQUEST_DELIVERED.value)
+        expired_series = np.cumsum(event_types == EventType.REQUEST_EXPIRED.value)
+        pending_series = np.maximum(generated_series - delivered_series - expired_series, 0)
 
         plt.figure(figsize=(10, 6))
         plt.plot(times, delivered_series, label="Delivered", color="g")
@@ -127,25 +125,20 @@ class MetricsManager:
                   run's output folder. If False, show the plot interactively.
         """
         # Count mutations per driver from events
-        events = self.event_manager.get_events_by_type(EventType.BEHAVIOUR_CHANGED)
-        if not events:
+        events = self.event_index.of_type(EventType.BEHAVIOUR_CHANGED)
+        if len(events) == 0:
             print("No BEHAVIOUR_CHANGED events recorded. Skipping Driver Mutations plot.")
             return
 
-        counts = {}
-        for ev in events:
-            if ev.driver_id is None:
-                continue
-            if ev.driver_id not in counts:
-                counts[ev.driver_id] = 0
-            counts[ev.driver_id] += 1
+        driver_ids, mutation_counts = np.unique(events['driver_id'][events['driver_id'] != NONE],
+                                                return_counts=True)
 
-        if not counts:
+        if len(driver_ids) == 0:
             print("No driver IDs found in BEHAVIOUR_CHANGED events. Skipping Driver Mutations plot.")
             return
 
-        driver_ids = sorted(counts.keys())
-        mutation_counts = [counts[d] for d in driver_ids]
+        driver_ids = driver_ids.tolist()
+        mutation_counts = mutation_counts.tolist()
 
         # Plot bar chart
         plt.figure(figsize=(10, 6))
@@ -168,84 +161,35 @@ class MetricsManager:
         """Plot cumulative deliveries grouped by driver behaviour over time.
 
         For each delivery event, we look up the driver's behaviour active at that
-        tick by scanning that driver's behaviour change events (which include the
-        behaviour name). We then increment the cumulative count for that behaviour and
-        record a snapshot. The result is a set of lines that grow over time, one per
-        behaviour (EarningsMaxBehaviour, GreedyDistanceBehaviour, LazyBehaviour).
+        tick in the run's BehaviourTimeline. We then increment the cumulative count
+        for that behaviour and record a snapshot. The result is a set of lines that grow
+        over time, one per behaviour (EarningsMaxBehaviour, GreedyDistanceBehaviour,
+        LazyBehaviour). Deliveries by drivers without a known behaviour are not counted.
 
         Args:
             save (bool): If True, save the figure as `<run_id>_behaviour_deliveries.png` inside the
                   run's output folder. If False, show the plot interactively.
         """
-        # Get all deliveries and behaviour change events
-        deliveries = self.event_manager.get_events_by_type(EventType.REQUEST_DELIVERED)
-
-        # Combine driver-generated behaviour and behaviour-changed events
-        behaviour_changes = (self.event_manager.get_events_by_type(EventType.DRIVER_GENERATED_BEHAVIOUR) +
-                             self.event_manager.get_events_by_type(EventType.BEHAVIOUR_CHANGED))
+        # Get all deliveries
+        deliveries = self.event_index.of_type(EventType.REQUEST_DELIVERED)
 
         # If no deliveries at all, there's nothing to plot
-        if not deliveries:
+        if len(deliveries) == 0:
             print("No deliveries recorded. Skipping Behaviour Deliveries plot.")
             return
 
-        # Build a simple timeline (sorted list) of behaviour changes per driver
-        changes_by_driver = {}
-        for ev in behaviour_changes:
-            if ev.driver_id is None:
-                continue
-            if ev.driver_id not in changes_by_driver:
-                changes_by_driver[ev.driver_id] = []
-            changes_by_driver[ev.driver_id].append(ev)
-
-        # Sort each driver's changes by time so we can scan from earliest to latest
-        for driver_id in changes_by_driver:
-            changes_by_driver[driver_id].sort(key=lambda e: e.timestamp)
-
-        # Helper: given a driver and a time, return the behaviour name the driver had
-        # Look for the latest change at or before the given time
-        def _get_behaviour_name(driver_id: int, at_time: int) -> str:
-            changes = changes_by_driver.get(driver_id, [])
-            last_name = None
-            for change in changes:
-                if change.timestamp <= at_time:
-                    last_name = change.behaviour_name
-                else:
-                    # once we pass the time, stop scanning
-                    break
-            if last_name is None:
-                return "Unknown"
-            return last_name
-
-        # Prepare cumulative counts per behaviour over time
-        deliveries_sorted = sorted(deliveries, key=lambda e: e.timestamp)
-        times = []
-        behaviour_counts_over_time = {
-            "EarningsMaxBehaviour": [],
-            "GreedyDistanceBehaviour": [],
-            "LazyBehaviour": []
-        }
-        cumulative_counts = {
-            "EarningsMaxBehaviour": 0,
-            "GreedyDistanceBehaviour": 0,
-            "LazyBehaviour": 0
-        }
-
-        # Process each delivery event in chronological order
-        for ev in deliveries_sorted:
-            driver_id = ev.driver_id if ev.driver_id is not None else -1
-            name = _get_behaviour_name(driver_id, ev.timestamp)
-
-            # If behaviour name is not one of the known keys, treat as Unknown
-            if name not in cumulative_counts:
-                name = "Unknown"
-
-            cumulative_counts[name] += 1
-            times.append(ev.timestamp)
-
-            # Record snapshot for each behaviour
-            for key in behaviour_counts_over_time:
-                behaviour_counts_over_time[key].append(cumulative_counts[key])
+        # Behaviour of the delivering driver at each delivery tick, looked up all at once
+        codes = self.behaviour_timeline.codes_at(deliveries['driver_id'], deliveries['timestamp'])
+        behaviour_names = self.behaviour_timeline.behaviour_names
+
+        # Cumulative counts per behaviour over time, one snapshot per delivery
+        times = deliveries['timestamp']
+        behaviour_counts_over_time = {}
+        for name in ("EarningsMaxBehaviour", "GreedyDistanceBehaviour", "LazyBehaviour"):
+            if name in behaviour_names:
+                behaviour_counts_over_time[name] = np.cumsum(codes == behaviour_names.index(name))
+            else:
+                behaviour_counts_over_time[name] = np.zeros(len(codes), dtype=np.int64)
 
         # Plot lines. We only draw a line if it has non-zero values to keep the plot clean.
         plt.figure(figsize=(10, 6))
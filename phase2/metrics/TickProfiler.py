@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import time
+from enum import Enum
+
+import numpy as np
+
+
+class TickPhase(Enum):
+    GENERATION = 0
+    WAIT_UPDATE = 1
+    DISPATCH = 2
+    OFFERS = 3
+    RESOLUTION = 4
+    MOVEMENT = 5
+    MUTATION = 6
+    TIME_ADVANCE = 7
+
+
+class TickProfiler:
+    """
+    Records the wall time and the number of items processed of every phase of every
+    simulation tick.
+
+    Times come from time.perf_counter_ns and are stored in a preallocated (ticks, phases)
+    int64 array, which doubles in size when full. Items (requests generated, waiting requests
+    dispatched, offers created and resolved, drivers moved and mutated) are summed per phase
+    over all ticks. Recording a phase is one subtraction and two array writes.
+
+    Each finished phase is recorded with its start time and item count: lap() reads the end
+    time itself, record() is given it. end_tick() closes the tick. The simulation shares its
+    timestamps with the TickTracer, so it calls record(). A disabled profiler is simply None in
+    the simulation, which costs one check per phase.
+
+    summary() gives per-phase items, totals, means and percentiles over the ticks and the time
+    per item, and dump() writes them as a report to the run directory
+    `phase2/metrics/runs/<run_id>/`.
+    """
+
+    DEFAULT_CAPACITY = 4096
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if not isinstance(capacity, int):
+            raise TypeError("capacity must be int")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self._durations = np.zeros((capacity, len(TickPhase)), dtype=np.int64)
+        self._items = np.zeros(len(TickPhase), dtype=np.int64)
+        self.ticks = 0
+
+    def __str__(self) -> str:
+        return f"TickProfiler(ticks={self.ticks})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def lap(self, phase: TickPhase, start: int, items: int = 0) -> int:
+        """
+        Add the time since `start` to a phase of the current tick.
+
+        Args:
+            phase (TickPhase): Phase that just finished
+            start (int): perf_counter_ns() value at which the phase started
+            items (int): Number of items the phase processed
+
+        Returns:
+            int: The current perf_counter_ns() value, the start of the next phase.
+        """
+        end = time.perf_counter_ns()
+        self.record(phase, start, end, items)
+        return end
+
+    def record(self, phase: TickPhase, start: int, end: int, items: int = 0) -> None:
+        """
+        Add the time between two perf_counter_ns() values to a phase of the current tick.
+
+        Args:
+            phase (TickPhase): Phase that just finished
+            start (int): Time at which the phase started
+            end (int): Time at which the phase ended
+            items (int): Number of items the phase processed
+        """
+        self._durations[self.ticks, phase.value] += end - start
+        self._items[phase.value] += items
+
+    def end_tick(self) -> None:
+        """
+        Close the current tick, growing the arrays if they are full.
+        """
+        self.ticks += 1
+        if self.ticks == len(self._durations):
+            grown = np.zeros((2 * len(self._durations), len(TickPhase)), dtype=np.int64)
+            grown[:self.ticks] = self._durations
+            self._durations = grown
+
+    def durations(self) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (ticks, phases) nanoseconds spent in each phase of each finished tick.
+        """
+        return self._durations[:self.ticks]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Summarise the finished ticks per phase.
+
+        Returns:
+            dict: Phase name -> items, total_ms, share (of the total time), mean_us, p50_us
+                and p99_us (per tick), and us_per_item.
+        """
+        durations = self.durations()
+        grand_total = int(durations.sum())
+        summary = {}
+        for phase in TickPhase:
+            column = durations[:, phase.value]
+            total = int(column.sum())
+            items = int(self._items[phase.value])
+            summary[phase.name] = {
+                'items': items,
+                'total_ms': total / 1e6,
+                'share': total / grand_total if grand_total else 0.0,
+                'mean_us': float(column.mean()) / 1e3 if len(column) else 0.0,
+                'p50_us': float(np.percentile(column, 50)) / 1e3 if len(column) else 0.0,
+                'p99_us': float(np.percentile(column, 99)) / 1e3 if len(column) else 0.0,
+                'us_per_item': total / items / 1e3 if items else 0.0,
+            }
+        return summary
+
+    def report(self) -> str:
+        """
+        Returns:
+            str: The summary as a table, one line per phase.
+        """
+        lines = [f"Tick profile over {self.ticks} ticks",
+                 f"{'phase':<14} {'items':>10} {'total ms':>10} {'share':>7} {'mean us':>10} "
+                 f"{'p50 us':>10} {'p99 us':>10} {'us/item':>10}"]
+        for name, row in self.summary().items():
+            lines.append(f"{name:<14} {row['items']:>10} {row['total_ms']:>10.2f} {row['share']:>7.1%} "
+                         f"{row['mean_us']:>10.1f} {row['p50_us']:>10.1f} {row['p99_us']:>10.1f} "
+                         f"{row['us_per_item']:>10.2f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, run_id: str, path: str | None = None) -> str | None:
+        """
+        Write the report to `<run_id>_profile.txt` in the run directory.
+
+        Args:
+            run_id (str): Unique identifier for the simulation run
+            path (str | None): Where to write the report instead
+
+        Returns:
+            Path of the written report, or None for test runs (nothing is written).
+        """
+        if path is None:
+            if "test_run" in run_id:
+                return None
+            base_dir = os.path.abspath(os.path.dirname(__file__))
+            run_dir = os.path.join(base_dir, "runs", run_id)
+            os.makedirs(run_dir, exist_ok=True)
+            path = os.path.join(run_dir, f"{run_id}_profile.txt")
+
+        with open(path, 'w') as f:
+            f.write(self.report())
+        return path
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+
+from phase2.metrics.TickProfiler import TickPhase
+
+# Name of the span of each phase, the method (or call) the phase runs. Dispatch builds the
+# tick's CostMatrix and then calls the dispatch policy, each with a nested span of its own.
+SPAN_NAMES = {
+    TickPhase.GENERATION: "request_generator.maybe_generate",
+    TickPhase.WAIT_UPDATE: "_update_req_wait_times",
+    TickPhase.DISPATCH: "dispatch",
+    TickPhase.OFFERS: "_create_offers",
+    TickPhase.RESOLUTION: "_assign_and_resolve_offers",
+    TickPhase.MOVEMENT: "_move_drivers",
+    TickPhase.MUTATION: "_mutate_drivers",
+    TickPhase.TIME_ADVANCE: "event_manager.end_tick",
+}
+
+
+class TickTracer:
+    """
+    Records every simulation tick as a timeline of spans and exports it in the Chrome
+    trace-event format, which opens in chrome://tracing and Perfetto.
+
+    Each tick is one "tick" span with a nested span per phase (see SPAN_NAMES), and phases
+    may contain nested spans of their own (see region). Spans carry counts such as the number
+    of idle drivers and waiting requests as arguments. They are kept in memory as plain tuples
+    of perf_counter_ns() values and only converted to JSON by dump(), at the end of the run,
+    so tracing does not write anything while ticks are timed.
+    """
+
+    def __init__(self) -> None:
+        # (name, category, start, end, args) per span, in the order the spans ended
+        self._spans: list[tuple[str, str, int, int, dict]] = []
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __str__(self) -> str:
+        return f"TickTracer(ticks={self.ticks}, spans={len(self)})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def span(self, phase: TickPhase, start: int, end: int, args: dict) -> None:
+        """
+        Record the span of a phase.
+
+        Args:
+            phase (TickPhase): Phase that just finished
+            start (int): perf_counter_ns() value at which the phase started
+            end (int): perf_counter_ns() value at which the phase ended
+            args (dict): Counts to show with the span
+        """
+        self._spans.append((SPAN_NAMES[phase], "phase", start, end, args))
+
+    def region(self, name: str, start: int, end: int, args: dict) -> None:
+        """
+        Record a span inside a phase, e.g. the CostMatrix build or the policy call of dispatch.
+
+        Args:
+            name (str): Name of the span
+            start (int): perf_counter_ns() value at which the span started
+            end (int): perf_counter_ns() value at which the span ended
+            args (dict): Counts to show with the span
+        """
+        self._spans.append((name, "region", start, end, args))
+
+    def end_tick(self, start: int, end: int, args: dict) -> None:
+        """
+        Record the span of a whole tick, around the spans of its phases.
+
+        Args:
+            start (int): perf_counter_ns() value at which the tick started
+            end (int): perf_counter_ns() value at which the tick ended
+            args (dict): Counts to show with the span, e.g. the simulation time
+        """
+        self._spans.append(("tick", "tick", start, end, args))
+        self.ticks += 1
+
+    def trace_events(self, run_id: str) -> list[dict]:
+        """
+        Convert the spans to trace events. Times are in microseconds from the first span.
+
+        Args:
+            run_id (str): Unique identifier for the simulation run, shown as the process name
+
+        Returns:
+            list[dict]: A process name event followed by one complete ("X") event per span.
+        """
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": f"run {run_id}"}}]
+        if not self._spans:
+            return events
+
+        origin = min(start for _, _, start, _, _ in self._spans)
+        for name, category, start, end, args in self._spans:
+            events.append({"name": name,
+                           "cat": category,
+                           "ph": "X",
+                           "ts": (start - origin) / 1e3,
+                           "dur": (end - start) / 1e3,
+                           "pid": 1,
+                           "tid": 1,
+                           "args": args})
+        return events
+
+    def dump(self, run_id: str, path: str | None = None) -> str | None:
+        """
+        Write the trace to `<run_id>_trace.json` in the run directory.
+
+        Args:
+            run_id (str): Unique identifier for the simulation run
+            path (str | None): Where to write the trace instead
+
+        Returns:
+            Path of the written trace, or None for test runs (nothing is written).
+        """
+        if path is None:
+            if "test_run" in run_id:
+                return None
+            base_dir = os.path.abspath(os.path.dirname(__file__))
+            run_dir = os.path.join(base_dir, "runs", run_id)
+            os.makedirs(run_dir, exist_ok=True)
+            path = os.path.join(run_dir, f"{run_id}_trace.json")
+
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": self.trace_events(run_id), "displayTimeUnit": "ms"}, f)
+        return path
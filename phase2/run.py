@@ -0,0 +1,224 @@
+"""
+Run a phase 2 simulation without the GUI.
+
+Builds a DeliverySimulation from command line parameters, runs it for a fixed number of
+ticks as fast as possible and prints the throughput and the final statistics. Events are
+written to `phase2/metrics/runs/<run_id>/` like in a GUI run, and the metrics plots can be
+saved there afterwards with a non-interactive matplotlib backend.
+
+Run with `python -m phase2.run`, see --help for the parameters.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import time
+
+from phase2.Checkpointer import Checkpointer
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.DriverGenerator import DriverGenerator
+from phase2.EventDrivenSimulation import EventDrivenSimulation
+from phase2.MutationRule import MutationRule
+from phase2.PoissonRequestGenerator import PoissonRequestGenerator
+from phase2.RandomStreams import RandomStreams
+from phase2.RateProfile import RateProfile
+from phase2.RequestGenerator import RequestGenerator
+from phase2.TraceRequestSource import TraceRequestSource
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+from phase2.dispatch.NearestNeighborPolicy import NearestNeighborPolicy
+from phase2.dispatch.OptimalAssignmentPolicy import OptimalAssignmentPolicy
+from phase2.metrics.Event import Event, EventType
+
+POLICIES = {
+    "global_greedy": GlobalGreedyPolicy,
+    "nearest_neighbor": NearestNeighborPolicy,
+    "optimal": OptimalAssignmentPolicy,
+}
+
+ENGINES = {
+    "tick": DeliverySimulation,
+    "event": EventDrivenSimulation,
+}
+
+
+def parse_demand_curve(text: str) -> list[tuple[float, float]]:
+    """
+    Parse a demand curve like "0:0.5,100:3,150:0.5" into (time, rate) points.
+    """
+    try:
+        return [(float(time), float(rate)) for time, rate in (point.split(":") for point in text.split(","))]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid demand curve {text!r}, expected time:rate,time:rate,...")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a phase 2 delivery simulation without the GUI.")
+    parser.add_argument("--drivers", type=int, default=50, help="number of drivers")
+    parser.add_argument("--rate", type=float, default=0.5, help="expected new requests per tick")
+    parser.add_argument("--timeout", type=int, default=30, help="ticks before a request expires")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="global_greedy", help="dispatch policy")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks to run (the horizon)")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the run's random streams")
+    parser.add_argument("--rng", choices=RandomStreams.KINDS, default="python",
+                        help="generator of the random streams: random.Random or numpy.random.Generator")
+    parser.add_argument("--width", type=int, default=50, help="width of the map")
+    parser.add_argument("--height", type=int, default=30, help="height of the map")
+    parser.add_argument("--speed", type=float, default=3.0, help="speed of the drivers")
+    parser.add_argument("--n-trips", type=int, default=5, help="trips the mutation rule looks back on")
+    parser.add_argument("--threshold", type=float, default=0.7, help="earnings threshold of the mutation rule")
+    parser.add_argument("--run-id", default=None, help="run id, defaults to the current time. "
+                                                       "Run ids containing 'test_run' write no events")
+    parser.add_argument("--event-format", choices=["csv", "binary", "async"], default="csv",
+                        help="how events are written")
+    parser.add_argument("--cascade-rounds", type=int, default=0, help="offer cascade rounds per tick")
+    parser.add_argument("--demand-curve", type=parse_demand_curve, default=None, metavar="TIME:RATE,...",
+                        help="Poisson demand following this rate curve instead of the constant --rate")
+    parser.add_argument("--demand-period", type=float, default=None, help="period after which the curve repeats")
+    parser.add_argument("--demand-kind", choices=RateProfile.KINDS, default="step",
+                        help="hold (step) or interpolate (linear) the rate between curve points")
+    parser.add_argument("--replay", default=None, metavar="PATH",
+                        help="replay the requests of a CSV trace, sorted by request time, instead of generating them")
+    parser.add_argument("--batch-ticks", type=int, default=0,
+                        help="ticks of requests drawn per NumPy call, 0 draws every request on its own")
+    parser.add_argument("--checkpoint", default=None, metavar="PATH", help="file to save checkpoints to")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="ticks between checkpoints")
+    parser.add_argument("--checkpoint-mode", choices=Checkpointer.MODES, default=None,
+                        help="write checkpoints from a forked process (default where available) or a thread")
+    parser.add_argument("--resume", default=None, metavar="PATH",
+                        help="continue the run saved in a checkpoint up to --ticks, the simulation "
+                             "parameters are taken from the checkpoint")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="tick",
+                        help="step every tick, or jump between events (faster when demand is sparse)")
+    parser.add_argument("--vectorized", action="store_true", help="move drivers with NumPy")
+    parser.add_argument("--profile", action="store_true", help="write a per-phase timing report")
+    parser.add_argument("--trace", action="store_true", help="write a Chrome trace of the ticks")
+    parser.add_argument("--metrics", action="store_true", help="save the metrics plots after the run")
+    return parser.parse_args(argv)
+
+
+def build_simulation(args: argparse.Namespace, run_id: str) -> DeliverySimulation:
+    """
+    Create the drivers and the simulation described by the arguments.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+        run_id (str): Unique identifier for the simulation run
+
+    Returns:
+        DeliverySimulation: The simulation at time 0.
+    """
+    # Independent demand, fleet and mutation streams, so runs with the same seed are identical
+    streams = RandomStreams(args.seed, kind=args.rng)
+
+    if args.replay is not None:
+        request_generator = TraceRequestSource(args.replay, width=args.width, height=args.height, start_id=1,
+                                               run_id=run_id)
+    elif args.demand_curve is not None:
+        profile = RateProfile(args.demand_curve, period=args.demand_period, kind=args.demand_kind)
+        request_generator = PoissonRequestGenerator(profile, width=args.width, height=args.height, start_id=1,
+                                                    run_id=run_id, rng=streams.demand)
+    else:
+        request_generator = RequestGenerator(rate=args.rate, width=args.width, height=args.height, start_id=1,
+                                             run_id=run_id, rng=streams.demand, batch_ticks=args.batch_ticks)
+
+    driver_generator = DriverGenerator(run_id, rng=streams.fleet)
+    drivers = driver_generator.generate(amount=args.drivers, width=args.width, height=args.height,
+                                        speed=args.speed, start_id=1)
+    simulation = ENGINES[args.engine](time=0,
+                                      width=args.width,
+                                      height=args.height,
+                                      drivers=drivers,
+                                      requests=[],
+                                      request_generator=request_generator,
+                                      dispatch_policy=POLICIES[args.policy](),
+                                      mutation_rule=MutationRule(n_trips=args.n_trips, threshold=float(args.threshold),
+                                                                 run_id=run_id, rng=streams.mutation),
+                                      timeout=args.timeout,
+                                      statistics={"served": 0, "expired": 0, "served_waits": []},
+                                      run_id=run_id,
+                                      vectorized=args.vectorized,
+                                      cascade_rounds=args.cascade_rounds,
+                                      profile=args.profile,
+                                      trace=args.trace)
+
+    if args.event_format == "binary":
+        simulation.event_manager.use_binary_writer()
+    elif args.event_format == "async":
+        simulation.event_manager.use_async_writer()
+
+    # Log the initial behaviour of each driver, so early deliveries are attributed correctly
+    simulation.event_manager.add_events([Event(timestamp=0,
+                                               event_type=EventType.DRIVER_GENERATED_BEHAVIOUR,
+                                               driver_id=driver.id,
+                                               request_id=None,
+                                               wait_time=None,
+                                               behaviour_name=type(driver.behaviour).__name__)
+                                         for driver in drivers])
+    return simulation
+
+
+def run(simulation: DeliverySimulation, ticks: int) -> float:
+    """
+    Run a simulation for a number of ticks and flush its events.
+
+    Args:
+        simulation (DeliverySimulation): Simulation to run
+        ticks (int): Number of ticks
+
+    Returns:
+        float: Seconds spent, including writing the remaining events and the last checkpoint.
+    """
+    start = time.perf_counter()
+    simulation.run_until(simulation.time + ticks)
+    if simulation.checkpointer is not None:
+        simulation.checkpointer.wait()
+    simulation.event_manager.close()
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.resume is not None:
+        simulation = DeliverySimulation.load_checkpoint(args.resume)
+        run_id = simulation.run_id
+    else:
+        run_id = args.run_id or datetime.datetime.now().strftime("%H%M%S_%d%m%y")
+        simulation = build_simulation(args, run_id)
+    if args.checkpoint is not None:
+        simulation.checkpointer = Checkpointer(args.checkpoint, args.checkpoint_every, mode=args.checkpoint_mode)
+
+    # --ticks is the horizon, a resumed run only runs the ticks left
+    ticks = max(args.ticks - simulation.time, 0)
+    seconds = run(simulation, ticks)
+
+    statistics = simulation.statistics
+    waits = statistics["served_waits"]
+    print(f"run {run_id}: {ticks} ticks in {seconds:.3f} s ({ticks / seconds if seconds else 0.0:.1f} ticks/sec)")
+    print(f"served: {statistics['served']}, expired: {statistics['expired']}, "
+          f"avg wait: {sum(waits) / len(waits) if waits else 0.0:.2f}")
+    if "cascade_rounds" in statistics:
+        print(f"cascade rounds: {statistics['cascade_rounds']}")
+    if isinstance(simulation, EventDrivenSimulation):
+        print(f"ticks with events: {simulation.processed_ticks}")
+    if simulation.checkpointer is not None:
+        print(simulation.checkpointer.report())
+
+    if simulation.profiler is not None:
+        print(simulation.profiler.report(), end="")
+        simulation.profiler.dump(run_id)
+    if simulation.tracer is not None:
+        path = simulation.tracer.dump(run_id)
+        if path is not None:
+            print(f"trace: {path}")
+
+    if args.metrics:
+        # Save the plots without opening windows
+        import matplotlib
+        matplotlib.use("Agg")
+        from phase2.metrics.MetricsManager import MetricsManager
+
+        MetricsManager(run_id=run_id).generate_plots(save=True)
+
+
+if __name__ == "__main__":
+    main()
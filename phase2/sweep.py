@@ -0,0 +1,80 @@
+"""
+Run a parameter sweep of phase 2 simulations in a process pool, without the GUI.
+
+Example:
+    python -m phase2.sweep --grid rate=0.5,1.0 timeout=20,30 policy=global_greedy,nearest_neighbor \
+        --replications 3 --ticks 500 --workers 4
+
+Each grid entry is `name=value,value,...` with the names of the options of phase2.run
+(with underscores, e.g. n_trips). Results are appended to a CSV, and running the same
+command again resumes an interrupted sweep. See ParameterSweep.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+
+from phase2.ParameterSweep import ParameterSweep
+
+
+def parse_value(text: str):
+    """
+    Convert a grid value to bool, int or float when it looks like one, otherwise keep the text.
+    """
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_grid(entries: list[str]) -> dict[str, list]:
+    grid = {}
+    for entry in entries:
+        name, sep, values = entry.partition("=")
+        if not sep or not values:
+            raise ValueError(f"grid entries look like name=value,value, got {entry!r}")
+        grid[name.replace("-", "_")] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a parameter sweep of phase 2 simulations.")
+    parser.add_argument("--grid", nargs="+", required=True, metavar="NAME=VALUES",
+                        help="parameter values to combine, e.g. rate=0.5,1.0")
+    parser.add_argument("--replications", type=int, default=1, help="runs per configuration")
+    parser.add_argument("--ticks", type=int, default=1000, help="ticks per run")
+    parser.add_argument("--seed", type=int, default=0, help="seed the run seeds are derived from")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--sweep-id", default=None, help="sweep id, defaults to the current time")
+    parser.add_argument("--results", default=None, help="results CSV, defaults to the sweep's run folder")
+    parser.add_argument("--write-events", action="store_true", help="write the events of every run")
+    args = parser.parse_args(argv)
+
+    sweep = ParameterSweep(sweep_id=args.sweep_id or datetime.datetime.now().strftime("sweep_%H%M%S_%d%m%y"),
+                           grid=parse_grid(args.grid),
+                           replications=args.replications,
+                           base={'ticks': args.ticks},
+                           seed=args.seed,
+                           results_path=args.results,
+                           write_events=args.write_events)
+
+    def progress(finished: int, total: int) -> None:
+        print(f"\r{finished}/{total} runs", end="", flush=True)
+
+    sweep.run(max_workers=args.workers, progress=progress)
+    print()
+    print(f"results: {sweep.results_path}")
+
+    names = list(sweep.grid)
+    print(" ".join(f"{name:>16}" for name in names) + f" {'runs':>5} {'served':>9} {'expired':>9} {'avg wait':>9}")
+    for row in sweep.summary():
+        print(" ".join(f"{str(row[name]):>16}" for name in names) +
+              f" {row['replications']:>5} {row['served']:>9.1f} {row['expired']:>9.1f} {row['avg_wait']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
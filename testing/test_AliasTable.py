@@ -0,0 +1,57 @@
+import random
+import unittest
+from collections import Counter
+
+from phase2.AliasTable import AliasTable
+
+
+class TestAliasTable(unittest.TestCase):
+
+    def test_frequencies_follow_weights(self):
+        weights = [1, 0, 3, 6]
+        table = AliasTable(weights)
+        rng = random.Random(4)
+        n = 40000
+        counts = Counter(table.sample(rng) for _ in range(n))
+
+        self.assertEqual(counts[1], 0)
+        for i, weight in enumerate(weights):
+            self.assertAlmostEqual(counts[i] / n, weight / sum(weights), delta=0.01)
+
+    def test_single_weight(self):
+        table = AliasTable([2.5])
+        self.assertEqual({table.sample(random.Random(1)) for _ in range(10)}, {0})
+        self.assertEqual(len(table), 1)
+
+    def test_2d_weights_are_flattened(self):
+        table = AliasTable([[0, 0], [0, 1]])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.sample(random.Random(1)), 3)
+
+    def test_column_probabilities_add_up(self):
+        weights = [5, 1, 1, 1, 2]
+        table = AliasTable(weights)
+        mass = [0.0] * len(weights)
+        for column, (prob, alias) in enumerate(zip(table.prob, table.alias)):
+            mass[column] += prob / len(weights)
+            mass[alias] += (1 - prob) / len(weights)
+
+        for got, weight in zip(mass, weights):
+            self.assertAlmostEqual(got, weight / sum(weights))
+
+    def test_invalid_weights(self):
+        with self.assertRaises(ValueError):
+            AliasTable([])
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+        with self.assertRaises(ValueError):
+            AliasTable([1, -1])
+
+    def test_str_representation(self):
+        table = AliasTable([1, 2])
+        self.assertEqual(str(table), "AliasTable(size=2)")
+        self.assertEqual(repr(table), str(table))
+
+
+if __name__ == '__main__':
+    unittest.main()
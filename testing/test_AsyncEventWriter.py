@@ -0,0 +1,150 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from phase2.metrics.AsyncEventWriter import AsyncEventWriter, BackpressurePolicy
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import CSV_HEADER
+
+
+class GatedAsyncEventWriter(AsyncEventWriter):
+    """Writer whose thread stalls on the first record until the gate is opened."""
+
+    def __init__(self, *args, **kwargs):
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        super().__init__(*args, **kwargs)
+
+    def format_record(self, record):
+        if threading.current_thread() is self._thread:
+            self.started.set()
+            self.gate.wait()
+        return super().format_record(record)
+
+
+def idle_event(driver_id):
+    return Event(1, EventType.DRIVER_IDLE, driver_id, None, 1)
+
+
+def expired_event(request_id):
+    return Event(1, EventType.REQUEST_EXPIRED, None, request_id, None)
+
+
+class TestAsyncEventWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, "run.csv")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _lines(self):
+        with open(self.filepath) as f:
+            return f.read().splitlines()[1:]
+
+    def _stall(self, writer):
+        # First record is taken by the thread, which then waits on the gate; the queue is empty again
+        writer.add(idle_event(0))
+        writer.started.wait()
+
+    def test_events_are_written_by_background_thread(self):
+        writer = AsyncEventWriter(self.filepath)
+        for i in range(100):
+            writer.add(expired_event(i))
+
+        writer.flush()
+
+        self.assertEqual(len(self._lines()), 100)
+        self.assertEqual(self._lines()[0], "1, 5, None, 0, None, None")
+        writer.close()
+
+    def test_close_stops_thread(self):
+        writer = AsyncEventWriter(self.filepath)
+        writer.add(expired_event(1))
+
+        writer.close()
+
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual(self._lines(), ["1, 5, None, 1, None, None"])
+
+    def test_drop_idle_policy_drops_idle_events_when_full(self):
+        writer = GatedAsyncEventWriter(self.filepath, queue_size=1, backpressure=BackpressurePolicy.DROP_IDLE)
+        self._stall(writer)
+        writer.add(expired_event(1))  # fills the queue
+
+        writer.add(idle_event(2))  # queue full, dropped
+
+        writer.gate.set()
+        writer.close()
+        self.assertEqual(writer.dropped, 1)
+        self.assertEqual(len(self._lines()), 2)
+
+    def test_drop_idle_policy_drops_whole_block_of_driver_events(self):
+        writer = GatedAsyncEventWriter(self.filepath, queue_size=1, backpressure=BackpressurePolicy.DROP_IDLE)
+        self._stall(writer)
+        writer.add_driver_events(1, EventType.DRIVER_IDLE, np.array([1, 2]), np.array([1, 1]))  # one queue item
+
+        writer.add_driver_events(1, EventType.DRIVER_IDLE, np.array([3, 4, 5]), np.array([1, 1, 1]))
+
+        writer.gate.set()
+        writer.close()
+        self.assertEqual(writer.dropped, 3)
+        self.assertEqual(self._lines(), ["1, 9, 0, None, 1, None", "1, 9, 1, None, 1, None",
+                                         "1, 9, 2, None, 1, None"])
+
+    def test_spill_policy_spills_and_merges(self):
+        writer = GatedAsyncEventWriter(self.filepath, queue_size=1, backpressure=BackpressurePolicy.SPILL)
+        self._stall(writer)
+        writer.add(expired_event(1))  # fills the queue
+
+        writer.add(expired_event(2))  # queue full, spilled
+
+        writer.gate.set()
+        writer.flush()
+        self.assertEqual(writer.spilled, 1)
+        self.assertEqual(len(self._lines()), 3)
+        self.assertFalse(os.path.exists(writer.spill_path))
+        writer.close()
+
+    def test_spill_policy_writes_spilled_events_in_blocks(self):
+        writer = GatedAsyncEventWriter(self.filepath, buffer_size=3, queue_size=1,
+                                       backpressure=BackpressurePolicy.SPILL)
+        self._stall(writer)
+        writer.add(expired_event(1))  # fills the queue
+
+        writer.add(expired_event(2))
+        writer.add(expired_event(3))
+        self.assertFalse(os.path.exists(writer.spill_path))
+        writer.add_driver_events(1, EventType.DRIVER_IDLE, np.array([4, 5]), np.array([1, 1]))
+        self.assertTrue(os.path.exists(writer.spill_path))
+        writer.add(expired_event(6))  # buffered again
+
+        writer.gate.set()
+        writer.close()
+        self.assertEqual(writer.spilled, 5)
+        self.assertEqual(len(self._lines()), 7)
+        self.assertEqual(self._lines()[-1], "1, 5, None, 6, None, None")
+
+    def test_clear_resets_file(self):
+        writer = AsyncEventWriter(self.filepath)
+        writer.add(expired_event(1))
+
+        writer.clear()
+        writer.close()
+
+        with open(self.filepath) as f:
+            self.assertEqual(f.read(), CSV_HEADER)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AsyncEventWriter(self.filepath, queue_size=0)
+        with self.assertRaises(TypeError):
+            AsyncEventWriter(self.filepath, backpressure="block")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from phase2.metrics.BehaviourTimeline import BehaviourTimeline
+from phase2.metrics.BinaryEventLog import NO_BEHAVIOUR
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventIndex import EventIndex
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
+
+EVENTS = [
+    Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 1, None, None, "EarningsMaxBehaviour"),
+    Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 5, None, None, "LazyBehaviour"),
+    Event(3, EventType.BEHAVIOUR_CHANGED, 1, None, None, "GreedyDistanceBehaviour"),
+    Event(3, EventType.REQUEST_DELIVERED, 1, 7, 3),
+    Event(6, EventType.BEHAVIOUR_CHANGED, 5, None, None, "EarningsMaxBehaviour"),
+    Event(8, EventType.BEHAVIOUR_CHANGED, 1, None, None, "LazyBehaviour"),
+    Event(8, EventType.BEHAVIOUR_CHANGED, 1, None, None, "EarningsMaxBehaviour"),
+    Event(4, EventType.BEHAVIOUR_CHANGED, 9, None, None, "LazyBehaviour"),
+]
+
+
+class TestBehaviourTimeline(unittest.TestCase):
+
+    def setUp(self):
+        index = EventIndex.from_csv_lines([CSV_HEADER] + [EventWriter.format_line(e) for e in EVENTS])
+        self.timeline = BehaviourTimeline.from_index(index)
+
+    def test_only_behaviour_events_are_used(self):
+        self.assertEqual(len(self.timeline), 7)
+        self.assertEqual(self.timeline.driver_ids.tolist(), [1, 5, 9])
+
+    def test_behaviour_at(self):
+        self.assertEqual(self.timeline.behaviour_at(1, 0), "EarningsMaxBehaviour")
+        self.assertEqual(self.timeline.behaviour_at(1, 2), "EarningsMaxBehaviour")
+        self.assertEqual(self.timeline.behaviour_at(1, 3), "GreedyDistanceBehaviour")
+        self.assertEqual(self.timeline.behaviour_at(5, 5), "LazyBehaviour")
+        self.assertEqual(self.timeline.behaviour_at(5, 6), "EarningsMaxBehaviour")
+
+    def test_last_logged_change_wins_on_ties(self):
+        self.assertEqual(self.timeline.behaviour_at(1, 8), "EarningsMaxBehaviour")
+
+    def test_after_last_change(self):
+        self.assertEqual(self.timeline.behaviour_at(1, 1000), "EarningsMaxBehaviour")
+        self.assertEqual(self.timeline.behaviour_at(9, 1000), "LazyBehaviour")
+
+    def test_unknown_before_first_change(self):
+        self.assertIsNone(self.timeline.behaviour_at(9, 3))
+        self.assertIsNone(self.timeline.behaviour_at(1, -5))
+
+    def test_unknown_driver(self):
+        self.assertIsNone(self.timeline.behaviour_at(2, 5))
+        self.assertIsNone(self.timeline.behaviour_at(0, 5))
+        self.assertIsNone(self.timeline.behaviour_at(100, 5))
+
+    def test_codes_at_matches_scalar_lookups(self):
+        driver_ids = np.array([1, 1, 5, 9, 9, 2, 1, 5])
+        times = np.array([0, 3, 6, 3, 4, 1, 9, 0])
+
+        codes = self.timeline.codes_at(driver_ids, times)
+        names = self.timeline.names_at(driver_ids, times)
+
+        self.assertEqual(names, [self.timeline.behaviour_at(d, t) for d, t in zip(driver_ids, times)])
+        self.assertEqual(codes[5], NO_BEHAVIOUR)
+
+    def test_codes_at_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.timeline.codes_at(np.array([1, 2]), np.array([1]))
+
+    def test_empty_timeline(self):
+        timeline = BehaviourTimeline.from_index(EventIndex.from_csv_lines([CSV_HEADER]))
+
+        self.assertEqual(len(timeline), 0)
+        self.assertIsNone(timeline.behaviour_at(1, 1))
+        self.assertEqual(timeline.codes_at(np.array([1, 2]), np.array([0, 1])).tolist(), [NO_BEHAVIOUR, NO_BEHAVIOUR])
+
+    def test_rejects_other_arrays(self):
+        with self.assertRaises(TypeError):
+            BehaviourTimeline([1, 2], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+from phase2.metrics.BinaryEventLog import BinaryEventLog, EVENT_DTYPE, NONE, NO_BEHAVIOUR
+from phase2.metrics.BinaryEventWriter import BinaryEventWriter
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
+
+EVENTS = [
+    Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 1, None, None, "EarningsMaxBehaviour"),
+    Event(1, EventType.REQUEST_GENERATED, None, 7, None),
+    Event(2, EventType.DRIVER_IDLE, 1, None, 2),
+    Event(3, EventType.BEHAVIOUR_CHANGED, 1, None, None, "GreedyDistanceBehaviour"),
+]
+
+
+class TestBinaryEventLog(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "run.csv")
+        writer = BinaryEventWriter(self.csv_path)
+        for event in EVENTS:
+            writer.add(event)
+        writer.close()
+        self.log = BinaryEventLog(BinaryEventLog.data_path_for(self.csv_path))
+
+    def tearDown(self):
+        del self.log
+        self.tmp_dir.cleanup()
+
+    def test_records_are_structured_array(self):
+        self.assertEqual(len(self.log), 4)
+        self.assertEqual(self.log.records.dtype, EVENT_DTYPE)
+        self.assertEqual(self.log.records['timestamp'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(self.log.records['event_type'].tolist(), [10, 1, 9, 8])
+        self.assertEqual(self.log.records['request_id'].tolist(), [NONE, 7, NONE, NONE])
+
+    def test_behaviour_names_are_interned(self):
+        self.assertEqual(self.log.behaviour_names, ["EarningsMaxBehaviour", "GreedyDistanceBehaviour"])
+        self.assertEqual(self.log.records['behaviour'].tolist(), [0, NO_BEHAVIOUR, NO_BEHAVIOUR, 1])
+
+    def test_to_events_round_trip(self):
+        self.assertEqual(self.log.to_events(), EVENTS)
+
+    def test_negative_values_are_not_missing(self):
+        events = [Event(4, EventType.REQUEST_DELIVERED, -1, -1, -1)]
+        writer = BinaryEventWriter(self.csv_path)
+        writer.clear()
+        writer.add_many(events)
+        writer.close()
+
+        self.assertEqual(BinaryEventLog(BinaryEventLog.data_path_for(self.csv_path)).to_events(), events)
+
+    def test_export_csv_matches_csv_writer(self):
+        out_path = os.path.join(self.tmp_dir.name, "export.csv")
+        self.log.export_csv(out_path)
+
+        with open(out_path) as f:
+            self.assertEqual(f.read(), CSV_HEADER + ''.join(EventWriter.format_line(e) for e in EVENTS))
+
+    def test_empty_log(self):
+        csv_path = os.path.join(self.tmp_dir.name, "empty.csv")
+        BinaryEventWriter(csv_path).close()
+
+        log = BinaryEventLog(BinaryEventLog.data_path_for(csv_path))
+
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.to_events(), [])
+
+    def test_rejects_other_files(self):
+        with open(self.csv_path, 'w') as f:
+            f.write(CSV_HEADER)
+
+        with self.assertRaises(ValueError):
+            BinaryEventLog(self.csv_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from phase2.metrics.BinaryEventLog import BinaryEventLog
+from phase2.metrics.BinaryEventWriter import BinaryEventWriter
+from phase2.metrics.Event import Event, EventType
+
+
+class TestBinaryEventWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp_dir.name, "run", "run.csv")
+        self.data_path = BinaryEventLog.data_path_for(self.csv_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_writes_next_to_csv_path(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.close()
+
+        self.assertTrue(os.path.exists(self.data_path))
+        self.assertFalse(os.path.exists(self.csv_path))
+
+    def test_records_are_buffered_until_flush(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+        self.assertEqual(len(BinaryEventLog(self.data_path)), 0)
+
+        writer.flush()
+
+        self.assertEqual(len(BinaryEventLog(self.data_path)), 1)
+        writer.close()
+
+    def test_add_many_records(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add_many([Event(1, EventType.REQUEST_GENERATED, None, 1, None),
+                         Event(2, EventType.BEHAVIOUR_CHANGED, 1, None, None, "EarningsMaxBehaviour")])
+        writer.close()
+
+        events = BinaryEventLog(self.data_path).to_events()
+        self.assertEqual([event.request_id for event in events], [1, None])
+        self.assertEqual(events[1].behaviour_name, "EarningsMaxBehaviour")
+
+    def test_driver_events_follow_buffered_records(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+        writer.add_driver_events(2, EventType.DRIVER_IDLE, np.array([3, 7]), np.array([1, 12]))
+        writer.close()
+
+        self.assertEqual(BinaryEventLog(self.data_path).to_events(),
+                         [Event(1, EventType.REQUEST_GENERATED, None, 1, None),
+                          Event(2, EventType.DRIVER_IDLE, 3, None, 1),
+                          Event(2, EventType.DRIVER_IDLE, 7, None, 12)])
+
+    def test_reopening_continues_log_and_side_table(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add(Event(1, EventType.BEHAVIOUR_CHANGED, 1, None, None, "EarningsMaxBehaviour"))
+        writer.close()
+
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add(Event(2, EventType.BEHAVIOUR_CHANGED, 1, None, None, "GreedyDistanceBehaviour"))
+        writer.add(Event(3, EventType.BEHAVIOUR_CHANGED, 1, None, None, "EarningsMaxBehaviour"))
+        writer.close()
+
+        log = BinaryEventLog(self.data_path)
+        self.assertEqual(log.behaviour_names, ["EarningsMaxBehaviour", "GreedyDistanceBehaviour"])
+        self.assertEqual(log.records['behaviour'].tolist(), [0, 1, 0])
+
+    def test_clear_empties_log(self):
+        writer = BinaryEventWriter(self.csv_path)
+        writer.add(Event(1, EventType.BEHAVIOUR_CHANGED, 1, None, None, "EarningsMaxBehaviour"))
+        writer.flush()
+
+        writer.clear()
+        writer.close()
+
+        log = BinaryEventLog(self.data_path)
+        self.assertEqual(len(log), 0)
+        self.assertEqual(log.behaviour_names, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
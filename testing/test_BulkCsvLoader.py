@@ -0,0 +1,156 @@
+import glob
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from phase2.BulkCsvLoader import BulkCsvLoader
+
+REQUEST_HEADER = "#request time, pickup x, pickup y , delivery x, delivery y\n"
+
+
+class TestBulkCsvLoader(unittest.TestCase):
+
+    def write(self, text):
+        f = tempfile.NamedTemporaryFile("w", delete=False, suffix=".csv")
+        f.write(text)
+        f.close()
+        self.addCleanup(self.remove, f.name)
+        return f.name
+
+    @staticmethod
+    def remove(path):
+        for file in [path] + glob.glob(f"{glob.escape(path)}.*.npy"):
+            os.remove(file)
+
+    def test_load_drivers(self):
+        path = self.write("#initial px,py\n11,22\n39.5,23\n")
+        rows, positions = BulkCsvLoader(50, 30).load_drivers(path)
+
+        self.assertEqual(rows.tolist(), [1, 2])
+        self.assertEqual(positions.tolist(), [[11.0, 22.0], [39.5, 23.0]])
+
+    def test_driver_header_aliases(self):
+        rows, positions = BulkCsvLoader(50, 30).load_drivers(self.write("y,x\n5,4\n"))
+        self.assertEqual(positions.tolist(), [[4.0, 5.0]])
+
+    def test_load_requests(self):
+        path = self.write(REQUEST_HEADER + "0,1,6,41,20\n1,4,25,3,21\n")
+        rows, values = BulkCsvLoader(50, 30).load_requests(path)
+
+        self.assertEqual(rows.tolist(), [1, 2])
+        self.assertEqual(values.dtype, np.int64)
+        self.assertEqual(values.tolist(), [[0, 1, 6, 41, 20], [1, 4, 25, 3, 21]])
+
+    def test_invalid_rows_are_counted_per_reason(self):
+        path = self.write(REQUEST_HEADER + "-1,0,0,0,0\n0,60,0,0,0\n0,0,0,0,31\nhello,1,2,3,4\n"
+                                           "0,1.5,2,3,4\n0,1,2\n\n0,1,2,3,4\n")
+        loader = BulkCsvLoader(50, 30)
+        rows, values = loader.load_requests(path)
+
+        self.assertEqual(rows.tolist(), [7])
+        self.assertEqual(values.tolist(), [[0, 1, 2, 3, 4]])
+        self.assertEqual(loader.report, {'rows': 7, 'kept': 1, 'not_a_number': 2, 'not_an_integer': 1,
+                                         'negative': 1, 'out_of_bounds': 2})
+        self.assertEqual(loader.summary("f.csv"), "f.csv: kept 1 of 7 rows (skipped 2 not a number, "
+                                                  "1 not an integer, 1 negative, 2 out of bounds)")
+
+    def test_times_outside_int64_are_rejected(self):
+        path = self.write(REQUEST_HEADER + "inf,1,2,3,4\n1e30,1,2,3,4\n-inf,1,2,3,4\n"
+                                           "9223372036854775807,1,2,3,4\n5,1,2,3,4\n")
+        loader = BulkCsvLoader(50, 30)
+        rows, values = loader.load_requests(path)
+
+        self.assertEqual(values.tolist(), [[5, 1, 2, 3, 4]])
+        self.assertEqual((loader.report['not_a_number'], loader.report['out_of_bounds']), (2, 2))
+
+    def test_infinite_positions_are_rejected(self):
+        loader = BulkCsvLoader(50, 30)
+        rows, positions = loader.load_drivers(self.write("x,y\ninf,2\n1,-inf\n3,4\n"))
+
+        self.assertEqual(positions.tolist(), [[3.0, 4.0]])
+        self.assertEqual(loader.report['not_a_number'], 2)
+
+    def test_load_custom_columns(self):
+        path = self.write("a,b,c\n1,2,3\n4,5,60\n")
+        rows, values = BulkCsvLoader(50, 30).load(path, {"c": ("c",), "a": ("a",)}, [50, 50], integer=True)
+
+        self.assertEqual(rows.tolist(), [1])
+        self.assertEqual(values.tolist(), [[3, 1]])
+
+    def test_header_only(self):
+        loader = BulkCsvLoader(50, 30)
+        rows, values = loader.load_requests(self.write(REQUEST_HEADER))
+
+        self.assertEqual(values.shape, (0, 5))
+        self.assertEqual(loader.summary("f.csv"), "f.csv: kept 0 of 0 rows")
+
+    def test_missing_column_and_empty_file(self):
+        with self.assertRaises(ValueError):
+            BulkCsvLoader(50, 30).load_requests(self.write("a,b\n1,2\n"))
+        with self.assertRaises(ValueError):
+            BulkCsvLoader(50, 30).load_drivers(self.write(""))
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            BulkCsvLoader(50, 30).load_drivers("no_such_file.csv")
+
+    def test_cache_is_reused_until_the_file_changes(self):
+        path = self.write("x,y\n1,2\n")
+        loader = BulkCsvLoader(50, 30, cache=True)
+
+        loader.load_drivers(path)
+        sidecar = loader.cache_path(path)
+        self.assertTrue(os.path.exists(sidecar))
+
+        # A cached parse is used even if the sidecar differs from the file
+        np.save(sidecar, np.array([[7.0, 8.0]]))
+        self.assertEqual(loader.load_drivers(path)[1].tolist(), [[7.0, 8.0]])
+
+        # Changing the file invalidates the cache and removes the stale sidecar
+        with open(path, "w") as f:
+            f.write("x,y\n3,4\n")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertEqual(loader.load_drivers(path)[1].tolist(), [[3.0, 4.0]])
+        self.assertFalse(os.path.exists(sidecar))
+        self.assertTrue(os.path.exists(loader.cache_path(path)))
+
+    def test_cache_is_written_atomically(self):
+        path = self.write("x,y\n1,2\n")
+        stale = f"{path}.1.npy"
+        np.save(stale, np.array([[7.0, 8.0]]))
+
+        with patch("phase2.BulkCsvLoader.os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                BulkCsvLoader(50, 30, cache=True).load_drivers(path)
+        # A failed write leaves no partial sidecar behind
+        self.assertFalse(os.path.exists(BulkCsvLoader.cache_path(path)))
+        for tmp in glob.glob(f"{glob.escape(path)}.*.tmp"):
+            os.remove(tmp)
+
+        BulkCsvLoader(50, 30, cache=True).load_drivers(path)
+        self.assertEqual(glob.glob(f"{glob.escape(path)}.*"), [BulkCsvLoader.cache_path(path)])
+
+    def test_cache_applies_bounds_of_each_loader(self):
+        path = self.write("x,y\n40,20\n")
+        BulkCsvLoader(50, 30, cache=True).load_drivers(path)
+
+        self.assertEqual(len(BulkCsvLoader(30, 30, cache=True).load_drivers(path)[0]), 0)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            BulkCsvLoader("50", 30)
+        with self.assertRaises(ValueError):
+            BulkCsvLoader(-1, 30)
+
+    def test_str_representation(self):
+        loader = BulkCsvLoader(50, 30)
+        self.assertEqual(str(loader), "BulkCsvLoader(width=50, height=30, cache=False)")
+        self.assertEqual(repr(loader), str(loader))
+
+
+if __name__ == '__main__':
+    unittest.main()
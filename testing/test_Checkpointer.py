@@ -0,0 +1,196 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from phase2.Checkpointer import Checkpointer, MAGIC
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.Driver import Driver, DriverStatus
+from phase2.MutationRule import MutationRule
+from phase2.Point import Point
+from phase2.RequestGenerator import RequestGenerator
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+from phase2.run import build_simulation, parse_args
+
+
+def state(simulation):
+    """
+    Everything a resumed run must reproduce: statistics, driver positions and request states.
+    """
+    return (simulation.time,
+            simulation.statistics['served'], simulation.statistics['expired'],
+            list(simulation.statistics['served_waits']),
+            [(d.id, d.position.x, d.position.y, d.status, type(d.behaviour).__name__) for d in simulation.drivers],
+            [(r.id, r.status, r.wait_time, r.assigned_driver) for r in simulation.requests])
+
+
+class TestCheckpointer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "run.ckpt")
+
+    def resumes_identically(self, make):
+        straight = make()
+        for _ in range(200):
+            straight.tick()
+
+        simulation = make()
+        for _ in range(100):
+            simulation.tick()
+        simulation.save_checkpoint(self.path)
+        resumed = DeliverySimulation.load_checkpoint(self.path)
+        self.assertIsNot(resumed, simulation)
+        for _ in range(100):
+            resumed.tick()
+
+        self.assertEqual(state(resumed), state(straight))
+
+    def test_resume_with_seeded_streams(self):
+        self.resumes_identically(lambda: build_simulation(parse_args(["--seed", "3", "--rate", "2"]), "test_run"))
+
+    def test_resume_with_numpy_streams(self):
+        args = parse_args(["--seed", "3", "--rate", "2", "--rng", "numpy", "--batch-ticks", "16"])
+        self.resumes_identically(lambda: build_simulation(args, "test_run"))
+
+    def test_resume_with_poisson_demand_and_cascade(self):
+        args = parse_args(["--seed", "5", "--demand-curve", "0:0.5,40:4,70:1", "--demand-period", "120",
+                           "--cascade-rounds", "2", "--policy", "optimal"])
+        self.resumes_identically(lambda: build_simulation(args, "test_run"))
+
+    def test_resume_vectorized(self):
+        args = parse_args(["--seed", "2", "--rate", "2", "--vectorized"])
+        self.resumes_identically(lambda: build_simulation(args, "test_run"))
+
+    def test_resume_trace_replay(self):
+        args = parse_args(["--seed", "1", "--replay", "data/requests.csv"])
+        self.resumes_identically(lambda: build_simulation(args, "test_run"))
+
+    def test_resume_restores_global_random_state(self):
+        def make():
+            random.seed(7)
+            drivers = [Driver(i, Point(random.randint(0, 49), random.randint(0, 29)), 1.5, DriverStatus.IDLE, None,
+                              EarningsMaxBehaviour() if i % 2 else GreedyDistanceBehaviour(), [], "test_run")
+                       for i in range(20)]
+            return DeliverySimulation(time=0, width=50, height=30, drivers=drivers, requests=[],
+                                      request_generator=RequestGenerator(2.5, 50, 30, 1, "test_run"),
+                                      dispatch_policy=GlobalGreedyPolicy(),
+                                      mutation_rule=MutationRule(5, 0.7, "test_run"), timeout=20,
+                                      statistics={'served': 0, 'expired': 0, 'served_waits': []},
+                                      run_id="test_run")
+
+        straight = make()
+        for _ in range(200):
+            straight.tick()
+
+        simulation = make()
+        for _ in range(100):
+            simulation.tick()
+        simulation.save_checkpoint(self.path)
+        # Draws made after the checkpoint must not leak into the resumed run
+        random.random()
+        resumed = DeliverySimulation.load_checkpoint(self.path)
+        self.assertIs(resumed.request_generator.rng, random)
+        for _ in range(100):
+            resumed.tick()
+
+        self.assertEqual(state(resumed), state(straight))
+
+    def test_resume_keeps_profiling_but_not_timings(self):
+        simulation = build_simulation(parse_args(["--seed", "1", "--profile"]), "test_run")
+        for _ in range(10):
+            simulation.tick()
+        simulation.save_checkpoint(self.path)
+
+        resumed = DeliverySimulation.load_checkpoint(self.path)
+
+        self.assertIsNotNone(resumed.profiler)
+        self.assertEqual(resumed.profiler.ticks, 0)
+        self.assertIsNone(resumed.tracer)
+        self.assertEqual(resumed.event_manager.filepath, simulation.event_manager.filepath)
+
+    def periodic_checkpoints_resume_identically(self, mode):
+        args = parse_args(["--seed", "8", "--rate", "2"])
+        straight = build_simulation(args, "test_run")
+        for _ in range(200):
+            straight.tick()
+
+        checkpointer = Checkpointer(self.path, every=100, mode=mode)
+        simulation = build_simulation(args, "test_run")
+        simulation.checkpointer = checkpointer
+        for _ in range(150):
+            simulation.tick()
+        checkpointer.wait()
+
+        self.assertEqual((checkpointer.saved, checkpointer.skipped, len(checkpointer.stalls)), (1, 0, 1))
+        resumed = DeliverySimulation.load_checkpoint(self.path)
+        self.assertEqual(resumed.time, 100)
+        self.assertIsNone(resumed.checkpointer)
+        for _ in range(100):
+            resumed.tick()
+        self.assertEqual(state(resumed), state(straight))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_periodic_checkpoints_fork(self):
+        self.periodic_checkpoints_resume_identically("fork")
+
+    def test_periodic_checkpoints_thread(self):
+        self.periodic_checkpoints_resume_identically("thread")
+
+    def test_checkpoint_is_skipped_while_busy(self):
+        checkpointer = Checkpointer(self.path, every=1, mode="thread")
+        simulation = build_simulation(parse_args(["--seed", "1"]), "test_run")
+        simulation.checkpointer = checkpointer
+        checkpointer._worker = MagicMock(is_alive=lambda: True)
+
+        simulation.tick()
+
+        self.assertEqual((checkpointer.saved, checkpointer.skipped), (0, 1))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_checkpoint_only_when_due(self):
+        checkpointer = Checkpointer(self.path, every=5, mode="thread")
+        simulation = build_simulation(parse_args(["--seed", "1"]), "test_run")
+
+        simulation.time = 4
+        self.assertFalse(checkpointer.maybe_checkpoint(simulation))
+        simulation.time = 5
+        self.assertTrue(checkpointer.maybe_checkpoint(simulation))
+        checkpointer.wait()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIn("1 saved, 0 skipped", checkpointer.report())
+
+    def test_file_is_compressed_with_header(self):
+        simulation = build_simulation(parse_args(["--seed", "1"]), "test_run")
+        simulation.save_checkpoint(self.path)
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertIs(Checkpointer.decode(data)['simulation'].__class__, DeliverySimulation)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["run.ckpt"])
+
+    def test_decode_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Checkpointer.decode(b"timestamp, event_type\n")
+
+    def test_load_rejects_other_objects(self):
+        Checkpointer.write(self.path, Checkpointer.encode({'simulation': GlobalGreedyPolicy(),
+                                                           'random_state': random.getstate(),
+                                                           'event_log': None}))
+        with self.assertRaises(TypeError):
+            DeliverySimulation.load_checkpoint(self.path)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            Checkpointer(1, 10)
+        with self.assertRaises(TypeError):
+            Checkpointer(self.path, 1.5)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.path, 0)
+        with self.assertRaises(ValueError):
+            Checkpointer(self.path, 10, mode="process")
@@ -0,0 +1,129 @@
+import random
+import unittest
+
+from phase2.Driver import Driver, DriverStatus
+from phase2.FleetStore import FleetStore
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.CostMatrix import CostMatrix
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+from phase2.dispatch.NearestNeighborPolicy import NearestNeighborPolicy
+
+
+def make_driver(id, x, y, status=DriverStatus.IDLE, speed=1.0):
+    return Driver(id, Point(x, y), speed, status, None, GreedyDistanceBehaviour(), [], "test_run")
+
+
+def make_request(id, pickup, dropoff, status=RequestStatus.WAITING):
+    return Request(id, Point(*pickup), Point(*dropoff), 0, status, None, 0, "test_run")
+
+
+class TestCostMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.drivers = [make_driver(1, 0, 0),
+                        make_driver(2, 3, 4, speed=2.0),
+                        make_driver(3, 9, 9, DriverStatus.TO_PICKUP)]
+        self.requests = [make_request(1, (3, 0), (3, 4)),
+                         make_request(2, (0, 4), (0, 0)),
+                         make_request(3, (1, 1), (2, 2), RequestStatus.ASSIGNED)]
+        self.costs = CostMatrix(self.drivers, self.requests)
+
+    def test_only_idle_drivers_and_waiting_requests(self):
+        self.assertEqual(self.costs.shape, (2, 2))
+        self.assertEqual(self.costs.drivers, self.drivers[:2])
+        self.assertEqual(self.costs.requests, self.requests[:2])
+
+    def test_matrices(self):
+        self.assertEqual(self.costs.trip_lengths.tolist(), [4.0, 4.0])
+        self.assertEqual(self.costs.pickup_distances().tolist(), [[3.0, 4.0], [4.0, 3.0]])
+        self.assertEqual(self.costs.total_distances().tolist(), [[7.0, 8.0], [8.0, 7.0]])
+        self.assertEqual(self.costs.etas().tolist(), [[7.0, 8.0], [4.0, 3.5]])
+        self.assertEqual(self.costs.rewards().tolist(), [[29.0, 31.0], [31.0, 29.0]])
+
+    def test_fleet_columns_give_same_matrix(self):
+        fleet = FleetStore(self.drivers)
+        costs = CostMatrix(self.drivers, self.requests, fleet=fleet)
+        fleet.release()
+
+        self.assertEqual(costs.drivers, self.drivers[:2])
+        self.assertEqual(costs.etas().tolist(), self.costs.etas().tolist())
+
+    def test_matrices_are_cached(self):
+        self.assertIs(self.costs.pickup_distances(), self.costs.pickup_distances())
+        self.assertIs(self.costs.total_distances(), self.costs.total_distances())
+
+    def test_values_equal_scalar_estimates(self):
+        rng = random.Random(2)
+        drivers = [make_driver(i, rng.uniform(0, 50), rng.uniform(0, 30)) for i in range(20)]
+        requests = [make_request(i, (rng.uniform(0, 50), rng.uniform(0, 30)), (rng.uniform(0, 50), rng.uniform(0, 30)))
+                    for i in range(20)]
+
+        lazy = CostMatrix(drivers, requests)
+        dense = CostMatrix(drivers, requests)
+        dense.pickup_distances()
+
+        for driver in drivers:
+            for request in requests:
+                expected = (driver.calc_estimated_total_dist_to_delivery(request),
+                            driver.position.distance_to(request.pickup),
+                            driver.calc_estimated_delivery_reward(request))
+                self.assertEqual(lazy.pair(driver, request), expected)
+                self.assertEqual(dense.pair(driver, request), expected)
+
+    def test_pair_outside_matrix(self):
+        self.assertIsNone(self.costs.pair(self.drivers[2], self.requests[0]))
+        self.assertIsNone(self.costs.pair(self.drivers[0], self.requests[2]))
+        # Same id, different object
+        self.assertIsNone(self.costs.pair(make_driver(1, 0, 0), self.requests[0]))
+
+    def test_matches(self):
+        self.assertTrue(self.costs.matches(self.drivers[:2], self.requests[:2]))
+        self.assertFalse(self.costs.matches(self.drivers[:1], self.requests[:2]))
+        self.assertFalse(self.costs.matches(self.drivers[1::-1], self.requests[:2]))
+
+    def test_fits_dense(self):
+        self.assertTrue(self.costs.fits_dense)
+        self.assertFalse(CostMatrix(self.drivers, self.requests, dense_limit=3).fits_dense)
+
+    def test_empty(self):
+        costs = CostMatrix([], [])
+
+        self.assertEqual(costs.shape, (0, 0))
+        self.assertEqual(costs.pickup_distances().shape, (0, 0))
+
+    def test_policies_give_same_matching_with_costs(self):
+        rng = random.Random(6)
+        for _ in range(30):
+            drivers = [make_driver(i, rng.randint(0, 10), rng.randint(0, 10)) for i in range(rng.randint(1, 10))]
+            requests = [make_request(i, (rng.randint(0, 10), rng.randint(0, 10)), (rng.randint(0, 10), rng.randint(0, 10)))
+                        for i in range(rng.randint(1, 10))]
+            costs = CostMatrix(drivers, requests)
+
+            for policy in (GlobalGreedyPolicy(), NearestNeighborPolicy()):
+                self.assertEqual(policy.assign(drivers, requests, 0, "test_run", costs=costs),
+                                 policy.assign(drivers, requests, 0, "test_run"))
+
+    def test_nearest_drivers(self):
+        drivers = [make_driver(i, x, 0) for i, x in enumerate([9, 1, 5, 1, 7])]
+        request = make_request(1, (0, 0), (1, 1))
+        costs = CostMatrix(drivers, [request])
+
+        self.assertEqual([d.id for d in costs.nearest_drivers(request, 3)], [1, 3, 2])
+        self.assertEqual([d.id for d in costs.nearest_drivers(request, 10)], [1, 3, 2, 4, 0])
+
+        # Same answer from the cached dense matrix
+        costs.pickup_distances()
+        self.assertEqual([d.id for d in costs.nearest_drivers(request, 3)], [1, 3, 2])
+
+        self.assertEqual(costs.nearest_drivers(make_request(2, (0, 0), (1, 1)), 3), [])
+        self.assertEqual(costs.nearest_drivers(request, 0), [])
+
+    def test_invalid_dense_limit(self):
+        with self.assertRaises(TypeError):
+            CostMatrix([], [], dense_limit=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,22 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 from phase2.Point import Point
 from phase2.Driver import Driver, DriverStatus
 from phase2.Request import Request, RequestStatus
 from phase2.Offer import Offer
 from phase2.MutationRule import MutationRule
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
 from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.CostMatrix import CostMatrix
 from phase2.dispatch.DispatchPolicy import DispatchPolicy
 from phase2.RequestGenerator import RequestGenerator
 from phase2.DeliverySimulation import DeliverySimulation
+from phase2.SpatialGrid import SpatialGrid
+from phase2.metrics.TickProfiler import TickPhase
+from phase2.run import build_simulation, parse_args
 
 """
 Since every unit that is imported and used in DeliverySimulation has already been used, we
@@ -44,6 +51,7 @@ class TestDeliverySimulation(unittest.TestCase):
 
         self.mock_request_generator = MagicMock(spec=RequestGenerator)
         self.mock_request_generator.maybe_generate.return_value = [self.request]
+        self.mock_request_generator.peak_rate = 0.5
 
         self.mock_dispatch_policy = MagicMock(spec=DispatchPolicy)
         self.mock_dispatch_policy.assign.return_value = [(self.driver, self.request)]
@@ -64,6 +72,10 @@ class TestDeliverySimulation(unittest.TestCase):
             run_id="test_run"
         )
 
+    def test_pickup_index_is_sized_for_expected_waiting_requests(self):
+        # 0.5 requests per tick waiting up to 5 ticks on a 10 x 10 map
+        self.assertEqual(self.sim.requests.pickup_index.cell_size, SpatialGrid.cell_size_for_area(10, 10, 2.5))
+
     @patch("phase2.DeliverySimulation.EventManager")
     def test_tick_calls_internal_methods(self, mock_event_manager_class):
         # Arrange
@@ -100,6 +112,69 @@ class TestDeliverySimulation(unittest.TestCase):
         self.assertEqual(self.request.wait_time, 1)
         self.assertEqual(self.sim.statistics['expired'], 0)
 
+    def test_wait_time_counts_ticks_in_the_simulation(self):
+        # Arrange
+        self.sim.time = 3
+        self.sim.requests.append(self.request)
+
+        # Act
+        for _ in range(2):
+            self.sim._update_req_wait_times()
+            self.sim.time += 1
+
+        # Assert
+        self.assertEqual(self.request.wait_time, 2)  # the same between ticks as the per-tick count
+        self.sim._update_req_wait_times()
+        self.assertEqual(self.request.wait_time, 3)  # the tick in progress counts as waited
+
+    def test_wait_time_of_request_with_future_creation_time(self):
+        # Arrange, e.g. requests loaded from a CSV by the GUI, which are active from t=0
+        self.request.creation_time = 110
+        self.sim.requests.append(self.request)
+
+        # Act
+        for _ in range(3):
+            self.sim._update_req_wait_times()
+            self.sim.time += 1
+
+        # Assert
+        self.assertEqual(self.request.wait_time, 3)
+        self.sim.time = 4
+        self.sim._update_req_wait_times()  # wait time 5, equal to timeout
+        self.assertEqual(self.request.status, RequestStatus.EXPIRED)
+        self.assertEqual(self.request.wait_time, 5)
+
+    def test_wait_time_is_frozen_when_request_finishes(self):
+        # Arrange
+        self.sim.requests.append(self.request)
+        self.sim.time = 2
+        self.request.mark_delivered(self.sim.time)
+
+        # Act
+        self.sim.time = 10
+
+        # Assert
+        self.assertEqual(self.request.wait_time, 2)
+
+    def test_setting_time_back_keeps_counted_waits(self):
+        # Arrange: the request has waited 3 ticks when the simulation restarts at t=0
+        self.sim.time = 100
+        self.sim.requests.append(self.request)
+        for _ in range(3):
+            self.sim._update_req_wait_times()
+            self.sim.time += 1
+
+        # Act
+        self.sim.time = 0
+
+        # Assert
+        self.assertEqual(self.request.wait_time, 3)
+        self.sim._update_req_wait_times()
+        self.sim.time += 1
+        self.assertEqual(self.request.status, RequestStatus.WAITING)
+        self.sim._update_req_wait_times()  # wait time 5, equal to timeout
+        self.assertEqual(self.request.status, RequestStatus.EXPIRED)
+
     def test_update_req_wait_times_expires_request_unassigned(self):
         # Arrange
         self.sim.requests.append(self.request)
@@ -129,6 +204,47 @@ class TestDeliverySimulation(unittest.TestCase):
         self.driver.expire_current_request.assert_called_once_with(self.sim.time)
         self.assertEqual(self.sim.statistics['expired'], 1)
 
+    def test_update_req_wait_times_expires_each_request_once(self):
+        # Arrange
+        self.sim.requests.append(self.request)
+        self.sim.time = 4
+
+        # Act
+        self.sim._update_req_wait_times()
+        self.sim.time = 5
+        self.sim._update_req_wait_times()
+
+        # Assert
+        self.assertEqual(self.request.status, RequestStatus.EXPIRED)
+        self.assertEqual(self.sim.statistics['expired'], 1)
+
+    def test_update_req_wait_times_skips_archived_requests(self):
+        # Arrange
+        self.sim.requests.append(self.request)
+        self.request.mark_delivered(0)
+        self.sim.time = 4  # would expire if it was still active
+
+        # Act
+        self.sim._update_req_wait_times()
+
+        # Assert
+        self.assertEqual(self.request.status, RequestStatus.DELIVERED)
+        self.assertEqual(self.sim.statistics['expired'], 0)
+        self.assertEqual(self.sim.requests.active(), [])
+
+    def test_dispatch_policy_only_receives_waiting_requests(self):
+        # Arrange
+        delivered = Request(id=2, pickup=Point(1, 1), dropoff=Point(2, 2), creation_time=0,
+                            status=RequestStatus.DELIVERED, assigned_driver=None, wait_time=0, run_id="test_run")
+        self.sim.requests.append(delivered)
+
+        # Act
+        self.sim.tick()
+
+        # Assert
+        passed_requests = self.mock_dispatch_policy.assign.call_args.kwargs['requests']
+        self.assertEqual(passed_requests, [self.request])
+
     def test_create_offers_returns_correct_offer_list(self):
         # Arrange
         offer_list = self.sim._create_offers([(self.driver, self.request)])
@@ -139,12 +255,56 @@ class TestDeliverySimulation(unittest.TestCase):
         self.assertEqual(offer_list[0].driver, self.driver)
         self.assertEqual(offer_list[0].request, self.request)
 
+    def test_create_offers_reads_cost_matrix(self):
+        # Arrange
+        costs = CostMatrix([self.driver], [self.request])
+
+        # Act
+        offer = self.sim._create_offers([(self.driver, self.request)], costs)[0]
+
+        # Assert
+        self.assertEqual(offer.estimated_distance_to_pickup, self.driver.position.distance_to(self.request.pickup))
+        self.assertEqual(offer.estimated_total_distance,
+                         self.driver.calc_estimated_total_dist_to_delivery(self.request))
+        self.assertEqual(offer.estimated_reward, self.driver.calc_estimated_delivery_reward(self.request))
+
+    def test_tick_passes_cost_matrix_to_policy(self):
+        # Arrange
+        self.sim.requests.append(self.request)
+        self.mock_dispatch_policy.assign.return_value = []
+
+        # Act
+        self.sim.tick()
+
+        # Assert
+        costs = self.mock_dispatch_policy.assign.call_args.kwargs['costs']
+        self.assertIsInstance(costs, CostMatrix)
+        self.assertEqual(costs.drivers, [self.driver])
+
+    def test_tick_skips_cost_matrix_without_waiting_requests_or_idle_drivers(self):
+        # Arrange
+        self.mock_dispatch_policy.assign.return_value = []
+        self.mock_request_generator.maybe_generate.return_value = []
+
+        # Act: no waiting requests
+        self.sim.tick()
+        without_requests = self.mock_dispatch_policy.assign.call_args.kwargs['costs']
+        # Act: no idle drivers
+        self.mock_request_generator.maybe_generate.return_value = [self.request]
+        self.driver.status = DriverStatus.TO_PICKUP
+        self.sim.tick()
+        without_drivers = self.mock_dispatch_policy.assign.call_args.kwargs['costs']
+
+        # Assert
+        self.assertIsNone(without_requests)
+        self.assertIsNone(without_drivers)
+
     def test_assign_and_resolve_offers_driver_accepts_offer(self):
         # Arrange
         offer = MagicMock(spec=Offer)
         offer.driver = self.driver
         offer.request = self.request
-        offer.driver.behaviour.decide = MagicMock(return_value=True)
+        offer.driver.behaviour.decide_batch = MagicMock(return_value=np.array([True]))
         offer.driver.assign_request = MagicMock()
 
         # Act
@@ -158,7 +318,7 @@ class TestDeliverySimulation(unittest.TestCase):
         offer = MagicMock(spec=Offer)
         offer.driver = self.driver
         offer.request = self.request
-        offer.driver.behaviour.decide = MagicMock(return_value=False)
+        offer.driver.behaviour.decide_batch = MagicMock(return_value=np.array([False]))
         offer.driver.assign_request = MagicMock()
 
         # Act
@@ -167,6 +327,163 @@ class TestDeliverySimulation(unittest.TestCase):
         # Assert
         offer.driver.assign_request.assert_not_called()
 
+    def test_assign_and_resolve_offers_batches_by_behaviour_class(self):
+        # Arrange
+        drivers = [Driver(i, Point(0, 0), 1.0, DriverStatus.IDLE, None,
+                          GreedyDistanceBehaviour() if i % 2 else EarningsMaxBehaviour(), [], "test_run")
+                   for i in range(4)]
+        requests = [Request(i, Point(1, 0), Point(2, 0), 0, RequestStatus.WAITING, None, 0, "test_run")
+                    for i in range(4)]
+        offers = self.sim._create_offers(list(zip(drivers, requests)))
+
+        # Act
+        with patch.object(GreedyDistanceBehaviour, 'decide_batch', autospec=True,
+                          return_value=np.array([True, False])) as greedy_batch, \
+                patch.object(EarningsMaxBehaviour, 'decide_batch', autospec=True,
+                             return_value=np.array([False, True])) as earnings_batch:
+            self.sim._assign_and_resolve_offers(offers)
+
+        # Assert
+        self.assertEqual(greedy_batch.call_args.args[1], [offers[1], offers[3]])
+        self.assertEqual(earnings_batch.call_args.args[1], [offers[0], offers[2]])
+        self.assertEqual([d.status for d in drivers],
+                         [DriverStatus.IDLE, DriverStatus.TO_PICKUP, DriverStatus.TO_PICKUP, DriverStatus.IDLE])
+
+    def make_cascade_sim(self, drivers, cascade_rounds):
+        return DeliverySimulation(time=0, width=300, height=10, drivers=drivers, requests=[],
+                                  request_generator=self.mock_request_generator,
+                                  dispatch_policy=self.mock_dispatch_policy,
+                                  mutation_rule=self.mock_mutation_rule, timeout=5,
+                                  statistics={'expired': 0, 'served': 0, 'served_waits': []},
+                                  run_id="test_run", cascade_rounds=cascade_rounds)
+
+    def test_cascade_reoffers_rejected_request_in_same_tick(self):
+        # Arrange: the proposed driver is too far away and rejects, the next nearest accepts
+        far = Driver(2, Point(0, 0), 1.0, DriverStatus.IDLE, None, GreedyDistanceBehaviour(), [], "test_run")
+        near = Driver(3, Point(30, 0), 1.0, DriverStatus.IDLE, None, GreedyDistanceBehaviour(), [], "test_run")
+        request = Request(2, Point(25, 0), Point(26, 0), 0, RequestStatus.WAITING, None, 0, "test_run")
+        self.mock_request_generator.maybe_generate.return_value = [request]
+        self.mock_dispatch_policy.assign.return_value = [(far, request)]
+        sim = self.make_cascade_sim([far, near], cascade_rounds=3)
+
+        # Act
+        sim.tick()
+
+        # Assert
+        self.assertEqual(request.assigned_driver, near.id)
+        self.assertEqual(far.status, DriverStatus.IDLE)
+        self.assertEqual(sim.last_cascade_rounds, 1)
+        self.assertEqual(sim.statistics['cascade_rounds'], 1)
+
+    def test_cascade_rounds_are_bounded(self):
+        # Arrange: every driver is too far away and rejects
+        drivers = [Driver(i, Point(40 * i, 0), 1.0, DriverStatus.IDLE, None, GreedyDistanceBehaviour(), [], "test_run")
+                   for i in range(4)]
+        request = Request(2, Point(250, 0), Point(251, 0), 0, RequestStatus.WAITING, None, 0, "test_run")
+        costs = CostMatrix(drivers, [request])
+
+        for cascade_rounds, expected_rounds in [(1, 1), (10, 3)]:
+            sim = self.make_cascade_sim(drivers, cascade_rounds)
+            offers = sim._create_offers([(drivers[0], request)], costs)
+            sim._assign_and_resolve_offers(offers)
+
+            # Act
+            rounds = sim._cascade_offers(offers, costs)
+
+            # Assert: one round per remaining driver, nearest first, until the limit
+            self.assertEqual(rounds, expected_rounds)
+            self.assertEqual(request.status, RequestStatus.WAITING)
+
+    def test_cascade_under_load_keeps_one_request_per_driver(self):
+        # More requests than idle drivers, so most cascade candidates are busy or taken in a round
+        for seed, vectorized in [(3, False), (5, False), (5, True)]:
+            args = parse_args(["--seed", str(seed), "--rate", "2.0", "--drivers", "20", "--cascade-rounds", "2"])
+            args.vectorized = vectorized
+            sim = build_simulation(args, "test_run")
+
+            for _ in range(150):
+                sim.tick()
+
+                held = [driver.current_request.id for driver in sim.drivers if driver.current_request is not None]
+                self.assertEqual(len(held), len(set(held)))
+                for request in sim.requests.by_status(RequestStatus.ASSIGNED):
+                    self.assertIs(sim._get_driver(request.assigned_driver).current_request, request)
+
+    def test_cascade_off_by_default(self):
+        # Act
+        self.sim.tick()
+
+        # Assert
+        self.assertEqual(self.sim.last_cascade_rounds, 0)
+        self.assertNotIn('cascade_rounds', self.sim.statistics)
+
+    def test_profiler_records_every_phase(self):
+        # Arrange
+        self.mock_dispatch_policy.assign.return_value = []
+        sim = DeliverySimulation(time=0, width=10, height=10, drivers=[self.driver], requests=[],
+                                 request_generator=self.mock_request_generator,
+                                 dispatch_policy=self.mock_dispatch_policy,
+                                 mutation_rule=self.mock_mutation_rule, timeout=5, statistics={},
+                                 run_id="test_run", profile=True)
+
+        # Act
+        for _ in range(3):
+            sim.tick()
+
+        # Assert
+        self.assertIsNone(self.sim.profiler)
+        self.assertEqual(sim.profiler.ticks, 3)
+        summary = sim.profiler.summary()
+        self.assertEqual(summary['GENERATION']['items'], 3)
+        self.assertEqual(summary['MOVEMENT']['items'], 3)
+        self.assertEqual(summary['TIME_ADVANCE']['items'], 0)
+
+    def test_tracer_records_nested_spans(self):
+        # Arrange
+        self.mock_dispatch_policy.assign.return_value = []
+        sim = DeliverySimulation(time=0, width=10, height=10, drivers=[self.driver], requests=[],
+                                 request_generator=self.mock_request_generator,
+                                 dispatch_policy=self.mock_dispatch_policy,
+                                 mutation_rule=self.mock_mutation_rule, timeout=5, statistics={},
+                                 run_id="test_run", trace=True)
+
+        # Act
+        sim.tick()
+        sim.tick()
+
+        # Assert
+        events = sim.tracer.trace_events(sim.run_id)[1:]
+        ticks = [event for event in events if event['name'] == "tick"]
+        self.assertEqual([tick['args']['time'] for tick in ticks], [0, 1])
+        self.assertIsNone(sim.profiler)
+
+        phases = [event for event in events if event['cat'] == "phase"]
+        self.assertEqual(len(phases), 2 * len(TickPhase))
+        first_tick = ticks[0]
+        for phase in phases[:len(TickPhase)]:
+            self.assertGreaterEqual(phase['ts'], first_tick['ts'])
+            self.assertLessEqual(phase['ts'] + phase['dur'], first_tick['ts'] + first_tick['dur'] + 1e-6)
+
+        dispatch = next(event for event in phases if event['name'] == "dispatch")
+        self.assertEqual(dispatch['args'], {'idle_drivers': 1, 'waiting_requests': 1, 'proposals': 0})
+        costs = next(event for event in events if event['name'] == "CostMatrix")
+        self.assertEqual(costs['ts'], dispatch['ts'])
+        assign = next(event for event in events if event['name'] == "dispatch_policy.assign")
+        self.assertEqual(assign['args'], {'policy': "MagicMock", 'proposals': 0})
+        self.assertGreaterEqual(assign['ts'], costs['ts'] + costs['dur'] - 1e-6)
+        self.assertLessEqual(assign['ts'] + assign['dur'], dispatch['ts'] + dispatch['dur'] + 1e-6)
+        self.assertEqual(len([event for event in events if event['name'] == "dispatch_policy.assign"]), 2)
+
+    def test_invalid_cascade_arguments(self):
+        for kwargs, error in [({'cascade_rounds': -1}, ValueError), ({'cascade_rounds': 1.0}, TypeError),
+                              ({'cascade_candidates': 0}, ValueError), ({'cascade_candidates': '3'}, TypeError)]:
+            with self.assertRaises(error):
+                DeliverySimulation(time=0, width=10, height=10, drivers=[self.driver], requests=[],
+                                   request_generator=self.mock_request_generator,
+                                   dispatch_policy=self.mock_dispatch_policy,
+                                   mutation_rule=self.mock_mutation_rule, timeout=5, statistics={},
+                                   run_id="test_run", **kwargs)
+
     def test_get_snapshot_returns_correct_structure(self):
         # Arrange
         self.sim.drivers[0].status = DriverStatus.IDLE
@@ -17,6 +17,11 @@ class ConcreteDriverBehaviour(DriverBehaviour):
         return True
 
 
+class RejectingBehaviour(DriverBehaviour):
+    def decide(self, driver, offer, time, run_id):
+        return False
+
+
 class TestDriverBehaviour(unittest.TestCase):
 
     def test_is_abstract_base_class(self):
@@ -48,6 +53,19 @@ class TestDriverBehaviour(unittest.TestCase):
 
         self.assertTrue(result)
 
+    def test_decide_batch_defaults_to_each_drivers_decide(self):
+        offers = []
+        for behaviour in [ConcreteDriverBehaviour(), RejectingBehaviour(), ConcreteDriverBehaviour()]:
+            offer = DummyOffer()
+            offer.driver = DummyDriver()
+            offer.driver.behaviour = behaviour
+            offers.append(offer)
+
+        result = ConcreteDriverBehaviour().decide_batch(offers, time=10, run_id="test_run")
+
+        self.assertEqual(result.dtype, bool)
+        self.assertEqual(result.tolist(), [True, False, True])
+
     def test_str_returns_class_name(self):
         behaviour = ConcreteDriverBehaviour()
         self.assertEqual(str(behaviour), "ConcreteDriverBehaviour")
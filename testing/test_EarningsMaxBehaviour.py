@@ -69,6 +69,29 @@ class TestEarningsMaxBehaviour(unittest.TestCase):
         self.assertEqual(event.driver_id, self.driver.id)
         self.assertEqual(event.request_id, self.request.id)
 
+    @patch("phase2.behaviour.DriverBehaviour.EventManager")
+    def test_decide_batch_matches_decide(self, mock_event_manager):
+        offers = [Offer(self.driver, self.request, 5, 10, 15),
+                  Offer(self.driver, self.request, 10, 5, 2),
+                  Offer(self.driver, self.request, 4, 1, 9.5),
+                  Offer(self.driver, self.request, 0, 0, 15)]
+
+        event_manager_instance = MagicMock()
+        mock_event_manager.return_value = event_manager_instance
+
+        result = self.behaviour.decide_batch(offers, time=7, run_id="test_run")
+
+        with patch("phase2.behaviour.EarningsMaxBehaviour.EventManager"):
+            expected = [self.behaviour.decide(self.driver, offer, 7, "test_run") for offer in offers]
+        self.assertEqual(result.tolist(), expected)
+
+        # All events are logged with one call, in offer order
+        event_manager_instance.add_events.assert_called_once()
+        events = event_manager_instance.add_events.call_args[0][0]
+        self.assertEqual([event.event_type for event in events],
+                         [EventType.REQUEST_PROPOSAL_ACCEPTED if accepted else EventType.REQUEST_PROPOSAL_DENIED
+                          for accepted in expected])
+
 
 if __name__ == "__main__":
     unittest.main()
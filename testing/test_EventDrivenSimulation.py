@@ -0,0 +1,202 @@
+import os
+import random
+import tempfile
+import unittest
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.Driver import Driver, DriverStatus
+from phase2.EventDrivenSimulation import EventDrivenSimulation
+from phase2.MutationRule import MutationRule
+from phase2.Point import Point
+from phase2.PoissonRequestGenerator import PoissonRequestGenerator
+from phase2.RateProfile import RateProfile
+from phase2.Request import RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.TraceRequestSource import TraceRequestSource
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+from phase2.run import build_simulation, parse_args
+
+
+class NoMutation(MutationRule):
+    """
+    MutationRule that never mutates, so both engines draw the same random numbers.
+    """
+
+    def maybe_mutate(self, driver, time):
+        pass
+
+    def mutation_probability(self, driver):
+        return 0.0
+
+
+def state(simulation):
+    """
+    Everything both engines must agree on: statistics, driver positions and request states.
+    """
+    if isinstance(simulation, EventDrivenSimulation):
+        simulation.get_snapshot()
+    return (simulation.time,
+            simulation.statistics['served'], simulation.statistics['expired'],
+            list(simulation.statistics['served_waits']),
+            [(d.id, d.position.x, d.position.y, d.status, d.idle_time) for d in simulation.drivers],
+            sorted((r.id, r.status, r.wait_time, r.assigned_driver) for r in simulation.requests))
+
+
+class TestEventDrivenSimulation(unittest.TestCase):
+
+    def make(self, engine, request_generator=None, mutation_rule=None, drivers=40, speed=1.3, seed=7, **kwargs):
+        rng = random.Random(seed)
+        fleet = [Driver(i, Point(rng.randint(0, 49), rng.randint(0, 29)), speed, DriverStatus.IDLE, None,
+                        EarningsMaxBehaviour() if i % 2 else GreedyDistanceBehaviour(), [], "test_run")
+                 for i in range(drivers)]
+        if request_generator is None:
+            request_generator = RequestGenerator(0.3, 50, 30, 1, "test_run", rng=random.Random(seed + 1))
+        if mutation_rule is None:
+            mutation_rule = NoMutation(5, 0.7, "test_run", rng=random.Random(seed + 2))
+        return engine(time=0, width=50, height=30, drivers=fleet, requests=[],
+                      request_generator=request_generator, dispatch_policy=GlobalGreedyPolicy(),
+                      mutation_rule=mutation_rule, timeout=20,
+                      statistics={'served': 0, 'expired': 0, 'served_waits': []},
+                      run_id="test_run", **kwargs)
+
+    def assert_same_run(self, make, ticks=400):
+        ticked = make(DeliverySimulation)
+        ticked.run_until(ticks)
+        evented = make(EventDrivenSimulation)
+        evented.run_until(ticks)
+
+        self.assertGreater(ticked.statistics['served'], 0)
+        self.assertEqual(state(evented), state(ticked))
+        return evented
+
+    def test_is_a_delivery_simulation(self):
+        self.assertIsInstance(self.make(EventDrivenSimulation), DeliverySimulation)
+
+    def test_matches_tick_engine_without_mutation(self):
+        self.assert_same_run(lambda engine: self.make(engine))
+
+    def test_matches_tick_engine_with_batched_requests(self):
+        self.assert_same_run(lambda engine: self.make(
+            engine, RequestGenerator(1.5, 50, 30, 1, "test_run", rng=random.Random(3), batch_ticks=16)))
+
+    def test_matches_tick_engine_with_poisson_demand(self):
+        profile = RateProfile([(0, 0.1), (50, 2.0), (80, 0.1)], period=200)
+        self.assert_same_run(lambda engine: self.make(
+            engine, PoissonRequestGenerator(profile, 50, 30, 1, "test_run", rng=random.Random(4))))
+
+    def test_matches_tick_engine_with_trace_replay(self):
+        self.assert_same_run(lambda engine: self.make(
+            engine, TraceRequestSource("data/requests.csv", 50, 30, 1, "test_run"), drivers=5), ticks=300)
+
+    def test_matches_tick_engine_with_cascade_under_load(self):
+        # More requests than idle drivers, so cascade rounds run into busy and taken candidates
+        def make(engine):
+            return self.make(engine, RequestGenerator(2.0, 50, 30, 1, "test_run", rng=random.Random(3)), seed=3,
+                             cascade_rounds=2)
+
+        ticked = make(DeliverySimulation)
+        evented = make(EventDrivenSimulation)
+        for _ in range(400):
+            ticked.tick()
+            evented.tick()
+            for request in evented.requests.by_status(RequestStatus.ASSIGNED):
+                self.assertIs(evented._get_driver(request.assigned_driver).current_request, request)
+
+        self.assertGreater(ticked.statistics['served'], 0)
+        self.assertEqual(state(evented), state(ticked))
+
+    def test_matches_tick_engine_on_exact_step_ties(self):
+        # Legs of 5 or 13 steps of speed 1 end exactly on the target
+        self.assert_same_run(lambda engine: self.make(engine, speed=1.0))
+
+    def test_skips_ticks_without_events(self):
+        simulation = self.make(EventDrivenSimulation, RequestGenerator(0.01, 50, 30, 1, "test_run",
+                                                                       rng=random.Random(5)))
+        simulation.run_until(2000)
+
+        self.assertEqual(simulation.time, 2000)
+        self.assertGreater(simulation.statistics['served'], 0)
+        self.assertLess(simulation.processed_ticks, 500)
+
+    def test_tick_by_tick_matches_run_until(self):
+        stepped = self.make(EventDrivenSimulation)
+        for _ in range(300):
+            stepped.tick()
+        jumped = self.make(EventDrivenSimulation)
+        jumped.run_until(300)
+
+        self.assertEqual(state(stepped), state(jumped))
+
+    def test_snapshot_has_current_positions(self):
+        ticked = self.make(DeliverySimulation)
+        evented = self.make(EventDrivenSimulation)
+        for _ in range(60):
+            ticked.tick()
+            evented.tick()
+
+        self.assertEqual([d['position'] for d in evented.get_snapshot()['drivers']],
+                         [d['position'] for d in ticked.get_snapshot()['drivers']])
+
+    def test_mutations_match_in_distribution(self):
+        served = []
+        for engine in (DeliverySimulation, EventDrivenSimulation):
+            total = 0
+            for seed in range(3):
+                simulation = self.make(engine, mutation_rule=MutationRule(5, 0.7, "test_run",
+                                                                          rng=random.Random(seed)), seed=seed)
+                simulation.run_until(400)
+                total += simulation.statistics['served']
+            served.append(total)
+
+        self.assertAlmostEqual(served[1] / served[0], 1.0, delta=0.1)
+
+    def test_mutation_events_switch_behaviour(self):
+        simulation = self.make(EventDrivenSimulation, mutation_rule=MutationRule(5, 0.7, "test_run",
+                                                                                 rng=random.Random(1)))
+        before = [type(d.behaviour) for d in simulation.drivers]
+        simulation.run_until(200)
+
+        self.assertNotEqual([type(d.behaviour) for d in simulation.drivers], before)
+
+    def test_drivers_added_later_are_tracked(self):
+        ticked = self.make(DeliverySimulation)
+        evented = self.make(EventDrivenSimulation)
+        for simulation in (ticked, evented):
+            simulation.run_until(50)
+            simulation.drivers.append(Driver(100, Point(3, 3), 1.3, DriverStatus.IDLE, None,
+                                             GreedyDistanceBehaviour(), [], "test_run"))
+            simulation.run_until(300)
+
+        self.assertEqual(state(evented), state(ticked))
+
+    def test_checkpoint_resumes_identically(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "run.ckpt")
+            args = parse_args(["--seed", "3", "--rate", "0.2", "--engine", "event"])
+            straight = build_simulation(args, "test_run")
+            straight.run_until(300)
+
+            simulation = build_simulation(args, "test_run")
+            simulation.run_until(150)
+            simulation.save_checkpoint(path)
+            resumed = DeliverySimulation.load_checkpoint(path)
+            self.assertIsInstance(resumed, EventDrivenSimulation)
+            resumed.run_until(300)
+
+        self.assertEqual(state(resumed), state(straight))
+
+    def test_unsupported_options(self):
+        with self.assertRaises(ValueError):
+            self.make(EventDrivenSimulation, vectorized=True)
+        with self.assertRaises(ValueError):
+            self.make(EventDrivenSimulation, profile=True)
+
+    def test_str_representation(self):
+        simulation = self.make(EventDrivenSimulation)
+        self.assertTrue(str(simulation).startswith("EventDrivenSimulation(time=0, drivers=40"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+
+from phase2.metrics.BinaryEventLog import BinaryEventLog, NONE, NO_BEHAVIOUR
+from phase2.metrics.BinaryEventWriter import BinaryEventWriter
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventIndex import EventIndex
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
+
+EVENTS = [
+    Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 1, None, None, "EarningsMaxBehaviour"),
+    Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 2, None, None, "LazyBehaviour"),
+    Event(3, EventType.REQUEST_DELIVERED, 1, 7, 3),
+    Event(1, EventType.REQUEST_GENERATED, None, 7, None),
+    Event(2, EventType.BEHAVIOUR_CHANGED, 1, None, None, "GreedyDistanceBehaviour"),
+    Event(1, EventType.REQUEST_GENERATED, None, 8, None),
+    Event(4, EventType.REQUEST_EXPIRED, None, 8, 3),
+]
+
+
+class TestEventIndex(unittest.TestCase):
+
+    def setUp(self):
+        lines = [CSV_HEADER] + [EventWriter.format_line(e) for e in EVENTS]
+        self.index = EventIndex.from_csv_lines(lines)
+
+    def test_from_csv_lines(self):
+        self.assertEqual(len(self.index), 7)
+        self.assertEqual(self.index.to_events(self.index.records), EVENTS)
+        self.assertEqual(self.index.behaviour_names,
+                         ["EarningsMaxBehaviour", "LazyBehaviour", "GreedyDistanceBehaviour"])
+
+    def test_malformed_lines_are_skipped(self):
+        index = EventIndex.from_csv_lines([CSV_HEADER,
+                                           "1, 1, None, 7, None, None\n",
+                                           "not, a, valid, line\n",
+                                           "x, 1, None, 7, None, None\n",
+                                           "1, 99, None, 7, None, None\n",
+                                           "\n"])
+
+        self.assertEqual(len(index), 1)
+
+    def test_by_time_is_stable(self):
+        self.assertEqual(self.index.by_time['timestamp'].tolist(), [0, 0, 1, 1, 2, 3, 4])
+        self.assertEqual(self.index.by_time['driver_id'][:2].tolist(), [1, 2])
+        self.assertEqual(self.index.by_time['request_id'][2:4].tolist(), [7, 8])
+
+    def test_of_type(self):
+        generated = self.index.of_type(EventType.REQUEST_GENERATED)
+        self.assertEqual(generated['request_id'].tolist(), [7, 8])
+        self.assertEqual(self.index.count(EventType.REQUEST_GENERATED), 2)
+        self.assertEqual(self.index.count(EventType.DRIVER_IDLE), 0)
+
+    def test_of_type_merges_types_by_time(self):
+        changes = self.index.of_type(EventType.BEHAVIOUR_CHANGED, EventType.DRIVER_GENERATED_BEHAVIOUR)
+
+        self.assertEqual(changes['timestamp'].tolist(), [0, 0, 2])
+        self.assertEqual([self.index.behaviour_name(c) for c in changes['behaviour'].tolist()],
+                         ["EarningsMaxBehaviour", "LazyBehaviour", "GreedyDistanceBehaviour"])
+
+    def test_for_driver(self):
+        events = self.index.for_driver(1)
+
+        self.assertEqual(events['timestamp'].tolist(), [0, 2, 3])
+        self.assertEqual(self.index.driver_ids().tolist(), [1, 2])
+
+    def test_for_request(self):
+        events = self.index.for_request(8)
+
+        self.assertEqual([EventType(t) for t in events['event_type'].tolist()],
+                         [EventType.REQUEST_GENERATED, EventType.REQUEST_EXPIRED])
+        self.assertEqual(self.index.request_ids().tolist(), [7, 8])
+
+    def test_unknown_ids_are_empty(self):
+        self.assertEqual(len(self.index.for_driver(99)), 0)
+        self.assertEqual(len(self.index.for_request(0)), 0)
+
+    def test_missing_values(self):
+        self.assertEqual(self.index.behaviour_name(NO_BEHAVIOUR), None)
+        self.assertNotIn(NONE, self.index.driver_ids().tolist())
+
+    def test_empty(self):
+        index = EventIndex.from_csv_lines([CSV_HEADER])
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(len(index.of_type(EventType.REQUEST_GENERATED)), 0)
+        self.assertEqual(len(index.for_driver(1)), 0)
+
+    def test_from_binary_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, "run.csv")
+            writer = BinaryEventWriter(csv_path)
+            for event in EVENTS:
+                writer.add(event)
+            writer.close()
+
+            log = BinaryEventLog(BinaryEventLog.data_path_for(csv_path))
+            index = EventIndex(log.records, log.behaviour_names)
+
+            self.assertEqual(index.to_events(index.records), EVENTS)
+            self.assertEqual(index.for_driver(1)['timestamp'].tolist(), [0, 2, 3])
+            del log, index
+
+    def test_rejects_other_arrays(self):
+        with self.assertRaises(TypeError):
+            EventIndex([1, 2, 3], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 from phase2.metrics.EventManager import EventManager
 from phase2.metrics.Event import Event, EventType
+from phase2.metrics.BinaryEventWriter import BinaryEventWriter
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
 
 
 class TestEventManager(unittest.TestCase):
@@ -23,13 +27,12 @@ class TestEventManager(unittest.TestCase):
         # Should not open any files
         mock_file.assert_not_called()
 
+    @patch("os.path.exists", return_value=True)
     @patch("builtins.open", new_callable=mock_open)
-    def test_add_event_writes_to_file(self, mock_file):
+    def test_add_event_writes_to_file_on_flush(self, mock_file, mock_exists):
         manager = EventManager("test_run")
         manager.filepath = "dummy.csv"
 
-        mock_file().write.reset_mock()
-
         event = Event(timestamp=5,
                       event_type=EventType.REQUEST_GENERATED,
                       driver_id=1,
@@ -38,11 +41,44 @@ class TestEventManager(unittest.TestCase):
 
         manager.add_event(event)
 
-        mock_file.assert_called_with("dummy.csv", 'a')
+        # Buffered, nothing written yet
+        mock_file.assert_not_called()
+
+        manager.flush()
+
+        mock_file.assert_called_once_with("dummy.csv", 'a')
         handle = mock_file()
         handle.write.assert_called_once_with(
             "5, 1, 1, 2, 10, None\n"
         )
+        manager.close()
+
+    @patch("os.path.exists", return_value=True)
+    @patch("builtins.open", new_callable=mock_open)
+    def test_managers_of_a_run_share_one_writer(self, mock_file, mock_exists):
+        first = EventManager("test_run")
+        first.filepath = "dummy.csv"
+        second = EventManager("test_run")
+        second.filepath = "dummy.csv"
+
+        first.add_event(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+        second.add_event(Event(2, EventType.REQUEST_GENERATED, None, 2, None))
+        first.flush()
+
+        mock_file.assert_called_once_with("dummy.csv", 'a')
+        mock_file().write.assert_called_once_with("1, 1, None, 1, None, None\n2, 1, None, 2, None, None\n")
+        first.close()
+
+    @patch("os.path.exists", return_value=True)
+    @patch("builtins.open", new_callable=mock_open)
+    def test_context_manager_flushes_and_closes(self, mock_file, mock_exists):
+        with EventManager("test_run") as manager:
+            manager.filepath = "dummy.csv"
+            manager.add_event(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+
+        mock_file().write.assert_called_once_with("1, 1, None, 1, None, None\n")
+        mock_file().close.assert_called_once()
+        self.assertIsNone(EventWriter.get("dummy.csv"))
 
     @patch(
         "builtins.open",
@@ -92,6 +128,68 @@ class TestEventManager(unittest.TestCase):
         manager.add_event(event)
         mock_file.assert_not_called()
 
+    @patch("builtins.open", new_callable=mock_open)
+    def test_add_events_skips_test_run(self, mock_file):
+        manager = EventManager("test_run")
+        manager.add_events([Event(1, EventType.REQUEST_GENERATED, 1, 2, 3)])
+        mock_file.assert_not_called()
+
+    def test_log_position_skips_test_run(self):
+        self.assertIsNone(EventManager("test_run").log_position())
+
+    def _manager_in_tmp_dir(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        manager = EventManager("test_run")
+        manager.filepath = os.path.join(tmp_dir.name, "run.csv")
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_restore_log_cuts_events_after_checkpoint(self):
+        manager = self._manager_in_tmp_dir()
+        EventWriter.for_path(manager.filepath)
+        manager.add_event(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+        position = manager.log_position()
+        manager.add_event(Event(2, EventType.REQUEST_GENERATED, None, 2, None))
+        manager.flush()
+
+        manager.restore_log(position)
+
+        self.assertEqual(position[0], "csv")
+        self.assertEqual([e.request_id for e in manager.get_events()], [1])
+        manager.add_event(Event(2, EventType.REQUEST_GENERATED, None, 3, None))
+        self.assertEqual([e.request_id for e in manager.get_events()], [1, 3])
+
+    def test_restore_log_keeps_binary_format(self):
+        manager = self._manager_in_tmp_dir()
+        EventWriter.for_path(manager.filepath)
+        manager.use_binary_writer()
+        manager.add_event(Event(1, EventType.REQUEST_GENERATED, None, 1, None))
+        position = manager.log_position()
+        manager.add_event(Event(2, EventType.REQUEST_GENERATED, None, 2, None))
+        manager.close()
+
+        manager.restore_log(position)
+
+        self.assertEqual(position[0], "binary")
+        self.assertIsInstance(EventWriter.get(manager.filepath), BinaryEventWriter)
+        self.assertEqual([e.request_id for e in manager.get_events()], [1])
+
+    def test_switching_to_binary_moves_csv_events(self):
+        manager = self._manager_in_tmp_dir()
+        EventWriter.for_path(manager.filepath)
+        manager.add_event(Event(0, EventType.DRIVER_GENERATED_BEHAVIOUR, 1, None, None, "EarningsMaxBehaviour"))
+        manager.flush()
+        manager.add_event(Event(0, EventType.REQUEST_GENERATED, None, 1, None))
+
+        manager.use_binary_writer()
+        manager.add_event(Event(1, EventType.DRIVER_IDLE, 1, None, 1))
+
+        self.assertEqual([e.event_type for e in manager.get_event_log().to_events()],
+                         [EventType.DRIVER_GENERATED_BEHAVIOUR, EventType.REQUEST_GENERATED, EventType.DRIVER_IDLE])
+        with open(manager.filepath) as f:
+            self.assertEqual(f.read(), CSV_HEADER)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from phase2.metrics.Event import Event, EventType
+from phase2.metrics.EventWriter import CSV_HEADER, EventWriter
+
+
+class TestEventWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tmp_dir.name, "run", "run.csv")
+
+    def tearDown(self):
+        writer = EventWriter.get(self.filepath)
+        if writer is not None:
+            writer.close()
+        self.tmp_dir.cleanup()
+
+    def _read(self):
+        with open(self.filepath) as f:
+            return f.read()
+
+    def test_creates_directory_and_header(self):
+        EventWriter.for_path(self.filepath)
+
+        self.assertEqual(self._read(), CSV_HEADER)
+
+    def test_for_path_returns_shared_writer(self):
+        self.assertIs(EventWriter.for_path(self.filepath), EventWriter.for_path(self.filepath))
+
+    def test_events_are_buffered_until_flush(self):
+        writer = EventWriter.for_path(self.filepath)
+        writer.add(Event(3, EventType.REQUEST_EXPIRED, None, 4, None))
+
+        self.assertEqual(self._read(), CSV_HEADER)
+
+        writer.flush()
+
+        self.assertEqual(self._read(), CSV_HEADER + "3, 5, None, 4, None, None\n")
+
+    def test_add_many_keeps_order(self):
+        writer = EventWriter.for_path(self.filepath)
+        writer.add_many([Event(3, EventType.REQUEST_EXPIRED, None, 4, None),
+                         Event(3, EventType.REQUEST_EXPIRED, None, 2, None)])
+        writer.flush()
+
+        self.assertEqual(self._read(), CSV_HEADER + "3, 5, None, 4, None, None\n3, 5, None, 2, None, None\n")
+
+    def test_driver_events_match_single_events(self):
+        writer = EventWriter.for_path(self.filepath)
+        writer.add_driver_events(4, EventType.DRIVER_IDLE, np.array([3, 7]), np.array([1, 12]))
+        writer.flush()
+        lines = self._read()
+
+        writer.clear()
+        writer.add_many([Event(4, EventType.DRIVER_IDLE, 3, None, 1), Event(4, EventType.DRIVER_IDLE, 7, None, 12)])
+        writer.flush()
+
+        self.assertEqual(lines, self._read())
+
+    def test_full_buffer_is_flushed(self):
+        writer = EventWriter(self.filepath, buffer_size=2)
+        writer.add(Event(1, EventType.DRIVER_IDLE, 1, None, 1))
+        writer.add(Event(1, EventType.DRIVER_IDLE, 2, None, 1))
+
+        self.assertEqual(len(self._read().splitlines()), 3)
+        writer.close()
+
+    def test_clear_drops_buffer_and_events(self):
+        writer = EventWriter.for_path(self.filepath)
+        writer.add(Event(1, EventType.DRIVER_IDLE, 1, None, 1))
+        writer.flush()
+        writer.add(Event(2, EventType.DRIVER_IDLE, 1, None, 2))
+
+        writer.clear()
+        writer.flush()
+
+        self.assertEqual(self._read(), CSV_HEADER)
+
+    def test_close_unregisters_writer(self):
+        writer = EventWriter.for_path(self.filepath)
+        writer.add(Event(1, EventType.BEHAVIOUR_CHANGED, 1, None, None, "GreedyDistanceBehaviour"))
+
+        writer.close()
+
+        self.assertIsNone(EventWriter.get(self.filepath))
+        self.assertTrue(self._read().endswith("1, 8, 1, None, None, GreedyDistanceBehaviour\n"))
+
+    def test_invalid_buffer_size(self):
+        with self.assertRaises(ValueError):
+            EventWriter(self.filepath, buffer_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
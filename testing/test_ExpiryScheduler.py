@@ -0,0 +1,63 @@
+import unittest
+
+from phase2.ExpiryScheduler import ExpiryScheduler
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+
+
+def make_request(id, creation_time):
+    return Request(id, Point(0, 0), Point(1, 1), creation_time, RequestStatus.WAITING, None, 0, "test_run")
+
+
+class TestExpiryScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = ExpiryScheduler()
+
+    def test_pop_due_returns_requests_up_to_cutoff_oldest_first(self):
+        late = make_request(1, 5)
+        early = make_request(2, 1)
+        middle = make_request(3, 3)
+        for request in (late, early, middle):
+            self.scheduler.schedule(request)
+
+        self.assertEqual(self.scheduler.pop_due(3), [early, middle])
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_pop_due_nothing_due(self):
+        self.scheduler.schedule(make_request(1, 10))
+
+        self.assertEqual(self.scheduler.pop_due(9), [])
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_finished_requests_are_skipped(self):
+        delivered = make_request(1, 0)
+        waiting = make_request(2, 0)
+        self.scheduler.schedule(delivered)
+        self.scheduler.schedule(waiting)
+        delivered.mark_delivered(1)
+
+        self.assertEqual(self.scheduler.pop_due(0), [waiting])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_equal_creation_times_keep_insertion_order(self):
+        requests = [make_request(i, 0) for i in range(5)]
+        for request in requests:
+            self.scheduler.schedule(request)
+
+        self.assertEqual(self.scheduler.pop_due(0), requests)
+
+    def test_next_due_skips_finished_requests(self):
+        early = make_request(1, 1)
+        late = make_request(2, 4)
+        self.scheduler.schedule(early)
+        self.scheduler.schedule(late)
+        early.status = RequestStatus.DELIVERED
+
+        self.assertEqual(self.scheduler.next_due(), 4)
+        self.assertEqual(self.scheduler.pop_due(10), [late])
+        self.assertIsNone(self.scheduler.next_due())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import random
+import unittest
+
+import numpy as np
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.Driver import Driver, DriverStatus
+from phase2.FleetStore import FleetDriver, FleetStore, FleetPoint
+from phase2.MutationRule import MutationRule
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+
+
+def make_driver(id, x, y, speed=1.0, status=DriverStatus.IDLE, request=None):
+    return Driver(id, Point(x, y), speed, status, request, GreedyDistanceBehaviour(), [], "test_run")
+
+
+def make_request(id, pickup, dropoff):
+    return Request(id, Point(*pickup), Point(*dropoff), 0, RequestStatus.WAITING, None, 0, "test_run")
+
+
+class TestFleetStore(unittest.TestCase):
+
+    def test_attach_copies_driver_state(self):
+        driver = make_driver(1, 2, 3, speed=2.0)
+        fleet = FleetStore([driver])
+
+        self.assertEqual(len(fleet), 1)
+        self.assertEqual(fleet.position[0].tolist(), [2.0, 3.0])
+        self.assertEqual(fleet.speed[0], 2.0)
+        self.assertEqual(fleet.status[0], DriverStatus.IDLE.value)
+        self.assertEqual(fleet.request_id[0], FleetStore.NO_REQUEST)
+        self.assertIsInstance(driver, FleetDriver)
+        self.assertIsInstance(driver.position, FleetPoint)
+        self.assertEqual(driver.position, Point(2, 3))
+
+    def test_standalone_driver_has_plain_attributes(self):
+        driver = make_driver(1, 2, 3)
+
+        self.assertIs(type(driver), Driver)
+        self.assertEqual(vars(driver)['idle_time'], 0)
+        self.assertIs(type(vars(driver)['position']), Point)
+
+    def test_driver_is_view_of_fleet(self):
+        driver = make_driver(1, 0, 0)
+        fleet = FleetStore([driver])
+
+        driver.position.x += 4
+        fleet.position[0, 1] = 7.0
+
+        self.assertEqual(fleet.position[0, 0], 4.0)
+        self.assertEqual(driver.position.y, 7.0)
+
+    def test_assign_request_updates_target_and_direction(self):
+        driver = make_driver(1, 0, 0)
+        request = make_request(5, (3, 4), (6, 8))
+        fleet = FleetStore([driver])
+
+        driver.assign_request(request, 0)
+
+        self.assertEqual(fleet.status[0], DriverStatus.TO_PICKUP.value)
+        self.assertEqual(fleet.target[0].tolist(), [3.0, 4.0])
+        self.assertEqual(fleet.request_id[0], 5)
+        self.assertAlmostEqual(fleet.direction[0, 0], 0.6)
+        self.assertAlmostEqual(fleet.direction[0, 1], 0.8)
+        self.assertTrue(fleet.has_direction[0])
+
+    def test_arrived_ignores_drivers_without_target(self):
+        driver = make_driver(1, 0, 0, status=DriverStatus.TO_PICKUP)
+        fleet = FleetStore([driver])
+
+        self.assertEqual(fleet.arrived(DriverStatus.TO_PICKUP).tolist(), [])
+
+    def test_advance_moves_along_direction(self):
+        driver = make_driver(1, 0, 0, speed=2.0)
+        driver.assign_request(make_request(1, (10, 0), (20, 0)), 0)
+        fleet = FleetStore([driver])
+
+        fleet.advance(np.ones(1, dtype=bool), 1.0)
+
+        self.assertEqual(driver.position, Point(2, 0))
+
+    def test_release_restores_standalone_driver(self):
+        driver = make_driver(1, 1, 1)
+        fleet = FleetStore([driver])
+        fleet.position[0] = (5.0, 6.0)
+        fleet.idle_time[0] = 3
+
+        fleet.release()
+
+        self.assertIs(type(driver), Driver)
+        self.assertNotIsInstance(driver.position, FleetPoint)
+        self.assertEqual(driver.position, Point(5, 6))
+        self.assertEqual(driver.idle_time, 3)
+
+    def test_assigning_position_keeps_view(self):
+        driver = make_driver(1, 0, 0)
+        fleet = FleetStore([driver])
+        view = driver.position
+
+        driver.position = Point(3, 4)
+
+        self.assertIs(driver.position, view)
+        self.assertEqual(fleet.position[0].tolist(), [3.0, 4.0])
+
+    def test_duplicate_drivers_get_one_slot(self):
+        driver = make_driver(1, 0, 0)
+        fleet = FleetStore([driver, driver])
+
+        self.assertEqual(len(fleet), 1)
+        self.assertEqual(fleet.source_len, 2)
+
+
+class TestVectorizedSimulation(unittest.TestCase):
+
+    @staticmethod
+    def _run(vectorized: bool, ticks: int):
+        random.seed(1234)
+        drivers = []
+        for i in range(20):
+            behaviour = EarningsMaxBehaviour() if i % 2 else GreedyDistanceBehaviour()
+            drivers.append(Driver(i, Point(random.randint(0, 49), random.randint(0, 29)), 1.5,
+                                  DriverStatus.IDLE, None, behaviour, [], "test_run"))
+
+        sim = DeliverySimulation(time=0, width=50, height=30, drivers=drivers, requests=[],
+                                 request_generator=RequestGenerator(2.5, 50, 30, 1, "test_run"),
+                                 dispatch_policy=GlobalGreedyPolicy(),
+                                 mutation_rule=MutationRule(5, 0.7, "test_run"),
+                                 timeout=20,
+                                 statistics={'served': 0, 'expired': 0, 'served_waits': []},
+                                 run_id="test_run",
+                                 vectorized=vectorized)
+        for _ in range(ticks):
+            sim.tick()
+        return sim
+
+    def test_vectorized_matches_scalar_engine(self):
+        scalar = self._run(vectorized=False, ticks=150)
+        vectorized = self._run(vectorized=True, ticks=150)
+
+        self.assertEqual(scalar.statistics, vectorized.statistics)
+        for a, b in zip(scalar.drivers, vectorized.drivers):
+            self.assertEqual((a.position.x, a.position.y), (b.position.x, b.position.y))
+            self.assertEqual(a.status, b.status)
+            self.assertEqual(a.idle_time, b.idle_time)
+
+    def test_replacing_drivers_rebuilds_fleet(self):
+        sim = self._run(vectorized=True, ticks=0)
+        old_driver = sim.drivers[0]
+
+        sim.drivers = [make_driver(99, 0, 0)]
+
+        self.assertIs(type(old_driver), Driver)
+        self.assertEqual(sim.fleet.ids.tolist(), [99])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.MutationRule import MutationRule
+from phase2.RandomStreams import RandomStreams
+from phase2.Request import RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.adapter.GUIAdapter import GUIAdapter
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+
+
+def make_simulation():
+    # Same setup as phase2_dispatch_ui.py
+    return DeliverySimulation(time=0, width=50, height=30, drivers=[], requests=[],
+                              request_generator=RequestGenerator(start_id=1, rate=0.5, width=50, height=30,
+                                                                 run_id="test_run"),
+                              dispatch_policy=GlobalGreedyPolicy(),
+                              mutation_rule=MutationRule(n_trips=5, threshold=0.7, run_id="test_run"),
+                              timeout=30, statistics={}, run_id="test_run")
+
+
+class TestGUIAdapter(unittest.TestCase):
+
+    def run_gui(self, adapter):
+        drivers = adapter.generate_drivers(3)
+        requests = []
+        adapter.generate_requests(0, requests, req_rate=2)
+        state = adapter.init_state(drivers, requests, timeout=30, req_rate=2)
+        for _ in range(5):
+            state, metrics = adapter.simulate_step(state)
+        return drivers, requests, state, metrics
+
+    def test_runs_without_streams(self):
+        random.seed(1)
+        drivers, requests, state, metrics = self.run_gui(GUIAdapter("test_run", make_simulation()))
+
+        self.assertEqual(len(drivers), 3)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(len(state['drivers']), 3)
+        self.assertEqual(state['t'], 5)
+        self.assertIn('avg_wait', metrics)
+
+    def test_runs_with_streams(self):
+        for kind in RandomStreams.KINDS:
+            runs = [self.run_gui(GUIAdapter("test_run", make_simulation(), streams=RandomStreams(4, kind)))
+                    for _ in range(2)]
+
+            self.assertEqual(runs[0][:2], runs[1][:2])
+            self.assertEqual(len(runs[0][2]['drivers']), 3)
+
+    def test_reinit_mid_run_counts_waits_from_the_new_time(self):
+        adapter = GUIAdapter("test_run", make_simulation())
+        adapter.init_state(adapter.generate_drivers(3), [], timeout=30, req_rate=2)
+        adapter.simulation.run_until(100)
+
+        state = adapter.init_state([], [{'id': 1, 'px': 10, 'py': 10, 'dx': 20, 'dy': 20, 't': 0}],
+                                   timeout=30, req_rate=0)
+        request = adapter.simulation.requests.get(1)
+        self.assertEqual(request.wait_time, 0)
+
+        for _ in range(29):
+            state, _ = adapter.simulate_step(state)
+        self.assertEqual(request.status, RequestStatus.WAITING)
+        self.assertEqual(request.wait_time, 29)
+        state, _ = adapter.simulate_step(state)
+        self.assertEqual(request.status, RequestStatus.EXPIRED)
+        self.assertEqual(adapter.simulation.statistics['expired'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from phase2.Point import Point
 from phase2.Driver import Driver, DriverStatus
@@ -112,6 +113,45 @@ class TestGlobalGreedyPolicy(unittest.TestCase):
         self.assertIn(matched[0][0], [self.driver_idle_1, self.driver_idle_2])
         self.assertEqual(matched[0][1], self.request_waiting_1)
 
+    def test_candidates_used_up_falls_back_to_grid(self):
+        # Every request prefers driver 0, so with one candidate each the others have to draw more
+        drivers = [Driver(i, Point(i * 3, 0), 1.0, DriverStatus.IDLE, None, b, [], "test_run") for i in range(4)]
+        requests = [Request(i, Point(0, i * 0.1), Point(0, i * 0.1), 0, RequestStatus.WAITING, None, 0, "test_run")
+                    for i in range(4)]
+
+        matched = GlobalGreedyPolicy(candidates=1).assign(drivers, requests, 0, "test_run")
+
+        self.assertEqual([(d.id, r.id) for d, r in matched], [(0, 0), (1, 1), (2, 2), (3, 3)])
+
+    def test_matches_sorting_all_pairs(self):
+        rng = random.Random(4)
+        for _ in range(50):
+            drivers = [Driver(i, Point(rng.randint(0, 10), rng.randint(0, 10)), 1.0, DriverStatus.IDLE, None,
+                              b, [], "test_run") for i in range(rng.randint(1, 12))]
+            requests = [Request(i, Point(rng.randint(0, 10), rng.randint(0, 10)),
+                                Point(rng.randint(0, 10), rng.randint(0, 10)), 0, RequestStatus.WAITING,
+                                None, 0, "test_run") for i in range(rng.randint(1, 12))]
+
+            # Reference: sort every pair by distance, ties in driver then request order
+            all_pairs = sorted(((d.position.distance_to(r.pickup) + r.pickup.distance_to(r.dropoff), i, j)
+                                for i, d in enumerate(drivers) for j, r in enumerate(requests)))
+            used_drivers, used_requests, expected = set(), set(), []
+            for _, i, j in all_pairs:
+                if i not in used_drivers and j not in used_requests:
+                    expected.append((i, j))
+                    used_drivers.add(i)
+                    used_requests.add(j)
+
+            matched = GlobalGreedyPolicy(candidates=2).assign(drivers, requests, 0, "test_run")
+
+            self.assertEqual([(d.id, r.id) for d, r in matched], expected)
+
+    def test_invalid_candidates(self):
+        with self.assertRaises(TypeError):
+            GlobalGreedyPolicy(candidates=2.0)
+        with self.assertRaises(ValueError):
+            GlobalGreedyPolicy(candidates=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -81,6 +81,33 @@ class TestGreedyDistanceBehaviour(unittest.TestCase):
         self.assertEqual(event.driver_id, self.driver.id)
         self.assertEqual(event.request_id, offer.request.id)
 
+    @patch("phase2.behaviour.DriverBehaviour.EventManager")
+    def test_decide_batch_compares_all_offers(self, mock_event_manager):
+        # Arrange
+        offers = []
+        for request_id, distance in enumerate([5.0, 100.0, GreedyDistanceBehaviour.DISTANCE_THRESHOLD]):
+            offer = MagicMock()
+            offer.driver = self.driver
+            offer.estimated_distance_to_pickup = distance
+            offer.request.id = request_id
+            offers.append(offer)
+
+        event_manager_instance = MagicMock()
+        mock_event_manager.return_value = event_manager_instance
+
+        # Act
+        result = self.behaviour.decide_batch(offers, time=5, run_id="test_run")
+
+        # Assert
+        self.assertEqual(result.tolist(), [True, False, False])
+
+        event_manager_instance.add_events.assert_called_once()
+        events = event_manager_instance.add_events.call_args[0][0]
+        self.assertEqual([event.event_type for event in events],
+                         [EventType.REQUEST_PROPOSAL_ACCEPTED, EventType.REQUEST_PROPOSAL_DENIED,
+                          EventType.REQUEST_PROPOSAL_DENIED])
+        self.assertEqual([event.request_id for event in events], [0, 1, 2])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -43,6 +44,24 @@ class TestMutationRule(unittest.TestCase):
         with self.assertRaises(TypeError):
             MutationRule(n_trips=5, threshold=0.5, run_id=123)
 
+    def test_invalid_rng_type(self):
+        with self.assertRaises(TypeError):
+            MutationRule(n_trips=5, threshold=0.5, run_id="test_run", rng=42)
+
+    def test_same_rng_seed_gives_same_mutations(self):
+        behaviours = []
+        for _ in range(2):
+            rule = MutationRule(n_trips=4, threshold=0.5, run_id="test_run", rng=random.Random(3))
+            driver = FakeDriver(driver_id=1, behaviour=GreedyDistanceBehaviour.GreedyDistanceBehaviour(), history=[])
+            with patch("phase2.MutationRule.EventManager"):
+                names = []
+                for time in range(50):
+                    rule.maybe_mutate(driver, time)
+                    names.append(type(driver.behaviour).__name__)
+            behaviours.append(names)
+
+        self.assertEqual(behaviours[0], behaviours[1])
+
     def test_str_representation(self):
         rule = MutationRule(n_trips=3, threshold=0.2, run_id="run")
 
@@ -61,15 +80,17 @@ class TestMutationRule(unittest.TestCase):
 class TestMutationRuleMaybeMutate(unittest.TestCase):
 
     def setUp(self):
+        self.rng = MagicMock(spec=random.Random)
         self.rule = MutationRule(
             n_trips=4,
             threshold=0.5, # if half of trips are expired, mutate
-            run_id="test_run"
+            run_id="test_run",
+            rng=self.rng
         )
 
-    @patch("phase2.MutationRule.random", return_value=1)
     @patch("phase2.MutationRule.EventManager")
-    def test_does_not_mutate_when_not_enough_trips(self, mock_event_manager, mock_random):
+    def test_does_not_mutate_when_not_enough_trips(self, mock_event_manager):
+        self.rng.random.return_value = 1
         driver = FakeDriver(
             driver_id=1,
             behaviour=MagicMock(),
@@ -80,9 +101,9 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
 
         mock_event_manager.assert_not_called()
 
-    @patch("phase2.MutationRule.random", return_value=1)
     @patch("phase2.MutationRule.EventManager")
-    def test_does_not_mutate_when_expired_ratio_below_threshold(self, mock_event_manager, mock_random):
+    def test_does_not_mutate_when_expired_ratio_below_threshold(self, mock_event_manager):
+        self.rng.random.return_value = 1
         history = [
             FakeTrip(RequestStatus.EXPIRED),
             FakeTrip(RequestStatus.DELIVERED),
@@ -100,12 +121,9 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
 
         mock_event_manager.assert_not_called()
 
-    @patch("phase2.MutationRule.random", return_value=1)
-    @patch("phase2.MutationRule.choice")
     @patch("phase2.MutationRule.EventManager")
-    def test_mutates_driver_when_expired_ratio_meets_threshold(
-        self, mock_event_manager, mock_choice, mock_random
-    ):
+    def test_mutates_driver_when_expired_ratio_meets_threshold(self, mock_event_manager):
+        self.rng.random.return_value = 1
         history = [
             FakeTrip(RequestStatus.EXPIRED),
             FakeTrip(RequestStatus.EXPIRED),
@@ -116,7 +134,7 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
         old_behaviour = EarningsMaxBehaviour.EarningsMaxBehaviour()
         new_behaviour_class = GreedyDistanceBehaviour.GreedyDistanceBehaviour
 
-        mock_choice.return_value = new_behaviour_class
+        self.rng.choice.return_value = new_behaviour_class
         event_manager_instance = MagicMock()
         mock_event_manager.return_value = event_manager_instance
 
@@ -135,17 +153,14 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
         mock_event_manager.assert_called_once_with("test_run")
         event_manager_instance.add_event.assert_called_once()
 
-    @patch("phase2.MutationRule.random.choice")
-    @patch("phase2.MutationRule.random", return_value=0.0)
     @patch("phase2.MutationRule.EventManager")
-    def test_mutates_driver_when_random_event_occurs(
-            self, mock_event_manager, mock_random, mock_choice
-    ):
+    def test_mutates_driver_when_random_event_occurs(self, mock_event_manager):
+        self.rng.random.return_value = 0.0
         # Arrange
         old_behaviour = EarningsMaxBehaviour.EarningsMaxBehaviour()  # instance
         new_behaviour_class = GreedyDistanceBehaviour.GreedyDistanceBehaviour  # class
 
-        mock_choice.return_value = new_behaviour_class  # choice returns a class
+        self.rng.choice.return_value = new_behaviour_class  # choice returns a class
         mock_event_manager.return_value = MagicMock()  # EventManager instance
 
         driver = FakeDriver(
@@ -160,11 +175,10 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
         # Assert
         self.assertIsInstance(driver.behaviour, new_behaviour_class)  # instance of class
 
-    @patch("phase2.MutationRule.choice")
     @patch("phase2.MutationRule.EventManager")
-    def test_mutation_excludes_current_behaviour(
-        self, mock_event_manager, mock_choice
-    ):
+    def test_mutation_excludes_current_behaviour(self, mock_event_manager):
+        self.rng.random.return_value = 1
+        self.rng.choice.return_value = GreedyDistanceBehaviour.GreedyDistanceBehaviour
 
         history = [
             FakeTrip(RequestStatus.EXPIRED),
@@ -181,14 +195,42 @@ class TestMutationRuleMaybeMutate(unittest.TestCase):
 
         self.rule.maybe_mutate(driver, time=5)
 
-        self.assertEqual(mock_choice.call_count, 1)
+        self.assertEqual(self.rng.choice.call_count, 1)
 
-        first_call_candidates = mock_choice.call_args_list[0][0][0]
+        first_call_candidates = self.rng.choice.call_args_list[0][0][0]
         self.assertEqual(
             set(first_call_candidates),
             {GreedyDistanceBehaviour.GreedyDistanceBehaviour}
         )
 
+    def test_mutation_probability_follows_maybe_mutate(self):
+        rule = MutationRule(n_trips=2, threshold=0.5, run_id="test_run")
+        earnings = EarningsMaxBehaviour.EarningsMaxBehaviour()
+        greedy = GreedyDistanceBehaviour.GreedyDistanceBehaviour()
+        expired = [FakeTrip(RequestStatus.EXPIRED)] * 2
+        delivered = [FakeTrip(RequestStatus.DELIVERED)] * 2
+
+        self.assertAlmostEqual(rule.mutation_probability(FakeDriver(1, earnings, [])), 0.02)
+        self.assertAlmostEqual(rule.mutation_probability(FakeDriver(1, earnings, expired)), 1.0)
+        self.assertAlmostEqual(rule.mutation_probability(FakeDriver(1, earnings, delivered)), 0.02 + 0.98 * 0.05)
+        self.assertAlmostEqual(rule.mutation_probability(FakeDriver(1, greedy, delivered)), 0.02 + 0.98 * 0.5)
+
+    def test_next_mutation_is_geometric(self):
+        rule = MutationRule(n_trips=2, threshold=0.5, run_id="test_run", rng=random.Random(3))
+        driver = FakeDriver(1, EarningsMaxBehaviour.EarningsMaxBehaviour(), [])
+
+        waits = [rule.next_mutation(driver, 10) - 10 for _ in range(5000)]
+
+        self.assertEqual(min(waits), 0)
+        self.assertAlmostEqual(sum(waits) / len(waits), (1 - 0.02) / 0.02, delta=3)
+
+    def test_next_mutation_when_certain_or_never(self):
+        rule = MutationRule(n_trips=2, threshold=0.5, run_id="test_run")
+        driver = FakeDriver(1, EarningsMaxBehaviour.EarningsMaxBehaviour(), [FakeTrip(RequestStatus.EXPIRED)] * 2)
+        self.assertEqual(rule.next_mutation(driver, 4), 4)
+
+        with patch.object(MutationRule, "mutation_probability", return_value=0.0):
+            self.assertIsNone(rule.next_mutation(driver, 4))
 
 
 if __name__ == "__main__":
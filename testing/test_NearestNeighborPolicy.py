@@ -4,6 +4,7 @@ from unittest.mock import MagicMock
 from phase2.Point import Point
 from phase2.Driver import Driver, DriverStatus
 from phase2.Request import Request, RequestStatus
+from phase2.RequestStore import RequestStore
 from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
 from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
 from phase2.dispatch.NearestNeighborPolicy import NearestNeighborPolicy
@@ -112,6 +113,39 @@ class TestNearestNeighborPolicy(unittest.TestCase):
         assigned_requests = [r.id for d, r in result]
         self.assertEqual(len(set(assigned_requests)), 2)
 
+    def test_assign_uses_request_store_index(self):
+        # Arrange
+        drivers = [Driver(id=i, position=Point(i * 10, 0), speed=1.0,
+                          status=DriverStatus.IDLE, current_request=None, behaviour=GreedyDistanceBehaviour(),
+                          history=[], run_id="test_run") for i in range(3)]
+        requests = [Request(id=i, pickup=Point(i * 10 + 1, 1), dropoff=Point(0, 0), creation_time=0,
+                            status=RequestStatus.WAITING, assigned_driver=None, wait_time=0, run_id="test_run")
+                    for i in range(3)]
+        store = RequestStore(requests)
+
+        # Act
+        result = self.policy.assign(drivers, store.waiting(), 0, "test_run")
+
+        # Assert
+        self.assertEqual([(d.id, r.id) for d, r in result], [(0, 0), (1, 1), (2, 2)])
+        # Proposals do not change the store's index
+        self.assertEqual(len(store.pickup_index), 3)
+        self.assertIs(store.pickup_index.nearest(Point(0, 0)), requests[0])
+
+    def test_assign_more_drivers_than_requests(self):
+        # Arrange
+        drivers = [Driver(id=i, position=Point(i, 0), speed=1.0,
+                          status=DriverStatus.IDLE, current_request=None, behaviour=GreedyDistanceBehaviour(),
+                          history=[], run_id="test_run") for i in range(3)]
+        request = Request(id=1, pickup=Point(2, 0), dropoff=Point(0, 0), creation_time=0,
+                          status=RequestStatus.WAITING, assigned_driver=None, wait_time=0, run_id="test_run")
+
+        # Act
+        result = self.policy.assign(drivers, [request], 0, "test_run")
+
+        # Assert
+        self.assertEqual(result, [(drivers[0], request)])
+
 
 if __name__ == "__main__":
     unittest.main()
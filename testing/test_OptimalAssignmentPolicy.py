@@ -0,0 +1,183 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from phase2.Point import Point
+from phase2.Driver import Driver, DriverStatus
+from phase2.Request import Request, RequestStatus
+from phase2.dispatch.CostMatrix import CostMatrix
+from phase2.dispatch.GlobalGreedyPolicy import GlobalGreedyPolicy
+from phase2.dispatch.OptimalAssignmentPolicy import OptimalAssignmentPolicy
+from phase2.behaviour.EarningsMaxBehaviour import EarningsMaxBehaviour
+
+b = EarningsMaxBehaviour()
+
+
+def brute_force(cost):
+    n, m = cost.shape
+    if n <= m:
+        return min(sum(cost[i, cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+    return brute_force(cost.T)
+
+
+class TestOptimalAssignmentPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = OptimalAssignmentPolicy()
+        self.rng = np.random.default_rng(3)
+
+    def make_driver(self, driver_id, x, y, status=DriverStatus.IDLE):
+        return Driver(driver_id, Point(x, y), 1.0, status, None, b, [], "test_run")
+
+    def make_request(self, request_id, pickup, dropoff, status=RequestStatus.WAITING):
+        return Request(request_id, Point(*pickup), Point(*dropoff), 0, status, None, 0, "test_run")
+
+    def check_solution(self, cost, rows, cols):
+        self.assertEqual(len(rows), min(cost.shape))
+        self.assertEqual(len(set(rows.tolist())), len(rows))
+        self.assertEqual(len(set(cols.tolist())), len(cols))
+        self.assertTrue(np.all(np.diff(rows) > 0))
+
+    def test_exact_matches_brute_force(self):
+        for n, m in [(1, 1), (3, 3), (4, 6), (6, 4), (5, 5), (2, 7)]:
+            for _ in range(5):
+                cost = self.rng.uniform(0, 100, size=(n, m))
+                rows, cols = self.policy.solve(cost)
+                self.check_solution(cost, rows, cols)
+                self.assertAlmostEqual(cost[rows, cols].sum(), brute_force(cost))
+
+    def test_exact_with_ties(self):
+        cost = self.rng.integers(0, 3, size=(5, 6)).astype(float)
+        rows, cols = self.policy.solve(cost)
+        self.check_solution(cost, rows, cols)
+        self.assertAlmostEqual(cost[rows, cols].sum(), brute_force(cost))
+
+    def test_auction_within_epsilon(self):
+        policy = OptimalAssignmentPolicy(max_exact_size=0, auction_epsilon=1e-3)
+        for n, m in [(1, 1), (1, 4), (4, 4), (5, 7), (7, 5), (3, 3)]:
+            for _ in range(5):
+                cost = self.rng.uniform(0, 100, size=(n, m))
+                rows, cols = policy.solve(cost)
+                self.check_solution(cost, rows, cols)
+                self.assertLessEqual(cost[rows, cols].sum(), brute_force(cost) + min(n, m) * 1e-3 + 1e-9)
+
+    def test_auction_agrees_with_hungarian(self):
+        exact = OptimalAssignmentPolicy()
+        auction = OptimalAssignmentPolicy(max_exact_size=0, auction_epsilon=1e-4)
+        points = self.rng.uniform(0, 100, size=(60, 2))
+        pickups = self.rng.uniform(0, 100, size=(80, 2))
+        cost = np.sqrt(((points[:, None, :] - pickups[None, :, :]) ** 2).sum(axis=2))
+
+        rows, cols = exact.solve(cost)
+        optimum = cost[rows, cols].sum()
+        rows, cols = auction.solve(cost)
+        self.check_solution(cost, rows, cols)
+        self.assertLessEqual(cost[rows, cols].sum(), optimum + 60 * 1e-4 + 1e-9)
+
+    def test_solve_empty(self):
+        rows, cols = self.policy.solve(np.empty((0, 3)))
+        self.assertEqual(len(rows), 0)
+        self.assertEqual(len(cols), 0)
+
+    def test_solve_rejects_non_matrix(self):
+        with self.assertRaises(ValueError):
+            self.policy.solve(np.zeros(3))
+
+    def test_assign_beats_greedy(self):
+        # Greedy takes the closest pair (d1, r1) first and leaves d2 with a long trip
+        d1 = self.make_driver(1, 0, 0)
+        d2 = self.make_driver(2, 4, 0)
+        r1 = self.make_request(1, (2, 0), (2, 0))
+        r2 = self.make_request(2, (-3, 0), (-3, 0))
+
+        matched = self.policy.assign([d1, d2], [r1, r2], 0, "test_run")
+        self.assertEqual(matched, [(d1, r2), (d2, r1)])
+
+        greedy = GlobalGreedyPolicy().assign([d1, d2], [r1, r2], 0, "test_run")
+        self.assertEqual(greedy, [(d1, r1), (d2, r2)])
+
+    def test_assign_filters_and_orders_by_driver(self):
+        busy = self.make_driver(1, 0, 0, DriverStatus.TO_PICKUP)
+        d2 = self.make_driver(2, 10, 0)
+        d3 = self.make_driver(3, 0, 0)
+        r1 = self.make_request(1, (9, 0), (9, 0))
+        r2 = self.make_request(2, (1, 0), (1, 0))
+        done = self.make_request(3, (0, 0), (0, 0), RequestStatus.DELIVERED)
+
+        matched = self.policy.assign([busy, d2, d3], [r1, r2, done], 0, "test_run")
+        self.assertEqual(matched, [(d2, r1), (d3, r2)])
+
+    def test_assign_more_drivers_than_requests(self):
+        drivers = [self.make_driver(i, 3 * i, 0) for i in range(5)]
+        request = self.make_request(1, (7, 0), (8, 0))
+
+        matched = self.policy.assign(drivers, [request], 0, "test_run")
+        self.assertEqual(matched, [(drivers[2], request)])
+
+    def test_assign_no_idle_drivers_or_requests(self):
+        busy = self.make_driver(1, 0, 0, DriverStatus.TO_DROPOFF)
+        request = self.make_request(1, (1, 0), (2, 0))
+        self.assertEqual(self.policy.assign([busy], [request], 0, "test_run"), [])
+        self.assertEqual(self.policy.assign([self.make_driver(2, 0, 0)], [], 0, "test_run"), [])
+
+    def test_assign_uses_matching_cost_matrix(self):
+        drivers = [self.make_driver(i, int(x), int(y)) for i, (x, y) in enumerate(self.rng.integers(0, 50, (6, 2)))]
+        requests = [self.make_request(i, tuple(p[:2].tolist()), tuple(p[2:].tolist()))
+                    for i, p in enumerate(self.rng.integers(0, 50, (8, 4)))]
+        costs = CostMatrix(drivers, requests)
+
+        matched = self.policy.assign(drivers, requests, 0, "test_run", costs=costs)
+        self.assertEqual(matched, self.policy.assign(drivers, requests, 0, "test_run"))
+
+        total = sum(costs.pair(d, r)[0] for d, r in matched)
+        greedy_total = sum(costs.pair(d, r)[0] for d, r in GlobalGreedyPolicy().assign(drivers, requests, 0, "test_run"))
+        self.assertLessEqual(total, greedy_total + 1e-9)
+
+    def test_assign_above_dense_limit(self):
+        for n_drivers, n_requests in [(40, 12), (12, 40)]:
+            drivers = [self.make_driver(i, float(x), float(y))
+                       for i, (x, y) in enumerate(self.rng.uniform(0, 50, (n_drivers, 2)))]
+            requests = [self.make_request(i, tuple(p[:2].tolist()), tuple(p[2:].tolist()))
+                        for i, p in enumerate(self.rng.uniform(0, 50, (n_requests, 4)))]
+            costs = CostMatrix(drivers, requests, dense_limit=400)
+
+            matched = self.policy.assign(drivers, requests, 0, "test_run", costs=costs)
+
+            # The full matrix is never built
+            self.assertIsNone(costs._total_distances)
+            self.assertEqual(len(matched), 12)
+            self.assertEqual(len({d.id for d, _ in matched}), 12)
+            self.assertEqual(len({r.id for _, r in matched}), 12)
+            self.assertEqual([d.id for d, _ in matched], sorted(d.id for d, _ in matched))
+
+            total = sum(costs.pair(d, r)[0] for d, r in matched)
+            optimum = sum(costs.pair(d, r)[0] for d, r in self.policy.assign(drivers, requests, 0, "test_run"))
+            self.assertLessEqual(total, 1.05 * optimum)
+
+    def test_chunks_match_optimum_on_separate_clusters(self):
+        # Every request has one driver right next to it, far from all others
+        drivers = [self.make_driver(i, 100 * i, 0) for i in range(10)]
+        requests = [self.make_request(i, (100 * (9 - i) + 1, 0), (100 * (9 - i) + 2, 0)) for i in range(10)]
+        costs = CostMatrix(drivers, requests, dense_limit=20)
+
+        matched = self.policy.assign(drivers, requests, 0, "test_run", costs=costs)
+        self.assertEqual(matched, self.policy.assign(drivers, requests, 0, "test_run"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            OptimalAssignmentPolicy(max_exact_size=1.5)
+        with self.assertRaises(ValueError):
+            OptimalAssignmentPolicy(max_exact_size=-1)
+        with self.assertRaises(TypeError):
+            OptimalAssignmentPolicy(auction_epsilon="small")
+        with self.assertRaises(ValueError):
+            OptimalAssignmentPolicy(auction_epsilon=0)
+        with self.assertRaises(TypeError):
+            OptimalAssignmentPolicy(candidates=2.0)
+        with self.assertRaises(ValueError):
+            OptimalAssignmentPolicy(candidates=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from phase2.ParameterSweep import ParameterSweep, run_configuration
+from phase2.sweep import parse_grid
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.results_path = os.path.join(self.tmp_dir.name, "results.csv")
+        self.sweep = ParameterSweep("sweep", {'rate': [0.5, 1.0], 'policy': ["global_greedy", "nearest_neighbor"]},
+                                    replications=2, base={'ticks': 30, 'drivers': 5}, seed=1,
+                                    results_path=self.results_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_configurations_cover_grid(self):
+        self.assertEqual(self.sweep.configurations,
+                         [{'rate': 0.5, 'policy': "global_greedy"}, {'rate': 0.5, 'policy': "nearest_neighbor"},
+                          {'rate': 1.0, 'policy': "global_greedy"}, {'rate': 1.0, 'policy': "nearest_neighbor"}])
+        self.assertEqual(len(self.sweep.pending()), 8)
+
+    def test_seeds_and_run_ids_are_unique_and_stable(self):
+        seeds = {self.sweep.seed_for(c, r) for c in range(4) for r in range(2)}
+        run_ids = {self.sweep.run_id(c, r) for c in range(4) for r in range(2)}
+
+        self.assertEqual(len(seeds), 8)
+        self.assertEqual(len(run_ids), 8)
+        self.assertEqual(self.sweep.seed_for(2, 1), self.sweep.seed_for(2, 1))
+        self.assertIn("test_run", self.sweep.run_id(0, 0))
+
+    def test_run_configuration_is_repeatable(self):
+        params = {'ticks': 30, 'drivers': 5, 'rate': 1.0}
+        first = run_configuration(params, 7, "sweep_test_run")
+        second = run_configuration(params, 7, "sweep_test_run")
+
+        for key in ('served', 'expired', 'avg_wait'):
+            self.assertEqual(first[key], second[key])
+
+    def test_run_writes_results_and_resumes(self):
+        progress = []
+        results = self.sweep.run(max_workers=2, progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual([(row['config'], row['replication']) for row in results],
+                         [(c, r) for c in range(4) for r in range(2)])
+        self.assertEqual(progress[-1], (8, 8))
+        self.assertEqual(self.sweep.pending(), [])
+
+        # Drop two runs, as if the sweep had been interrupted
+        with open(self.results_path, newline='') as f:
+            rows = list(csv.reader(f))
+        with open(self.results_path, 'w', newline='') as f:
+            csv.writer(f).writerows(rows[:-2])
+        self.assertEqual(len(self.sweep.pending()), 2)
+
+        progress.clear()
+        resumed = self.sweep.run(max_workers=2, progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(progress, [(7, 8), (8, 8)])
+        self.assertEqual([(row['served'], row['expired']) for row in resumed],
+                         [(row['served'], row['expired']) for row in results])
+
+    def test_failing_runs_keep_finished_runs(self):
+        sweep = ParameterSweep("sweep", {'policy': ["global_greedy", "missing"]}, replications=2,
+                               base={'ticks': 30, 'drivers': 5}, seed=1, results_path=self.results_path)
+
+        with self.assertRaises(RuntimeError) as context:
+            sweep.run(max_workers=2)
+
+        self.assertIn("2 of 4 runs failed", str(context.exception))
+        self.assertIsInstance(context.exception.__cause__, KeyError)
+        self.assertEqual(len(sweep.results()), 2)
+        self.assertEqual(sweep.pending(), [(1, 0), (1, 1)])
+
+    def test_summary_averages_replications(self):
+        self.sweep.run(max_workers=2)
+        results = self.sweep.results()
+        summary = self.sweep.summary()
+
+        self.assertEqual(len(summary), 4)
+        self.assertEqual(summary[0]['replications'], 2)
+        self.assertEqual(summary[0]['served'], (results[0]['served'] + results[1]['served']) / 2)
+
+    def test_results_file_of_other_sweep(self):
+        self.sweep.run(max_workers=2)
+        other = ParameterSweep("other", {'timeout': [10]}, results_path=self.results_path)
+
+        self.assertEqual(other.results(), [])
+        with self.assertRaises(ValueError):
+            other.run(max_workers=1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep("sweep", {'unknown': [1]})
+        with self.assertRaises(ValueError):
+            ParameterSweep("sweep", {'seed': [1, 2]})
+        with self.assertRaises(TypeError):
+            ParameterSweep("sweep", {'rate': []})
+        with self.assertRaises(ValueError):
+            ParameterSweep("sweep", {'rate': [1.0]}, replications=0)
+
+    def test_parse_grid(self):
+        self.assertEqual(parse_grid(["rate=0.5,1", "policy=optimal", "n-trips=3", "vectorized=true"]),
+                         {'rate': [0.5, 1], 'policy': ["optimal"], 'n_trips': [3], 'vectorized': [True]})
+        with self.assertRaises(ValueError):
+            parse_grid(["rate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
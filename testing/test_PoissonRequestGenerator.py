@@ -0,0 +1,121 @@
+import random
+import unittest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from phase2.PoissonRequestGenerator import PoissonRequestGenerator
+from phase2.RateProfile import RateProfile
+from phase2.Request import RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+
+
+class TestPoissonRequestGenerator(unittest.TestCase):
+
+    def make(self, profile, seed=1, **kwargs):
+        return PoissonRequestGenerator(profile, width=20, height=10, start_id=1, run_id="test_run",
+                                       rng=random.Random(seed), **kwargs)
+
+    def test_is_a_request_generator(self):
+        self.assertIsInstance(self.make(RateProfile.constant(1)), RequestGenerator)
+
+    def test_counts_are_poisson(self):
+        rg = self.make(RateProfile.constant(3.0))
+        counts = np.array([len(rg.maybe_generate(time)) for time in range(4000)])
+
+        # A Poisson count has its variance equal to its mean
+        self.assertAlmostEqual(counts.mean(), 3.0, delta=0.1)
+        self.assertAlmostEqual(counts.var(), 3.0, delta=0.3)
+        self.assertEqual(rg.next_id, counts.sum() + 1)
+
+    def test_rush_hour_follows_the_profile(self):
+        rg = self.make(RateProfile([(0, 0.5), (100, 5.0), (150, 0.5)], period=200))
+        counts = [len(rg.maybe_generate(time)) for time in range(2000)]
+
+        quiet = [c for time, c in enumerate(counts) if not 100 <= time % 200 < 150]
+        rush = [c for time, c in enumerate(counts) if 100 <= time % 200 < 150]
+        self.assertAlmostEqual(np.mean(quiet), 0.5, delta=0.1)
+        self.assertAlmostEqual(np.mean(rush), 5.0, delta=0.3)
+
+    def test_rate_follows_the_time(self):
+        rg = self.make(RateProfile([(0, 0.5), (10, 2.0)]))
+        rg.maybe_generate(12)
+        self.assertEqual(rg.rate, 2.0)
+
+    def test_peak_rate_is_profile_maximum(self):
+        rg = self.make(RateProfile([(0, 0.5), (10, 2.0), (20, 1.0)]))
+        self.assertEqual(rg.peak_rate, 2.0)
+
+    def test_zero_rate_generates_nothing(self):
+        rg = self.make(RateProfile.constant(0))
+        self.assertEqual(rg.maybe_generate(0), [])
+
+    def test_request_fields(self):
+        rg = self.make(RateProfile.constant(5))
+        requests = rg.maybe_generate(3)
+
+        self.assertGreater(len(requests), 0)
+        for r in requests:
+            self.assertEqual(r.creation_time, 3)
+            self.assertEqual(r.status, RequestStatus.WAITING)
+            self.assertTrue(0 <= r.pickup.x <= 19 and 0 <= r.pickup.y <= 9)
+            self.assertTrue(0 <= r.dropoff.x <= 19 and 0 <= r.dropoff.y <= 9)
+
+    def test_density_grid_places_points_in_its_cells(self):
+        pickup = np.zeros((2, 4))
+        pickup[1, 3] = 1.0   # bottom right cell: x in [15, 20), y in [5, 10)
+        dropoff = np.zeros((2, 4))
+        dropoff[0, 0] = 1.0  # top left cell: x in [0, 5), y in [0, 5)
+        rg = self.make(RateProfile.constant(4), pickup_density=pickup, dropoff_density=dropoff)
+
+        requests = [r for time in range(50) for r in rg.maybe_generate(time)]
+        self.assertGreater(len(requests), 0)
+        for r in requests:
+            self.assertTrue(15 <= r.pickup.x <= 19 and 5 <= r.pickup.y <= 9)
+            self.assertTrue(0 <= r.dropoff.x <= 4 and 0 <= r.dropoff.y <= 4)
+
+    def test_same_seed_gives_same_requests(self):
+        runs = []
+        for _ in range(2):
+            rg = self.make(RateProfile([(0, 1.0), (5, 3.0)], period=10, kind="linear"), seed=6,
+                           pickup_density=np.arange(8).reshape(2, 4))
+            runs.append([(r.id, r.creation_time, r.pickup.x, r.pickup.y, r.dropoff.x, r.dropoff.y)
+                         for time in range(30) for r in rg.maybe_generate(time)])
+
+        self.assertEqual(runs[0], runs[1])
+
+    @patch("phase2.PoissonRequestGenerator.EventManager")
+    def test_events_are_added_in_one_call(self, mock_event_manager):
+        event_manager_instance = MagicMock()
+        mock_event_manager.return_value = event_manager_instance
+
+        requests = self.make(RateProfile.constant(5)).maybe_generate(0)
+
+        event_manager_instance.add_events.assert_called_once()
+        events = event_manager_instance.add_events.call_args[0][0]
+        self.assertEqual([e.request_id for e in events], [r.id for r in requests])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            PoissonRequestGenerator(1.0, width=20, height=10, start_id=1, run_id="test_run")
+        with self.assertRaises(ValueError):
+            self.make(RateProfile.constant(1), pickup_density=np.ones(4))
+        with self.assertRaises(ValueError):
+            self.make(RateProfile.constant(1)).maybe_generate(-1)
+
+    def test_next_arrival_peeks_without_changing_requests(self):
+        profile = RateProfile([(0, 0.05), (20, 1.5), (30, 0.05)], period=60, kind="linear")
+        peeked, plain = self.make(profile, seed=9), self.make(profile, seed=9)
+        expected = [(r.id, r.creation_time, r.pickup.x) for time in range(120) for r in plain.maybe_generate(time)]
+
+        created = []
+        time = 0
+        while (time := peeked.next_arrival(time, 120)) is not None:
+            created.extend((r.id, r.creation_time, r.pickup.x) for r in peeked.maybe_generate(time))
+            time += 1
+
+        self.assertEqual(created, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
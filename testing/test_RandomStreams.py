@@ -0,0 +1,91 @@
+import random
+import unittest
+
+import numpy as np
+
+from phase2.RandomStreams import NumpyRandom, RandomStreams, as_random
+
+
+class TestAsRandom(unittest.TestCase):
+
+    def test_none_is_global_random_module(self):
+        self.assertIs(as_random(None), random)
+
+    def test_random_instance_is_kept(self):
+        rng = random.Random(1)
+        self.assertIs(as_random(rng), rng)
+
+    def test_numpy_generator_is_wrapped(self):
+        rng = as_random(np.random.default_rng(1))
+
+        self.assertIsInstance(rng, NumpyRandom)
+        self.assertTrue(0 <= rng.random() < 1)
+        self.assertTrue(2 <= rng.uniform(2, 3) <= 3)
+        self.assertIn(rng.choice(["a", "b"]), ["a", "b"])
+        self.assertIn(rng.randint(0, 4), range(5))
+
+    def test_invalid_type(self):
+        with self.assertRaises(TypeError):
+            as_random(1)
+
+
+class TestNumpyRandom(unittest.TestCase):
+
+    def test_draws_follow_the_generator(self):
+        draws = [NumpyRandom(np.random.default_rng(5)).random() for _ in range(2)]
+        self.assertEqual(draws[0], draws[1])
+        self.assertEqual(draws[0], float(np.random.default_rng(5).random()))
+
+    def test_state_round_trip(self):
+        rng = NumpyRandom(np.random.default_rng(5))
+        state = rng.getstate()
+        first = [rng.random() for _ in range(3)]
+        rng.setstate(state)
+        self.assertEqual([rng.random() for _ in range(3)], first)
+
+    def test_invalid_generator(self):
+        with self.assertRaises(TypeError):
+            NumpyRandom(random.Random(1))
+
+
+class TestRandomStreams(unittest.TestCase):
+
+    def test_same_seed_gives_same_streams(self):
+        for kind in RandomStreams.KINDS:
+            a, b = RandomStreams(9, kind=kind), RandomStreams(9, kind=kind)
+            for name in ("demand", "fleet", "mutation"):
+                self.assertEqual([as_random(getattr(a, name)).random() for _ in range(5)],
+                                 [as_random(getattr(b, name)).random() for _ in range(5)])
+
+    def test_streams_are_independent(self):
+        streams = RandomStreams(9)
+        draws = [[stream.random() for _ in range(5)] for stream in (streams.demand, streams.fleet, streams.mutation)]
+        self.assertEqual(len({tuple(d) for d in draws}), 3)
+
+        # Using one stream does not shift the others
+        other = RandomStreams(9)
+        for _ in range(100):
+            other.fleet.random()
+        self.assertEqual([other.demand.random() for _ in range(5)], draws[0])
+
+    def test_different_seeds_differ(self):
+        self.assertNotEqual(RandomStreams(1).demand.random(), RandomStreams(2).demand.random())
+
+    def test_kinds(self):
+        self.assertIsInstance(RandomStreams(1).demand, random.Random)
+        self.assertIsInstance(RandomStreams(1, kind="numpy").demand, np.random.Generator)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            RandomStreams("1")
+        with self.assertRaises(ValueError):
+            RandomStreams(1, kind="mt")
+
+    def test_str_representation(self):
+        streams = RandomStreams(3, kind="numpy")
+        self.assertEqual(str(streams), "RandomStreams(seed=3, kind=numpy)")
+        self.assertEqual(repr(streams), str(streams))
+
+
+if __name__ == '__main__':
+    unittest.main()
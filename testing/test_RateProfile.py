@@ -0,0 +1,72 @@
+import unittest
+
+from phase2.RateProfile import RateProfile
+
+
+class TestRateProfile(unittest.TestCase):
+
+    def test_step_holds_rate_until_next_point(self):
+        profile = RateProfile([(0, 0.5), (100, 3.0), (150, 0.5)])
+
+        self.assertEqual(profile.rate(0), 0.5)
+        self.assertEqual(profile.rate(99.9), 0.5)
+        self.assertEqual(profile.rate(100), 3.0)
+        self.assertEqual(profile.rate(149), 3.0)
+        self.assertEqual(profile.rate(1000), 0.5)
+        self.assertEqual(profile.max_rate, 3.0)
+
+    def test_linear_interpolates(self):
+        profile = RateProfile([(0, 1.0), (10, 3.0)], kind="linear")
+
+        self.assertAlmostEqual(profile.rate(5), 2.0)
+        self.assertEqual(profile.rate(20), 3.0)
+
+    def test_before_first_point_uses_first_rate(self):
+        self.assertEqual(RateProfile([(10, 2.0), (20, 1.0)]).rate(3), 2.0)
+
+    def test_periodic_step_repeats(self):
+        profile = RateProfile([(0, 0.5), (100, 3.0), (150, 0.5)], period=300)
+
+        self.assertEqual(profile.rate(420), 3.0)
+        self.assertEqual(profile.rate(460), 0.5)
+
+    def test_periodic_curve_wraps_before_first_point(self):
+        self.assertEqual(RateProfile([(10, 2.0), (20, 1.0)], period=50).rate(55), 1.0)
+
+    def test_periodic_linear_closes_the_cycle(self):
+        profile = RateProfile([(0, 0.0), (50, 4.0)], period=100, kind="linear")
+
+        self.assertAlmostEqual(profile.rate(75), 2.0)
+        self.assertAlmostEqual(profile.rate(125), 2.0)
+
+    def test_constant(self):
+        profile = RateProfile.constant(1.5)
+        self.assertEqual(profile.rate(0), 1.5)
+        self.assertEqual(profile.rate(10 ** 6), 1.5)
+
+    def test_invalid_points(self):
+        with self.assertRaises(TypeError):
+            RateProfile([])
+        with self.assertRaises(TypeError):
+            RateProfile([(0, "1")])
+        with self.assertRaises(ValueError):
+            RateProfile([(5, 1.0), (5, 2.0)])
+        with self.assertRaises(ValueError):
+            RateProfile([(0, -1.0)])
+
+    def test_invalid_period_and_kind(self):
+        with self.assertRaises(ValueError):
+            RateProfile([(0, 1.0), (10, 2.0)], period=10)
+        with self.assertRaises(TypeError):
+            RateProfile([(0, 1.0)], period="day")
+        with self.assertRaises(ValueError):
+            RateProfile([(0, 1.0)], kind="cubic")
+
+    def test_str_representation(self):
+        profile = RateProfile([(0, 1.0)], period=10)
+        self.assertEqual(str(profile), "RateProfile(points=[(0, 1.0)], period=10, kind=step)")
+        self.assertEqual(repr(profile), str(profile))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import random
 import unittest
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 from phase2.RequestGenerator import RequestGenerator
 from phase2.Request import RequestStatus
 
@@ -136,4 +139,93 @@ class TestRequestGeneratorMaybeGenerate(unittest.TestCase):
         rg = RequestGenerator(rate=1, width=10, height=10, start_id=0, run_id="test_run")
         rg.maybe_generate(time=7)
 
-        event_manager_instance.add_event.assert_called_once()
\ No newline at end of file
+        event_manager_instance.add_event.assert_called_once()
+
+
+class TestRequestGeneratorBatched(unittest.TestCase):
+
+    def test_invalid_batch_ticks(self):
+        with self.assertRaises(TypeError):
+            RequestGenerator(rate=1, width=10, height=10, start_id=0, run_id="test_run", batch_ticks=1.5)
+        with self.assertRaises(ValueError):
+            RequestGenerator(rate=1, width=10, height=10, start_id=0, run_id="test_run", batch_ticks=-1)
+
+    def test_integer_rate_gives_exact_counts_inside_the_map(self):
+        rg = RequestGenerator(rate=3, width=10, height=5, start_id=1, run_id="test_run",
+                              rng=random.Random(1), batch_ticks=4)
+        requests = []
+        for time in range(10):
+            new = rg.maybe_generate(time)
+            self.assertEqual(len(new), 3)
+            self.assertTrue(all(r.creation_time == time for r in new))
+            requests += new
+
+        self.assertEqual([r.id for r in requests], list(range(1, 31)))
+        self.assertEqual(rg.next_id, 31)
+        for r in requests:
+            self.assertEqual(r.status, RequestStatus.WAITING)
+            for point in (r.pickup, r.dropoff):
+                self.assertTrue(0 <= point.x <= 9 and 0 <= point.y <= 4)
+                self.assertEqual(point.x, int(point.x))
+
+    def test_fractional_rate_matches_on_average(self):
+        rg = RequestGenerator(rate=1.25, width=10, height=10, start_id=1, run_id="test_run",
+                              rng=np.random.default_rng(2), batch_ticks=64)
+        counts = [len(rg.maybe_generate(time)) for time in range(2000)]
+
+        self.assertTrue(set(counts) <= {1, 2})
+        self.assertAlmostEqual(sum(counts) / len(counts), 1.25, delta=0.05)
+
+    def test_same_seed_gives_same_requests(self):
+        runs = []
+        for _ in range(2):
+            rg = RequestGenerator(rate=2.5, width=20, height=20, start_id=1, run_id="test_run",
+                                  rng=random.Random(8), batch_ticks=16)
+            runs.append([(r.id, r.pickup.x, r.pickup.y, r.dropoff.x, r.dropoff.y)
+                         for time in range(40) for r in rg.maybe_generate(time)])
+
+        self.assertEqual(runs[0], runs[1])
+
+    def test_rate_change_draws_a_new_block(self):
+        rg = RequestGenerator(rate=1, width=10, height=10, start_id=1, run_id="test_run",
+                              rng=random.Random(3), batch_ticks=50)
+        rg.maybe_generate(0)
+        rg.rate = 4
+
+        self.assertEqual(len(rg.maybe_generate(1)), 4)
+
+    @patch("phase2.RequestGenerator.EventManager")
+    def test_events_are_added_in_one_call(self, mock_event_manager):
+        event_manager_instance = MagicMock()
+        mock_event_manager.return_value = event_manager_instance
+
+        rg = RequestGenerator(rate=3, width=10, height=10, start_id=1, run_id="test_run",
+                              rng=random.Random(1), batch_ticks=8)
+        rg.maybe_generate(time=2)
+
+        event_manager_instance.add_events.assert_called_once()
+        events = event_manager_instance.add_events.call_args[0][0]
+        self.assertEqual([e.request_id for e in events], [1, 2, 3])
+
+    def test_next_arrival_peeks_without_changing_requests(self):
+        for batch_ticks in (0, 8):
+            peeked = RequestGenerator(rate=0.2, width=10, height=10, start_id=1, run_id="test_run",
+                                      rng=random.Random(4), batch_ticks=batch_ticks)
+            plain = RequestGenerator(rate=0.2, width=10, height=10, start_id=1, run_id="test_run",
+                                     rng=random.Random(4), batch_ticks=batch_ticks)
+            expected = [(time, r.id, r.pickup.x, r.dropoff.y) for time in range(100)
+                        for r in plain.maybe_generate(time)]
+
+            created = []
+            time = 0
+            while (time := peeked.next_arrival(time, 100)) is not None:
+                created.extend((time, r.id, r.pickup.x, r.dropoff.y) for r in peeked.maybe_generate(time))
+                time += 1
+
+            self.assertEqual(created, expected)
+
+    def test_next_arrival_respects_until(self):
+        rg = RequestGenerator(rate=3, width=10, height=10, start_id=1, run_id="test_run", rng=random.Random(1))
+
+        self.assertIsNone(rg.next_arrival(5, 5))
+        self.assertEqual(rg.next_arrival(5, 6), 5)
@@ -0,0 +1,116 @@
+import unittest
+
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+from phase2.RequestStore import RequestStore
+
+
+def make_request(id, status=RequestStatus.WAITING):
+    return Request(id, Point(0, 0), Point(1, 1), 0, status, None, 0, "test_run")
+
+
+class TestRequestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.waiting = make_request(1)
+        self.assigned = make_request(2, RequestStatus.ASSIGNED)
+        self.delivered = make_request(3, RequestStatus.DELIVERED)
+        self.store = RequestStore([self.waiting, self.assigned, self.delivered])
+
+    def test_requests_are_partitioned_by_status(self):
+        self.assertEqual(self.store.waiting(), [self.waiting])
+        self.assertEqual(self.store.assigned(), [self.assigned])
+        self.assertEqual(self.store.picked(), [])
+        self.assertEqual(self.store.archive, [self.delivered])
+        self.assertEqual(len(self.store), 3)
+
+    def test_active_excludes_archived_requests(self):
+        self.assertEqual(self.store.active(), [self.waiting, self.assigned])
+
+    def test_status_change_moves_request(self):
+        self.waiting.mark_assigned(7, 1)
+
+        self.assertEqual(self.store.waiting(), [])
+        self.assertEqual(self.store.assigned(), [self.assigned, self.waiting])
+
+    def test_finished_request_is_archived(self):
+        self.assigned.mark_picked(1)
+        self.assigned.mark_delivered(2)
+
+        self.assertNotIn(self.assigned, self.store.active())
+        self.assertIn(self.assigned, self.store.archive)
+        self.assertIsNone(self.store.get(2))
+
+    def test_get_finds_active_request(self):
+        self.assertIs(self.store.get(1), self.waiting)
+
+    def test_count(self):
+        self.assertEqual(self.store.count(RequestStatus.WAITING), 1)
+        self.assertEqual(self.store.count(RequestStatus.DELIVERED), 1)
+        self.assertEqual(self.store.count(RequestStatus.EXPIRED), 0)
+
+    def test_iteration_yields_every_request(self):
+        self.assertCountEqual(list(self.store), [self.waiting, self.assigned, self.delivered])
+
+    def test_append_behaves_like_add(self):
+        request = make_request(4)
+        self.store.append(request)
+
+        self.assertIn(request, self.store.waiting())
+
+    def test_by_status_rejects_archived_status(self):
+        with self.assertRaises(ValueError):
+            self.store.by_status(RequestStatus.EXPIRED)
+
+    def test_add_rejects_non_request(self):
+        with self.assertRaises(TypeError):
+            self.store.add("not a request")
+
+    def test_moving_request_to_other_store(self):
+        other = RequestStore()
+        other.add(self.waiting)
+        self.waiting.mark_expired(1)
+
+        self.assertEqual(self.store.waiting(), [])
+        self.assertEqual(other.archive, [self.waiting])
+
+    def test_pickup_index_follows_waiting_bucket(self):
+        self.assertEqual(len(self.store.pickup_index), 1)
+        self.assertIn(self.waiting.id, self.store.pickup_index)
+
+        self.waiting.mark_assigned(7, 1)
+        self.assertEqual(len(self.store.pickup_index), 0)
+
+        self.assigned.status = RequestStatus.WAITING
+        self.assertIs(self.store.pickup_index.nearest(Point(0, 0)), self.assigned)
+
+    def test_next_expiry_is_oldest_active_request(self):
+        now = [5]
+        store = RequestStore([Request(1, Point(0, 0), Point(1, 1), 3, RequestStatus.WAITING, None, 0, "test_run"),
+                              Request(2, Point(0, 0), Point(1, 1), 1, RequestStatus.ASSIGNED, None, 2, "test_run")])
+        self.assertIsNone(store.next_expiry())
+        store.clock = lambda: now[0]
+
+        self.assertEqual(store.next_expiry(), 3)  # waited 2 ticks before the clock started
+        store.get(2).status = RequestStatus.DELIVERED
+        self.assertEqual(store.next_expiry(), 5)
+        self.assertIsNone(RequestStore().next_expiry())
+
+    def test_wait_time_counts_from_when_request_is_added(self):
+        now = [10]
+        store = RequestStore()
+        store.clock = lambda: now[0]
+        request = Request(4, Point(0, 0), Point(1, 1), 50, RequestStatus.WAITING, None, 1, "test_run")
+
+        store.add(request)
+        now[0] = 13
+
+        self.assertEqual(request.wait_time, 4)
+        request.wait_time = 0  # counts on from the new value
+        self.assertEqual(store.pop_expired(1), [])
+        now[0] = 14
+        self.assertEqual(store.pop_expired(1), [request])
+
+
+if __name__ == "__main__":
+    unittest.main()
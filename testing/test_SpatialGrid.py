@@ -0,0 +1,136 @@
+import random
+import unittest
+
+from phase2.Driver import Driver, DriverStatus
+from phase2.Point import Point
+from phase2.Request import Request, RequestStatus
+from phase2.SpatialGrid import SpatialGrid
+from phase2.behaviour.GreedyDistanceBehaviour import GreedyDistanceBehaviour
+
+
+def make_request(id, x, y):
+    return Request(id, Point(x, y), Point(0, 0), 0, RequestStatus.WAITING, None, 0, "test_run")
+
+
+def linear_nearest(requests, point):
+    best, best_distance = None, float("inf")
+    for request in requests:
+        distance = point.distance_to(request.pickup)
+        if distance < best_distance:
+            best, best_distance = request, distance
+    return best
+
+
+class TestSpatialGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.near = make_request(1, 1, 1)
+        self.far = make_request(2, 20, 20)
+        self.grid = SpatialGrid(cell_size=2.0)
+        self.grid.insert(self.near)
+        self.grid.insert(self.far)
+
+    def test_nearest(self):
+        self.assertIs(self.grid.nearest(Point(0, 0)), self.near)
+        self.assertIs(self.grid.nearest(Point(18, 25)), self.far)
+
+    def test_nearest_on_empty_grid(self):
+        self.assertIsNone(SpatialGrid().nearest(Point(0, 0)))
+        self.assertIsNone(SpatialGrid().pop_nearest(Point(0, 0)))
+
+    def test_nearest_far_outside_grid(self):
+        self.assertIs(self.grid.nearest(Point(-500, -500)), self.near)
+
+    def test_remove(self):
+        self.grid.remove(self.near)
+
+        self.assertEqual(len(self.grid), 1)
+        self.assertNotIn(self.near.id, self.grid)
+        self.assertIs(self.grid.nearest(Point(0, 0)), self.far)
+        self.assertIsNone(self.grid.remove(self.near))
+
+    def test_pop_nearest_and_reinsert(self):
+        request, seq = self.grid.pop_nearest(Point(0, 0))
+        self.assertIs(request, self.near)
+        self.assertEqual(len(self.grid), 1)
+
+        self.grid.insert(request, seq)
+        self.assertIs(self.grid.nearest(Point(0, 0)), self.near)
+
+    def test_ties_go_to_first_inserted(self):
+        first = make_request(3, 3, 0)
+        second = make_request(4, -3, 0)
+        grid = SpatialGrid.from_requests([second, first], cell_size=1.0)
+
+        self.assertIs(grid.nearest(Point(0, 0)), second)
+
+        # A removed request keeps its place when re-inserted with its sequence number
+        seq = grid.remove(second)
+        grid.insert(second, seq)
+        self.assertIs(grid.nearest(Point(0, 0)), second)
+
+    def test_reinsert_keeps_sequence(self):
+        moved = make_request(1, 5, 5)
+        self.grid.insert(moved)
+
+        self.assertEqual(len(self.grid), 2)
+        self.assertIs(self.grid.nearest(Point(5, 5)), moved)
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(11)
+        requests = [make_request(i, rng.randint(0, 30), rng.randint(0, 30)) for i in range(80)]
+        grid = SpatialGrid.from_requests(requests, cell_size=3.0)
+
+        for _ in range(200):
+            point = Point(rng.uniform(-10, 40), rng.uniform(-10, 40))
+            self.assertIs(grid.nearest(point), linear_nearest(requests, point))
+
+    def test_iter_nearest_yields_in_order(self):
+        rng = random.Random(12)
+        requests = [make_request(i, rng.randint(0, 30), rng.randint(0, 30)) for i in range(60)]
+        grid = SpatialGrid.from_requests(requests, cell_size=4.0)
+        point = Point(7.5, 12.0)
+
+        keys = [(key, seq) for key, seq, _ in grid.iter_nearest(point, offset=3.0)]
+
+        expected = sorted((point.distance_to(r.pickup) + 3.0, i) for i, r in enumerate(requests))
+        self.assertEqual(keys, expected)
+
+    def test_from_drivers(self):
+        drivers = [Driver(i, Point(i, 0), 1.0, DriverStatus.IDLE, None, GreedyDistanceBehaviour(), [], "test_run")
+                   for i in range(3)]
+        grid = SpatialGrid.from_drivers(drivers)
+
+        self.assertIs(grid.nearest(Point(2.2, 0)), drivers[2])
+
+    def test_from_requests_chooses_cell_size(self):
+        requests = [make_request(i, i * 10, i * 10) for i in range(5)]
+        grid = SpatialGrid.from_requests(requests)
+
+        self.assertGreater(grid.cell_size, 0)
+        self.assertEqual(len(grid), 5)
+
+    def test_cell_size_for_area(self):
+        self.assertEqual(SpatialGrid.cell_size_for_area(50, 30, 15), 10.0)
+        self.assertEqual(SpatialGrid.cell_size_for_area(50, 30, 0), SpatialGrid.DEFAULT_CELL_SIZE)
+        self.assertEqual(SpatialGrid.cell_size_for_area(0, 30, 15), SpatialGrid.DEFAULT_CELL_SIZE)
+
+    def test_search_bounds_shrink_with_removals(self):
+        self.grid.remove(self.far)
+        self.assertIs(self.grid.nearest(Point(40, 40)), self.near)
+        self.assertEqual((self.grid._min_cell, self.grid._max_cell), ((0, 0), (0, 0)))
+
+        self.grid.insert(self.far)
+        self.grid.remove(self.near)
+        self.assertIs(self.grid.nearest(Point(0, 0)), self.far)
+        self.assertEqual((self.grid._min_cell, self.grid._max_cell), ((10, 10), (10, 10)))
+
+    def test_invalid_cell_size(self):
+        with self.assertRaises(TypeError):
+            SpatialGrid("2")
+        with self.assertRaises(ValueError):
+            SpatialGrid(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from phase2.metrics.TickProfiler import TickPhase, TickProfiler
+
+
+class TestTickProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = TickProfiler(capacity=2)
+
+    def record_tick(self, nanoseconds_per_phase):
+        # Fake clock: every lap ends `nanoseconds` after its start
+        start = 0
+        for phase, nanoseconds in zip(TickPhase, nanoseconds_per_phase):
+            with patch("phase2.metrics.TickProfiler.time.perf_counter_ns", return_value=start + nanoseconds):
+                start = self.profiler.lap(phase, start)
+        self.profiler.end_tick()
+
+    def test_lap_returns_end_time(self):
+        with patch("phase2.metrics.TickProfiler.time.perf_counter_ns", return_value=150):
+            self.assertEqual(self.profiler.lap(TickPhase.DISPATCH, 100), 150)
+
+        self.profiler.end_tick()
+        self.assertEqual(self.profiler.durations()[0, TickPhase.DISPATCH.value], 50)
+
+    def test_record_adds_to_current_tick(self):
+        self.profiler.record(TickPhase.DISPATCH, 100, 150)
+        self.profiler.record(TickPhase.DISPATCH, 200, 210)
+        self.profiler.end_tick()
+
+        self.assertEqual(self.profiler.durations()[0, TickPhase.DISPATCH.value], 60)
+
+    def test_arrays_grow_past_capacity(self):
+        for tick in range(5):
+            self.record_tick([tick + 1] * len(TickPhase))
+
+        self.assertEqual(self.profiler.ticks, 5)
+        self.assertEqual(self.profiler.durations()[:, 0].tolist(), [1, 2, 3, 4, 5])
+
+    def test_summary(self):
+        for _ in range(99):
+            self.record_tick([1000, 0, 3000, 0, 0, 0, 0, 0])
+        self.record_tick([1000, 0, 103000, 0, 0, 0, 0, 0])
+
+        summary = self.profiler.summary()
+
+        self.assertEqual(set(summary), {phase.name for phase in TickPhase})
+        self.assertAlmostEqual(summary['GENERATION']['total_ms'], 0.1)
+        self.assertAlmostEqual(summary['DISPATCH']['mean_us'], 4.0)
+        self.assertAlmostEqual(summary['DISPATCH']['p50_us'], 3.0)
+        self.assertGreater(summary['DISPATCH']['p99_us'], 3.0)
+        self.assertAlmostEqual(summary['GENERATION']['share'] + summary['DISPATCH']['share'], 1.0)
+
+    def test_summary_counts_items(self):
+        self.profiler.record(TickPhase.MOVEMENT, 0, 4000, items=8)
+        self.profiler.end_tick()
+        self.profiler.record(TickPhase.MOVEMENT, 0, 2000, items=4)
+        self.profiler.end_tick()
+
+        row = self.profiler.summary()['MOVEMENT']
+        self.assertEqual(row['items'], 12)
+        self.assertAlmostEqual(row['us_per_item'], 0.5)
+
+    def test_summary_without_ticks(self):
+        summary = self.profiler.summary()
+        self.assertEqual(summary['MOVEMENT'], {'items': 0, 'total_ms': 0.0, 'share': 0.0,
+                                               'mean_us': 0.0, 'p50_us': 0.0, 'p99_us': 0.0,
+                                               'us_per_item': 0.0})
+
+    def test_dump_writes_report(self):
+        self.record_tick([1000] * len(TickPhase))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = self.profiler.dump("run", os.path.join(tmp_dir, "profile.txt"))
+            with open(path) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(lines[0], "Tick profile over 1 ticks")
+        self.assertEqual(len(lines), 2 + len(TickPhase))
+        self.assertTrue(lines[2].startswith("GENERATION"))
+
+    def test_dump_skips_test_run(self):
+        self.assertIsNone(self.profiler.dump("test_run"))
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(TypeError):
+            TickProfiler(capacity=1.5)
+        with self.assertRaises(ValueError):
+            TickProfiler(capacity=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
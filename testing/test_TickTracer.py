@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+
+from phase2.metrics.TickProfiler import TickPhase
+from phase2.metrics.TickTracer import SPAN_NAMES, TickTracer
+
+
+class TestTickTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = TickTracer()
+        self.tracer.region("CostMatrix", 2000, 2500, {'idle_drivers': 3})
+        self.tracer.span(TickPhase.DISPATCH, 2000, 5000, {'idle_drivers': 3})
+        self.tracer.span(TickPhase.MOVEMENT, 5000, 6000, {'drivers': 4})
+        self.tracer.end_tick(1000, 7000, {'time': 0})
+
+    def test_counts_ticks_and_spans(self):
+        self.assertEqual(self.tracer.ticks, 1)
+        self.assertEqual(len(self.tracer), 4)
+
+    def test_trace_events(self):
+        events = self.tracer.trace_events("run")
+
+        self.assertEqual(events[0]['ph'], "M")
+        self.assertEqual(events[0]['args'], {'name': "run run"})
+
+        spans = {event['name']: event for event in events[1:]}
+        self.assertEqual(set(spans), {"tick", "CostMatrix", SPAN_NAMES[TickPhase.DISPATCH],
+                                      SPAN_NAMES[TickPhase.MOVEMENT]})
+        self.assertTrue(all(event['ph'] == "X" for event in events[1:]))
+
+        # Microseconds from the first span, phases nested in their tick
+        self.assertEqual((spans["tick"]['ts'], spans["tick"]['dur']), (0.0, 6.0))
+        dispatch = spans["dispatch"]
+        self.assertEqual((dispatch['ts'], dispatch['dur']), (1.0, 3.0))
+        self.assertEqual(dispatch['args'], {'idle_drivers': 3})
+        self.assertEqual((spans["CostMatrix"]['ts'], spans["CostMatrix"]['dur']), (1.0, 0.5))
+        self.assertEqual(spans["CostMatrix"]['cat'], "region")
+
+    def test_empty_trace(self):
+        self.assertEqual(len(TickTracer().trace_events("run")), 1)
+
+    def test_dump_writes_json(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = self.tracer.dump("run", os.path.join(tmp_dir, "trace.json"))
+            with open(path) as f:
+                trace = json.load(f)
+
+        self.assertEqual(len(trace['traceEvents']), 5)
+        self.assertEqual(trace['displayTimeUnit'], "ms")
+
+    def test_dump_skips_test_run(self):
+        self.assertIsNone(self.tracer.dump("test_run"))
+
+    def test_every_phase_has_a_span_name(self):
+        self.assertEqual(set(SPAN_NAMES), set(TickPhase))
+
+
+if __name__ == '__main__':
+    unittest.main()
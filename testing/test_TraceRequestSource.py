@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+from phase2.Request import RequestStatus
+from phase2.RequestGenerator import RequestGenerator
+from phase2.TraceRequestSource import TraceRequestSource
+
+HEADER = "#request time, pickup x, pickup y , delivery x, delivery y\n"
+
+
+class TestTraceRequestSource(unittest.TestCase):
+
+    def write_trace(self, rows, header=HEADER):
+        f = tempfile.NamedTemporaryFile("w", delete=False, suffix=".csv")
+        f.write(header + "".join(row + "\n" for row in rows))
+        f.close()
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def make(self, rows, **kwargs):
+        source = TraceRequestSource(self.write_trace(rows), width=50, height=30, start_id=1, run_id="test_run",
+                                    **kwargs)
+        self.addCleanup(source.close)
+        return source
+
+    def test_is_a_request_generator(self):
+        self.assertIsInstance(self.make(["0,1,1,2,2"]), RequestGenerator)
+
+    def test_releases_rows_at_their_time(self):
+        source = self.make(["0,1,6,41,20", "1,4,25,3,21", "1,10,22,41,25", "5,44,30,45,29"])
+
+        self.assertEqual([r.id for r in source.maybe_generate(0)], [1])
+        self.assertEqual([r.id for r in source.maybe_generate(1)], [2, 3])
+        self.assertEqual(source.maybe_generate(2), [])
+        self.assertFalse(source.exhausted())
+        self.assertEqual([r.id for r in source.maybe_generate(7)], [4])
+        self.assertTrue(source.exhausted())
+        self.assertEqual(source.maybe_generate(8), [])
+        self.assertEqual(source.released, 4)
+
+    def test_request_fields(self):
+        request = self.make(["3,1,6,41,20"]).maybe_generate(4)[0]
+
+        self.assertEqual((request.pickup.x, request.pickup.y), (1, 6))
+        self.assertEqual((request.dropoff.x, request.dropoff.y), (41, 20))
+        self.assertEqual(request.creation_time, 3)
+        self.assertEqual(request.status, RequestStatus.WAITING)
+
+    def test_invalid_rows_are_skipped(self):
+        source = self.make(["0,1,1,2,2", "-1,1,1,2,2", "1,51,1,2,2", "1,1,1,2", "x,1,1,2,2", "", "2,3,3,4,4"])
+
+        self.assertEqual(len(source.maybe_generate(10)), 2)
+        self.assertEqual(source.skipped, 4)
+
+    def test_rows_are_read_lazily(self):
+        # The unsorted row is only noticed when the replay reaches it
+        source = self.make(["0,1,1,2,2", "5,1,1,2,2", "6,1,1,2,2", "2,1,1,2,2"])
+
+        self.assertEqual(len(source.maybe_generate(4)), 1)
+        with self.assertRaises(ValueError):
+            source.maybe_generate(6)
+
+    def test_missing_columns(self):
+        path = self.write_trace(["0,1"], header="time,x\n")
+        with self.assertRaises(ValueError):
+            TraceRequestSource(path, width=50, height=30, start_id=1, run_id="test_run")
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            TraceRequestSource("no_such_trace.csv", width=50, height=30, start_id=1, run_id="test_run")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            TraceRequestSource(1, width=50, height=30, start_id=1, run_id="test_run")
+        with self.assertRaises(ValueError):
+            self.make(["0,1,1,2,2"]).maybe_generate(-1)
+
+    @patch("phase2.TraceRequestSource.EventManager")
+    def test_events_are_added_in_one_call(self, mock_event_manager):
+        event_manager_instance = MagicMock()
+        mock_event_manager.return_value = event_manager_instance
+
+        self.make(["0,1,1,2,2", "0,3,3,4,4"]).maybe_generate(0)
+
+        events = event_manager_instance.add_events.call_args[0][0]
+        self.assertEqual([e.request_id for e in events], [1, 2])
+
+    def test_str_representation(self):
+        source = self.make(["0,1,1,2,2"])
+        self.assertTrue(str(source).startswith("TraceRequestSource(path="))
+        self.assertEqual(repr(source), str(source))
+
+    def test_next_arrival_is_next_release_tick(self):
+        source = self.make(["3,1,1,2,2", "7,3,3,4,4"])
+
+        self.assertEqual(source.next_arrival(0, 10), 3)
+        self.assertIsNone(source.next_arrival(0, 3))
+        source.maybe_generate(3)
+        self.assertEqual(source.next_arrival(4, 10), 7)
+        source.maybe_generate(7)
+        self.assertIsNone(source.next_arrival(8, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from phase2.DeliverySimulation import DeliverySimulation
+from phase2.EventDrivenSimulation import EventDrivenSimulation
+from phase2.PoissonRequestGenerator import PoissonRequestGenerator
+from phase2.TraceRequestSource import TraceRequestSource
+from phase2.dispatch.NearestNeighborPolicy import NearestNeighborPolicy
+from phase2.run import build_simulation, main, parse_args, run
+
+
+class TestRun(unittest.TestCase):
+
+    def test_build_simulation_from_arguments(self):
+        args = parse_args(["--drivers", "7", "--rate", "2", "--timeout", "12", "--policy", "nearest_neighbor",
+                           "--width", "20", "--height", "10", "--seed", "1", "--cascade-rounds", "2", "--profile"])
+
+        simulation = build_simulation(args, "test_run")
+
+        self.assertIsInstance(simulation, DeliverySimulation)
+        self.assertEqual(len(simulation.drivers), 7)
+        self.assertEqual(simulation.request_generator.rate, 2)
+        self.assertEqual(simulation.timeout, 12)
+        self.assertIsInstance(simulation.dispatch_policy, NearestNeighborPolicy)
+        self.assertEqual((simulation.width, simulation.height), (20, 10))
+        self.assertEqual(simulation.cascade_rounds, 2)
+        self.assertIsNotNone(simulation.profiler)
+        self.assertIsNone(simulation.tracer)
+
+    def test_seed_makes_runs_repeatable(self):
+        args = parse_args(["--ticks", "50", "--seed", "4"])
+        results = []
+        for _ in range(2):
+            simulation = build_simulation(args, "test_run")
+            run(simulation, args.ticks)
+            results.append((simulation.statistics['served'], simulation.statistics['expired'],
+                            [(d.position.x, d.position.y) for d in simulation.drivers]))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(simulation.time, 50)
+
+    def test_numpy_streams_make_runs_bit_identical(self):
+        args = parse_args(["--ticks", "50", "--seed", "4", "--rng", "numpy"])
+        results = []
+        for _ in range(2):
+            simulation = build_simulation(args, "test_run")
+            run(simulation, args.ticks)
+            results.append((simulation.statistics['served_waits'],
+                            [(d.position.x, d.position.y, type(d.behaviour).__name__) for d in simulation.drivers]))
+
+        self.assertEqual(results[0], results[1])
+
+    def test_policies_see_the_same_demand(self):
+        requests = []
+        for policy in ("global_greedy", "nearest_neighbor"):
+            simulation = build_simulation(parse_args(["--seed", "6", "--policy", policy]), "test_run")
+            generated = []
+            for time in range(40):
+                generated += [(r.id, r.pickup.x, r.pickup.y, r.dropoff.x, r.dropoff.y)
+                              for r in simulation.request_generator.maybe_generate(time)]
+                simulation.tick()
+            requests.append(generated)
+
+        self.assertEqual(requests[0], requests[1])
+
+    def test_demand_curve_uses_poisson_generator(self):
+        args = parse_args(["--demand-curve", "0:0.5,50:4,80:0.5", "--demand-period", "100", "--seed", "1"])
+        simulation = build_simulation(args, "test_run")
+
+        self.assertIsInstance(simulation.request_generator, PoissonRequestGenerator)
+        self.assertEqual(simulation.request_generator.profile.rate(160), 4.0)
+        run(simulation, 20)
+
+    def test_invalid_demand_curve(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--demand-curve", "0-1"])
+
+    def test_replay_uses_trace_source(self):
+        args = parse_args(["--replay", "data/requests.csv", "--seed", "1"])
+        simulation = build_simulation(args, "test_run")
+
+        self.assertIsInstance(simulation.request_generator, TraceRequestSource)
+        run(simulation, 120)
+        self.assertTrue(simulation.request_generator.exhausted())
+        self.assertEqual(len(simulation.requests), simulation.request_generator.released)
+
+    def test_main_prints_throughput_and_statistics(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            main(["--ticks", "20", "--seed", "2", "--run-id", "cli_test_run", "--profile"])
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("run cli_test_run: 20 ticks in "))
+        self.assertIn("ticks/sec", lines[0])
+        self.assertTrue(lines[1].startswith("served: "))
+        self.assertTrue(lines[2].startswith("Tick profile over 20 ticks"))
+
+    def test_unknown_policy(self):
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args(["--policy", "random"])
+
+    def test_event_engine_sees_the_same_demand(self):
+        args = parse_args(["--ticks", "50", "--seed", "4", "--engine", "event"])
+        simulation = build_simulation(args, "test_run")
+        run(simulation, args.ticks)
+
+        self.assertIsInstance(simulation, EventDrivenSimulation)
+        self.assertEqual(simulation.time, 50)
+        ticked = build_simulation(parse_args(["--seed", "4"]), "test_run")
+        run(ticked, 50)
+        self.assertEqual(len(simulation.requests), len(ticked.requests))
+
+
+if __name__ == '__main__':
+    unittest.main()